@@ -0,0 +1,63 @@
+import asyncio
+import functools
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# HTTP requests in flight at once, across every client sharing the runner
+# (see ADR-0026).
+MAX_CONCURRENT_REQUESTS = 8
+
+
+class AsyncRunner:
+    # One event loop on its own daemon thread. Async callers fan requests out
+    # on it with asyncio.gather; sync callers hand it a coroutine and block on
+    # the result. Either way a request only holds a thread while it's actually
+    # on the wire -- waiting for the semaphore, or for a retry delay, is just
+    # a suspended coroutine.
+
+    def __init__(self, max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS) -> None:
+        self._loop = asyncio.new_event_loop()
+        # The blocking requests calls run here, sized to the semaphore: a
+        # thousand queued requests are a thousand coroutines, not threads.
+        self._loop.set_default_executor(
+            ThreadPoolExecutor(
+                max_workers=max_concurrent_requests, thread_name_prefix="http"
+            )
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="http-event-loop", daemon=True
+        )
+        self._thread.start()
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        # Blocking on the loop from its own thread would never return.
+        if threading.current_thread() is self._thread:
+            coroutine.close()
+            raise RuntimeError("AsyncRunner.run called from its own event loop.")
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    async def call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        async with self._semaphore:
+            return await self._loop.run_in_executor(
+                None, functools.partial(func, *args, **kwargs)
+            )
+
+
+_shared_runner_lock = threading.Lock()
+
+
+@functools.cache
+def _start_shared_runner() -> AsyncRunner:
+    return AsyncRunner()
+
+
+def shared_runner() -> AsyncRunner:
+    # Lazily started, so importing a client never spawns the loop thread,
+    # and locked, so two first callers can't each start one.
+    with _shared_runner_lock:
+        return _start_shared_runner()
@@ -1,10 +1,11 @@
 import logging.config
 import sys
 from logging import Logger, getLogger
+from typing import Literal, Self
 
 import yaml
 from common.logging import APP_LOGGER_NAME, config
-from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
 
 logging.config.dictConfig(config)
 logger: Logger = getLogger(APP_LOGGER_NAME)
@@ -13,14 +14,61 @@ logger: Logger = getLogger(APP_LOGGER_NAME)
 class OctopusAPISettings(BaseModel):
     account_number: str
     api_key: str
+    # Consumption history windows fetched at once (see ADR-0025).
+    fetch_workers: int = Field(default=4, gt=0)
+    # Opt-in: cached catalogue and product responses are also kept here, so
+    # they survive a restart (see ADR-0027).
+    cache_directory: str | None = None
 
 
 class MariaDBSettings(BaseModel):
-    host: str
-    port: int
-    database: str
-    username: str
-    password: str
+    # "sqlite" keeps everything in the single file at sqlite_path, in WAL
+    # mode, for a one-container deployment (see ADR-0021); the connection
+    # fields below are then unused and may be left blank.
+    backend: Literal["mariadb", "sqlite"] = "mariadb"
+    sqlite_path: str = "/config/octopus.sqlite"
+    host: str | None = None
+    port: int | None = None
+    database: str | None = None
+    username: str | None = None
+    password: str | None = None
+    # Rows per multi-row INSERT ... ON DUPLICATE KEY UPDATE statement -- bounds
+    # packet size (max_allowed_packet) while keeping a 45-day refill to a
+    # handful of round trips.
+    write_chunk_size: int = Field(default=1000, gt=0)
+    # Rows per fetch from a server-side cursor on reads that scale with
+    # history -- bounds the app's peak memory regardless of retention.
+    read_chunk_size: int = Field(default=5000, gt=0)
+    # Opt-in: range-partition consumption, consumption_cost and product_rate by
+    # month so retention pruning drops whole partitions (MariaDB only, see
+    # ADR-0016). Either way, whatever is left is deleted in short batches.
+    partitioned_retention: bool = False
+    prune_batch_size: int = Field(default=5000, gt=0)
+    # A batch slower than this halves the next one, keeping each DELETE's
+    # lock hold short on slow (SD-card) storage.
+    prune_batch_time_limit_seconds: float = Field(default=2.0, gt=0)
+    # Opt-in: write_* calls queue their rows for one writer thread, which
+    # merges whatever has queued into a single transaction (see ADR-0020).
+    write_behind: bool = False
+    # Queued write_* calls (each one page of rows) before callers block.
+    write_behind_queue_size: int = Field(default=64, gt=0)
+    # How long flush() waits for the writer to commit what was queued
+    # before failing the caller with MariaDBError.
+    write_behind_flush_timeout_seconds: float = Field(default=300.0, gt=0)
+
+    @model_validator(mode="after")
+    def _require_connection_for_mariadb(self) -> Self:
+        if self.backend == "mariadb":
+            missing = [
+                name
+                for name in ("host", "port", "database", "username", "password")
+                if getattr(self, name) is None
+            ]
+            if missing:
+                raise ValueError(
+                    f"{', '.join(missing)} required for the mariadb backend"
+                )
+        return self
 
 
 class RefreshSettings(BaseModel):
@@ -28,6 +76,9 @@ class RefreshSettings(BaseModel):
 
     refresh_interval: int = Field(alias="refresh_interval_hours")
     retention: int = Field(alias="retention_days")
+    # Opt-in: consumption past retention is exported here, one compressed
+    # file per month, before it is pruned (see ADR-0022).
+    archive_directory: str | None = None
 
 
 class ApplicationSettings(BaseModel):
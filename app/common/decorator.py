@@ -1,6 +1,7 @@
+import asyncio
 import logging.config
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Coroutine
 from logging import Logger, getLogger
 from typing import Any
 
@@ -11,14 +12,19 @@ logger: Logger = getLogger(APP_LOGGER_NAME)
 
 
 def retry(
-    stop_after: int = 3, retry_delay: int = 10
+    stop_after: int = 3,
+    retry_delay: int = 10,
+    give_up_on: tuple[type[Exception], ...] = (),
 ) -> Callable[[Callable[..., Any | None]], Callable[..., Any]]:
+    # give_up_on: errors that another attempt can't fix, raised at once.
     def decorator(func: Callable[..., Any | None]) -> Callable[..., Any]:
         def wrapper(*args: Any, **kwargs: Any) -> Any:
             attempt = 1
             while attempt < stop_after:
                 try:
                     return func(*args, **kwargs)
+                except give_up_on:
+                    raise
                 except Exception as e:
                     error = f"Error attempting to execute {func}: {e}. \nRetrying in {retry_delay} seconds."
                     logger.warning(error)
@@ -36,6 +42,38 @@ def retry(
     return decorator
 
 
+def async_retry(
+    stop_after: int = 3, retry_delay: int = 10
+) -> Callable[
+    [Callable[..., Coroutine[Any, Any, Any]]], Callable[..., Coroutine[Any, Any, Any]]
+]:
+    # retry() for coroutines: the delay is an asyncio.sleep, so a request
+    # waiting to retry holds no thread (see ADR-0026).
+    def decorator(
+        func: Callable[..., Coroutine[Any, Any, Any]],
+    ) -> Callable[..., Coroutine[Any, Any, Any]]:
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            attempt = 1
+            while attempt < stop_after:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    error = f"Error attempting to execute {func}: {e}. \nRetrying in {retry_delay} seconds."
+                    logger.warning(error)
+                    attempt += 1
+                    await asyncio.sleep(retry_delay)
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                error = f"Error attempting to execute {func}: {e}. \nRetries exhausted."
+                logger.error(error)
+                raise
+
+        return wrapper
+
+    return decorator
+
+
 def retry_with_exponential_backoff(
     max_attempts: int = 5, base_delay_seconds: int = 60, multiplier: int = 2
 ) -> Callable[[Callable[..., None]], Callable[..., None]]:
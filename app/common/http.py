@@ -1,7 +1,20 @@
-from typing import NoReturn
+import threading
+from typing import Any, NamedTuple, NoReturn, TypeVar
 
 import requests
+from common.decorator import retry
 from common.exceptions import APIError
+from common.rate_limit import HostRateLimiter, shared_rate_limiter
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+
+REQUEST_TIMEOUT_SECONDS = 30
+# Hosts kept pooled, and keep-alive connections kept per host -- the forecast
+# sources are two hosts polled a request at a time.
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 4
+
+T = TypeVar("T", bound=BaseModel)
 
 
 def raise_for_http_error(
@@ -14,3 +27,65 @@ def raise_for_http_error(
             error_body = response.text
         raise APIError(error_body) from error
     raise RuntimeError(f"Failed to {description}: {error}.") from error
+
+
+class _Validated(NamedTuple):
+    etag: str | None
+    last_modified: str | None
+    response_model: type[BaseModel]
+    parsed: Any
+
+
+class PooledHTTPClient:
+    # The shared HTTP client for third-party sources (see ADR-0029). One
+    # Session, so urllib3 keeps a keep-alive connection pool per host and an
+    # hourly poll reuses a warm connection. Each URL's ETag/Last-Modified is
+    # sent back on the next request, and a 304 is answered from the copy
+    # they validated. Session state is never mutated after construction;
+    # the validator map is the only shared state, behind a lock.
+
+    def __init__(self, limiter: HostRateLimiter | None = None) -> None:
+        self._limiter = limiter or shared_rate_limiter()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._validated: dict[str, _Validated] = {}
+
+    @retry()
+    def get(self, url: str, response_model: type[T], description: str = "request") -> T:
+        with self._lock:
+            validated = self._validated.get(url)
+        if validated is not None and validated.response_model is not response_model:
+            validated = None
+        headers = {}
+        if validated is not None and validated.etag:
+            headers["If-None-Match"] = validated.etag
+        if validated is not None and validated.last_modified:
+            headers["If-Modified-Since"] = validated.last_modified
+
+        response: requests.Response | None = None
+        try:
+            self._limiter.acquire(url)
+            response = self._session.get(
+                url=url, headers=headers, timeout=REQUEST_TIMEOUT_SECONDS
+            )
+            self._limiter.record(url, response)
+            if response.status_code == 304 and validated is not None:
+                return validated.parsed
+            response.raise_for_status()
+            parsed = response_model.model_validate(response.json())
+        except Exception as e:
+            raise_for_http_error(response, e, description)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._lock:
+                self._validated[url] = _Validated(
+                    etag, last_modified, response_model, parsed
+                )
+        return parsed
@@ -0,0 +1,147 @@
+import asyncio
+import logging.config
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from logging import Logger, getLogger
+from urllib.parse import urlparse
+
+import requests
+from common.logging import APP_LOGGER_NAME, config
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+# Steady requests per second to any one host, and the burst allowed above
+# it (see ADR-0030). None of the upstreams publish a limit; this is well
+# under what a refresh needs to stay fast and well clear of a hammering.
+REQUESTS_PER_SECOND = 5.0
+BURST = 10
+# Adaptive backoff: each throttled or failed response halves a host's rate,
+# down to the floor; each success wins back a tenth of the full rate.
+MIN_REQUESTS_PER_SECOND = 0.2
+RECOVERY_FRACTION = 0.1
+# A 429/503 with no usable Retry-After pauses the host this long, doubling
+# per consecutive one, up to the cap.
+THROTTLE_PAUSE_SECONDS = 1.0
+MAX_THROTTLE_PAUSE_SECONDS = 60.0
+THROTTLE_STATUSES = {429, 503}
+
+
+def _retry_after_seconds(response: requests.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return max(0.0, (retry_at - datetime.now(UTC)).total_seconds())
+
+
+class _Bucket:
+    def __init__(self, now: float) -> None:
+        self.rate = REQUESTS_PER_SECOND
+        self.tokens = float(BURST)
+        self.updated = now
+        self.paused_until = now
+        self.consecutive_throttles = 0
+        self.waited_seconds = 0.0
+
+    def reserve(self, now: float) -> float:
+        # Takes a token now -- into debt if need be, so callers queue in
+        # arrival order -- and returns how long the caller must wait for it.
+        self.tokens = min(BURST, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        token_wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        return max(token_wait, self.paused_until - now)
+
+
+class HostRateLimiter:
+    # A token bucket per upstream host, shared by every client that talks to
+    # it, so concurrent jobs are throttled together rather than each on its
+    # own. Callers reserve under the lock and sleep outside it -- blocking
+    # callers with time.sleep, the async transport with asyncio.sleep.
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: dict[str, _Bucket] = {}
+
+    def acquire(self, url: str) -> float:
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record(self, url: str, response: requests.Response) -> None:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._bucket(host)
+            if response.status_code == 429 or response.status_code >= 500:
+                bucket.rate = max(MIN_REQUESTS_PER_SECOND, bucket.rate / 2)
+                if response.status_code in THROTTLE_STATUSES:
+                    pause = _retry_after_seconds(response)
+                    if pause is None:
+                        pause = min(
+                            MAX_THROTTLE_PAUSE_SECONDS,
+                            THROTTLE_PAUSE_SECONDS * 2**bucket.consecutive_throttles,
+                        )
+                    bucket.consecutive_throttles += 1
+                    bucket.paused_until = max(
+                        bucket.paused_until, self._clock() + pause
+                    )
+                logger.warning(
+                    f"{host} answered {response.status_code}: throttling to "
+                    f"{bucket.rate:.2f} requests/s."
+                )
+            else:
+                bucket.consecutive_throttles = 0
+                bucket.rate = min(
+                    REQUESTS_PER_SECOND,
+                    bucket.rate + REQUESTS_PER_SECOND * RECOVERY_FRACTION,
+                )
+
+    def waited_seconds(self) -> dict[str, float]:
+        # Total time callers have spent waiting on each host.
+        with self._lock:
+            return {host: b.waited_seconds for host, b in self._buckets.items()}
+
+    def _reserve(self, url: str) -> float:
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._bucket(host)
+            wait = bucket.reserve(self._clock())
+            bucket.waited_seconds += wait
+        if wait > 0:
+            logger.debug(f"Waiting {wait:.2f}s for a {host} request slot.")
+        return wait
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self._clock())
+        return bucket
+
+
+# Created at import: unlike the async runner, a limiter starts no thread.
+_shared_limiter = HostRateLimiter()
+
+
+def shared_rate_limiter() -> HostRateLimiter:
+    return _shared_limiter
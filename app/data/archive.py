@@ -0,0 +1,167 @@
+import gzip
+import json
+import logging.config
+import os
+import zlib
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from logging import Logger, getLogger
+from pathlib import Path
+from typing import Any
+
+from common.logging import APP_LOGGER_NAME, config
+from data.model import Consumption, Energy, Unit, as_energy_char
+
+# consumption.raw_value/est_kwh are DECIMAL(8, 5): archived as integers
+# scaled by 10^5, which round-trips them exactly.
+DECIMAL_PLACES = 5
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+# A gzip member starts with its magic number and the deflate method byte.
+GZIP_MAGIC = b"\x1f\x8b\x08"
+# zlib's window bits for a gzip-wrapped stream.
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def _months(period_from: datetime, period_to: datetime) -> list[tuple[int, int]]:
+    months = []
+    year, month = period_from.year, period_from.month
+    while (year, month) <= (period_to.year, period_to.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _deltas(values: list[int]) -> list[int]:
+    return [value - previous for previous, value in zip([0, *values], values)]
+
+
+def _undeltas(deltas: list[int]) -> list[int]:
+    values, total = [], 0
+    for delta in deltas:
+        total += delta
+        values.append(total)
+    return values
+
+
+def _scaled(value: Decimal) -> int:
+    return int(value.scaleb(DECIMAL_PLACES))
+
+
+def _unscaled(value: int) -> Decimal:
+    return Decimal(value).scaleb(-DECIMAL_PLACES)
+
+
+class ConsumptionArchive:
+    # Cold storage for consumption past the retention window (see ADR-0022):
+    # one append-only file per UTC month, each a run of gzip members holding
+    # one column-oriented segment per export. Concatenated gzip members are
+    # still one valid gzip stream, so appending never rewrites what's there.
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+
+    def append(self, energy: Energy, consumption: list[Consumption]) -> None:
+        by_month: dict[tuple[int, int], list[Consumption]] = {}
+        for point in sorted(consumption, key=lambda point: point.start):
+            start = point.start.astimezone(UTC)
+            by_month.setdefault((start.year, start.month), []).append(point)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        for (year, month), points in by_month.items():
+            segment = json.dumps(self._segment(energy, points), separators=(",", ":"))
+            # One write of a complete member, fsynced: a crash can at worst
+            # tear the last segment, which read() then skips.
+            with open(self._path(year, month), "ab") as file:
+                file.write(gzip.compress(segment.encode() + b"\n"))
+                file.flush()
+                os.fsync(file.fileno())
+
+    def read(
+        self, energy: Energy, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        # Half-hours starting in [period_from, period_to). A half-hour
+        # exported twice (a prune re-run after its delete failed) is
+        # returned once, the later export winning.
+        energy_char = as_energy_char(energy)
+        points: dict[datetime, Consumption] = {}
+        for year, month in _months(
+            period_from.astimezone(UTC), period_to.astimezone(UTC)
+        ):
+            for segment in self._segments(self._path(year, month)):
+                if segment["energy"] != energy_char:
+                    continue
+                for point in self._points(segment):
+                    if period_from <= point.start < period_to:
+                        points[point.start] = point
+        return [points[start] for start in sorted(points)]
+
+    def _path(self, year: int, month: int) -> Path:
+        return self._directory / f"consumption-{year:04d}-{month:02d}.json.gz"
+
+    def _segment(self, energy: Energy, points: list[Consumption]) -> dict[str, Any]:
+        # Epoch seconds, delta-encoded: a run of half-hours is 1800, 1800, ...
+        starts = [int(point.start.timestamp()) for point in points]
+        return {
+            "energy": as_energy_char(energy),
+            "start": _deltas(starts),
+            "seconds": [
+                int((point.end - point.start).total_seconds()) for point in points
+            ],
+            "unit": [point.unit.name for point in points],
+            "raw_value": [_scaled(point.raw) for point in points],
+            "est_kwh": [_scaled(point.est_kwh) for point in points],
+        }
+
+    def _points(self, segment: dict[str, Any]) -> list[Consumption]:
+        starts = [
+            datetime.fromtimestamp(start, UTC) for start in _undeltas(segment["start"])
+        ]
+        return [
+            Consumption(
+                raw=_unscaled(raw),
+                est_kwh=_unscaled(est_kwh),
+                unit=Unit[unit],
+                start=start,
+                end=start + timedelta(seconds=seconds),
+            )
+            for start, seconds, unit, raw, est_kwh in zip(
+                starts,
+                segment["seconds"],
+                segment["unit"],
+                segment["raw_value"],
+                segment["est_kwh"],
+            )
+        ]
+
+    def _segments(self, path: Path) -> list[dict[str, Any]]:
+        if not path.exists():
+            return []
+        data = path.read_bytes()
+        segments = []
+        offset = 0
+        while offset < len(data):
+            # Decoded a member at a time, not as one stream: a member torn
+            # by an interrupted append, with later exports appended after
+            # it, costs only its own segment.
+            decompressor = zlib.decompressobj(wbits=GZIP_WBITS)
+            try:
+                member = decompressor.decompress(data[offset:])
+                if decompressor.eof:
+                    segments.append(json.loads(member))
+                    offset = len(data) - len(decompressor.unused_data)
+                    continue
+                error = "truncated"
+            except (zlib.error, ValueError) as e:
+                error = str(e)
+            logger.warning(
+                f"Consumption archive {path.name}: skipped a damaged segment "
+                f"at byte {offset} ({error})."
+            )
+            # Resume at the next member header; one that turns out to be a
+            # chance match inside compressed data fails and is skipped too.
+            offset = data.find(GZIP_MAGIC, offset + 1)
+            if offset == -1:
+                break
+        return segments
@@ -1,12 +1,12 @@
 from datetime import datetime
 
 from common.config import ApplicationSettings
+from common.http import PooledHTTPClient
 from data.model import (
     Consumption,
     ConsumptionSummary,
     CostForecast,
     DailyCostSummary,
-    Energy,
 )
 from data.mysql.client import MariaDBClient
 from data.octopus.agile_predict import AgilePredictClient
@@ -22,6 +22,8 @@ from data.octopus.model import (
     Rate,
 )
 from data.octopus.x2r import X2rClient
+from data.rate_timeline import RateTimeline
+from data.warm_start import WarmStartStore
 
 
 class MonitoringClient:
@@ -30,45 +32,69 @@ class MonitoringClient:
     _billing_period: BillingPeriodClient
     _agile_predict: AgilePredictClient
     _x2r: X2rClient
+    warm_start: WarmStartStore
 
     account: Account
     meters: list[Meter]
     region_code: str
 
-    def __init__(self, settings: ApplicationSettings) -> None:
+    def __init__(self, settings: ApplicationSettings, warm_start: bool = True) -> None:
         self.octopus = OctopusEnergyAPIClient(settings.octopus)
         self.mariadb = MariaDBClient(settings.mariadb)
         self._billing_period = BillingPeriodClient(settings.octopus, KrakenTransport())
-        self._agile_predict = AgilePredictClient()
-        self._x2r = X2rClient()
+        # One pool for both forecast sources (see ADR-0029).
+        forecast_http = PooledHTTPClient()
+        self._agile_predict = AgilePredictClient(forecast_http)
+        self._x2r = X2rClient(forecast_http)
+        self.warm_start = WarmStartStore(self.mariadb)
+
+        # Only startup reads the snapshot; every scheduled refresh still
+        # fetches afresh and saves what it fetched (see ADR-0034).
+        snapshot = self.warm_start.restore() if warm_start else None
+        if (
+            snapshot is not None
+            and snapshot.account is not None
+            and snapshot.region_code is not None
+        ):
+            self.account = snapshot.account
+            self.meters = snapshot.meters
+            self.region_code = snapshot.region_code
+            return
 
         account, meters = self.octopus.get_account_meter_information()
         self.account = account
         self.meters = meters
 
         self.region_code = self.octopus.get_region_code(self.account.postcode)
+        self.warm_start.save_account(self.account, self.meters, self.region_code)
 
     def refresh_meters(
         self,
     ) -> None:
         _, meters = self.octopus.get_account_meter_information()
         self.meters = meters
+        self.warm_start.save_account(self.account, self.meters, self.region_code)
 
-    def fetch_consumption(
-        self, meter: Meter, period_from: datetime
-    ) -> tuple[str | None, list[Consumption]]:
-        return self.octopus.get_consumption(meter, period_from)
+    def fetch_consumption_range(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        return self.octopus.get_consumption_range(meter, period_from, period_to)
 
-    def fetch_consumption_page(
-        self, energy: Energy, next_page: str
-    ) -> tuple[str | None, list[Consumption]]:
-        return self.octopus.get_consumption_directly_from_endpoint(energy, next_page)
+    def fetch_daily_consumption(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        return self.octopus.get_daily_consumption(meter, period_from, period_to)
 
     def persist_consumption(self, meter: Meter, consumption: list[Consumption]) -> None:
         self.mariadb.write_consumption(meter, consumption)
 
-    def persist_consumption_summary(self, summaries: list[ConsumptionSummary]) -> None:
-        self.mariadb.write_consumption_summary(summaries)
+    def persist_consumption_summary(
+        self, summaries: list[ConsumptionSummary], backfilled_to: datetime | None = None
+    ) -> None:
+        self.mariadb.write_consumption_summary(summaries, backfilled_to)
+
+    def read_backfill_checkpoint(self) -> datetime | None:
+        return self.mariadb.read_backfill_checkpoint()
 
     def persist_agreement(self, meter: Meter, agreements: list[Agreement]) -> None:
         self.mariadb.write_agreement(meter, agreements)
@@ -76,8 +102,12 @@ class MonitoringClient:
     def fetch_products(self) -> list[Product]:
         return self.octopus.get_products()
 
-    def is_product_available_in_region(self, product_code: str, region: str) -> bool:
-        return self.octopus.get_product_region_availability(product_code, region)
+    async def is_product_available_in_region_async(
+        self, product_code: str, region: str
+    ) -> bool:
+        return await self.octopus.get_product_region_availability_async(
+            product_code, region
+        )
 
     def persist_product(self, product: Product) -> None:
         self.mariadb.write_product(product)
@@ -93,6 +123,17 @@ class MonitoringClient:
             product_code, tariff_code, period_from, period_to
         )
 
+    async def fetch_electricity_rates_async(
+        self,
+        product_code: str,
+        tariff_code: str,
+        period_from: datetime | None,
+        period_to: datetime | None,
+    ) -> list[Rate]:
+        return await self.octopus.get_electricity_rates_async(
+            product_code, tariff_code, period_from, period_to
+        )
+
     def fetch_gas_rates(
         self,
         product_code: str,
@@ -104,16 +145,33 @@ class MonitoringClient:
             product_code, tariff_code, period_from, period_to
         )
 
-    def persist_rate(self, product_code: str, region: str, rates: list[Rate]) -> None:
-        self.mariadb.write_product_rate(product_code, region, rates)
+    def persist_rate(
+        self, product_code: str, tariff_code: str, region: str, rates: list[Rate]
+    ) -> None:
+        self.mariadb.write_product_rate(product_code, region, rates, tariff_code)
+
+    def read_rate_watermark(
+        self, product_code: str, tariff_code: str, region: str
+    ) -> datetime | None:
+        return self.mariadb.read_rate_watermark(product_code, tariff_code, region)
 
-    def fetch_electricity_tariff_code(
+    async def fetch_electricity_tariff_code_async(
         self, product_code: str, region: str
     ) -> str | None:
-        return self.octopus.get_electricity_tariff_code(product_code, region)
+        return await self.octopus.get_electricity_tariff_code_async(
+            product_code, region
+        )
 
     def get_current_billing_period(self) -> BillingPeriod:
-        return self._billing_period.get_current_billing_period()
+        # A restored period serves the startup forecast once; the daily job
+        # after it fetches afresh.
+        restored = self.warm_start.restored.billing_period
+        if restored is not None:
+            self.warm_start.restored.billing_period = None
+            return restored
+        billing_period = self._billing_period.get_current_billing_period()
+        self.warm_start.save_billing_period(billing_period)
+        return billing_period
 
     def fetch_agile_forecast(self, region: str) -> list[AgileForecastReading]:
         return self._agile_predict.get_forecast(region)
@@ -138,10 +196,12 @@ class MonitoringClient:
             period_from, period_to, region
         )
 
-    def read_current_product_rate(
-        self, product_code: str, region: str, as_of: datetime
-    ) -> Rate | None:
-        return self.mariadb.read_current_product_rate(product_code, region, as_of)
+    def read_rate_timeline(
+        self, product_code: str, region: str, period_from: datetime, period_to: datetime
+    ) -> RateTimeline[Rate]:
+        return self.mariadb.read_rate_timeline(
+            product_code, region, period_from, period_to
+        )
 
     def persist_cost_forecast(self, forecast: CostForecast) -> None:
         self.mariadb.write_cost_forecast(forecast)
@@ -1,25 +1,24 @@
 import logging.config
-from datetime import datetime
+from datetime import UTC, datetime
 from logging import Logger, getLogger
 from typing import Protocol
 
 from common.decorator import retry
 from common.logging import APP_LOGGER_NAME, config
+from data import local_day
 from data.model import Consumption, Energy
+from data.mysql.gaps import ConsumptionGapScanner
 from data.octopus.model import Meter, MeterSource
+from data.warm_start import WarmStartStore
 
 logging.config.dictConfig(config)
 logger: Logger = getLogger(APP_LOGGER_NAME)
 
 
 class ConsumptionFetchSource(MeterSource, Protocol):
-    def fetch_consumption(
-        self, meter: Meter, period_from: datetime
-    ) -> tuple[str | None, list[Consumption]]: ...
-
-    def fetch_consumption_page(
-        self, energy: Energy, next_page: str
-    ) -> tuple[str | None, list[Consumption]]: ...
+    def fetch_consumption_range(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]: ...
 
 
 class ConsumptionSource(ConsumptionFetchSource, Protocol):
@@ -30,17 +29,34 @@ class ConsumptionSource(ConsumptionFetchSource, Protocol):
 
 class ConsumptionRetriever:
     _client: ConsumptionSource
+    _warm_start: WarmStartStore
+    _gap_scanner: ConsumptionGapScanner
 
     _latest_retrieved_date: dict[Energy, datetime]
 
-    def __init__(self, client: ConsumptionSource) -> None:
+    def __init__(
+        self,
+        client: ConsumptionSource,
+        warm_start: WarmStartStore,
+        gap_scanner: ConsumptionGapScanner,
+    ) -> None:
         self._client = client
-        self._latest_retrieved_date: dict[Energy, datetime] = {}
+        self._warm_start = warm_start
+        self._gap_scanner = gap_scanner
+        # Seeded from the warm-start snapshot, if any (see ADR-0034).
+        self._latest_retrieved_date: dict[Energy, datetime] = dict(
+            warm_start.restored.consumption_cursors
+        )
 
-    def retrieve(self, period_from: datetime | None) -> None:
-        self._client.refresh_meters()
+    def resume(self, period_from: datetime) -> None:
+        # Every meter from period_from, except that one with a later cursor
+        # fetches only from there -- after a warm start, just what arrived
+        # while the process was down. The meters are the ones the client
+        # has just restored or fetched, so they aren't refreshed again here;
+        # refresh() does that on the normal schedule (see ADR-0034).
         for meter in self._client.meters:
-            self.get_meter_consumption(meter, period_from)
+            cursor = self._latest_retrieved_date.get(meter.energy, period_from)
+            self.get_meter_consumption(meter, max(period_from, cursor))
 
     def refresh(self) -> None:
         self._client.refresh_meters()
@@ -50,6 +66,35 @@ class ConsumptionRetriever:
                 self._latest_retrieved_date[meter.energy],
             )
 
+    def backfill_gaps(self, period_from: datetime) -> None:
+        # Refetches only the half-hours missing from the store since
+        # period_from, up to the start of today -- today is still arriving
+        # and is the refresh loop's (see ADR-0035).
+        self._client.refresh_meters()
+        period_to = local_day.start_of_local_day(
+            local_day.to_local_date(datetime.now(UTC))
+        )
+        for meter in self._client.meters:
+            scan_from = max(period_from, meter.start_date())
+            gaps = (
+                self._gap_scanner.find(meter.energy, scan_from, period_to)
+                if scan_from < period_to
+                else []
+            )
+            recovered = 0
+            for gap_from, gap_to in gaps:
+                consumption = self._client.fetch_consumption_range(
+                    meter, gap_from, gap_to
+                )
+                if consumption:
+                    self.write(meter, consumption)
+                    recovered += len(consumption)
+            self._gap_scanner.record_run(meter.energy, gaps, recovered)
+            logger.info(
+                f"Consumption gap backfill: {recovered} {meter.energy.name} "
+                f"half-hour(s) recovered across {len(gaps)} gap(s) since {scan_from}."
+            )
+
     @retry()
     def get_meter_consumption(
         self,
@@ -59,24 +104,22 @@ class ConsumptionRetriever:
         if not period_from:
             period_from = meter.start_date()
         logger.debug(f"Retrieving {meter.energy.name} consumption from {period_from}.")
-        next_page, consumption = self._client.fetch_consumption(meter, period_from)
+        # Merged in period order across every fetch window before anything
+        # is persisted (see ADR-0025).
+        consumption = self._client.fetch_consumption_range(
+            meter, period_from, datetime.now(UTC)
+        )
         latest_retrieved_date = period_from
-        while True:
-            if consumption:
-                self.write(meter, consumption)
-                latest_retrieved_date = max(
-                    latest_retrieved_date, max(c.end for c in consumption)
-                )
-            if next_page is None:
-                break
-            (
-                next_page,
-                consumption,
-            ) = self._client.fetch_consumption_page(meter.energy, next_page)
+        if consumption:
+            self.write(meter, consumption)
+            latest_retrieved_date = max(
+                latest_retrieved_date, max(c.end for c in consumption)
+            )
         logger.info(
             f"Successfully retrieved consumption from {period_from} to {latest_retrieved_date}"
         )
         self._latest_retrieved_date[meter.energy] = latest_retrieved_date
+        self._warm_start.save_consumption_cursor(meter.energy, latest_retrieved_date)
 
     def write(self, meter: Meter, consumption: list[Consumption]) -> None:
         _min = min(c.start for c in consumption)
@@ -5,9 +5,10 @@ from logging import Logger, getLogger
 from typing import Protocol
 
 from common.logging import APP_LOGGER_NAME, config
-from data.consumption import ConsumptionFetchSource
-from data.model import ConsumptionSummary, Energy
+from data import local_day
+from data.model import Consumption, ConsumptionSummary, Energy
 from data.mysql.client import MariaDBClient
+from data.octopus.model import Meter, MeterSource
 
 logging.config.dictConfig(config)
 logger: Logger = getLogger(APP_LOGGER_NAME)
@@ -22,17 +23,40 @@ class ConsumptionSummaryRetriever:
         self._mariadb = mariadb
 
     def refresh(self) -> None:
-        as_of = datetime.now(UTC).date()
-        summaries = self._mariadb.read_consumption_summarization_window(as_of)
-        self._mariadb.write_consumption_summary(summaries)
-        logger.info(f"Consumption summary refresh: {len(summaries)} day(s) summarized.")
+        batch = self._mariadb.read_consumption_summarization_batch()
+        self._mariadb.complete_consumption_summarization(batch)
+        logger.info(
+            f"Consumption summary refresh: {len(batch.summaries)} day(s) "
+            f"summarized from {len(batch.dirty_days)} dirty day mark(s)."
+        )
 
 
-class ConsumptionSummaryBackfillSource(ConsumptionFetchSource, Protocol):
+class ConsumptionSummaryBackfillSource(MeterSource, Protocol):
+    def fetch_daily_consumption(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]: ...
+
     def persist_consumption_summary(
-        self, summaries: list[ConsumptionSummary]
+        self, summaries: list[ConsumptionSummary], backfilled_to: datetime | None = None
     ) -> None: ...
 
+    def read_backfill_checkpoint(self) -> datetime | None: ...
+
+
+def plan_month_chunks(
+    period_from: datetime, period_to: datetime
+) -> list[tuple[datetime, datetime]]:
+    # Back-to-back half-open chunks covering [period_from, period_to), split
+    # at each Europe/London month start.
+    chunks = []
+    chunk_from = period_from
+    while chunk_from < period_to:
+        next_month = local_day.first_of_next_month(local_day.to_local_date(chunk_from))
+        chunk_to = min(local_day.start_of_local_day(next_month), period_to)
+        chunks.append((chunk_from, chunk_to))
+        chunk_from = chunk_to
+    return chunks
+
 
 class ConsumptionSummaryBackfill:
     _client: ConsumptionSummaryBackfillSource
@@ -43,34 +67,44 @@ class ConsumptionSummaryBackfill:
     def run(self, as_of: datetime | None = None) -> None:
         if as_of is None:
             as_of = datetime.now(UTC)
-        # Anchored to midnight UTC of the cutoff date, not as_of's exact
+        # Anchored to local midnight of the cutoff date, not as_of's exact
         # time-of-day -- otherwise Octopus omits intervals before that time
         # on the oldest backfilled day, producing a partial daily total.
-        cutoff_date = (as_of - timedelta(days=BACKFILL_WINDOW_DAYS)).date()
-        period_from = datetime(
-            cutoff_date.year, cutoff_date.month, cutoff_date.day, tzinfo=UTC
+        cutoff_date = local_day.to_local_date(as_of) - timedelta(
+            days=BACKFILL_WINDOW_DAYS
         )
+        period_from = local_day.start_of_local_day(cutoff_date)
+        # A retry after a failure picks up at the first chunk not yet
+        # written rather than re-fetching the whole window (see ADR-0033).
+        checkpoint = self._client.read_backfill_checkpoint()
+        if checkpoint is not None and checkpoint > period_from:
+            logger.info(f"Yearly comparison backfill: resuming from {checkpoint}.")
+            period_from = checkpoint
 
         self._client.refresh_meters()
+        days = 0
+        for chunk_from, chunk_to in plan_month_chunks(period_from, as_of):
+            summaries = self._summarize(chunk_from, chunk_to)
+            self._client.persist_consumption_summary(summaries, backfilled_to=chunk_to)
+            days += len(summaries)
+        logger.info(
+            f"Yearly comparison backfill: {days} day(s) summarized "
+            f"across {len(self._client.meters)} meter(s)."
+        )
+
+    def _summarize(
+        self, period_from: datetime, period_to: datetime
+    ) -> list[ConsumptionSummary]:
+        # Only one month of day totals is held at a time. Keyed by local
+        # day, matching the local_date the daily summary job groups by.
         totals: dict[tuple[Energy, date], Decimal] = {}
         for meter in self._client.meters:
-            next_page, consumption = self._client.fetch_consumption(meter, period_from)
-            while True:
-                for point in consumption:
-                    key = (meter.energy, point.start.date())
-                    totals[key] = totals.get(key, Decimal(0)) + point.est_kwh
-                if next_page is None:
-                    break
-                next_page, consumption = self._client.fetch_consumption_page(
-                    meter.energy, next_page
-                )
-
-        summaries = [
+            for point in self._client.fetch_daily_consumption(
+                meter, period_from, period_to
+            ):
+                key = (meter.energy, local_day.to_local_date(point.start))
+                totals[key] = totals.get(key, Decimal(0)) + point.est_kwh
+        return [
             ConsumptionSummary(energy=energy, date=day, total_kwh=total)
             for (energy, day), total in totals.items()
         ]
-        self._client.persist_consumption_summary(summaries)
-        logger.info(
-            f"Yearly comparison backfill: {len(summaries)} day(s) summarized "
-            f"across {len(self._client.meters)} meter(s)."
-        )
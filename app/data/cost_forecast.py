@@ -16,6 +16,7 @@ from data.octopus.model import (
     Rate,
     TariffType,
 )
+from data.rate_timeline import RateTimeline
 
 logging.config.dictConfig(config)
 logger: Logger = getLogger(APP_LOGGER_NAME)
@@ -86,9 +87,9 @@ class CostForecastSource(MeterSource, Protocol):
         self, period_from: datetime, period_to: datetime, region: str
     ) -> list[DailyCostSummary]: ...
 
-    def read_current_product_rate(
-        self, product_code: str, region: str, as_of: datetime
-    ) -> Rate | None: ...
+    def read_rate_timeline(
+        self, product_code: str, region: str, period_from: datetime, period_to: datetime
+    ) -> RateTimeline[Rate]: ...
 
     def persist_cost_forecast(self, forecast: CostForecast) -> None: ...
 
@@ -116,16 +117,25 @@ class CostForecastRetriever:
         # documented behavior rather than a case this code can meaningfully
         # detect or correct for.
         agreement = self._current_electricity_agreement(as_of)
+        # Every rate lookup below, in one read. A day past as_of: gap-filled
+        # days are priced at their midday, and today's may be later than
+        # as_of.
+        rates = self._client.read_rate_timeline(
+            agreement.product_code,
+            self._client.region_code,
+            elapsed_start,
+            as_of + timedelta(days=1),
+        )
         daily_costs = self._client.read_elapsed_billing_period_costs(
             elapsed_start, as_of, self._client.region_code
         )
         daily_costs = self._fill_zero_consumption_days(
-            billing_period.start, as_of, agreement, daily_costs
+            billing_period.start, as_of, agreement, rates, daily_costs
         )
         actual_cost_to_date = sum((d.day_cost_gbp for d in daily_costs), Decimal(0))
 
         remaining_cost = self._project_remaining_cost(
-            billing_period, agreement, daily_costs, as_of
+            billing_period, agreement, rates, daily_costs, as_of
         )
 
         forecast = CostForecast(
@@ -155,9 +165,9 @@ class CostForecastRetriever:
         # "valid_to is None". Real Agile contracts renew as fixed one-year
         # terms, so Octopus's API never returns valid_to=None for them, not
         # even for the currently-active one; mirrors the range-containment
-        # predicate client.py's read_current_product_rate uses instead of
-        # requiring an open-ended row. Unlike that query, this doesn't order
-        # by valid_from on a tie: Octopus's data model doesn't produce
+        # check RateTimeline uses instead of requiring an open-ended row.
+        # Unlike RateTimeline, this doesn't prefer the latest valid_from on
+        # a tie: Octopus's data model doesn't produce
         # overlapping agreements for one meter, so the first match in
         # response order is taken as-is (see spec for this fix).
         agreement = next(
@@ -180,25 +190,21 @@ class CostForecastRetriever:
         billing_period_start: date,
         as_of: datetime,
         agreement: Agreement,
+        rates: RateTimeline[Rate],
         daily_costs: list[DailyCostSummary],
     ) -> list[DailyCostSummary]:
         # A day with zero consumption rows produces no row from the join in
         # read_elapsed_billing_period_costs -- there's no consumption row to
         # join a standing charge through. The standing charge still accrues
         # for that day regardless of usage, so it's filled in here from
-        # whichever product_rate applied at that day's midday. One query per
-        # missing day (accepted tradeoff: a billing period is at most ~31
-        # days and zero-consumption days are rare, so this never approaches
-        # a scale where batching the lookup would be worth the complexity).
+        # whichever product_rate applied at that day's midday.
         present_days = {d.date for d in daily_costs}
         filled = list(daily_costs)
         day = billing_period_start
         while local_day.start_of_local_day(day) < as_of:
             if day not in present_days:
                 midday = local_day.start_of_local_day(day) + timedelta(hours=12)
-                rate = self._client.read_current_product_rate(
-                    agreement.product_code, self._client.region_code, midday
-                )
+                rate = rates.at(midday)
                 if rate is None:
                     raise RuntimeError(
                         f"No product_rate found for {agreement.product_code} "
@@ -221,6 +227,7 @@ class CostForecastRetriever:
         self,
         billing_period: BillingPeriod,
         agreement: Agreement,
+        rates: RateTimeline[Rate],
         daily_costs: list[DailyCostSummary],
         as_of: datetime,
     ) -> Decimal:
@@ -234,8 +241,9 @@ class CostForecastRetriever:
         # (end - as_of.date()) subtraction: the latter silently drops
         # as_of.date() ("today") from *both* the elapsed and remaining
         # counts whenever as_of lands on an exact midnight.
-        total_period_days = (billing_period.end - billing_period.start).days + 1
-        remaining_days = total_period_days - len(daily_costs)
+        remaining_days = (
+            (billing_period.end - billing_period.start).days + 1 - len(daily_costs)
+        )
 
         # remaining_hours spans from as_of through the end of the inclusive
         # billing_period_end -- unlike remaining_days, this correctly
@@ -274,9 +282,7 @@ class CostForecastRetriever:
         future_daily_kwh = project_daily_average_consumption(
             real_daily_totals or [d.total_kwh for d in daily_costs]
         )
-        current_rate = self._client.read_current_product_rate(
-            agreement.product_code, self._client.region_code, as_of
-        )
+        current_rate = rates.at(as_of)
         if current_rate is None:
             raise RuntimeError(
                 f"No product_rate found for {agreement.product_code} in "
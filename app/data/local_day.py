@@ -6,9 +6,13 @@ HALF_HOUR = timedelta(minutes=30)
 
 
 def to_local_date(instant: datetime) -> date:
+    return to_local(instant).date()
+
+
+def to_local(instant: datetime) -> datetime:
     if instant.tzinfo is None:
         instant = instant.replace(tzinfo=UTC)
-    return instant.astimezone(LONDON).date()
+    return instant.astimezone(LONDON)
 
 
 def start_of_local_day(local_date: date) -> datetime:
@@ -22,3 +26,7 @@ def expected_half_hour_count(local_date: date) -> int:
     start_of_next_day = start_of_local_day(local_date + timedelta(days=1))
     duration = start_of_next_day - start_of_day
     return duration // HALF_HOUR
+
+
+def first_of_next_month(month: date) -> date:
+    return (month.replace(day=1) + timedelta(days=32)).replace(day=1)
@@ -0,0 +1,52 @@
+from typing import Any
+
+from common.config import MariaDBSettings
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# How long a SQLite connection waits on another connection's write lock
+# before failing -- jobs overlap at 04:00, and SQLite has one writer at a time.
+SQLITE_BUSY_TIMEOUT_MS = 30_000
+
+
+def storage_url(settings: MariaDBSettings) -> str:
+    match settings.backend:
+        case "mariadb":
+            return (
+                f"mysql+pymysql://{settings.username}:{settings.password}"
+                f"@{settings.host}:{settings.port}/{settings.database}"
+            )
+        case "sqlite":
+            return f"sqlite:///{settings.sqlite_path}"
+
+
+def engine_options(settings: MariaDBSettings) -> dict[str, Any]:
+    match settings.backend:
+        case "mariadb":
+            return {}
+        case "sqlite":
+            # Pooled connections are handed between job threads; each is
+            # only ever used by one thread at a time.
+            return {"connect_args": {"check_same_thread": False}}
+
+
+def prepare_engine(engine: Engine, settings: MariaDBSettings) -> Engine:
+    match settings.backend:
+        case "mariadb":
+            return engine
+        case "sqlite":
+            event.listen(engine, "connect", _configure_sqlite_connection)
+            # Tables are declared in the "octopus" schema for MariaDB; a
+            # SQLite file has no schemas, so the qualifier is dropped.
+            return engine.execution_options(schema_translate_map={"octopus": None})
+
+
+def _configure_sqlite_connection(dbapi_connection: Any, _record: Any) -> None:
+    cursor = dbapi_connection.cursor()
+    # WAL: readers (Grafana, the read_* paths) never block the writer or
+    # each other. synchronous=NORMAL is durable across app crashes under WAL
+    # and skips the fsync per commit that FULL would cost on an SD card.
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
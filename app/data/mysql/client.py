@@ -1,9 +1,9 @@
 import logging.config
-from collections.abc import Generator
+import time
+from collections.abc import Callable, Generator
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import UTC, date, datetime, timedelta
-from decimal import Decimal
 from logging import Logger, getLogger
 from typing import Any
 
@@ -17,68 +17,98 @@ from data.model import (
     CostForecast,
     DailyCostSummary,
     Energy,
+    Unit,
     as_energy_char,
     energy_from_char,
 )
 from data.mysql import model
+from data.mysql.backend import engine_options, prepare_engine, storage_url
+from data.mysql.compact_keys import half_hour_slot
+from data.mysql.consumption_cost import (
+    CostWindow,
+    changed_validity_spans,
+    rate_cost_windows,
+    refresh_consumption_cost,
+)
 from data.mysql.model import SQLBase
+from data.mysql.retention import (
+    delete_in_batches,
+    drop_expired_partitions,
+    sync_monthly_partitions,
+)
+from data.mysql.rollups import refresh_hourly_summaries, refresh_monthly_summaries
+from data.mysql.schema import (
+    backfill_consumption_local_dates,
+    backfill_summary_rollups,
+    schema_fingerprint,
+    schema_is_current,
+    sync_model,
+)
+from data.mysql.upsert import UpsertResult, bulk_upsert
+from data.mysql.write_behind import WriteBehindQueue
 from data.octopus.model import AgileForecastReading, Agreement, Meter, Product, Rate
-from sqlalchemy import and_, create_engine, inspect, or_, text
+from data.rate_timeline import RateTimeline
+from sqlalchemy import (
+    Table,
+    and_,
+    create_engine,
+    func,
+    or_,
+    select,
+    tuple_,
+)
 from sqlalchemy.engine import Connection, Engine
-from sqlalchemy.engine.reflection import Inspector
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.schema import CreateColumn
-
-SUMMARIZATION_WINDOW_DAYS = 14
+from sqlalchemy.sql.elements import ColumnElement
+
+CONSUMPTION_SUMMARY_WATERMARK = "consumption_summary"
+# job_watermark row recording how far the yearly comparison backfill has
+# got (see ADR-0033).
+YEARLY_COMPARISON_BACKFILL_CHECKPOINT = "yearly_comparison_backfill"
+HALF_HOUR = timedelta(minutes=30)
+
+# Table name -> partitioning column, for the opt-in monthly partitioning
+# (see ADR-0016). agreement stays unpartitioned: a handful of rows, never
+# pruned.
+MONTHLY_PARTITIONED_COLUMNS = {
+    "consumption": "period_from",
+    "consumption_cost": "period_from",
+    "product_rate": "valid_from",
+}
 
 logging.config.dictConfig(config)
 logger: Logger = getLogger(APP_LOGGER_NAME)
 
 
 @dataclass
-class _DailyAccumulator:
-    total_kwh: Decimal = Decimal(0)
-    variable_cost: Decimal = Decimal(0)
-    standing_charge: Decimal = Decimal(0)
-    row_count: int = 0
-
-
-def upsert(s: Session, record: Any) -> None:
-    try:
-        with s.begin_nested():
-            s.add(record)
-            s.flush()
-            return
-    except IntegrityError as exc:
-        pk_columns = [col.name for col in inspect(type(record)).primary_key]
-        pk_filter = {col: getattr(record, col) for col in pk_columns}
-        update_dict = {
-            col.name: getattr(record, col.name) for col in record.__table__.columns
-        }
-        if (
-            s.query(type(record))
-            .filter_by(**pk_filter)
-            .update(update_dict, synchronize_session=False)
-        ):
-            return
-        raise RuntimeError(
-            f"Upsert conflict resolution failed: no {type(record).__name__} row "
-            f"matched primary key {pk_filter}. The IntegrityError was likely caused "
-            "by a non-primary-key constraint violation."
-        ) from exc
+class ConsumptionSummarizationBatch:
+    summaries: list[ConsumptionSummary]
+    # (energy char, local date, marked_at) exactly as read -- see
+    # complete_consumption_summarization for why marked_at is carried along.
+    dirty_days: list[tuple[str, date, datetime]]
+    high_water_mark: datetime
 
 
-def _energy_scoped_id(energy_char: str, dt: datetime) -> str:
-    return energy_char + dt.strftime("%Y%m%d%H%M%S")
-
-
-def _rate_scoped_id(product_code: str, region: str, valid_from: datetime) -> str:
-    return f"{product_code}_{region}_{valid_from.strftime('%Y%m%d%H%M')}"
-
-
-def _forecast_scoped_id(region: str, period_from: datetime) -> str:
-    return f"{region}_{period_from.strftime('%Y%m%d%H%M')}"
+@dataclass
+class _TableWrite:
+    table: Table
+    rows: list[dict[str, Any]]
+    description: str
+    dependent_write: tuple[Table, list[dict[str, Any]]] | None = None
+    cost_windows: Callable[[Session], list[CostWindow]] | None = None
+    # Re-derives whichever summary rows the write touched, once it and any
+    # dependent write are in (see ADR-0023).
+    rollup: Callable[[Session], None] | None = None
+
+
+def _consumption_point(row: Any) -> Consumption:
+    return Consumption(
+        raw=row.raw_value,
+        est_kwh=row.est_kwh,
+        unit=Unit[row.unit],
+        start=row.period_from.replace(tzinfo=UTC),
+        end=row.period_to.replace(tzinfo=UTC),
+    )
 
 
 class SessionBuilder:
@@ -86,94 +116,112 @@ class SessionBuilder:
     engine: Engine
 
     def __init__(self, settings: MariaDBSettings):
-        uri = f"mysql+pymysql://{settings.username}:{settings.password}@{settings.host}:{settings.port}/{settings.database}"
-        self.engine = create_engine(uri)
+        self.engine = prepare_engine(
+            create_engine(storage_url(settings), **engine_options(settings)),
+            settings,
+        )
         self.session = sessionmaker(bind=self.engine)
 
 
 class MariaDBClient:
     def __init__(self, settings: MariaDBSettings) -> None:
         self._session_builder = SessionBuilder(settings)
+        self._write_chunk_size = settings.write_chunk_size
+        self._read_chunk_size = settings.read_chunk_size
+        self._prune_batch_size = settings.prune_batch_size
+        self._prune_batch_time_limit = settings.prune_batch_time_limit_seconds
+        self._partitioned_retention = settings.partitioned_retention
+        self._write_behind: WriteBehindQueue[_TableWrite] | None = (
+            WriteBehindQueue(
+                self._write_merged,
+                self._write_now,
+                settings.write_behind_queue_size,
+                settings.write_behind_flush_timeout_seconds,
+            )
+            if settings.write_behind
+            else None
+        )
+        dialect_name = self._session_builder.engine.dialect.name
+        if self._partitioned_retention and dialect_name not in ("mysql", "mariadb"):
+            logger.warning(
+                f"partitioned_retention is not supported on {dialect_name}; "
+                "pruning falls back to batched deletes."
+            )
+            self._partitioned_retention = False
         self._sync_schema()
 
     def _sync_schema(self) -> None:
+        started = time.perf_counter()
         engine = self._session_builder.engine
-        existing_tables = set(inspect(engine).get_table_names())
-
-        SQLBase.metadata.create_all(engine, checkfirst=True)
-
-        created_tables = {
-            table.name for table in SQLBase.metadata.tables.values()
-        } - existing_tables
-        if created_tables:
-            logger.info(
-                f"Schema sync: created missing tables: {sorted(created_tables)}"
-            )
-
-        inspector = inspect(engine)
-        # MariaDB/MySQL DDL auto-commits per statement, so this transaction
-        # doesn't make the ADD COLUMN / CREATE INDEX loops atomic — it's just
-        # a connection scope. Idempotent regardless: a re-run picks up
-        # anything not yet added.
-        with engine.begin() as connection:
-            self._sync_missing_columns(connection, inspector)
-            self._sync_missing_indexes(connection, inspector)
-
-    def _sync_missing_columns(
-        self, connection: Connection, inspector: Inspector
-    ) -> None:
-        for table in SQLBase.metadata.tables.values():
-            schema = connection.schema_for_object(table)
-            existing_columns = {
-                column["name"]
-                for column in inspector.get_columns(table.name, schema=schema)
-            }
-            missing_columns = [
-                column
-                for column in table.columns
-                if column.name not in existing_columns
-            ]
-            if not missing_columns:
-                continue
-
-            logger.info(
-                f"Schema sync: adding missing columns to {table.name}: "
-                f"{[column.name for column in missing_columns]}"
+        fingerprint = schema_fingerprint(engine.dialect)
+        if schema_is_current(engine, fingerprint):
+            outcome = "model unchanged, reflection skipped"
+        else:
+            self._sync_model(engine)
+            self._record_schema_fingerprint(fingerprint)
+            outcome = "model changed, full additive sync"
+        # Not gated on the fingerprint: the months that need a partition
+        # move on with the calendar, not with the model.
+        if self._partitioned_retention:
+            with engine.begin() as connection:
+                self._sync_partitions(connection)
+        logger.info(f"Schema sync: {outcome} ({time.perf_counter() - started:.3f}s).")
+
+    def _record_schema_fingerprint(self, fingerprint: str) -> None:
+        # Written only after the whole sync succeeded, so a startup that
+        # fails part-way runs the full sync again next time.
+        with self.session_write_scope() as s:
+            bulk_upsert(
+                s,
+                model.schema_version.__table__,
+                [{"fingerprint": fingerprint, "synced_at": datetime.now(UTC)}],
             )
 
-            qualified_name = f"{schema}.{table.name}" if schema else table.name
-            for column in missing_columns:
-                column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
-                connection.execute(
-                    text(f"ALTER TABLE {qualified_name} ADD COLUMN {column_ddl}")
-                )
-
-    def _sync_missing_indexes(
-        self, connection: Connection, inspector: Inspector
-    ) -> None:
-        for table in SQLBase.metadata.tables.values():
-            schema = connection.schema_for_object(table)
-            existing_index_names = {
-                index["name"]
-                for index in inspector.get_indexes(table.name, schema=schema)
-            }
-            missing_indexes = [
-                index
-                for index in table.indexes
-                if index.name not in existing_index_names
-            ]
-            if not missing_indexes:
-                continue
+    def _sync_model(self, engine: Engine) -> None:
+        sync_model(engine, self._write_chunk_size)
+        # These one-offs only have work to do right after the model
+        # changed, so they sit behind the fingerprint as well.
+        backfill_consumption_local_dates(
+            self.session_write_scope, self._read_chunk_size
+        )
+        self._backfill_consumption_cost()
+        backfill_summary_rollups(
+            self.session_read_scope,
+            self.session_write_scope,
+            self._read_chunk_size,
+            self._write_chunk_size,
+        )
 
-            logger.info(
-                f"Schema sync: creating missing indexes on {table.name}: "
-                f"{[index.name for index in missing_indexes]}"
-            )
-            for index in missing_indexes:
-                index.create(bind=connection)
+    def _sync_partitions(self, connection: Connection) -> None:
+        # Startup-only, like the rest of schema sync -- MONTHS_AHEAD of
+        # headroom covers an app left running for weeks between restarts,
+        # and prune_older_than tops it up daily as well.
+        today = datetime.now(UTC).date()
+        for table_name, column in MONTHLY_PARTITIONED_COLUMNS.items():
+            table = SQLBase.metadata.tables[f"octopus.{table_name}"]
+            sync_monthly_partitions(connection, table, column, today)
+
+    def _backfill_consumption_cost(self) -> None:
+        # Only a consumption_cost table that has never been populated is
+        # rebuilt here -- once it exists, every write keeps it current.
+        with self.session_read_scope() as s:
+            has_costs = s.query(model.consumption_cost).first() is not None
+            has_consumption = s.query(model.consumption).first() is not None
+        if has_consumption and not has_costs:
+            self.rebuild_consumption_cost()
+
+    def _flush(self) -> None:
+        # No-op unless write_behind is on. Otherwise blocks until every
+        # write_* the calling thread has queued is committed, raising the
+        # first one's error if any failed.
+        if self._write_behind is not None:
+            self._write_behind.flush()
 
     @contextmanager
     def session_read_scope(self) -> Generator[Session]:
+        # The calling thread's queued writes land first, so a job always
+        # reads back what it just wrote.
+        self._flush()
         session = self._session_builder.session()
         try:
             yield session
@@ -182,6 +230,7 @@ class MariaDBClient:
 
     @contextmanager
     def session_write_scope(self) -> Generator[Session]:
+        self._flush()
         session = self._session_builder.session()
         try:
             yield session
@@ -192,130 +241,334 @@ class MariaDBClient:
         finally:
             session.close()
 
-    def _write_all(self, records: list[Any], description: str) -> None:
+    def _write_all(self, write: _TableWrite) -> UpsertResult | None:
+        if self._write_behind is None:
+            return self._write_now(write)
+        # None, not counts: they aren't known until the writer thread commits,
+        # and a merged commit only has them per table, not per write. The
+        # writer logs them instead.
+        self._write_behind.submit(write)
+        return None
+
+    def _write_now(self, write: _TableWrite) -> UpsertResult:
         try:
             with self.session_write_scope() as s:
-                for record in records:
-                    upsert(s, record)
-                logger.debug(f"{description}: {len(records)} written to MariaDB.")
-                return
+                # Resolved before the upsert, so it can still compare the
+                # incoming rows against what was stored.
+                windows = [] if write.cost_windows is None else write.cost_windows(s)
+                result = bulk_upsert(s, write.table, write.rows, self._write_chunk_size)
+                if write.dependent_write is not None:
+                    dependent_table, dependent_rows = write.dependent_write
+                    bulk_upsert(
+                        s, dependent_table, dependent_rows, self._write_chunk_size
+                    )
+                # Same transaction as the write itself, so consumption_cost
+                # is never visibly out of step with its sources.
+                for window in windows:
+                    refresh_consumption_cost(
+                        s, window, self._read_chunk_size, self._write_chunk_size
+                    )
+                if write.rollup is not None:
+                    write.rollup(s)
+                logger.debug(
+                    f"{write.description}: {result.inserted} inserted, "
+                    f"{result.updated} updated in MariaDB."
+                )
+                return result
         except Exception as e:
-            logger.error(f"Failed to write {description}: {e}")
+            logger.error(f"Failed to write {write.description}: {e}")
             raise MariaDBError(e) from e
 
-    def write_consumption(self, meter: Meter, consumption: list[Consumption]) -> None:
+    def _write_merged(self, writes: list[_TableWrite]) -> None:
+        # Everything the writer thread drained, in one transaction: the rows
+        # for each table go out as one bulk upsert (later writes winning on
+        # a repeated key, as they would have one after another), and every
+        # cost window is re-derived once the sources they price from are
+        # all written.
+        by_table: dict[str, list[_TableWrite]] = {}
+        for write in writes:
+            by_table.setdefault(write.table.name, []).append(write)
+        windows: list[CostWindow] = []
+        with self.session_write_scope() as s:
+            for group in by_table.values():
+                for write in group:
+                    if write.cost_windows is not None:
+                        windows.extend(write.cost_windows(s))
+                result = bulk_upsert(
+                    s,
+                    group[0].table,
+                    [row for write in group for row in write.rows],
+                    self._write_chunk_size,
+                )
+                dependent_rows: dict[str, tuple[Table, list[dict[str, Any]]]] = {}
+                for write in group:
+                    if write.dependent_write is not None:
+                        dependent_table, rows = write.dependent_write
+                        dependent_rows.setdefault(
+                            dependent_table.name, (dependent_table, [])
+                        )[1].extend(rows)
+                for dependent_table, rows in dependent_rows.values():
+                    bulk_upsert(s, dependent_table, rows, self._write_chunk_size)
+                logger.debug(
+                    f"{group[0].description} (write-behind, {len(group)} merged): "
+                    f"{result.inserted} inserted, {result.updated} updated in "
+                    "MariaDB."
+                )
+            for window in dict.fromkeys(windows):
+                refresh_consumption_cost(
+                    s, window, self._read_chunk_size, self._write_chunk_size
+                )
+            for write in writes:
+                if write.rollup is not None:
+                    write.rollup(s)
+
+    def write_consumption(
+        self, meter: Meter, consumption: list[Consumption]
+    ) -> UpsertResult | None:
         energy_char = as_energy_char(meter.energy)
-        records = [
-            model.consumption(
-                id=_energy_scoped_id(energy_char, point.start),
-                energy=energy_char,
-                period_from=point.start,
-                period_to=point.end,
-                raw_value=point.raw,
-                unit=point.unit.name,
-                est_kwh=point.est_kwh,
-            )
+        rows: list[dict[str, Any]] = [
+            {
+                "energy": energy_char,
+                "slot": half_hour_slot(point.start),
+                "period_from": point.start,
+                "period_to": point.end,
+                "raw_value": point.raw,
+                "unit": point.unit.name,
+                "est_kwh": point.est_kwh,
+                "local_date": local_day.to_local_date(point.start),
+            }
             for point in consumption
         ]
-        self._write_all(records, "Consumption data")
+        # Marked in the same transaction as the consumption rows themselves,
+        # so a crash between the two can never leave a revised day that the
+        # next summarization refresh doesn't know to re-aggregate.
+        marked_at = datetime.now(UTC)
+        local_dates = {row["local_date"] for row in rows}
+        dirty_days = [
+            {"energy": energy_char, "date": day, "marked_at": marked_at}
+            for day in local_dates
+        ]
+        cost_window: list[CostWindow] = (
+            [
+                (
+                    energy_char,
+                    min(point.start for point in consumption),
+                    max(point.start for point in consumption) + HALF_HOUR,
+                )
+            ]
+            if consumption
+            else []
+        )
+        return self._write_all(
+            _TableWrite(
+                model.consumption.__table__,
+                rows,
+                "Consumption data",
+                dependent_write=(model.consumption_dirty_day.__table__, dirty_days),
+                cost_windows=lambda _: cost_window,
+                rollup=lambda s: refresh_hourly_summaries(
+                    s, energy_char, local_dates, self._write_chunk_size
+                ),
+            )
+        )
 
-    def write_agreement(self, meter: Meter, agreements: list[Agreement]) -> None:
+    def write_agreement(
+        self, meter: Meter, agreements: list[Agreement]
+    ) -> UpsertResult | None:
         energy_char = as_energy_char(meter.energy)
-        records = [
-            model.agreement(
-                id=_energy_scoped_id(energy_char, agreement.valid_from),
-                energy=energy_char,
-                product_code=agreement.product_code,
-                tariff_code=agreement.tariff_code,
-                valid_from=agreement.valid_from,
-                valid_to=agreement.valid_to,
-            )
+        rows = [
+            {
+                "energy": energy_char,
+                "slot": half_hour_slot(agreement.valid_from),
+                "product_code": agreement.product_code,
+                "tariff_code": agreement.tariff_code,
+                "valid_from": agreement.valid_from,
+                "valid_to": agreement.valid_to,
+            }
             for agreement in agreements
         ]
-        self._write_all(records, "Agreement data")
+        table = model.agreement.__table__
+        return self._write_all(
+            _TableWrite(
+                table,
+                rows,
+                "Agreement data",
+                cost_windows=lambda s: [
+                    (energy_char, span_from, span_to)
+                    for span_from, span_to in changed_validity_spans(s, table, rows)
+                ],
+            )
+        )
 
-    def write_product(self, product: Product) -> None:
-        record = model.product(
-            product_code=product.product_code,
-            display_name=product.display_name,
-            direction=product.direction.value,
+    def write_product(self, product: Product) -> UpsertResult | None:
+        row = {
+            "product_code": product.product_code,
+            "display_name": product.display_name,
+            "direction": product.direction.value,
+        }
+        return self._write_all(
+            _TableWrite(model.product.__table__, [row], "Product data")
         )
-        self._write_all([record], "Product data")
 
     def write_product_rate(
-        self, product_code: str, region: str, rates: list[Rate]
-    ) -> None:
-        records = [
-            model.product_rate(
-                id=_rate_scoped_id(product_code, region, rate.valid_from),
-                product_code=product_code,
-                region=region,
-                valid_from=rate.valid_from,
-                valid_to=rate.valid_to,
-                unit_rate=rate.unit_rate,
-                standing_charge=rate.standing_charge,
-            )
+        self,
+        product_code: str,
+        region: str,
+        rates: list[Rate],
+        tariff_code: str | None = None,
+    ) -> UpsertResult | None:
+        rows = [
+            {
+                "product_code": product_code,
+                "region": region,
+                "slot": half_hour_slot(rate.valid_from),
+                "valid_from": rate.valid_from,
+                "valid_to": rate.valid_to,
+                "unit_rate": rate.unit_rate,
+                "standing_charge": rate.standing_charge,
+            }
             for rate in rates
         ]
-        self._write_all(records, "Product rate data")
+        # Advanced with the rates, never ahead of them: a failed write leaves
+        # the next refresh fetching from the old watermark.
+        watermark = (
+            None
+            if tariff_code is None or not rates
+            else (
+                model.rate_watermark.__table__,
+                [
+                    {
+                        "product_code": product_code,
+                        "tariff_code": tariff_code,
+                        "region": region,
+                        "latest_valid_from": max(rate.valid_from for rate in rates),
+                    }
+                ],
+            )
+        )
+        table = model.product_rate.__table__
+        return self._write_all(
+            _TableWrite(
+                table,
+                rows,
+                "Product rate data",
+                dependent_write=watermark,
+                cost_windows=lambda s: rate_cost_windows(s, product_code, rows),
+            )
+        )
+
+    def read_rate_watermark(
+        self, product_code: str, tariff_code: str, region: str
+    ) -> datetime | None:
+        with self.session_read_scope() as session:
+            watermark = (
+                session.query(model.rate_watermark)
+                .filter_by(
+                    product_code=product_code, tariff_code=tariff_code, region=region
+                )
+                .one_or_none()
+            )
+            if watermark is None:
+                return None
+            return watermark.latest_valid_from.replace(tzinfo=UTC)
+
+    def rebuild_consumption_cost(self) -> int:
+        epoch = datetime(1970, 1, 1)
+        try:
+            with self.session_write_scope() as s:
+                energies = [
+                    energy_char
+                    for (energy_char,) in s.query(model.consumption.energy).distinct()
+                ]
+                rebuilt = sum(
+                    refresh_consumption_cost(
+                        s,
+                        (energy_char, epoch, None),
+                        self._read_chunk_size,
+                        self._write_chunk_size,
+                    )
+                    for energy_char in energies
+                )
+                logger.info(f"Rebuilt {rebuilt} consumption_cost row(s).")
+                return rebuilt
+        except Exception as e:
+            logger.error(f"Failed to rebuild consumption costs: {e}")
+            raise MariaDBError(e) from e
 
     def write_agile_forecast(
         self,
         region: str,
         readings: list[AgileForecastReading],
         fetched_at: datetime,
-    ) -> None:
-        records = [
-            model.agile_forecast(
-                id=_forecast_scoped_id(region, reading.period_from),
-                region=region,
-                period_from=reading.period_from,
-                period_to=reading.period_to,
-                forecast_unit_rate=reading.unit_rate,
-                fetched_at=fetched_at,
-            )
+    ) -> UpsertResult | None:
+        rows = [
+            {
+                "region": region,
+                "slot": half_hour_slot(reading.period_from),
+                "period_from": reading.period_from,
+                "period_to": reading.period_to,
+                "forecast_unit_rate": reading.unit_rate,
+                "fetched_at": fetched_at,
+            }
             for reading in readings
         ]
-        self._write_all(records, "Agile forecast data")
+        return self._write_all(
+            _TableWrite(model.agile_forecast.__table__, rows, "Agile forecast data")
+        )
 
     def write_cost_forecast(self, forecast: CostForecast) -> None:
-        record = model.cost_forecast(
-            billing_period_start=forecast.billing_period_start,
-            billing_period_end=forecast.billing_period_end,
-            actual_cost_to_date=forecast.actual_cost_to_date,
-            projected_total_cost=forecast.projected_total_cost,
-            computed_at=forecast.computed_at,
-        )
-        self._write_all([record], "Cost forecast data")
+        # Append-only history (autoincrement id, no natural key to conflict
+        # on), so a plain INSERT rather than the bulk upsert path.
+        try:
+            with self.session_write_scope() as s:
+                s.add(
+                    model.cost_forecast(
+                        billing_period_start=forecast.billing_period_start,
+                        billing_period_end=forecast.billing_period_end,
+                        actual_cost_to_date=forecast.actual_cost_to_date,
+                        projected_total_cost=forecast.projected_total_cost,
+                        computed_at=forecast.computed_at,
+                    )
+                )
+                logger.debug("Cost forecast data: 1 written to MariaDB.")
+        except Exception as e:
+            logger.error(f"Failed to write Cost forecast data: {e}")
+            raise MariaDBError(e) from e
 
-    def read_current_product_rate(
-        self, product_code: str, region: str, as_of: datetime
-    ) -> Rate | None:
+    def read_rate_timeline(
+        self, product_code: str, region: str, period_from: datetime, period_to: datetime
+    ) -> RateTimeline[Rate]:
+        # Every rate in force at any instant in [period_from, period_to], in
+        # one query, so a job resolves all its "rate at t" lookups in memory
+        # instead of a round trip each.
         pr = model.product_rate
         with self.session_read_scope() as session:
-            row = (
+            rows = (
                 session.query(pr)
                 .filter(
                     pr.product_code == product_code,
                     pr.region == region,
-                    pr.valid_from <= as_of,
-                    or_(pr.valid_to.is_(None), as_of < pr.valid_to),
+                    # Redundant with valid_from <= period_to, but bounds the
+                    # scan of the (product_code, region, slot) primary key.
+                    pr.slot <= half_hour_slot(period_to),
+                    pr.valid_from <= period_to,
+                    or_(pr.valid_to.is_(None), period_from < pr.valid_to),
                 )
-                # Explicit ordering, not bare .first(): if overlapping rows
-                # ever matched (bad upstream data), .first() with no ORDER
-                # BY is nondeterministic. Most-recently-started wins, same
-                # "ORDER BY valid_from DESC LIMIT 1" convention already used
-                # for current-rate lookups in grafana/mariadb/queries.md.
-                .order_by(pr.valid_from.desc())
-                .first()
+                .order_by(pr.slot)
+                .all()
+            )
+        # Reattached as UTC for the same reason as read_agile_forecast below:
+        # lookups come in tz-aware.
+        return RateTimeline(
+            Rate(
+                valid_from=row.valid_from.replace(tzinfo=UTC),
+                valid_to=(
+                    None if row.valid_to is None else row.valid_to.replace(tzinfo=UTC)
+                ),
+                unit_rate=row.unit_rate,
+                standing_charge=row.standing_charge,
             )
-        if row is None:
-            return None
-        return Rate(
-            valid_from=row.valid_from,
-            valid_to=row.valid_to,
-            unit_rate=row.unit_rate,
-            standing_charge=row.standing_charge,
+            for row in rows
         )
 
     def read_agile_forecast(
@@ -325,8 +578,12 @@ class MariaDBClient:
         with self.session_read_scope() as session:
             rows = (
                 session.query(af)
-                .filter(af.region == region, af.period_from >= as_of)
-                .order_by(af.period_from)
+                .filter(
+                    af.region == region,
+                    af.slot >= half_hour_slot(as_of),
+                    af.period_from >= as_of,
+                )
+                .order_by(af.slot)
                 .all()
             )
         # DATETIME columns come back tz-naive regardless of backend -- every
@@ -347,152 +604,219 @@ class MariaDBClient:
     def read_elapsed_billing_period_costs(
         self, period_from: datetime, period_to: datetime, region: str
     ) -> list[DailyCostSummary]:
-        # Joins each half-hourly consumption row to whichever agreement and
-        # product_rate actually applied at that moment (not just the
-        # current one), so a mid-period rate change is naturally reflected
-        # day-by-day. A day with zero consumption rows produces no row here
-        # at all -- it's the caller's responsibility to fill that gap, since
-        # there's no consumption row to join a standing charge through.
-        c = model.consumption
-        a = model.agreement
-        pr = model.product_rate
+        # A single-table range scan over consumption_cost, which already
+        # holds each half-hour priced by whichever agreement and product_rate
+        # actually applied at that moment (not just the current one), so a
+        # mid-period rate change is naturally reflected day-by-day. A day
+        # with zero consumption rows produces no row here at all -- it's the
+        # caller's responsibility to fill that gap, since there's no
+        # consumption row to carry a standing charge.
+        cc = model.consumption_cost
 
         with self.session_read_scope() as session:
-            rows = (
+            daily = (
                 session.query(
-                    c.period_from,
-                    c.est_kwh.label("est_kwh"),
-                    pr.unit_rate.label("unit_rate"),
-                    pr.standing_charge.label("standing_charge"),
-                )
-                .join(
-                    a,
-                    and_(
-                        a.energy == c.energy,
-                        c.period_from >= a.valid_from,
-                        or_(a.valid_to.is_(None), c.period_from < a.valid_to),
-                    ),
-                )
-                .join(
-                    pr,
-                    and_(
-                        pr.product_code == a.product_code,
-                        pr.region == region,
-                        c.period_from >= pr.valid_from,
-                        or_(pr.valid_to.is_(None), c.period_from < pr.valid_to),
-                    ),
-                )
-                .filter(
-                    c.energy == as_energy_char(Energy.electricity),
-                    c.period_from >= period_from,
-                    c.period_from < period_to,
+                    cc.local_date,
+                    func.sum(cc.est_kwh).label("total_kwh"),
+                    func.sum(cc.variable_cost).label("variable_cost"),
+                    func.max(cc.standing_charge).label("standing_charge"),
+                    func.count().label("row_count"),
+                ).filter(
+                    cc.energy == as_energy_char(Energy.electricity),
+                    cc.region == region,
+                    cc.period_from >= period_from,
+                    cc.period_from < period_to,
                 )
-                .all()
-            )
-
-        # Grouped in Python by Europe/London local calendar day, not the raw
-        # UTC date -- Octopus's own daily reporting (and the "day" a UK user
-        # means by "cost for 26 July") is local time. See ADR-0010 for why
-        # this is Python/zoneinfo-based rather than SQL CONVERT_TZ.
-        daily: dict[date, _DailyAccumulator] = {}
-        for row in rows:
-            day = local_day.to_local_date(row.period_from)
-            bucket = daily.setdefault(day, _DailyAccumulator())
-            bucket.total_kwh += row.est_kwh
-            bucket.variable_cost += row.est_kwh * row.unit_rate
-            bucket.standing_charge = max(bucket.standing_charge, row.standing_charge)
-            bucket.row_count += 1
-
-        # Octopus's consumption API has a real settlement lag -- a day can
-        # still be missing rows more than 24 hours after it ends. A
-        # strictly-past day must have all of that local day's expected
-        # half-hourly rows (48 normally, 46/50 on a UK clock-change date) to
-        # be treated as final; the current/most-recent day (period_to's
-        # local date) is exempt since it's expected to be partial by
-        # definition ("cost so far"). An incomplete past day drops out
-        # entirely here, same as a day with zero consumption rows already
-        # does, and is picked up by the caller's gap-fill.
-        today = local_day.to_local_date(period_to)
-        return [
-            DailyCostSummary(
-                date=day,
-                total_kwh=bucket.total_kwh,
-                day_cost_gbp=(bucket.variable_cost + bucket.standing_charge) / 100,
+                # Grouped by the persisted Europe/London local_date, not the
+                # raw UTC date -- Octopus's own daily reporting (and the
+                # "day" a UK user means by "cost for 26 July") is local
+                # time. The zone conversion itself still happens in Python,
+                # once per row at write time (see ADR-0014).
+                .group_by(cc.local_date)
+                # Streamed into the filter below rather than buffered, as
+                # every read that can scale with history is.
+                .yield_per(self._read_chunk_size)
             )
-            for day, bucket in daily.items()
-            if day == today
-            or bucket.row_count == local_day.expected_half_hour_count(day)
-        ]
+            # Octopus's consumption API has a real settlement lag -- a day
+            # can still be missing rows more than 24 hours after it ends. A
+            # strictly-past day must have all of that local day's expected
+            # half-hourly rows (48 normally, 46/50 on a UK clock-change
+            # date) to be treated as final; the current/most-recent day
+            # (period_to's local date) is exempt since it's expected to be
+            # partial by definition ("cost so far"). An incomplete past day
+            # drops out entirely here, same as a day with zero consumption
+            # rows already does, and is picked up by the caller's gap-fill.
+            today = local_day.to_local_date(period_to)
+            return [
+                DailyCostSummary(
+                    date=day.local_date,
+                    total_kwh=day.total_kwh,
+                    day_cost_gbp=(day.variable_cost + day.standing_charge) / 100,
+                )
+                for day in daily
+                if day.local_date == today
+                or day.row_count == local_day.expected_half_hour_count(day.local_date)
+            ]
 
-    def read_consumption_summarization_window(
-        self, as_of: date
-    ) -> list[ConsumptionSummary]:
-        # Deliberately no lower bound on the raw `consumption` scan below:
-        # gap detection (a day outside the trailing window with no existing
-        # summary row) requires seeing all of history, not just the recent
-        # cutoff. Table growth is bounded by the raw retention window via
-        # the weekly prune_old_data job (see DataPruner), which always runs
-        # after this summarization job in the same scheduling tick -- so by
-        # the time pruning deletes anything, it has already been summarized.
-        # `- 1` because the window is inclusive of as_of itself: 14 trailing
-        # days means as_of, as_of-1, ..., as_of-13 (14 dates), not 15.
-        cutoff = as_of - timedelta(days=SUMMARIZATION_WINDOW_DAYS - 1)
+    def read_consumption_summarization_batch(
+        self, as_of: datetime | None = None
+    ) -> ConsumptionSummarizationBatch:
+        if as_of is None:
+            as_of = datetime.now(UTC)
+        c = model.consumption
+        dd = model.consumption_dirty_day
         with self.session_read_scope() as session:
-            raw_rows = session.query(
-                model.consumption.energy,
-                model.consumption.period_from,
-                model.consumption.est_kwh,
-            ).all()
-
-            # Grouped in Python by Europe/London local calendar day, not the
-            # raw UTC date -- keeps this job's day boundaries consistent
-            # with ConsumptionSummaryBackfill, which already buckets by
-            # local day (it reads the still-locally-offset Octopus response
-            # directly, before any DB round-trip).
-            daily_totals: dict[tuple[str, date], Decimal] = {}
-            for row in raw_rows:
-                day = local_day.to_local_date(row.period_from)
-                key = (row.energy, day)
-                daily_totals[key] = daily_totals.get(key, Decimal(0)) + row.est_kwh
-
-            # `daily_consumption_summary` is exempt from raw-data pruning
-            # (kept for long-running yearly comparisons), so it grows
-            # unbounded over years -- restricted to just the dates present
-            # in daily_totals (bounded by raw retention) rather than
-            # fetching the whole table.
-            candidate_days = {day for _, day in daily_totals}
-            existing_summary_days: set[tuple[str, date]] = set()
-            if candidate_days:
-                existing_summary_days = {
-                    (row.energy, row.date)
-                    for row in session.query(
-                        model.daily_consumption_summary.energy,
-                        model.daily_consumption_summary.date,
+            dirty_days = [
+                (row.energy, row.date, row.marked_at)
+                for row in session.query(dd.energy, dd.date, dd.marked_at).all()
+            ]
+            watermark = (
+                session.query(model.job_watermark)
+                .filter_by(job_name=CONSUMPTION_SUMMARY_WATERMARK)
+                .one_or_none()
+            )
+            query = session.query(
+                c.energy, c.local_date, func.sum(c.est_kwh).label("total_kwh")
+            ).group_by(c.energy, c.local_date)
+            if watermark is None:
+                # First run against a database that predates dirty-day
+                # tracking: its existing raw rows were never marked, so one
+                # full pass establishes the baseline. Every later run only
+                # touches the days write_consumption has marked since.
+                high_water_mark = as_of
+            elif dirty_days:
+                query = query.filter(
+                    tuple_(c.energy, c.local_date).in_(
+                        {(energy_char, day) for energy_char, day, _ in dirty_days}
                     )
-                    .filter(model.daily_consumption_summary.date.in_(candidate_days))
-                    .all()
-                }
-
-        return [
-            ConsumptionSummary(
-                energy=energy_from_char(energy_char),
-                date=day,
-                total_kwh=total_kwh,
+                )
+                high_water_mark = max(marked_at for _, _, marked_at in dirty_days)
+            else:
+                high_water_mark = watermark.high_water_mark
+
+            # Bucketed by the persisted Europe/London local_date, which keeps
+            # this job's day boundaries consistent with
+            # ConsumptionSummaryBackfill, which buckets the still-locally-offset
+            # Octopus response by local day directly.
+            summaries = (
+                [
+                    ConsumptionSummary(
+                        energy=energy_from_char(row.energy),
+                        date=row.local_date,
+                        total_kwh=row.total_kwh,
+                    )
+                    for row in query.yield_per(self._read_chunk_size)
+                ]
+                if watermark is None or dirty_days
+                else []
             )
-            for (energy_char, day), total_kwh in daily_totals.items()
-            if day >= cutoff or (energy_char, day) not in existing_summary_days
+        return ConsumptionSummarizationBatch(
+            summaries=summaries,
+            dirty_days=dirty_days,
+            high_water_mark=high_water_mark,
+        )
+
+    def complete_consumption_summarization(
+        self, batch: ConsumptionSummarizationBatch
+    ) -> None:
+        dd = model.consumption_dirty_day
+        summary_rows: list[dict[str, Any]] = [
+            {
+                "energy": as_energy_char(summary.energy),
+                "date": summary.date,
+                "total_kwh": summary.total_kwh,
+            }
+            for summary in batch.summaries
         ]
+        try:
+            with self.session_write_scope() as s:
+                bulk_upsert(
+                    s,
+                    model.daily_consumption_summary.__table__,
+                    summary_rows,
+                    self._write_chunk_size,
+                )
+                refresh_monthly_summaries(
+                    s,
+                    {(row["energy"], row["date"]) for row in summary_rows},
+                    self._write_chunk_size,
+                )
+                # Only marks still carrying the marked_at this batch read are
+                # cleared: a consumption write that re-marked a day after the
+                # read bumped its marked_at, so that day stays dirty for the
+                # next run instead of being silently dropped.
+                if batch.dirty_days:
+                    s.query(dd).filter(
+                        tuple_(dd.energy, dd.date, dd.marked_at).in_(batch.dirty_days)
+                    ).delete(synchronize_session=False)
+                bulk_upsert(
+                    s,
+                    model.job_watermark.__table__,
+                    [
+                        {
+                            "job_name": CONSUMPTION_SUMMARY_WATERMARK,
+                            "high_water_mark": batch.high_water_mark,
+                        }
+                    ],
+                )
+                logger.debug(
+                    f"Consumption summarization: {len(summary_rows)} day(s) "
+                    f"written, {len(batch.dirty_days)} dirty mark(s) cleared."
+                )
+        except Exception as e:
+            logger.error(f"Failed to complete consumption summarization: {e}")
+            raise MariaDBError(e) from e
 
-    def write_consumption_summary(self, summaries: list[ConsumptionSummary]) -> None:
-        records = [
-            model.daily_consumption_summary(
-                energy=as_energy_char(summary.energy),
-                date=summary.date,
-                total_kwh=summary.total_kwh,
-            )
+    def write_consumption_summary(
+        self, summaries: list[ConsumptionSummary], backfilled_to: datetime | None = None
+    ) -> UpsertResult | None:
+        rows: list[dict[str, Any]] = [
+            {
+                "energy": as_energy_char(summary.energy),
+                "date": summary.date,
+                "total_kwh": summary.total_kwh,
+            }
             for summary in summaries
         ]
-        self._write_all(records, "Consumption summary data")
+        # The backfill checkpoint commits with the days it covers, so a
+        # resumed backfill never skips a chunk that was not written.
+        checkpoint = (
+            None
+            if backfilled_to is None
+            else (
+                model.job_watermark.__table__,
+                [
+                    {
+                        "job_name": YEARLY_COMPARISON_BACKFILL_CHECKPOINT,
+                        "high_water_mark": backfilled_to,
+                    }
+                ],
+            )
+        )
+        return self._write_all(
+            _TableWrite(
+                model.daily_consumption_summary.__table__,
+                rows,
+                "Consumption summary data",
+                dependent_write=checkpoint,
+                rollup=lambda s: refresh_monthly_summaries(
+                    s,
+                    {(row["energy"], row["date"]) for row in rows},
+                    self._write_chunk_size,
+                ),
+            )
+        )
+
+    def read_backfill_checkpoint(self) -> datetime | None:
+        with self.session_read_scope() as session:
+            checkpoint = (
+                session.query(model.job_watermark)
+                .filter_by(job_name=YEARLY_COMPARISON_BACKFILL_CHECKPOINT)
+                .one_or_none()
+            )
+            if checkpoint is None:
+                return None
+            return checkpoint.high_water_mark.replace(tzinfo=UTC)
 
     def has_successful_job_run(self, job_name: str) -> bool:
         with self.session_read_scope() as session:
@@ -516,6 +840,10 @@ class MariaDBClient:
     def record_job_run(
         self, job_name: str, status: str, error: str | None = None
     ) -> None:
+        # Flushed first and outside the try below: a "success" is only
+        # recorded once the job's queued writes are durable, and a failed one
+        # surfaces as its own error rather than as a job_run write failure.
+        self._flush()
         try:
             with self.session_write_scope() as s:
                 record = model.job_run(
@@ -531,37 +859,133 @@ class MariaDBClient:
             logger.error(f"Failed to record job run for {job_name}: {e}")
             raise MariaDBError(e) from e
 
-    def prune_consumption_older_than(self, cutoff: datetime) -> int:
-        try:
-            with self.session_write_scope() as session:
-                deleted = (
-                    session.query(model.consumption)
-                    .filter(model.consumption.period_from < cutoff)
-                    .delete(synchronize_session=False)
-                )
-                logger.debug(
-                    f"Pruned {deleted} consumption row(s) older than {cutoff}."
+    def _prune(
+        self, table: Table, expired: ColumnElement[bool], cutoff: datetime
+    ) -> int:
+        deleted = 0
+        if self._partitioned_retention:
+            with self._session_builder.engine.begin() as connection:
+                sync_monthly_partitions(
+                    connection,
+                    table,
+                    MONTHLY_PARTITIONED_COLUMNS[table.name],
+                    datetime.now(UTC).date(),
                 )
-                return deleted
+                deleted += drop_expired_partitions(connection, table, expired, cutoff)
+        # Whatever no whole partition could take -- the month straddling the
+        # cutoff, or everything when unpartitioned.
+        deleted += delete_in_batches(
+            self.session_write_scope,
+            table,
+            expired,
+            self._prune_batch_size,
+            self._prune_batch_time_limit,
+        )
+        return deleted
+
+    def prune_consumption_older_than(
+        self,
+        cutoff: datetime,
+        archive: Callable[[Energy, list[Consumption]], None] | None = None,
+    ) -> int:
+        c = model.consumption.__table__
+        cc = model.consumption_cost.__table__
+        try:
+            # Every row about to go, handed over before any is deleted: a
+            # failed export leaves the rows in place for the next run.
+            if archive is not None:
+                self._export_consumption_older_than(cutoff, archive)
+            deleted = self._prune(c, c.c.period_from < cutoff, cutoff)
+            self._prune(cc, cc.c.period_from < cutoff, cutoff)
+            logger.debug(f"Pruned {deleted} consumption row(s) older than {cutoff}.")
+            return deleted
         except Exception as e:
             logger.error(f"Failed to prune consumption data: {e}")
             raise MariaDBError(e) from e
 
-    def prune_product_rates_older_than(self, cutoff: datetime) -> int:
-        try:
-            with self.session_write_scope() as session:
-                deleted = (
-                    session.query(model.product_rate)
-                    .filter(
-                        model.product_rate.valid_to.isnot(None),
-                        model.product_rate.valid_to < cutoff,
-                    )
-                    .delete(synchronize_session=False)
+    def _export_consumption_older_than(
+        self, cutoff: datetime, archive: Callable[[Energy, list[Consumption]], None]
+    ) -> None:
+        c = model.consumption
+        exported = 0
+        page: list[Consumption] = []
+        page_energy = ""
+        with self.session_read_scope() as s:
+            rows = (
+                s.query(
+                    c.energy,
+                    c.period_from,
+                    c.period_to,
+                    c.raw_value,
+                    c.est_kwh,
+                    c.unit,
                 )
-                logger.debug(
-                    f"Pruned {deleted} product_rate row(s) older than {cutoff}."
+                .filter(c.period_from < cutoff)
+                .order_by(c.energy, c.slot)
+                .yield_per(self._read_chunk_size)
+            )
+            for row in rows:
+                if page and (
+                    row.energy != page_energy or len(page) == self._read_chunk_size
+                ):
+                    archive(energy_from_char(page_energy), page)
+                    exported += len(page)
+                    page = []
+                page_energy = row.energy
+                page.append(_consumption_point(row))
+        if page:
+            archive(energy_from_char(page_energy), page)
+            exported += len(page)
+        logger.debug(f"Archived {exported} consumption row(s) older than {cutoff}.")
+
+    def read_consumption(
+        self,
+        energy: Energy,
+        period_from: datetime,
+        period_to: datetime,
+        archive: (
+            Callable[[Energy, datetime, datetime], list[Consumption]] | None
+        ) = None,
+    ) -> list[Consumption]:
+        # Half-hours starting in [period_from, period_to). Anything before the
+        # oldest row still in the table has been pruned, so that part of the
+        # range is read back from the archive, if there is one (see ADR-0022).
+        c = model.consumption
+        energy_char = as_energy_char(energy)
+        with self.session_read_scope() as s:
+            oldest = s.execute(
+                select(func.min(c.period_from)).where(c.energy == energy_char)
+            ).scalar()
+            rows = (
+                s.query(c.period_from, c.period_to, c.raw_value, c.est_kwh, c.unit)
+                .filter(
+                    c.energy == energy_char,
+                    c.slot >= half_hour_slot(period_from),
+                    c.slot <= half_hour_slot(period_to),
+                    c.period_from >= period_from,
+                    c.period_from < period_to,
                 )
-                return deleted
+                .order_by(c.slot)
+                .yield_per(self._read_chunk_size)
+            )
+            points = [_consumption_point(row) for row in rows]
+        archived_to = (
+            period_to if oldest is None else min(period_to, oldest.replace(tzinfo=UTC))
+        )
+        if archive is None or period_from >= archived_to:
+            return points
+        return archive(energy, period_from, archived_to) + points
+
+    def prune_product_rates_older_than(self, cutoff: datetime) -> int:
+        pr = model.product_rate.__table__
+        try:
+            deleted = self._prune(
+                pr,
+                and_(pr.c.valid_to.isnot(None), pr.c.valid_to < cutoff),
+                cutoff,
+            )
+            logger.debug(f"Pruned {deleted} product_rate row(s) older than {cutoff}.")
+            return deleted
         except Exception as e:
             logger.error(f"Failed to prune product rate data: {e}")
             raise MariaDBError(e) from e
@@ -0,0 +1,128 @@
+import logging.config
+from datetime import UTC, datetime
+from logging import Logger, getLogger
+from typing import Any
+
+from common.logging import APP_LOGGER_NAME, config
+from data.mysql.model import SQLBase
+from data.mysql.upsert import bulk_upsert
+from sqlalchemy import MetaData, Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+SLOT_SECONDS = 1800
+LEGACY_SUFFIX = "_legacy_id"
+COMPACT_SUFFIX = "_compact"
+
+# Table name -> the datetime column its slot is numbered from. These are the
+# tables that were keyed by a formatted string `id` before ADR-0017.
+SLOT_COLUMNS = {
+    "consumption": "period_from",
+    "agreement": "valid_from",
+    "product_rate": "valid_from",
+    "agile_forecast": "period_from",
+}
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+
+def half_hour_slot(dt: datetime) -> int:
+    # Naive values are UTC by convention, the same as everywhere else a
+    # DATETIME column is read back (see local_day).
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return int(dt.timestamp()) // SLOT_SECONDS
+
+
+def migrate_to_compact_keys(engine: Engine, chunk_size: int) -> None:
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for table_name, slot_column in SLOT_COLUMNS.items():
+            table = SQLBase.metadata.tables[f"octopus.{table_name}"]
+            schema = connection.schema_for_object(table)
+            if not inspector.has_table(table_name, schema=schema):
+                continue
+            columns = {
+                column["name"]
+                for column in inspector.get_columns(table_name, schema=schema)
+            }
+            if "id" in columns and "slot" not in columns:
+                _migrate_table(connection, table, schema, slot_column, chunk_size)
+
+
+def _migrate_table(
+    connection: Connection,
+    table: Table,
+    schema: str | None,
+    slot_column: str,
+    chunk_size: int,
+) -> None:
+    compact_name = f"{table.name}{COMPACT_SUFFIX}"
+    legacy_name = f"{table.name}{LEGACY_SUFFIX}"
+    logger.info(
+        f"Schema sync: migrating {table.name} to compact slot keys; the original "
+        f"table is kept as {legacy_name}."
+    )
+    original = Table(table.name, MetaData(), schema=schema, autoload_with=connection)
+    # Index names are database-wide on SQLite, so the original's would
+    # collide with the copy's; the original never needs them again.
+    for index in list(original.indexes):
+        index.drop(bind=connection)
+    # Copied into a side table and only swapped in once complete: the
+    # original rows are never altered, and a copy that fails part-way is
+    # simply discarded and redone on the next startup.
+    # sqlalchemy-stubs predates to_metadata, 1.4's rename of tometadata.
+    compact = table.to_metadata(  # type: ignore[attr-defined]
+        MetaData(), name=compact_name
+    )
+    compact.drop(bind=connection, checkfirst=True)
+    compact.create(bind=connection)
+
+    copied = _copy_rows(connection, original, compact, slot_column, chunk_size)
+
+    for old_name, new_name in ((table.name, legacy_name), (compact_name, table.name)):
+        connection.execute(
+            text(
+                f"ALTER TABLE {_qualified(schema, old_name)} "
+                f"RENAME TO {_qualified(schema, new_name)}"
+            )
+        )
+    logger.info(f"Schema sync: copied {copied} {table.name} row(s) to slot keys.")
+
+
+def _copy_rows(
+    connection: Connection,
+    original: Table,
+    compact: Table,
+    slot_column: str,
+    chunk_size: int,
+) -> int:
+    target_columns = {column.name for column in compact.columns}
+    session = Session(bind=connection)
+    copied = 0
+    last_id = None
+    while True:
+        page = original.select().order_by(original.c.id).limit(chunk_size)
+        if last_id is not None:
+            page = page.where(original.c.id > last_id)
+        rows = connection.execute(page).mappings().all()
+        if not rows:
+            break
+        compact_rows = [_compact_row(row, target_columns, slot_column) for row in rows]
+        bulk_upsert(session, compact, compact_rows, chunk_size)
+        copied += len(rows)
+        last_id = rows[-1]["id"]
+    return copied
+
+
+def _qualified(schema: str | None, name: str) -> str:
+    return f"{schema}.{name}" if schema else name
+
+
+def _compact_row(
+    row: Any, target_columns: set[str], slot_column: str
+) -> dict[str, Any]:
+    compact = {name: value for name, value in row.items() if name in target_columns}
+    compact["slot"] = half_hour_slot(row[slot_column])
+    return compact
@@ -0,0 +1,218 @@
+from datetime import datetime
+from typing import Any
+
+from data.mysql import model
+from data.mysql.compact_keys import half_hour_slot
+from data.mysql.upsert import bulk_upsert
+from sqlalchemy import Table, and_, func, or_, select, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+# (energy char, from inclusive, to exclusive or None for open-ended) --
+# a span of consumption_cost rows to re-derive after a write.
+CostWindow = tuple[str, datetime, datetime | None]
+
+
+def _as_stored(value: Any) -> Any:
+    # DATETIME columns hand back the naive wall-clock value they were given,
+    # so an incoming tz-aware value is compared the same way it is stored.
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return value
+
+
+def changed_validity_spans(
+    session: Session, table: Table, rows: list[dict[str, Any]]
+) -> list[tuple[datetime, datetime | None]]:
+    # Agreements and rates are re-fetched and rewritten wholesale every
+    # hour, almost always unchanged -- only rows that are new or actually
+    # differ from what's stored are worth re-pricing consumption for. The
+    # span covers both the old and new valid_to, so a shortened window
+    # re-prices the slots it no longer covers too.
+    if not rows:
+        return []
+    primary_key = list(table.primary_key.columns)
+
+    def key_of(row: Any) -> tuple[Any, ...]:
+        return tuple(row[column.name] for column in primary_key)
+
+    stored = {
+        key_of(row): row
+        for row in session.execute(
+            table.select().where(
+                tuple_(*primary_key).in_([key_of(row) for row in rows])
+            )
+        ).mappings()
+    }
+    spans = []
+    for row in rows:
+        existing = stored.get(key_of(row))
+        if existing is not None and all(
+            _as_stored(value) == existing[name] for name, value in row.items()
+        ):
+            continue
+        valid_to = row["valid_to"]
+        if existing is not None and valid_to is not None:
+            valid_to = (
+                None
+                if existing["valid_to"] is None
+                else max(_as_stored(valid_to), existing["valid_to"])
+            )
+        spans.append((row["valid_from"], valid_to))
+    return spans
+
+
+def _covering_span(
+    spans: list[tuple[datetime, datetime | None]],
+) -> tuple[datetime, datetime | None]:
+    start = min(_as_stored(span_from) for span_from, _ in spans)
+    ends = [_as_stored(span_to) for _, span_to in spans]
+    return start, None if None in ends else max(ends)
+
+
+def rate_cost_windows(
+    session: Session, product_code: str, rows: list[dict[str, Any]]
+) -> list[CostWindow]:
+    spans = changed_validity_spans(session, model.product_rate.__table__, rows)
+    if not spans:
+        return []
+    # Only energies that have ever been on this product can have
+    # consumption priced by it -- comparison products synced purely for
+    # the catalogue re-price nothing.
+    a = model.agreement
+    energies = [
+        energy_char
+        for (energy_char,) in session.query(a.energy)
+        .filter(a.product_code == product_code)
+        .distinct()
+    ]
+    window_from, window_to = _covering_span(spans)
+    return [(energy_char, window_from, window_to) for energy_char in energies]
+
+
+def _window_filters(
+    window: CostWindow,
+) -> tuple[list[ColumnElement[bool]], list[ColumnElement[bool]]]:
+    c = model.consumption
+    cc = model.consumption_cost
+    energy_char = window[0]
+    window_from = _as_stored(window[1])
+    window_to = _as_stored(window[2])
+
+    # The slot bounds let the scan ride the (energy, slot) primary key;
+    # the period_from bounds keep it exact for a window that doesn't
+    # start on a half-hour.
+    consumption_window = [
+        c.energy == energy_char,
+        c.slot >= half_hour_slot(window_from),
+        c.period_from >= window_from,
+    ]
+    cost_window = [cc.energy == energy_char, cc.period_from >= window_from]
+    if window_to is not None:
+        consumption_window.append(c.slot <= half_hour_slot(window_to))
+        consumption_window.append(c.period_from < window_to)
+        cost_window.append(cc.period_from < window_to)
+    return consumption_window, cost_window
+
+
+def refresh_consumption_cost(
+    session: Session, window: CostWindow, read_chunk_size: int, write_chunk_size: int
+) -> int:
+    c = model.consumption
+    cc = model.consumption_cost
+    consumption_window, cost_window = _window_filters(window)
+
+    # Rebuilt rather than patched: a slot whose agreement or rate no
+    # longer applies must lose its old price, not keep it.
+    session.query(cc).filter(*cost_window).delete(synchronize_session=False)
+
+    first_slot, last_slot = session.execute(
+        select(func.min(c.slot), func.max(c.slot)).where(*consumption_window)
+    ).one()
+    if first_slot is None:
+        return 0
+    # Priced read_chunk_size half-hours at a time, each chunk streamed
+    # off a server-side cursor and written before the next is read, so
+    # a full rebuild holds one chunk in memory, not the whole history.
+    # Chunks are disjoint slot ranges, so no slot is priced twice.
+    refreshed = 0
+    for chunk_from in range(first_slot, last_slot + 1, read_chunk_size):
+        facts = _priced_consumption(
+            session,
+            window[0],
+            [
+                *consumption_window,
+                c.slot >= chunk_from,
+                c.slot < chunk_from + read_chunk_size,
+            ],
+            read_chunk_size,
+        )
+        bulk_upsert(
+            session,
+            cc.__table__,
+            list(facts.values()),
+            write_chunk_size,
+        )
+        refreshed += len(facts)
+    return refreshed
+
+
+def _priced_consumption(
+    session: Session,
+    energy_char: str,
+    consumption_window: list[ColumnElement[bool]],
+    read_chunk_size: int,
+) -> dict[tuple[datetime, str], dict[str, Any]]:
+    c = model.consumption
+    a = model.agreement
+    pr = model.product_rate
+    priced = (
+        session.query(
+            c.period_from,
+            c.local_date,
+            c.est_kwh,
+            a.product_code,
+            pr.region,
+            pr.unit_rate,
+            pr.standing_charge,
+        )
+        .join(
+            a,
+            and_(
+                a.energy == c.energy,
+                c.period_from >= a.valid_from,
+                or_(a.valid_to.is_(None), c.period_from < a.valid_to),
+            ),
+        )
+        .join(
+            pr,
+            and_(
+                pr.product_code == a.product_code,
+                c.period_from >= pr.valid_from,
+                or_(pr.valid_to.is_(None), c.period_from < pr.valid_to),
+            ),
+        )
+        .filter(*consumption_window)
+        # Ascending, so when overlapping agreement or rate windows (bad
+        # upstream data) both match a slot, the most-recently-started
+        # one is applied last and wins below -- the same tie-break as
+        # RateTimeline.
+        .order_by(a.valid_from, pr.valid_from)
+        # Fully drained into the dict before the caller writes: a
+        # server-side cursor holds its connection until it is.
+        .yield_per(read_chunk_size)
+    )
+    return {
+        (row.period_from, row.region): {
+            "energy": energy_char,
+            "period_from": row.period_from,
+            "region": row.region,
+            "local_date": row.local_date,
+            "product_code": row.product_code,
+            "est_kwh": row.est_kwh,
+            "unit_rate": row.unit_rate,
+            "standing_charge": row.standing_charge,
+            "variable_cost": row.est_kwh * row.unit_rate,
+        }
+        for row in priced
+    }
@@ -0,0 +1,128 @@
+import logging.config
+from datetime import UTC, date, datetime, timedelta
+from logging import Logger, getLogger
+
+from common.exceptions import MariaDBError
+from common.logging import APP_LOGGER_NAME, config
+from data import local_day
+from data.model import Energy, as_energy_char
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import SLOT_SECONDS, half_hour_slot
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+HALF_HOUR = timedelta(minutes=30)
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+
+def _local_day_slots(day: date) -> range:
+    return range(
+        half_hour_slot(local_day.start_of_local_day(day)),
+        half_hour_slot(local_day.start_of_local_day(day + timedelta(days=1))),
+    )
+
+
+def _slot_ranges(slots: list[int]) -> list[tuple[datetime, datetime]]:
+    # Sorted slots as the fewest back-to-back [from, to) ranges: a run of
+    # consecutive slots, across a day boundary or not, is one range.
+    ranges: list[tuple[int, int]] = []
+    for slot in slots:
+        if ranges and ranges[-1][1] == slot:
+            ranges[-1] = (ranges[-1][0], slot + 1)
+        else:
+            ranges.append((slot, slot + 1))
+    return [
+        (
+            datetime.fromtimestamp(start * SLOT_SECONDS, UTC),
+            datetime.fromtimestamp(end * SLOT_SECONDS, UTC),
+        )
+        for start, end in ranges
+    ]
+
+
+def find_consumption_gaps(
+    session: Session, energy_char: str, period_from: datetime, period_to: datetime
+) -> list[tuple[datetime, datetime]]:
+    # The half-hours in [period_from, period_to) with no consumption row, as
+    # the fewest [from, to) ranges that cover them (see ADR-0035).
+    c = model.consumption
+    window = range(half_hour_slot(period_from), half_hour_slot(period_to))
+    first_day = local_day.to_local_date(period_from)
+    days = [
+        first_day + timedelta(days=offset)
+        for offset in range(
+            (local_day.to_local_date(period_to - HALF_HOUR) - first_day).days + 1
+        )
+    ]
+    counts = dict(
+        session.query(c.local_date, func.count())
+        .filter(
+            c.energy == energy_char,
+            c.slot >= window.start,
+            c.slot < window.stop,
+        )
+        .group_by(c.local_date)
+        .all()
+    )
+    # Only the days short of their expected half-hours -- usually the last
+    # one or two -- have their slots read back. Clamped to the window, so a
+    # day it only partly covers (short by definition) yields no gap for the
+    # part outside it.
+    expected = [
+        slot
+        for day in days
+        if counts.get(day, 0) < local_day.expected_half_hour_count(day)
+        for slot in _local_day_slots(day)
+        if slot in window
+    ]
+    if not expected:
+        return []
+    stored = {
+        slot
+        for (slot,) in session.query(c.slot).filter(
+            c.energy == energy_char, c.slot.between(expected[0], expected[-1])
+        )
+    }
+    return _slot_ranges([slot for slot in expected if slot not in stored])
+
+
+class ConsumptionGapScanner:
+    _mariadb: MariaDBClient
+
+    def __init__(self, mariadb: MariaDBClient) -> None:
+        self._mariadb = mariadb
+
+    def find(
+        self, energy: Energy, period_from: datetime, period_to: datetime
+    ) -> list[tuple[datetime, datetime]]:
+        with self._mariadb.session_read_scope() as session:
+            return find_consumption_gaps(
+                session, as_energy_char(energy), period_from, period_to
+            )
+
+    def record_run(
+        self,
+        energy: Energy,
+        gaps: list[tuple[datetime, datetime]],
+        recovered_half_hours: int,
+    ) -> None:
+        try:
+            with self._mariadb.session_write_scope() as s:
+                s.add(
+                    model.consumption_gap_run(
+                        energy=as_energy_char(energy),
+                        ran_at=datetime.now(UTC),
+                        gap_ranges=len(gaps),
+                        missing_half_hours=sum(
+                            (gap_to - gap_from) // HALF_HOUR
+                            for gap_from, gap_to in gaps
+                        ),
+                        recovered_half_hours=recovered_half_hours,
+                    )
+                )
+        except Exception as e:
+            logger.error(f"Failed to record consumption gap run: {e}")
+            raise MariaDBError(e) from e
@@ -1,7 +1,17 @@
 from typing import ClassVar
 
-from sqlalchemy import Column, Date, DateTime, Index, Integer, Numeric, String
-from sqlalchemy.dialects.mysql import DECIMAL
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Index,
+    Integer,
+    Numeric,
+    SmallInteger,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.mysql import DATETIME, DECIMAL
 from sqlalchemy.ext.declarative import declarative_base
 
 SQLBase = declarative_base()
@@ -9,34 +19,36 @@ SQLBase = declarative_base()
 
 class consumption(SQLBase):
     __tablename__ = "consumption"
-    __table_args__: ClassVar[tuple[Index, dict[str, str]]] = (
+    __table_args__: ClassVar[tuple[Index, Index, dict[str, str]]] = (
         Index("ix_consumption_energy_period_from", "energy", "period_from"),
+        Index("ix_consumption_energy_local_date", "energy", "local_date"),
         {"schema": "octopus"},
     )
 
-    id = Column(String(50), primary_key=True)
-    energy = Column(String(1))
+    energy = Column(String(1), primary_key=True)
+    # Half-hour slot number of period_from, epoch seconds // 1800 -- a
+    # compact integer key in place of the old formatted-string id (see
+    # ADR-0017). period_from itself is still stored for queries.
+    slot = Column(Integer, primary_key=True, autoincrement=False)
     period_from = Column(DateTime, nullable=False)
     period_to = Column(DateTime, nullable=False)
     raw_value = Column(DECIMAL(8, 5, unsigned=True), nullable=False)
     unit = Column(String(5))
     est_kwh = Column(DECIMAL(8, 5, unsigned=True), nullable=False)
+    # Europe/London calendar day of period_from, computed once in Python at
+    # write time (see ADR-0014). Nullable only so schema sync can add it to
+    # an already-populated table; the startup backfill fills older rows.
+    local_date = Column(Date)
 
 
 class agreement(SQLBase):
     __tablename__ = "agreement"
-    __table_args__: ClassVar[tuple[Index, dict[str, str]]] = (
-        Index(
-            "ix_agreement_energy_valid_from_valid_to",
-            "energy",
-            "valid_from",
-            "valid_to",
-        ),
-        {"schema": "octopus"},
-    )
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
 
-    id = Column(String(50), primary_key=True)
-    energy = Column(String(1), nullable=False)
+    # (energy, slot of valid_from) already orders rows the way the old
+    # (energy, valid_from, valid_to) index did, so it carries no extra index.
+    energy = Column(String(1), primary_key=True)
+    slot = Column(Integer, primary_key=True, autoincrement=False)
     product_code = Column(String(50), nullable=False)
     tariff_code = Column(String(50), nullable=False)
     valid_from = Column(DateTime, nullable=False)
@@ -54,20 +66,14 @@ class product(SQLBase):
 
 class product_rate(SQLBase):
     __tablename__ = "product_rate"
-    __table_args__: ClassVar[tuple[Index, dict[str, str]]] = (
-        Index(
-            "ix_product_rate_product_code_region_valid_from_valid_to",
-            "product_code",
-            "region",
-            "valid_from",
-            "valid_to",
-        ),
-        {"schema": "octopus"},
-    )
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
 
-    id = Column(String(70), primary_key=True)
-    product_code = Column(String(50), nullable=False)
-    region = Column(String(1), nullable=False)
+    # Clustered on (product_code, region, slot of valid_from): the "latest
+    # rate starting at or before X" lookup is a descent of the primary key
+    # itself, replacing the old secondary index on the same columns.
+    product_code = Column(String(50), primary_key=True)
+    region = Column(String(1), primary_key=True)
+    slot = Column(Integer, primary_key=True, autoincrement=False)
     valid_from = Column(DateTime, nullable=False)
     valid_to = Column(DateTime)
     unit_rate = Column(Numeric(9, 6), nullable=False)
@@ -83,15 +89,115 @@ class daily_consumption_summary(SQLBase):
     total_kwh = Column(DECIMAL(8, 5, unsigned=True), nullable=False)
 
 
-class agile_forecast(SQLBase):
-    __tablename__ = "agile_forecast"
+class hourly_consumption_summary(SQLBase):
+    # Consumption per Europe/London local hour, maintained in the same
+    # transaction as every consumption write and, like the daily summary,
+    # never pruned (see ADR-0023).
+    __tablename__ = "hourly_consumption_summary"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
+    energy = Column(String(1), primary_key=True)
+    date = Column(Date, primary_key=True)
+    # 0-23 local; the fall-back hour that happens twice is one bucket of
+    # four half-hours, which half_hours keeps averages honest about.
+    hour = Column(SmallInteger, primary_key=True, autoincrement=False)
+    total_kwh = Column(DECIMAL(8, 5, unsigned=True), nullable=False)
+    half_hours = Column(SmallInteger, nullable=False)
+
+
+class monthly_consumption_summary(SQLBase):
+    # Re-derived from daily_consumption_summary whenever a day in the month
+    # is written.
+    __tablename__ = "monthly_consumption_summary"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
+    energy = Column(String(1), primary_key=True)
+    # First day of the local calendar month.
+    month = Column(Date, primary_key=True)
+    total_kwh = Column(DECIMAL(10, 5, unsigned=True), nullable=False)
+    days = Column(SmallInteger, nullable=False)
+
+
+class consumption_dirty_day(SQLBase):
+    __tablename__ = "consumption_dirty_day"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
+    energy = Column(String(1), primary_key=True)
+    date = Column(Date, primary_key=True)
+    # Microsecond precision: summarization clears a mark only if marked_at
+    # still matches what it read, so a re-mark landing within the same
+    # second as that read must still compare unequal.
+    marked_at = Column(DATETIME(fsp=6), nullable=False)
+
+
+class job_watermark(SQLBase):
+    __tablename__ = "job_watermark"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
+    job_name = Column(String(100), primary_key=True)
+    high_water_mark = Column(DateTime, nullable=False)
+
+
+class rate_watermark(SQLBase):
+    # The latest valid_from synced per tariff, written in the same
+    # transaction as the rates themselves; the next pricing refresh fetches
+    # only from just before it (see ADR-0031).
+    __tablename__ = "rate_watermark"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
+    product_code = Column(String(50), primary_key=True)
+    tariff_code = Column(String(50), primary_key=True)
+    region = Column(String(1), primary_key=True)
+    latest_valid_from = Column(DateTime, nullable=False)
+
+
+class warm_start_state(SQLBase):
+    # What startup would otherwise re-fetch -- account and meters, region
+    # code, billing period, consumption cursors -- one JSON section per row,
+    # each stamped with when it was captured (see ADR-0034).
+    __tablename__ = "warm_start_state"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
+    name = Column(String(50), primary_key=True)
+    state = Column(Text, nullable=False)
+    captured_at = Column(DateTime, nullable=False)
+
+
+class consumption_cost(SQLBase):
+    __tablename__ = "consumption_cost"
     __table_args__: ClassVar[tuple[Index, dict[str, str]]] = (
-        Index("ix_agile_forecast_region_period_from", "region", "period_from"),
+        Index(
+            "ix_consumption_cost_energy_region_local_date",
+            "energy",
+            "region",
+            "local_date",
+        ),
         {"schema": "octopus"},
     )
 
-    id = Column(String(70), primary_key=True)
-    region = Column(String(1), nullable=False)
+    # One row per consumption half-hour per region that has a rate for it,
+    # priced by whichever agreement and product_rate applied at period_from.
+    # Derived entirely from consumption/agreement/product_rate and kept in
+    # step with them at write time (see ADR-0015) -- never written directly.
+    energy = Column(String(1), primary_key=True)
+    period_from = Column(DateTime, primary_key=True)
+    region = Column(String(1), primary_key=True)
+    local_date = Column(Date, nullable=False)
+    product_code = Column(String(50), nullable=False)
+    est_kwh = Column(DECIMAL(8, 5, unsigned=True), nullable=False)
+    unit_rate = Column(Numeric(9, 6), nullable=False)
+    standing_charge = Column(Numeric(9, 6), nullable=False)
+    # est_kwh * unit_rate at full precision, so SUM(variable_cost) matches
+    # the SUM(est_kwh * unit_rate) it replaces exactly.
+    variable_cost = Column(Numeric(18, 11), nullable=False)
+
+
+class agile_forecast(SQLBase):
+    __tablename__ = "agile_forecast"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
+    region = Column(String(1), primary_key=True)
+    slot = Column(Integer, primary_key=True, autoincrement=False)
     period_from = Column(DateTime, nullable=False)
     period_to = Column(DateTime, nullable=False)
     forecast_unit_rate = Column(Numeric(9, 6), nullable=False)
@@ -122,3 +228,30 @@ class job_run(SQLBase):
     status = Column(String(20), nullable=False)
     ran_at = Column(DateTime, nullable=False)
     error_message = Column(String(1000))
+
+
+class consumption_gap_run(SQLBase):
+    # One row per meter per gap backfill: how many half-hours were missing
+    # and how many of them Octopus had since published (see ADR-0035).
+    __tablename__ = "consumption_gap_run"
+    __table_args__: ClassVar[tuple[Index, dict[str, str]]] = (
+        Index("ix_consumption_gap_run_energy_ran_at", "energy", "ran_at"),
+        {"schema": "octopus"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    energy = Column(String(1), nullable=False)
+    ran_at = Column(DateTime, nullable=False)
+    gap_ranges = Column(Integer, nullable=False)
+    missing_half_hours = Column(Integer, nullable=False)
+    recovered_half_hours = Column(Integer, nullable=False)
+
+
+class schema_version(SQLBase):
+    __tablename__ = "schema_version"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
+    # One row per model fingerprint that schema sync has fully applied (see
+    # ADR-0018); startup skips reflection when the current one is present.
+    fingerprint = Column(String(64), primary_key=True)
+    synced_at = Column(DateTime, nullable=False)
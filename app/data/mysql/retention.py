@@ -0,0 +1,236 @@
+import logging.config
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from datetime import date, datetime
+from logging import Logger, getLogger
+
+from common.logging import APP_LOGGER_NAME, config
+from sqlalchemy import (
+    Table,
+    delete,
+    func,
+    literal,
+    not_,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+# Partitions kept ahead of the current month, so inserts never land in the
+# catch-all partition between two daily syncs.
+MONTHS_AHEAD = 2
+MAXVALUE_PARTITION = "pmax"
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month_start(day: date) -> date:
+    return (
+        date(day.year + 1, 1, 1)
+        if day.month == 12
+        else date(day.year, day.month + 1, 1)
+    )
+
+
+def partition_name(month: date) -> str:
+    return f"p{month.strftime('%Y%m')}"
+
+
+def _partition_month(name: str) -> date | None:
+    if name == MAXVALUE_PARTITION:
+        return None
+    return datetime.strptime(name[1:], "%Y%m").date()
+
+
+def _partition_clause(months: list[date]) -> str:
+    # RANGE COLUMNS on the DATETIME itself, not RANGE(TO_DAYS(...)), so the
+    # optimizer can prune partitions for a plain period_from range predicate.
+    bounds = [
+        f"PARTITION {partition_name(month)} VALUES LESS THAN "
+        f"('{next_month_start(month).isoformat()} 00:00:00')"
+        for month in months
+    ]
+    bounds.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return ", ".join(bounds)
+
+
+def _qualified_name(connection: Connection, table: Table) -> str:
+    schema = connection.schema_for_object(table)
+    return f"{schema}.{table.name}" if schema else table.name
+
+
+def _existing_partitions(connection: Connection, table: Table) -> list[str]:
+    rows = connection.execute(
+        text(
+            "SELECT PARTITION_NAME FROM information_schema.PARTITIONS "
+            "WHERE TABLE_SCHEMA = COALESCE(:schema, DATABASE()) "
+            "AND TABLE_NAME = :table_name AND PARTITION_NAME IS NOT NULL "
+            "ORDER BY PARTITION_ORDINAL_POSITION"
+        ),
+        {"schema": connection.schema_for_object(table), "table_name": table.name},
+    )
+    return [row.PARTITION_NAME for row in rows]
+
+
+def _months_between(first: date, last: date) -> list[date]:
+    months = []
+    month = month_start(first)
+    while month <= last:
+        months.append(month)
+        month = next_month_start(month)
+    return months
+
+
+def sync_monthly_partitions(
+    connection: Connection, table: Table, column: str, today: date
+) -> None:
+    qualified_name = _qualified_name(connection, table)
+    last_month = month_start(today)
+    for _ in range(MONTHS_AHEAD):
+        last_month = next_month_start(last_month)
+
+    existing = _existing_partitions(connection, table)
+    if not existing:
+        oldest = connection.execute(select(func.min(table.c[column]))).scalar()
+        first_month = month_start(oldest.date() if oldest is not None else today)
+        months = _months_between(first_month, last_month)
+        # MariaDB requires the partitioning column in every unique key, so
+        # a primary key that doesn't already carry it is widened in the
+        # same ALTER (one table rebuild, not two). Still unique -- it only
+        # gains a column.
+        primary_key = [primary.name for primary in table.primary_key.columns]
+        widen_primary_key = (
+            ""
+            if column in primary_key
+            else f"DROP PRIMARY KEY, ADD PRIMARY KEY ({', '.join(primary_key)}, "
+            f"{column}) "
+        )
+        logger.info(
+            f"Schema sync: partitioning {table.name} by month on {column} "
+            f"({len(months)} partition(s) from {months[0]:%Y-%m})."
+        )
+        connection.execute(
+            text(
+                f"ALTER TABLE {qualified_name} {widen_primary_key}"
+                f"PARTITION BY RANGE COLUMNS({column}) "
+                f"({_partition_clause(months)})"
+            )
+        )
+        return
+
+    existing_months = [
+        month for month in map(_partition_month, existing) if month is not None
+    ]
+    newest = max(existing_months, default=month_start(today))
+    missing = [
+        month
+        for month in _months_between(next_month_start(newest), last_month)
+        if month not in existing_months
+    ]
+    if not missing:
+        return
+    logger.info(
+        f"Schema sync: adding {table.name} partition(s) "
+        f"{[partition_name(month) for month in missing]}."
+    )
+    # pmax only ever holds rows dated past the newest named partition,
+    # normally none, so splitting it is close to free.
+    connection.execute(
+        text(
+            f"ALTER TABLE {qualified_name} REORGANIZE PARTITION "
+            f"{MAXVALUE_PARTITION} INTO ({_partition_clause(missing)})"
+        )
+    )
+
+
+def drop_expired_partitions(
+    connection: Connection,
+    table: Table,
+    expired: ColumnElement[bool],
+    cutoff: datetime,
+) -> int:
+    dropped: list[str] = []
+    rows = 0
+    for name in _existing_partitions(connection, table):
+        month = _partition_month(name)
+        if month is None or next_month_start(month) > cutoff.date():
+            continue
+        # Only a partition with no row the prune would keep is dropped --
+        # product_rate is partitioned by valid_from, so an old partition can
+        # still hold an open-ended rate that is in force today. Anything
+        # left behind is removed row by row by the batched delete instead.
+        survivor = connection.execute(
+            select(literal(1))
+            .select_from(table)
+            .with_hint(table, f"PARTITION ({name})")
+            .where(not_(expired))
+            .limit(1)
+        ).first()
+        if survivor is not None:
+            continue
+        rows += connection.execute(
+            select(func.count())
+            .select_from(table)
+            .with_hint(table, f"PARTITION ({name})")
+        ).scalar_one()
+        dropped.append(name)
+
+    if dropped:
+        connection.execute(
+            text(
+                f"ALTER TABLE {_qualified_name(connection, table)} "
+                f"DROP PARTITION {', '.join(dropped)}"
+            )
+        )
+        logger.info(f"Dropped {table.name} partition(s) {dropped} ({rows} row(s)).")
+    return rows
+
+
+def delete_in_batches(
+    session_scope: Callable[[], AbstractContextManager[Session]],
+    table: Table,
+    expired: ColumnElement[bool],
+    batch_size: int,
+    batch_time_limit: float,
+) -> int:
+    primary_key = list(table.primary_key.columns)
+    key_column = primary_key[0] if len(primary_key) == 1 else tuple_(*primary_key)
+    deleted = 0
+    batches = 0
+    while True:
+        started = time.monotonic()
+        # One short transaction per batch, so the row locks taken by a large
+        # prune are released every batch_size rows instead of held until
+        # the whole backlog is gone.
+        with session_scope() as session:
+            keys = [
+                row[0] if len(primary_key) == 1 else tuple(row)
+                for row in session.query(*primary_key).filter(expired).limit(batch_size)
+            ]
+            if keys:
+                session.execute(delete(table).where(key_column.in_(keys)))
+        elapsed = time.monotonic() - started
+        if not keys:
+            break
+        deleted += len(keys)
+        batches += 1
+        logger.info(
+            f"Pruning {table.name}: {deleted} row(s) deleted after {batches} "
+            f"batch(es); last batch of {len(keys)} took {elapsed:.2f}s."
+        )
+        if len(keys) < batch_size:
+            break
+        # Over budget: halve the next batch rather than abort, so a slow
+        # disk still makes steady progress without long lock holds.
+        if elapsed > batch_time_limit and batch_size > 1:
+            batch_size //= 2
+    return deleted
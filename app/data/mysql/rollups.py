@@ -0,0 +1,78 @@
+from datetime import date
+from decimal import Decimal
+
+from data import local_day
+from data.mysql import model
+from data.mysql.upsert import bulk_upsert
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+
+def refresh_hourly_summaries(
+    session: Session, energy_char: str, local_dates: set[date], write_chunk_size: int
+) -> None:
+    # Whole local days re-aggregated from raw consumption rather than
+    # adjusted by the incoming rows, so a revised half-hour replaces its
+    # old value instead of adding to it. Bounded by the days written --
+    # 48 rows a day -- however much history is retained.
+    if not local_dates:
+        return
+    c = model.consumption
+    hours: dict[tuple[date, int], tuple[Decimal, int]] = {}
+    for row in session.query(c.local_date, c.period_from, c.est_kwh).filter(
+        c.energy == energy_char, c.local_date.in_(local_dates)
+    ):
+        key = (row.local_date, local_day.to_local(row.period_from).hour)
+        total_kwh, half_hours = hours.get(key, (Decimal(0), 0))
+        hours[key] = (total_kwh + row.est_kwh, half_hours + 1)
+    bulk_upsert(
+        session,
+        model.hourly_consumption_summary.__table__,
+        [
+            {
+                "energy": energy_char,
+                "date": day,
+                "hour": hour,
+                "total_kwh": total_kwh,
+                "half_hours": half_hours,
+            }
+            for (day, hour), (total_kwh, half_hours) in hours.items()
+        ],
+        write_chunk_size,
+    )
+
+
+def refresh_monthly_summaries(
+    session: Session, days: set[tuple[str, date]], write_chunk_size: int
+) -> None:
+    # One aggregate per (energy, month) touched, over at most 31 daily
+    # rows each.
+    d = model.daily_consumption_summary
+    rows = []
+    for energy_char, month in sorted(
+        {(energy_char, day.replace(day=1)) for energy_char, day in days}
+    ):
+        total_kwh, day_count = (
+            session.query(func.sum(d.total_kwh), func.count())
+            .filter(
+                d.energy == energy_char,
+                d.date >= month,
+                d.date < local_day.first_of_next_month(month),
+            )
+            .one()
+        )
+        if day_count:
+            rows.append(
+                {
+                    "energy": energy_char,
+                    "month": month,
+                    "total_kwh": total_kwh,
+                    "days": day_count,
+                }
+            )
+    bulk_upsert(
+        session,
+        model.monthly_consumption_summary.__table__,
+        rows,
+        write_chunk_size,
+    )
@@ -0,0 +1,219 @@
+import hashlib
+import logging.config
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from logging import Logger, getLogger
+
+from common.logging import APP_LOGGER_NAME, config
+from data import local_day
+from data.mysql import model
+from data.mysql.compact_keys import migrate_to_compact_keys
+from data.mysql.model import SQLBase
+from data.mysql.rollups import refresh_hourly_summaries, refresh_monthly_summaries
+from sqlalchemy import and_, bindparam, inspect, text, update
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlalchemy.engine.reflection import Inspector
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+
+def schema_fingerprint(dialect: Dialect) -> str:
+    # The DDL schema sync would emit for every table and index, so any model
+    # change that sync could act on changes the hash, and nothing else does.
+    ddl = []
+    for table in sorted(SQLBase.metadata.tables.values(), key=lambda t: t.key):
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        for index in sorted(table.indexes, key=lambda index: str(index.name)):
+            # sqlalchemy-stubs misdeclares CreateIndex's parameter as `str`
+            # (see test_every_declared_index_compiles_as_valid_mariadb_ddl).
+            statement = CreateIndex(index)  # type: ignore[arg-type]
+            ddl.append(str(statement.compile(dialect=dialect)))
+    return hashlib.sha256("\n".join(ddl).encode()).hexdigest()
+
+
+def schema_is_current(engine: Engine, fingerprint: str) -> bool:
+    table = model.schema_version.__table__
+    with engine.connect() as connection:
+        if not inspect(connection).has_table(
+            table.name, schema=connection.schema_for_object(table)
+        ):
+            return False
+        return (
+            Session(bind=connection)
+            .query(table.c.fingerprint)
+            .filter(table.c.fingerprint == fingerprint)
+            .first()
+            is not None
+        )
+
+
+def sync_model(engine: Engine, write_chunk_size: int) -> None:
+    # Before anything else: the additive sync below can't add a NOT NULL
+    # key column to a populated table, so tables still keyed by the old
+    # string id are rebuilt on slot keys first (see ADR-0017).
+    migrate_to_compact_keys(engine, write_chunk_size)
+    existing_tables = set(inspect(engine).get_table_names())
+
+    SQLBase.metadata.create_all(engine, checkfirst=True)
+
+    created_tables = {
+        table.name for table in SQLBase.metadata.tables.values()
+    } - existing_tables
+    if created_tables:
+        logger.info(f"Schema sync: created missing tables: {sorted(created_tables)}")
+
+    inspector = inspect(engine)
+    # MariaDB/MySQL DDL auto-commits per statement, so this transaction
+    # doesn't make the ADD COLUMN / CREATE INDEX loops atomic — it's just
+    # a connection scope. Idempotent regardless: a re-run picks up
+    # anything not yet added.
+    with engine.begin() as connection:
+        _sync_missing_columns(connection, inspector)
+        _sync_missing_indexes(connection, inspector)
+
+
+def _sync_missing_columns(connection: Connection, inspector: Inspector) -> None:
+    for table in SQLBase.metadata.tables.values():
+        schema = connection.schema_for_object(table)
+        existing_columns = {
+            column["name"]
+            for column in inspector.get_columns(table.name, schema=schema)
+        }
+        missing_columns = [
+            column for column in table.columns if column.name not in existing_columns
+        ]
+        if not missing_columns:
+            continue
+
+        logger.info(
+            f"Schema sync: adding missing columns to {table.name}: "
+            f"{[column.name for column in missing_columns]}"
+        )
+
+        qualified_name = f"{schema}.{table.name}" if schema else table.name
+        for column in missing_columns:
+            column_ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(
+                text(f"ALTER TABLE {qualified_name} ADD COLUMN {column_ddl}")
+            )
+
+
+def _sync_missing_indexes(connection: Connection, inspector: Inspector) -> None:
+    for table in SQLBase.metadata.tables.values():
+        schema = connection.schema_for_object(table)
+        existing_index_names = {
+            index["name"] for index in inspector.get_indexes(table.name, schema=schema)
+        }
+        missing_indexes = [
+            index for index in table.indexes if index.name not in existing_index_names
+        ]
+        if not missing_indexes:
+            continue
+
+        logger.info(
+            f"Schema sync: creating missing indexes on {table.name}: "
+            f"{[index.name for index in missing_indexes]}"
+        )
+        for index in missing_indexes:
+            index.create(bind=connection)
+
+
+def backfill_consumption_local_dates(
+    session_write_scope: Callable[[], AbstractContextManager[Session]],
+    read_chunk_size: int,
+) -> None:
+    # One-off in practice: only rows written before consumption.local_date
+    # existed are NULL, and write_consumption fills it for everything
+    # since. Computed in Python, same as at write time, so the day
+    # attribution is identical whichever path set it (see ADR-0014).
+    c = model.consumption.__table__
+    backfilled = 0
+    # A page at a time, so memory stays flat however much history
+    # predates the column; each page's update takes it out of the next
+    # page's WHERE.
+    while True:
+        with session_write_scope() as s:
+            pending = (
+                s.query(c.c.energy, c.c.slot, c.c.period_from)
+                .filter(c.c.local_date.is_(None))
+                .limit(read_chunk_size)
+                .all()
+            )
+            if not pending:
+                break
+            s.execute(
+                update(c)
+                .where(
+                    and_(
+                        c.c.energy == bindparam("row_energy"),
+                        c.c.slot == bindparam("row_slot"),
+                    )
+                )
+                .values(local_date=bindparam("row_local_date")),
+                [
+                    {
+                        "row_energy": row.energy,
+                        "row_slot": row.slot,
+                        "row_local_date": local_day.to_local_date(row.period_from),
+                    }
+                    for row in pending
+                ],
+            )
+        backfilled += len(pending)
+    if backfilled:
+        logger.info(
+            f"Schema sync: backfilled local_date on {backfilled} " "consumption row(s)."
+        )
+
+
+def backfill_summary_rollups(
+    session_read_scope: Callable[[], AbstractContextManager[Session]],
+    session_write_scope: Callable[[], AbstractContextManager[Session]],
+    read_chunk_size: int,
+    write_chunk_size: int,
+) -> None:
+    # Same shape as the consumption_cost backfill: only a rollup that has
+    # never been populated is built here, from whatever its source still
+    # holds; every write keeps it current from then on.
+    c = model.consumption
+    d = model.daily_consumption_summary
+    with session_read_scope() as s:
+        has_hourly = s.query(model.hourly_consumption_summary).first() is not None
+        has_monthly = s.query(model.monthly_consumption_summary).first() is not None
+        consumption_days = (
+            []
+            if has_hourly
+            else [
+                (row.energy, row.local_date)
+                for row in s.query(c.energy, c.local_date).distinct()
+                if row.local_date is not None
+            ]
+        )
+        summary_days = (
+            set()
+            if has_monthly
+            else {(row.energy, row.date) for row in s.query(d.energy, d.date)}
+        )
+    # A transaction per read_chunk_size half-hours' worth of days.
+    days_per_chunk = max(1, read_chunk_size // 48)
+    for start in range(0, len(consumption_days), days_per_chunk):
+        chunk = consumption_days[start : start + days_per_chunk]
+        with session_write_scope() as s:
+            for energy_char in {energy_char for energy_char, _ in chunk}:
+                refresh_hourly_summaries(
+                    s,
+                    energy_char,
+                    {day for e, day in chunk if e == energy_char},
+                    write_chunk_size,
+                )
+    if summary_days:
+        with session_write_scope() as s:
+            refresh_monthly_summaries(s, summary_days, write_chunk_size)
+    if consumption_days or summary_days:
+        logger.info(
+            f"Schema sync: built hourly summaries for {len(consumption_days)} "
+            f"day(s) and monthly summaries from {len(summary_days)} day(s)."
+        )
@@ -0,0 +1,102 @@
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Table, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Insert
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+
+    def __add__(self, other: "UpsertResult") -> "UpsertResult":
+        return UpsertResult(
+            inserted=self.inserted + other.inserted,
+            updated=self.updated + other.updated,
+        )
+
+
+def bulk_upsert(
+    session: Session,
+    table: Table,
+    rows: list[dict[str, Any]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> UpsertResult:
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}.")
+    # Last occurrence of a primary key wins, matching what the old
+    # record-at-a-time path left behind -- and keeps the inserted/updated
+    # split honest, since a key repeated within one multi-row statement
+    # would otherwise be counted as two inserts.
+    unique_rows = list({_primary_key_of(table, row): row for row in rows}.values())
+    result = UpsertResult()
+    for start in range(0, len(unique_rows), chunk_size):
+        result += _upsert_chunk(session, table, unique_rows[start : start + chunk_size])
+    return result
+
+
+def _upsert_chunk(
+    session: Session, table: Table, chunk: list[dict[str, Any]]
+) -> UpsertResult:
+    # MariaDB's affected-rows count can't tell an insert apart from an
+    # unchanged-row update once SQLAlchemy's pymysql dialect sets
+    # CLIENT_FOUND_ROWS, so existing keys are looked up explicitly instead --
+    # one extra round trip per chunk, not per row.
+    existing_keys = _existing_primary_keys(session, table, chunk)
+    # executemany form, not .values(chunk): the statement stays cacheable
+    # instead of being recompiled with thousands of bind params per chunk,
+    # and pymysql's executemany still rewrites it into one multi-row
+    # VALUES (...), (...) ON DUPLICATE KEY UPDATE on the wire.
+    session.execute(_upsert_statement(session, table, chunk), chunk)
+    updated = sum(1 for row in chunk if _primary_key_of(table, row) in existing_keys)
+    return UpsertResult(inserted=len(chunk) - updated, updated=updated)
+
+
+def _upsert_statement(
+    session: Session, table: Table, chunk: list[dict[str, Any]]
+) -> Insert:
+    primary_key_names = [column.name for column in table.primary_key.columns]
+    update_names = [name for name in chunk[0] if name not in primary_key_names]
+    dialect_name = session.get_bind().dialect.name
+    match dialect_name:
+        case "mysql" | "mariadb":
+            mysql_statement = mysql_insert(table)
+            return mysql_statement.on_duplicate_key_update(
+                {name: mysql_statement.inserted[name] for name in update_names}
+            )
+        case "sqlite":
+            sqlite_statement = sqlite_insert(table)
+            return sqlite_statement.on_conflict_do_update(
+                index_elements=primary_key_names,
+                set_={name: sqlite_statement.excluded[name] for name in update_names},
+            )
+        case _:
+            raise NotImplementedError(
+                f"Bulk upsert is not supported for the {dialect_name} dialect."
+            )
+
+
+def _existing_primary_keys(
+    session: Session, table: Table, chunk: list[dict[str, Any]]
+) -> set[Hashable]:
+    primary_key_columns = list(table.primary_key.columns)
+    keys = [_primary_key_of(table, row) for row in chunk]
+    if len(primary_key_columns) == 1:
+        (column,) = primary_key_columns
+        return {value for (value,) in session.query(column).filter(column.in_(keys))}
+    rows = session.query(*primary_key_columns).filter(
+        tuple_(*primary_key_columns).in_(keys)
+    )
+    return {tuple(row) for row in rows}
+
+
+def _primary_key_of(table: Table, row: dict[str, Any]) -> Hashable:
+    values = tuple(row[column.name] for column in table.primary_key.columns)
+    return values[0] if len(values) == 1 else values
@@ -0,0 +1,119 @@
+import logging.config
+import queue
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from logging import Logger, getLogger
+
+from common.exceptions import MariaDBError
+from common.logging import APP_LOGGER_NAME, config
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+
+class WriteBehindQueue[W]:
+    # One writer thread behind a bounded queue (see ADR-0020). Whatever has
+    # queued up while the previous commit ran goes out as one merged
+    # transaction, so jobs that write at the same moment share a commit (and
+    # an fsync) instead of contending for locks with one each.
+
+    def __init__(
+        self,
+        write_merged: Callable[[list[W]], None],
+        write_one: Callable[[W], object],
+        max_pending: int,
+        flush_timeout: float,
+    ) -> None:
+        self._write_merged = write_merged
+        self._write_one = write_one
+        self._flush_timeout = flush_timeout
+        # Bounded, so a writer that falls behind blocks the jobs feeding it
+        # rather than buffering their pages without limit.
+        self._queue: queue.Queue[tuple[W, Future[None]]] = queue.Queue(max_pending)
+        self._submitted = threading.local()
+        self._writer = threading.Thread(
+            target=self._run, name="mariadb-write-behind", daemon=True
+        )
+        self._writer.start()
+
+    def submit(self, write: W) -> Future[None]:
+        self._require_writer()
+        future: Future[None] = Future()
+        self._queue.put((write, future))
+        self._own_pending().append(future)
+        return future
+
+    def flush(self) -> None:
+        # Waits only for what the calling thread submitted: a job confirms
+        # its own writes without stalling behind another job's.
+        pending = self._own_pending()
+        futures = list(pending)
+        pending.clear()
+        if all(future.done() for future in futures):
+            self._raise_first_error(futures)
+            return
+        # Bounded, and only while the writer is running: a writer that died
+        # or hangs on a lock would otherwise block every job that flushes --
+        # record_job_run and every read scope included -- for ever.
+        self._require_writer()
+        deadline = time.monotonic() + self._flush_timeout
+        for future in futures:
+            try:
+                future.exception(timeout=max(deadline - time.monotonic(), 0))
+            except TimeoutError:
+                raise MariaDBError(
+                    f"Write-behind: queued writes not committed within "
+                    f"{self._flush_timeout}s."
+                ) from None
+        self._raise_first_error(futures)
+
+    @staticmethod
+    def _raise_first_error(futures: list[Future[None]]) -> None:
+        errors = [
+            error for error in (future.exception() for future in futures) if error
+        ]
+        if errors:
+            raise errors[0]
+
+    def _require_writer(self) -> None:
+        if not self._writer.is_alive():
+            raise MariaDBError("Write-behind: the writer thread has stopped.")
+
+    def _own_pending(self) -> list[Future[None]]:
+        if not hasattr(self._submitted, "futures"):
+            self._submitted.futures = []
+        return self._submitted.futures
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch: list[tuple[W, Future[None]]]) -> None:
+        try:
+            self._write_merged([write for write, _ in batch])
+        except Exception as e:
+            # One bad write shouldn't fail everything it happened to be
+            # merged with, so each is retried in a transaction of its own
+            # and only the culprit's future carries the error.
+            logger.warning(
+                f"Write-behind: merged commit of {len(batch)} write(s) failed "
+                f"({e}); retrying each on its own."
+            )
+            for write, future in batch:
+                try:
+                    self._write_one(write)
+                except Exception as write_error:
+                    future.set_exception(write_error)
+                else:
+                    future.set_result(None)
+            return
+        for _, future in batch:
+            future.set_result(None)
@@ -61,8 +61,16 @@ class AccountClient:
         self._transport = transport
 
     def get_account_meter_information(self) -> tuple[Account, list[Meter]]:
+        return self._transport.run(self.get_account_meter_information_async())
+
+    def get_region_code(self, postcode: str) -> str:
+        return self._transport.run(self.get_region_code_async(postcode))
+
+    async def get_account_meter_information_async(
+        self,
+    ) -> tuple[Account, list[Meter]]:
         url = self._transport.base_url + f"accounts/{self._account_number}"
-        parsed = self._transport.get(
+        parsed = await self._transport.get_async(
             url,
             AccountMeterInformationResponse,
             description="fetch account/meter information",
@@ -103,9 +111,9 @@ class AccountClient:
 
         return (account, meters)
 
-    def get_region_code(self, postcode: str) -> str:
+    async def get_region_code_async(self, postcode: str) -> str:
         url = self._transport.base_url + "industry/grid-supply-points"
-        parsed = self._transport.get(
+        parsed = await self._transport.get_async(
             url,
             GridSupplyPointsResponse,
             params={"postcode": postcode},
@@ -1,14 +1,11 @@
 from datetime import datetime, timedelta
 from decimal import Decimal
 
-import requests
-from common.decorator import retry
 from common.exceptions import APIError
-from common.http import raise_for_http_error
+from common.http import PooledHTTPClient
 from data.octopus.model import AgileForecastReading
 from pydantic import BaseModel, RootModel
 
-REQUEST_TIMEOUT_SECONDS = 30
 HALF_HOUR = timedelta(minutes=30)
 
 
@@ -28,16 +25,15 @@ class AgilePredictResponse(RootModel[list[AgilePredictRegionForecast]]):
 class AgilePredictClient:
     base_url: str = "https://agilepredict.com/api/"
 
-    @retry()
+    def __init__(self, http: PooledHTTPClient | None = None) -> None:
+        self._http = http or PooledHTTPClient()
+
     def get_forecast(self, region: str) -> list[AgileForecastReading]:
-        url = self.base_url + f"{region}/"
-        response: requests.Response | None = None
-        try:
-            response = requests.get(url=url, timeout=REQUEST_TIMEOUT_SECONDS)
-            response.raise_for_status()
-            parsed = AgilePredictResponse.model_validate(response.json())
-        except Exception as e:
-            raise_for_http_error(response, e, "fetch Agile forecast")
+        parsed = self._http.get(
+            self.base_url + f"{region}/",
+            AgilePredictResponse,
+            description="fetch Agile forecast",
+        )
 
         forecast = next(iter(parsed.root), None)
         if forecast is None or not forecast.prices:
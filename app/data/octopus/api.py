@@ -16,7 +16,7 @@ class OctopusEnergyAPIClient:
         self._account = AccountClient(settings, transport)
         self._product = ProductClient(transport)
         self._rate = RateClient(transport)
-        self._consumption = ConsumptionClient(transport)
+        self._consumption = ConsumptionClient(transport, settings.fetch_workers)
 
     # region Account Information
 
@@ -55,6 +55,31 @@ class OctopusEnergyAPIClient:
             product_code, tariff_code, period_from, period_to
         )
 
+    async def get_product_region_availability_async(
+        self, product_code: str, region: str
+    ) -> bool:
+        return await self._product.get_product_region_availability_async(
+            product_code, region
+        )
+
+    async def get_electricity_tariff_code_async(
+        self, product_code: str, region: str
+    ) -> str | None:
+        return await self._product.get_electricity_tariff_code_async(
+            product_code, region
+        )
+
+    async def get_electricity_rates_async(
+        self,
+        product_code: str,
+        tariff_code: str,
+        period_from: datetime | None = None,
+        period_to: datetime | None = None,
+    ) -> list[Rate]:
+        return await self._rate.get_electricity_rates_async(
+            product_code, tariff_code, period_from, period_to
+        )
+
     def get_gas_rates(
         self,
         product_code: str,
@@ -82,4 +107,14 @@ class OctopusEnergyAPIClient:
             energy, api_endpoint
         )
 
+    def get_consumption_range(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        return self._consumption.get_consumption_range(meter, period_from, period_to)
+
+    def get_daily_consumption(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        return self._consumption.get_daily_consumption(meter, period_from, period_to)
+
     # endregion
@@ -1,4 +1,5 @@
-from datetime import UTC, datetime
+import asyncio
+from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
@@ -9,6 +10,29 @@ from data.octopus.transport import OctopusTransport
 from pydantic import BaseModel
 
 DEFAULT_PAGE_SIZE = 100
+# The largest page_size Octopus accepts -- a year of half-hours. Every
+# window below fits in one page of it, so a window is normally one request.
+MAX_PAGE_SIZE = 25_000
+# Span of each independently fetched sub-window (see ADR-0025): small enough
+# that a 45-day startup window already fans out across workers, large enough
+# that the 730-day backfill is a couple of dozen requests, not 350.
+FETCH_WINDOW = timedelta(days=31)
+# Octopus's server-side aggregation: one reading per Europe/London day, its
+# interval_start that day's local midnight.
+GROUP_BY_DAY = "day"
+
+
+def plan_fetch_windows(
+    period_from: datetime, period_to: datetime, window: timedelta = FETCH_WINDOW
+) -> list[tuple[datetime, datetime]]:
+    # Back-to-back half-open windows covering [period_from, period_to).
+    windows = []
+    window_from = period_from
+    while window_from < period_to:
+        window_to = min(window_from + window, period_to)
+        windows.append((window_from, window_to))
+        window_from = window_to
+    return windows
 
 
 class ConsumptionReading(BaseModel):
@@ -25,19 +49,34 @@ class ConsumptionResponse(BaseModel):
 class ConsumptionClient:
     _consumption_funcs: dict
 
-    def __init__(self, transport: OctopusTransport) -> None:
+    def __init__(self, transport: OctopusTransport, fetch_workers: int = 1) -> None:
         self._transport = transport
+        self._fetch_workers = fetch_workers
         self._consumption_funcs: dict = {
-            Energy.electricity: self.get_electricity_consumption,
-            Energy.gas: self.get_gas_consumption,
+            Energy.electricity: self.get_electricity_consumption_async,
+            Energy.gas: self.get_gas_consumption_async,
         }
 
     def get_consumption(
         self, meter: Meter, period_from: datetime, period_to: datetime | None = None
     ) -> tuple[str | None, list[Consumption]]:
-        func = self._consumption_funcs[meter.energy]
-        value = func(meter, period_from, period_to)
-        return value
+        return self._transport.run(
+            self.get_consumption_async(meter, period_from, period_to)
+        )
+
+    def get_consumption_range(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        return self._transport.run(
+            self.get_consumption_range_async(meter, period_from, period_to)
+        )
+
+    def get_daily_consumption(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        return self._transport.run(
+            self.get_daily_consumption_async(meter, period_from, period_to)
+        )
 
     def get_electricity_consumption(
         self,
@@ -45,29 +84,128 @@ class ConsumptionClient:
         period_from: datetime | None,
         period_to: datetime | None,
         page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> tuple[str | None, list[Consumption]]:
+        return self._transport.run(
+            self.get_electricity_consumption_async(
+                meter, period_from, period_to, page_size
+            )
+        )
+
+    def get_gas_consumption(
+        self,
+        meter: Gas,
+        period_from: datetime | None,
+        period_to: datetime | None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> tuple[str | None, list[Consumption]]:
+        return self._transport.run(
+            self.get_gas_consumption_async(meter, period_from, period_to, page_size)
+        )
+
+    def get_consumption_directly_from_endpoint(
+        self,
+        energy: Energy,
+        api_endpoint: str,
+        params: dict[str, Any] | None = None,
+    ) -> tuple[str | None, list[Consumption]]:
+        return self._transport.run(
+            self.get_consumption_directly_from_endpoint_async(
+                energy, api_endpoint, params
+            )
+        )
+
+    async def get_consumption_async(
+        self, meter: Meter, period_from: datetime, period_to: datetime | None = None
+    ) -> tuple[str | None, list[Consumption]]:
+        func = self._consumption_funcs[meter.energy]
+        return await func(meter, period_from, period_to)
+
+    async def get_consumption_range_async(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        # Each window is independent of the others, unlike a chain of `next`
+        # links, so they're gathered on the transport's event loop -- at most
+        # fetch_workers of them in flight, within the runner's global limit
+        # -- and only merged, in period order as order_by=period returned
+        # each one, once all have arrived.
+        windows = plan_fetch_windows(period_from, period_to)
+        fetch_slots = asyncio.Semaphore(self._fetch_workers)
+
+        async def fetch(
+            window_from: datetime, window_to: datetime
+        ) -> list[Consumption]:
+            async with fetch_slots:
+                return await self._get_window(meter, window_from, window_to)
+
+        fetched = await asyncio.gather(*(fetch(*window) for window in windows))
+        # Keyed by start: a reading Octopus returns on both sides of a window
+        # boundary is kept once.
+        merged = {point.start: point for points in fetched for point in points}
+        return [merged[start] for start in sorted(merged)]
+
+    async def _get_window(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        func = self._consumption_funcs[meter.energy]
+        next_page, consumption = await func(
+            meter, period_from, period_to, MAX_PAGE_SIZE
+        )
+        # A window fits in one page; followed anyway rather than trusted.
+        while next_page is not None:
+            next_page, page = await self.get_consumption_directly_from_endpoint_async(
+                meter.energy, next_page
+            )
+            consumption.extend(page)
+        return consumption
+
+    async def get_daily_consumption_async(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        # A month of day totals is ~31 readings where the half-hourly fetch
+        # is ~1,500, so one request covers what get_consumption_range
+        # would gather across windows.
+        func = self._consumption_funcs[meter.energy]
+        next_page, consumption = await func(
+            meter, period_from, period_to, DEFAULT_PAGE_SIZE, GROUP_BY_DAY
+        )
+        while next_page is not None:
+            next_page, page = await self.get_consumption_directly_from_endpoint_async(
+                meter.energy, next_page
+            )
+            consumption.extend(page)
+        return consumption
+
+    async def get_electricity_consumption_async(
+        self,
+        meter: Electricity,
+        period_from: datetime | None,
+        period_to: datetime | None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        group_by: str | None = None,
     ) -> tuple[str | None, list[Consumption]]:
         api_endpoint = (
             self._transport.base_url
             + f"electricity-meter-points/{meter.mpan}/meters/{meter.serial_number}/consumption/"
         )
-        params = self._build_params(period_from, period_to, page_size)
-        return self.get_consumption_directly_from_endpoint(
+        params = self._build_params(period_from, period_to, page_size, group_by)
+        return await self.get_consumption_directly_from_endpoint_async(
             Energy.electricity, api_endpoint, params
         )
 
-    def get_gas_consumption(
+    async def get_gas_consumption_async(
         self,
         meter: Gas,
         period_from: datetime | None,
         period_to: datetime | None,
         page_size: int = DEFAULT_PAGE_SIZE,
+        group_by: str | None = None,
     ) -> tuple[str | None, list[Consumption]]:
         api_endpoint = (
             self._transport.base_url
             + f"gas-meter-points/{meter.mprn}/meters/{meter.serial_number}/consumption/"
         )
-        params = self._build_params(period_from, period_to, page_size)
-        return self.get_consumption_directly_from_endpoint(
+        params = self._build_params(period_from, period_to, page_size, group_by)
+        return await self.get_consumption_directly_from_endpoint_async(
             Energy.gas, api_endpoint, params
         )
 
@@ -76,21 +214,24 @@ class ConsumptionClient:
         period_from: datetime | None,
         period_to: datetime | None,
         page_size: int,
+        group_by: str | None = None,
     ) -> dict[str, Any]:
         params: dict[str, Any] = {"page_size": page_size, "order_by": "period"}
         if period_from:
             params["period_from"] = to_utc_z(period_from)
         if period_to:
             params["period_to"] = to_utc_z(period_to)
+        if group_by:
+            params["group_by"] = group_by
         return params
 
-    def get_consumption_directly_from_endpoint(
+    async def get_consumption_directly_from_endpoint_async(
         self,
         energy: Energy,
         api_endpoint: str,
         params: dict[str, Any] | None = None,
     ) -> tuple[str | None, list[Consumption]]:
-        parsed = self._transport.get(
+        parsed = await self._transport.get_async(
             api_endpoint,
             ConsumptionResponse,
             params=params,
@@ -1,4 +1,10 @@
-from datetime import date
+import logging.config
+import re
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, date, datetime, timedelta
+from logging import Logger, getLogger
 from typing import Any, TypeVar
 
 import requests
@@ -6,16 +12,44 @@ from common.config import OctopusAPISettings
 from common.decorator import retry
 from common.exceptions import APIError
 from common.http import raise_for_http_error
+from common.logging import APP_LOGGER_NAME, config
+from common.rate_limit import HostRateLimiter, shared_rate_limiter
 from data.octopus.model import BillingPeriod
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, create_model
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
 
 REQUEST_TIMEOUT_SECONDS = 30
+# A token this close to its exp is renewed rather than sent, so it can't
+# expire between being handed out and reaching Kraken.
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=2)
+# Kraken's GraphQL error codes for a request whose JWT is missing, was
+# rejected, or has expired.
+KRAKEN_AUTH_ERROR_CODES = frozenset({"KT-CT-1111", "KT-CT-1112", "KT-CT-1124"})
 
 T = TypeVar("T", bound=BaseModel)
+R = TypeVar("R")
+
+
+class KrakenAuthError(APIError):
+    pass
+
+
+def _is_auth_error(errors: list[dict[str, Any]]) -> bool:
+    return any(
+        error.get("extensions", {}).get("errorCode") in KRAKEN_AUTH_ERROR_CODES
+        for error in errors
+    )
 
 
 class ObtainKrakenTokenData(BaseModel):
     token: str
+    # The JWT's claims, including exp (epoch seconds); without it the token
+    # isn't reused.
+    payload: dict[str, Any] = {}
+    refreshToken: str | None = None
+    refreshExpiresIn: int | None = None
 
 
 class ObtainKrakenTokenPayload(BaseModel):
@@ -36,39 +70,93 @@ class AccountPayload(BaseModel):
     billingOptions: BillingOptionsData
 
 
-class BillingOptionsPayload(BaseModel):
-    account: AccountPayload
-
-
-class BillingOptionsResponse(BaseModel):
-    data: BillingOptionsPayload
-
-
 OBTAIN_KRAKEN_JWT_MUTATION = """
 mutation obtainKrakenToken($input: ObtainJSONWebTokenInput!) {
   obtainKrakenToken(input: $input) {
     token
+    payload
+    refreshToken
+    refreshExpiresIn
   }
 }
 """
 
-BILLING_OPTIONS_QUERY = """
-query billingOptions($accountNumber: String!) {
-  account(accountNumber: $accountNumber) {
-    billingOptions {
-      currentBillingPeriodStartDate
-      currentBillingPeriodEndDate
-      isFixed
-    }
+BILLING_OPTIONS_SELECTION = """
+account(accountNumber: $accountNumber) {
+  billingOptions {
+    currentBillingPeriodStartDate
+    currentBillingPeriodEndDate
+    isFixed
   }
 }
 """
 
 
+@dataclass(frozen=True)
+class KrakenQuery:
+    # One top-level field of a GraphQL query, its variables written $name,
+    # so that several can be sent as one document (see
+    # KrakenTransport.query_batch).
+    selection: str
+    variable_types: dict[str, str]
+    variables: dict[str, Any]
+    response_model: type[BaseModel]
+
+
+def _batch_alias(index: int) -> str:
+    return f"q{index}"
+
+
+def _batch_document(queries: list[KrakenQuery]) -> tuple[str, dict[str, Any]]:
+    # Each query's field is aliased q0, q1, ... and its variables prefixed
+    # to match, so fields and variables from different queries can't clash.
+    definitions: list[str] = []
+    fields: list[str] = []
+    variables: dict[str, Any] = {}
+    for index, query in enumerate(queries):
+        alias = _batch_alias(index)
+        for name, graphql_type in query.variable_types.items():
+            definitions.append(f"${alias}_{name}: {graphql_type}")
+            variables[f"{alias}_{name}"] = query.variables[name]
+        selection = re.sub(r"\$(\w+)", rf"${alias}_\1", query.selection.strip())
+        fields.append(f"{alias}: {selection}")
+    signature = f"({', '.join(definitions)})" if definitions else ""
+    return (f"query batch{signature} {{\n" + "\n".join(fields) + "\n}", variables)
+
+
 class KrakenTransport:
     base_url: str = "https://api.octopus.energy/v1/graphql/"
 
-    @retry()
+    def __init__(self, limiter: HostRateLimiter | None = None) -> None:
+        # Shares api.octopus.energy's bucket with OctopusTransport.
+        self._limiter = limiter or shared_rate_limiter()
+        # One pooled Session, so each POST reuses a warm TCP/TLS connection.
+        # The JWT travels as a per-request header; session state is never
+        # mutated, as in OctopusTransport.
+        self._session = requests.Session()
+
+    def query_batch(
+        self,
+        queries: list[KrakenQuery],
+        description: str = "request",
+        token: str | None = None,
+    ) -> list[Any]:
+        # Several queries, one POST: results come back in the same order.
+        document, variables = _batch_document(queries)
+        fields: dict[str, Any] = {
+            _batch_alias(index): (query.response_model, ...)
+            for index, query in enumerate(queries)
+        }
+        data_model = create_model("KrakenBatchData", **fields)
+        response_model = create_model("KrakenBatchResponse", data=(data_model, ...))
+        parsed = self.post(document, variables, response_model, description, token)
+        return [
+            getattr(parsed.data, _batch_alias(index)) for index in range(len(queries))
+        ]
+
+    # Resending a rejected token can't succeed; KrakenTokenCache.with_token
+    # replaces it instead.
+    @retry(give_up_on=(KrakenAuthError,))
     def post(
         self,
         query: str,
@@ -80,15 +168,21 @@ class KrakenTransport:
         response: requests.Response | None = None
         try:
             headers = {"Authorization": f"JWT {token}"} if token else {}
-            response = requests.post(
+            self._limiter.acquire(self.base_url)
+            response = self._session.post(
                 url=self.base_url,
                 json={"query": query, "variables": variables},
                 headers=headers,
                 timeout=REQUEST_TIMEOUT_SECONDS,
             )
+            self._limiter.record(self.base_url, response)
+            if response.status_code == 401:
+                raise KrakenAuthError(response.text)
             response.raise_for_status()
             body = response.json()
             if "errors" in body:
+                if _is_auth_error(body["errors"]):
+                    raise KrakenAuthError(body["errors"])
                 raise APIError(body["errors"])
             return response_model.model_validate(body)
         except APIError:
@@ -97,35 +191,120 @@ class KrakenTransport:
             raise_for_http_error(response, e, description)
 
 
+class KrakenTokenCache:
+    # One JWT, reused until shortly before its exp. It is then renewed with
+    # the refresh token while that is valid, or minted afresh from the API
+    # key (see ADR-0028). Shared by concurrent job threads, hence the lock.
+
+    def __init__(
+        self,
+        api_key: str,
+        transport: KrakenTransport,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self._api_key = api_key
+        self._transport = transport
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._token: str | None = None
+        self._expires_at = datetime.min.replace(tzinfo=UTC)
+        self._refresh_token: str | None = None
+        self._refresh_expires_at = datetime.min.replace(tzinfo=UTC)
+
+    def get(self) -> str:
+        with self._lock:
+            now = self._clock()
+            if self._token is not None and now < self._expires_at - TOKEN_EXPIRY_MARGIN:
+                return self._token
+            obtained = None
+            if (
+                self._refresh_token is not None
+                and now < self._refresh_expires_at - TOKEN_EXPIRY_MARGIN
+            ):
+                try:
+                    obtained = self._obtain(
+                        {"refreshToken": self._refresh_token}, "refresh Kraken token"
+                    )
+                except Exception:
+                    logger.warning(
+                        "Kraken refresh token rejected -- minting a new token "
+                        "from the API key.",
+                        exc_info=True,
+                    )
+            if obtained is None:
+                obtained = self._obtain({"APIKey": self._api_key}, "mint Kraken token")
+            self._store(obtained, now)
+            return obtained.token
+
+    def with_token(self, request: Callable[[str], R]) -> R:
+        # Kraken can reject a token before its exp (revoked, or the clock
+        # skewed), so a request refused for auth drops the cached token and
+        # is retried once with a fresh one.
+        token = self.get()
+        try:
+            return request(token)
+        except KrakenAuthError:
+            logger.warning(
+                "Kraken rejected the cached token -- retrying once with a new one.",
+                exc_info=True,
+            )
+            self.invalidate(token)
+            return request(self.get())
+
+    def invalidate(self, token: str) -> None:
+        with self._lock:
+            # Only the token that was rejected: another thread may already
+            # have replaced it.
+            if self._token == token:
+                self._token = None
+                self._expires_at = datetime.min.replace(tzinfo=UTC)
+
+    def _obtain(
+        self, token_input: dict[str, str], description: str
+    ) -> ObtainKrakenTokenData:
+        response = self._transport.post(
+            OBTAIN_KRAKEN_JWT_MUTATION,
+            {"input": token_input},
+            ObtainKrakenTokenResponse,
+            description=description,
+        )
+        return response.data.obtainKrakenToken
+
+    def _store(self, obtained: ObtainKrakenTokenData, now: datetime) -> None:
+        self._token = obtained.token
+        exp = obtained.payload.get("exp")
+        self._expires_at = datetime.fromtimestamp(exp, UTC) if exp else now
+        if obtained.refreshToken and obtained.refreshExpiresIn:
+            self._refresh_token = obtained.refreshToken
+            self._refresh_expires_at = datetime.fromtimestamp(
+                obtained.refreshExpiresIn, UTC
+            )
+
+
 class BillingPeriodClient:
     def __init__(
         self, settings: OctopusAPISettings, transport: KrakenTransport
     ) -> None:
         self._account_number = settings.account_number
-        self._api_key = settings.api_key
         self._transport = transport
+        self._tokens = KrakenTokenCache(settings.api_key, transport)
 
     def get_current_billing_period(self) -> BillingPeriod:
-        token = self._mint_token()
-        billing_options = self._transport.post(
-            BILLING_OPTIONS_QUERY,
+        query = KrakenQuery(
+            BILLING_OPTIONS_SELECTION,
+            {"accountNumber": "String!"},
             {"accountNumber": self._account_number},
-            BillingOptionsResponse,
-            description="fetch billing period",
-            token=token,
-        ).data.account.billingOptions
+            AccountPayload,
+        )
+        (account,) = self._tokens.with_token(
+            lambda token: self._transport.query_batch(
+                [query], description="fetch billing period", token=token
+            )
+        )
+        billing_options = account.billingOptions
 
         return BillingPeriod.from_billing_options(
             billing_options.period_start,
             billing_options.period_end,
             billing_options.is_fixed,
         )
-
-    def _mint_token(self) -> str:
-        response = self._transport.post(
-            OBTAIN_KRAKEN_JWT_MUTATION,
-            {"input": {"APIKey": self._api_key}},
-            ObtainKrakenTokenResponse,
-            description="mint Kraken token",
-        )
-        return response.data.obtainKrakenToken.token
@@ -25,17 +25,39 @@ class ProductClient:
         self._transport = transport
 
     def get_products(self) -> list[Product]:
+        return self._transport.run(self.get_products_async())
+
+    def get_products_directly_from_endpoint(
+        self, api_endpoint: str
+    ) -> tuple[str | None, list[Product]]:
+        return self._transport.run(
+            self.get_products_directly_from_endpoint_async(api_endpoint)
+        )
+
+    def get_product_region_availability(self, product_code: str, region: str) -> bool:
+        return self._transport.run(
+            self.get_product_region_availability_async(product_code, region)
+        )
+
+    def get_electricity_tariff_code(self, product_code: str, region: str) -> str | None:
+        return self._transport.run(
+            self.get_electricity_tariff_code_async(product_code, region)
+        )
+
+    async def get_products_async(self) -> list[Product]:
         products: list[Product] = []
         api_endpoint: str | None = self._transport.base_url + "products/"
         while api_endpoint:
-            api_endpoint, page = self.get_products_directly_from_endpoint(api_endpoint)
+            api_endpoint, page = await self.get_products_directly_from_endpoint_async(
+                api_endpoint
+            )
             products.extend(page)
         return products
 
-    def get_products_directly_from_endpoint(
+    async def get_products_directly_from_endpoint_async(
         self, api_endpoint: str
     ) -> tuple[str | None, list[Product]]:
-        parsed = self._transport.get(
+        parsed = await self._transport.get_async(
             api_endpoint, ProductListResponse, description="fetch product catalogue"
         )
         products = [
@@ -48,9 +70,11 @@ class ProductClient:
         ]
         return (parsed.next, products)
 
-    def get_product_region_availability(self, product_code: str, region: str) -> bool:
+    async def get_product_region_availability_async(
+        self, product_code: str, region: str
+    ) -> bool:
         api_endpoint = self._transport.base_url + f"products/{product_code}/"
-        parsed = self._transport.get(
+        parsed = await self._transport.get_async(
             api_endpoint,
             ProductDetailResponse,
             description=f"fetch product detail for {product_code}",
@@ -61,9 +85,11 @@ class ProductClient:
             or region in parsed.single_register_gas_tariffs
         )
 
-    def get_electricity_tariff_code(self, product_code: str, region: str) -> str | None:
+    async def get_electricity_tariff_code_async(
+        self, product_code: str, region: str
+    ) -> str | None:
         api_endpoint = self._transport.base_url + f"products/{product_code}/"
-        parsed = self._transport.get(
+        parsed = await self._transport.get_async(
             api_endpoint,
             ProductDetailResponse,
             description=f"fetch product detail for {product_code}",
@@ -1,3 +1,4 @@
+import asyncio
 import logging.config
 from datetime import datetime
 from decimal import Decimal
@@ -9,6 +10,7 @@ from data.model import Energy
 from data.octopus.model import Rate
 from data.octopus.timestamps import to_utc_z
 from data.octopus.transport import OctopusTransport
+from data.rate_timeline import RateTimeline
 from pydantic import BaseModel
 
 logging.config.dictConfig(config)
@@ -44,8 +46,10 @@ class RateClient:
         period_from: datetime | None = None,
         period_to: datetime | None = None,
     ) -> list[Rate]:
-        return self._get_rates(
-            Energy.electricity, product_code, tariff_code, period_from, period_to
+        return self._transport.run(
+            self.get_electricity_rates_async(
+                product_code, tariff_code, period_from, period_to
+            )
         )
 
     def get_gas_rates(
@@ -55,11 +59,33 @@ class RateClient:
         period_from: datetime | None = None,
         period_to: datetime | None = None,
     ) -> list[Rate]:
-        return self._get_rates(
+        return self._transport.run(
+            self.get_gas_rates_async(product_code, tariff_code, period_from, period_to)
+        )
+
+    async def get_electricity_rates_async(
+        self,
+        product_code: str,
+        tariff_code: str,
+        period_from: datetime | None = None,
+        period_to: datetime | None = None,
+    ) -> list[Rate]:
+        return await self._get_rates(
+            Energy.electricity, product_code, tariff_code, period_from, period_to
+        )
+
+    async def get_gas_rates_async(
+        self,
+        product_code: str,
+        tariff_code: str,
+        period_from: datetime | None = None,
+        period_to: datetime | None = None,
+    ) -> list[Rate]:
+        return await self._get_rates(
             Energy.gas, product_code, tariff_code, period_from, period_to
         )
 
-    def _get_rates(
+    async def _get_rates(
         self,
         energy: Energy,
         product_code: str,
@@ -68,19 +94,24 @@ class RateClient:
         period_to: datetime | None,
     ) -> list[Rate]:
         tariff_path = TARIFF_PATH[energy]
-        unit_rates = self._get_all_readings(
-            self._endpoint(
-                tariff_path, product_code, tariff_code, "standard-unit-rates"
+        # The two series are independent, so they're fetched side by side.
+        unit_rates, standing_charges = await asyncio.gather(
+            self._get_all_readings(
+                self._endpoint(
+                    tariff_path, product_code, tariff_code, "standard-unit-rates"
+                ),
+                period_from,
+                period_to,
+                f"fetch {energy.name} unit rates",
+            ),
+            self._get_all_readings(
+                self._endpoint(
+                    tariff_path, product_code, tariff_code, "standing-charges"
+                ),
+                period_from,
+                period_to,
+                f"fetch {energy.name} standing charges",
             ),
-            period_from,
-            period_to,
-            f"fetch {energy.name} unit rates",
-        )
-        standing_charges = self._get_all_readings(
-            self._endpoint(tariff_path, product_code, tariff_code, "standing-charges"),
-            period_from,
-            period_to,
-            f"fetch {energy.name} standing charges",
         )
         return self._pair(unit_rates, standing_charges)
 
@@ -92,7 +123,7 @@ class RateClient:
             + f"products/{product_code}/{tariff_path}/{tariff_code}/{resource}/"
         )
 
-    def _get_all_readings(
+    async def _get_all_readings(
         self,
         api_endpoint: str,
         period_from: datetime | None,
@@ -103,7 +134,7 @@ class RateClient:
         params: dict[str, Any] | None = self._build_params(period_from, period_to)
         endpoint: str | None = api_endpoint
         while endpoint:
-            endpoint, page = self._get_readings_directly_from_endpoint(
+            endpoint, page = await self._get_readings_directly_from_endpoint(
                 endpoint, params, description
             )
             readings.extend(page)
@@ -122,13 +153,13 @@ class RateClient:
             params["period_to"] = to_utc_z(period_to)
         return params
 
-    def _get_readings_directly_from_endpoint(
+    async def _get_readings_directly_from_endpoint(
         self,
         api_endpoint: str,
         params: dict[str, Any] | None,
         description: str,
     ) -> tuple[str | None, list[RateReading]]:
-        parsed = self._transport.get(
+        parsed = await self._transport.get_async(
             api_endpoint, RateResponse, params=params, description=description
         )
         return (parsed.next, parsed.results)
@@ -137,17 +168,26 @@ class RateClient:
     def _pair(
         unit_rates: list[RateReading], standing_charges: list[RateReading]
     ) -> list[Rate]:
-        rates: list[Rate] = []
-        for unit_rate in unit_rates:
-            standing_charge = next(
-                (
-                    sc
-                    for sc in standing_charges
-                    if sc.valid_from <= unit_rate.valid_from
-                    and (sc.valid_to is None or unit_rate.valid_from < sc.valid_to)
+        # A single merge sweep of the unit rates, in valid_from order,
+        # against the standing-charge timeline -- not a scan of every
+        # standing charge per unit rate, which was quadratic across a year
+        # of Agile half-hours. Output keeps the unit rates' response order.
+        standing_charge_timeline = RateTimeline(standing_charges)
+        in_order = sorted(
+            range(len(unit_rates)), key=lambda i: unit_rates[i].valid_from
+        )
+        covering = dict(
+            zip(
+                in_order,
+                standing_charge_timeline.sweep(
+                    unit_rates[i].valid_from for i in in_order
                 ),
-                None,
+                strict=True,
             )
+        )
+        rates: list[Rate] = []
+        for i, unit_rate in enumerate(unit_rates):
+            standing_charge = covering[i]
             if standing_charge is None:
                 logger.warning(
                     "No standing charge covers unit rate window starting "
@@ -0,0 +1,175 @@
+import asyncio
+import hashlib
+import json
+import logging.config
+import os
+import re
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from logging import Logger, getLogger
+from pathlib import Path
+from typing import Any, TypeVar
+from urllib.parse import urlencode, urlparse
+
+from common.logging import APP_LOGGER_NAME, config
+from pydantic import BaseModel
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class ResponseCache:
+    # Validated responses for slow-changing endpoints, each kept for the TTL
+    # of the first rule whose pattern matches its URL path (see ADR-0027).
+    # Every method but the disk reads and writes runs on the transport's event
+    # loop thread, so the maps below need no lock: concurrent callers for one
+    # key are coroutines awaiting the same future, and only the first actually
+    # loads or fetches. The disk I/O runs on the loop's executor, so a slow
+    # disk never stalls the requests in flight.
+
+    def __init__(
+        self,
+        ttls: list[tuple[re.Pattern[str], timedelta]],
+        directory: Path | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._ttls = ttls
+        self._directory = directory
+        self._clock = clock
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._in_flight: dict[str, asyncio.Future[Any]] = {}
+        # A hit is any call served without its own request: from memory,
+        # from disk, or by sharing another caller's in-flight fetch.
+        self.hits = 0
+        self.misses = 0
+
+    def ttl_for(self, url: str) -> timedelta | None:
+        path = urlparse(url).path
+        return next((ttl for pattern, ttl in self._ttls if pattern.search(path)), None)
+
+    async def get(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        response_model: type[T],
+        ttl: timedelta,
+        fetch: Callable[[], Awaitable[T]],
+    ) -> T:
+        key = self._key(url, params, response_model)
+        cached = self._fresh(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.hits += 1
+            return await in_flight
+
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        fetched: tuple[float, Any] | None = None
+        try:
+            parsed = await self._load(key, response_model)
+            if parsed is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                parsed = await fetch()
+                fetched = (self._clock() + ttl.total_seconds(), parsed)
+                self._entries[key] = fetched
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieved here so a failure nobody else was waiting on isn't
+            # reported as never retrieved.
+            future.exception()
+            raise
+        else:
+            future.set_result(parsed)
+        finally:
+            del self._in_flight[key]
+            # Only a cancelled load or fetch gets here unresolved:
+            # CancelledError isn't an Exception. The callers sharing it are
+            # cancelled with it, rather than left awaiting a future nothing
+            # will ever resolve.
+            if not future.done():
+                future.cancel()
+        # After the callers sharing the fetch have their answer, which doesn't
+        # depend on the file.
+        if fetched is not None and self._directory is not None:
+            await asyncio.to_thread(self._write, self._directory, key, *fetched)
+        return parsed
+
+    @staticmethod
+    def _key(
+        url: str, params: dict[str, Any] | None, response_model: type[BaseModel]
+    ) -> str:
+        query = urlencode(sorted((params or {}).items()))
+        return f"{response_model.__name__} {url}?{query}"
+
+    def _fresh(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, parsed = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        return parsed
+
+    async def _load(self, key: str, response_model: type[T]) -> T | None:
+        if self._directory is None:
+            return None
+        entry = await asyncio.to_thread(
+            self._read, self._directory, key, response_model
+        )
+        if entry is None:
+            return None
+        self._entries[key] = entry
+        return entry[1]
+
+    @staticmethod
+    def _path(directory: Path, key: str) -> Path:
+        return directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def _read(
+        self, directory: Path, key: str, response_model: type[BaseModel]
+    ) -> tuple[float, Any] | None:
+        path = self._path(directory, key)
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+            expires_at = stored["expires_at"]
+            if expires_at <= self._clock():
+                # Nothing else prunes the directory, so an expired file is
+                # deleted as soon as a read finds it.
+                path.unlink(missing_ok=True)
+                return None
+            return (expires_at, response_model.model_validate(stored["body"]))
+        except FileNotFoundError:
+            return None
+        except (OSError, KeyError, ValueError) as e:
+            # A corrupt or outdated file is just a miss; the fetch that
+            # follows overwrites it.
+            logger.warning(f"Ignoring unreadable response cache file {path}: {e}.")
+            return None
+
+    def _write(
+        self, directory: Path, key: str, expires_at: float, parsed: BaseModel
+    ) -> None:
+        path = self._path(directory, key)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            # Written aside and renamed over, so a reader never sees half a
+            # file.
+            staging = path.with_suffix(".tmp")
+            with open(staging, "w", encoding="utf-8") as file:
+                json.dump(
+                    {"expires_at": expires_at, "body": parsed.model_dump(mode="json")},
+                    file,
+                )
+            os.replace(staging, path)
+        except OSError as e:
+            logger.warning(f"Failed to write response cache file {path}: {e}.")
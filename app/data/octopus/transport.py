@@ -1,37 +1,108 @@
+import re
+from collections.abc import Coroutine
+from datetime import timedelta
+from pathlib import Path
 from typing import Any, TypeVar
 
 import requests
+from common.aio import AsyncRunner, shared_runner
 from common.config import OctopusAPISettings
-from common.decorator import retry
+from common.decorator import async_retry
 from common.http import raise_for_http_error
+from common.rate_limit import HostRateLimiter, shared_rate_limiter
+from data.octopus.response_cache import ResponseCache
 from pydantic import BaseModel
 
 REQUEST_TIMEOUT_SECONDS = 30
+# Endpoints whose responses are reused rather than refetched, by URL path
+# (see ADR-0027). The catalogue and product details change a few times a
+# month but were requested on every hourly pricing refresh.
+CACHE_TTLS = [
+    (re.compile(r"/products/$"), timedelta(hours=6)),
+    (re.compile(r"/products/[^/]+/$"), timedelta(hours=24)),
+]
 
 T = TypeVar("T", bound=BaseModel)
+R = TypeVar("R")
 
 
 class OctopusTransport:
     base_url: str = "https://api.octopus.energy/v1/"
 
-    def __init__(self, settings: OctopusAPISettings) -> None:
+    def __init__(
+        self,
+        settings: OctopusAPISettings,
+        runner: AsyncRunner | None = None,
+        limiter: HostRateLimiter | None = None,
+    ) -> None:
         # Shared across concurrent background job threads (see
-        # _run_with_backoff_in_background in main.py) -- one Session for
-        # connection reuse, relying on urllib3's own internally-locked
-        # connection pool for concurrent GETs. requests.Session doesn't
-        # document a blanket thread-safety guarantee, so session state
-        # (auth, headers, cookies) must never be mutated after construction;
-        # auth is set once here, immediately below, and nowhere else.
+        # _run_with_backoff_in_background in main.py) and the runner's
+        # executor threads -- one Session for connection reuse, relying on
+        # urllib3's own internally-locked connection pool for concurrent
+        # GETs. requests.Session doesn't document a blanket thread-safety
+        # guarantee, so session state (auth, headers, cookies) must never be
+        # mutated after construction; auth is set once here, immediately
+        # below, and nowhere else.
         self._session = requests.Session()
         self._session.auth = (settings.api_key, "")
+        self._runner = runner or shared_runner()
+        self._limiter = limiter or shared_rate_limiter()
+        self.response_cache = ResponseCache(
+            CACHE_TTLS,
+            Path(settings.cache_directory) if settings.cache_directory else None,
+        )
+
+    def run(self, coroutine: Coroutine[Any, Any, R]) -> R:
+        # The synchronous API: each client's blocking method is this over its
+        # *_async counterpart (see ADR-0026).
+        return self._runner.run(coroutine)
 
-    @retry()
     def get(
         self,
         url: str,
         response_model: type[T],
         params: dict[str, Any] | None = None,
         description: str = "request",
+    ) -> T:
+        return self.run(self.get_async(url, response_model, params, description))
+
+    async def get_async(
+        self,
+        url: str,
+        response_model: type[T],
+        params: dict[str, Any] | None = None,
+        description: str = "request",
+    ) -> T:
+        ttl = self.response_cache.ttl_for(url)
+        if ttl is None:
+            return await self._fetch(url, response_model, params, description)
+        return await self.response_cache.get(
+            url,
+            params,
+            response_model,
+            ttl,
+            lambda: self._fetch(url, response_model, params, description),
+        )
+
+    @async_retry()
+    async def _fetch(
+        self,
+        url: str,
+        response_model: type[T],
+        params: dict[str, Any] | None,
+        description: str,
+    ) -> T:
+        await self._limiter.acquire_async(url)
+        return await self._runner.call(
+            self._get, url, response_model, params, description
+        )
+
+    def _get(
+        self,
+        url: str,
+        response_model: type[T],
+        params: dict[str, Any] | None,
+        description: str,
     ) -> T:
         response: requests.Response | None = None
         try:
@@ -40,6 +111,7 @@ class OctopusTransport:
                 params=params,
                 timeout=REQUEST_TIMEOUT_SECONDS,
             )
+            self._limiter.record(url, response)
             response.raise_for_status()
             return response_model.model_validate(response.json())
         except Exception as e:
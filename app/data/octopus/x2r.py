@@ -1,15 +1,12 @@
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 
-import requests
-from common.decorator import retry
 from common.exceptions import APIError
-from common.http import raise_for_http_error
+from common.http import PooledHTTPClient
 from data.local_day import LONDON
 from data.octopus.model import AgileForecastReading
 from pydantic import BaseModel
 
-REQUEST_TIMEOUT_SECONDS = 30
 HALF_HOUR = timedelta(minutes=30)
 
 
@@ -50,16 +47,13 @@ class X2rResponse(BaseModel):
 class X2rClient:
     base_url: str = "https://api.x2r.uk/agile/"
 
-    @retry()
+    def __init__(self, http: PooledHTTPClient | None = None) -> None:
+        self._http = http or PooledHTTPClient()
+
     def get_forecast(self, region: str) -> list[AgileForecastReading]:
-        url = self.base_url + region
-        response: requests.Response | None = None
-        try:
-            response = requests.get(url=url, timeout=REQUEST_TIMEOUT_SECONDS)
-            response.raise_for_status()
-            parsed = X2rResponse.model_validate(response.json())
-        except Exception as e:
-            raise_for_http_error(response, e, "fetch Agile forecast")
+        parsed = self._http.get(
+            self.base_url + region, X2rResponse, description="fetch Agile forecast"
+        )
 
         if not parsed.prices.forecast:
             raise APIError(f"No Agile forecast data returned for region {region}.")
@@ -1,9 +1,12 @@
+import asyncio
 import logging.config
-from collections.abc import Iterator
-from datetime import datetime
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import datetime, timedelta
 from logging import Logger, getLogger
-from typing import Protocol
+from typing import Protocol, TypeVar
 
+from common.aio import AsyncRunner, shared_runner
 from common.logging import APP_LOGGER_NAME, config
 from data.model import Energy
 from data.octopus.model import Agreement, Direction, Meter, MeterSource, Product, Rate
@@ -11,6 +14,19 @@ from data.octopus.model import Agreement, Direction, Meter, MeterSource, Product
 logging.config.dictConfig(config)
 logger: Logger = getLogger(APP_LOGGER_NAME)
 
+# How far behind each rate watermark a refresh starts fetching, so a rate
+# republished or corrected soon after it was first synced is still picked up
+# (see ADR-0031).
+RATE_WATERMARK_OVERLAP = timedelta(days=1)
+# Products whose detail and rate requests are in flight at once during the
+# catalogue and comparison passes (see ADR-0032). Each comparison product
+# fetches two rate series side by side, so this keeps the pass within the
+# async runner's MAX_CONCURRENT_REQUESTS.
+PRODUCT_SYNC_WORKERS = 4
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 class PricingSource(MeterSource, Protocol):
     region_code: str
@@ -19,7 +35,7 @@ class PricingSource(MeterSource, Protocol):
 
     def fetch_products(self) -> list[Product]: ...
 
-    def is_product_available_in_region(
+    async def is_product_available_in_region_async(
         self, product_code: str, region: str
     ) -> bool: ...
 
@@ -33,6 +49,14 @@ class PricingSource(MeterSource, Protocol):
         period_to: datetime | None,
     ) -> list[Rate]: ...
 
+    async def fetch_electricity_rates_async(
+        self,
+        product_code: str,
+        tariff_code: str,
+        period_from: datetime | None,
+        period_to: datetime | None,
+    ) -> list[Rate]: ...
+
     def fetch_gas_rates(
         self,
         product_code: str,
@@ -42,10 +66,14 @@ class PricingSource(MeterSource, Protocol):
     ) -> list[Rate]: ...
 
     def persist_rate(
-        self, product_code: str, region: str, rates: list[Rate]
+        self, product_code: str, tariff_code: str, region: str, rates: list[Rate]
     ) -> None: ...
 
-    def fetch_electricity_tariff_code(
+    def read_rate_watermark(
+        self, product_code: str, tariff_code: str, region: str
+    ) -> datetime | None: ...
+
+    async def fetch_electricity_tariff_code_async(
         self, product_code: str, region: str
     ) -> str | None: ...
 
@@ -53,28 +81,80 @@ class PricingSource(MeterSource, Protocol):
 class PricingRetriever:
     _client: PricingSource
 
-    def __init__(self, client: PricingSource) -> None:
+    def __init__(
+        self,
+        client: PricingSource,
+        workers: int = PRODUCT_SYNC_WORKERS,
+        runner: AsyncRunner | None = None,
+    ) -> None:
         self._client = client
+        self._workers = workers
+        # The loop the source's *_async calls run on: the transport's own,
+        # since its request semaphore is bound to it.
+        self._runner = runner or shared_runner()
 
-    def refresh(self) -> None:
+    def refresh(self, full_resync: bool = False) -> None:
+        # full_resync ignores every rate watermark and re-fetches each tariff
+        # from the start of its agreement (or its whole history, for a
+        # comparison product) -- for picking up an upstream correction older
+        # than the overlap.
+        if full_resync:
+            logger.info("Pricing refresh: full rate resync requested.")
+        started = time.perf_counter()
         self._client.refresh_meters()
         self._sync_agreements()
         products = self._client.fetch_products()
         self._sync_product_catalogue(products)
-        self._sync_own_product_rates()
-        self._sync_comparison_rates(products)
+        self._sync_own_product_rates(full_resync)
+        self._sync_comparison_rates(products, full_resync)
+        logger.info(
+            f"Pricing refresh: {len(products)} products synced "
+            f"({time.perf_counter() - started:.3f}s)."
+        )
+
+    def _in_parallel(
+        self, fn: Callable[[T], Awaitable[R]], items: list[T]
+    ) -> list[R | BaseException]:
+        # Only the network calls fan out: every call has finished by the time
+        # this returns, and the caller persists each result, or handles its
+        # failure, one at a time in the original order.
+        return self._runner.run(self._gather(fn, items))
+
+    async def _gather(
+        self, fn: Callable[[T], Awaitable[R]], items: list[T]
+    ) -> list[R | BaseException]:
+        slots = asyncio.Semaphore(self._workers)
+
+        async def call(item: T) -> R:
+            async with slots:
+                return await fn(item)
+
+        return await asyncio.gather(
+            *(call(item) for item in items), return_exceptions=True
+        )
+
+    @staticmethod
+    def _result(outcome: R | BaseException) -> R:
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
 
     def _sync_agreements(self) -> None:
         for meter in self._client.meters:
             self._client.persist_agreement(meter, meter.agreements)
 
     def _sync_product_catalogue(self, products: list[Product]) -> None:
-        for product in products:
-            if product.direction == Direction.EXPORT:
-                continue
-            if not self._client.is_product_available_in_region(
+        import_products = [
+            product for product in products if product.direction != Direction.EXPORT
+        ]
+        availability = self._in_parallel(
+            lambda product: self._client.is_product_available_in_region_async(
                 product.product_code, self._client.region_code
-            ):
+            ),
+            import_products,
+        )
+        for product, available in zip(import_products, availability):
+            if not self._result(available):
                 continue
             self._client.persist_product(product)
 
@@ -83,7 +163,19 @@ class PricingRetriever:
             for agreement in meter.agreements:
                 yield meter, agreement
 
-    def _sync_own_product_rates(self) -> None:
+    def _resume_from(
+        self, product_code: str, tariff_code: str, full_resync: bool
+    ) -> datetime | None:
+        # Where an incremental fetch picks up, or None to fetch from the
+        # start: on a full resync, or a tariff never synced before.
+        if full_resync:
+            return None
+        watermark = self._client.read_rate_watermark(
+            product_code, tariff_code, self._client.region_code
+        )
+        return None if watermark is None else watermark - RATE_WATERMARK_OVERLAP
+
+    def _sync_own_product_rates(self, full_resync: bool) -> None:
         for meter, agreement in self._meter_agreement_pairs():
             if agreement.has_zero_or_negative_width:
                 logger.debug(
@@ -99,14 +191,29 @@ class PricingRetriever:
                 else self._client.fetch_gas_rates
             )
             try:
+                resume_from = self._resume_from(
+                    agreement.product_code, agreement.tariff_code, full_resync
+                )
+                period_from = (
+                    agreement.valid_from
+                    if resume_from is None
+                    else max(agreement.valid_from, resume_from)
+                )
+                if agreement.valid_to is not None and period_from >= agreement.valid_to:
+                    # An earlier agreement on a tariff since renewed: its
+                    # rates are all behind the watermark already.
+                    continue
                 rates = fetch_rates(
                     agreement.product_code,
                     agreement.tariff_code,
-                    agreement.valid_from,
+                    period_from,
                     agreement.valid_to,
                 )
                 self._client.persist_rate(
-                    agreement.product_code, self._client.region_code, rates
+                    agreement.product_code,
+                    agreement.tariff_code,
+                    self._client.region_code,
+                    rates,
                 )
             except Exception:
                 logger.warning(
@@ -115,23 +222,33 @@ class PricingRetriever:
                     exc_info=True,
                 )
 
-    def _sync_comparison_rates(self, products: list[Product]) -> None:
+    def _sync_comparison_rates(
+        self, products: list[Product], full_resync: bool
+    ) -> None:
         own_product_codes = {
             agreement.product_code for _, agreement in self._meter_agreement_pairs()
         }
-        for product in products:
-            if product.direction == Direction.EXPORT:
-                continue
-            if product.product_code in own_product_codes:
-                # Already synced with the agreement's actual tariff_code by
-                # _sync_own_product_rates — re-fetching here would pick an
-                # arbitrary billing method and risk overwriting the accurate
-                # rate, since product_rate rows are keyed by product_code/
-                # region/valid_from, not tariff_code.
-                continue
-            tariff_code = self._client.fetch_electricity_tariff_code(
+        # An own product is already synced with the agreement's actual
+        # tariff_code by _sync_own_product_rates — re-fetching here would pick
+        # an arbitrary billing method and risk overwriting the accurate rate,
+        # since product_rate rows are keyed by product_code/region/valid_from,
+        # not tariff_code.
+        comparison_products = [
+            product
+            for product in products
+            if product.direction != Direction.EXPORT
+            and product.product_code not in own_product_codes
+        ]
+        tariff_codes = self._in_parallel(
+            lambda product: self._client.fetch_electricity_tariff_code_async(
                 product.product_code, self._client.region_code
-            )
+            ),
+            comparison_products,
+        )
+
+        fetches: list[tuple[Product, str, datetime | None]] = []
+        for product, lookup in zip(comparison_products, tariff_codes):
+            tariff_code = self._result(lookup)
             if tariff_code is None:
                 logger.info(
                     f"No electricity rate published for {product.product_code} "
@@ -139,15 +256,37 @@ class PricingRetriever:
                 )
                 continue
             try:
-                rates = self._client.fetch_electricity_rates(
-                    product.product_code, tariff_code, None, None
+                period_from = self._resume_from(
+                    product.product_code, tariff_code, full_resync
                 )
+            except Exception as e:
+                self._warn_comparison_sync_failed(product, tariff_code, e)
+                continue
+            fetches.append((product, tariff_code, period_from))
+
+        rate_fetches = self._in_parallel(
+            lambda fetch: self._client.fetch_electricity_rates_async(
+                fetch[0].product_code, fetch[1], fetch[2], None
+            ),
+            fetches,
+        )
+        for (product, tariff_code, _), rates in zip(fetches, rate_fetches):
+            try:
                 self._client.persist_rate(
-                    product.product_code, self._client.region_code, rates
-                )
-            except Exception:
-                logger.warning(
-                    f"Failed to sync comparison rates for "
-                    f"{product.product_code}/{tariff_code} — skipping.",
-                    exc_info=True,
+                    product.product_code,
+                    tariff_code,
+                    self._client.region_code,
+                    self._result(rates),
                 )
+            except Exception as e:
+                self._warn_comparison_sync_failed(product, tariff_code, e)
+
+    @staticmethod
+    def _warn_comparison_sync_failed(
+        product: Product, tariff_code: str, error: Exception
+    ) -> None:
+        logger.warning(
+            f"Failed to sync comparison rates for "
+            f"{product.product_code}/{tariff_code} — skipping.",
+            exc_info=error,
+        )
@@ -3,6 +3,7 @@ from datetime import UTC, datetime, timedelta
 from logging import Logger, getLogger
 
 from common.logging import APP_LOGGER_NAME, config
+from data.archive import ConsumptionArchive
 from data.mysql.client import MariaDBClient
 
 logging.config.dictConfig(config)
@@ -12,16 +13,25 @@ logger: Logger = getLogger(APP_LOGGER_NAME)
 class DataPruner:
     _mariadb: MariaDBClient
     _retention_days: int
+    _archive: ConsumptionArchive | None
 
-    def __init__(self, mariadb: MariaDBClient, retention_days: int) -> None:
+    def __init__(
+        self,
+        mariadb: MariaDBClient,
+        retention_days: int,
+        archive: ConsumptionArchive | None = None,
+    ) -> None:
         self._mariadb = mariadb
         self._retention_days = retention_days
+        self._archive = archive
 
     def run(self, as_of: datetime | None = None) -> None:
         if as_of is None:
             as_of = datetime.now(UTC)
         cutoff = as_of - timedelta(days=self._retention_days)
-        deleted_consumption = self._mariadb.prune_consumption_older_than(cutoff)
+        deleted_consumption = self._mariadb.prune_consumption_older_than(
+            cutoff, None if self._archive is None else self._archive.append
+        )
         deleted_rates = self._mariadb.prune_product_rates_older_than(cutoff)
         logger.info(
             f"Pruned {deleted_consumption} consumption row(s) and "
@@ -0,0 +1,72 @@
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import datetime
+from typing import Protocol
+
+
+class Windowed(Protocol):
+    @property
+    def valid_from(self) -> datetime: ...
+
+    @property
+    def valid_to(self) -> datetime | None: ...
+
+
+def _in_force_before(end: datetime | None, instant: datetime) -> bool:
+    return end is None or instant < end
+
+
+class RateTimeline[W: Windowed]:
+    # One product's rate windows, for one region, sorted by valid_from:
+    # "which window is in force at t" is a bisect rather than a scan.
+    # Windows are half-open, [valid_from, valid_to), valid_to=None meaning
+    # open-ended. Where bad upstream data overlaps two windows, the
+    # most-recently-started wins -- the same tie-break as the
+    # "ORDER BY slot DESC LIMIT 1" lookups in grafana/mariadb/queries.md.
+
+    def __init__(self, windows: Iterable[W]) -> None:
+        # First occurrence of a valid_from wins: for API pages that is
+        # response order, which is what pairing always took.
+        unique: dict[datetime, W] = {}
+        for window in windows:
+            unique.setdefault(window.valid_from, window)
+        self._windows = sorted(unique.values(), key=lambda w: w.valid_from)
+        self._starts = [window.valid_from for window in self._windows]
+        # _reach[i] is the latest valid_to among _windows[:i + 1] (None for
+        # open-ended), so a lookup that lands in a gap stops walking back at
+        # once instead of scanning every earlier window.
+        self._reach: list[datetime | None] = []
+        for window in self._windows:
+            if not self._reach:
+                reach = window.valid_to
+            elif self._reach[-1] is None or window.valid_to is None:
+                reach = None
+            else:
+                reach = max(self._reach[-1], window.valid_to)
+            self._reach.append(reach)
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def at(self, instant: datetime) -> W | None:
+        return self._in_force(bisect_right(self._starts, instant) - 1, instant)
+
+    def sweep(self, instants: Iterable[datetime]) -> Iterator[W | None]:
+        # For ascending instants: one forward pass over the windows
+        # alongside them, O(n + m) rather than a bisect per instant.
+        latest_started = -1
+        for instant in instants:
+            while (
+                latest_started + 1 < len(self._starts)
+                and self._starts[latest_started + 1] <= instant
+            ):
+                latest_started += 1
+            yield self._in_force(latest_started, instant)
+
+    def _in_force(self, latest_started: int, instant: datetime) -> W | None:
+        i = latest_started
+        while i >= 0 and _in_force_before(self._reach[i], instant):
+            if _in_force_before(self._windows[i].valid_to, instant):
+                return self._windows[i]
+            i -= 1
+        return None
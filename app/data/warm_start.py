@@ -0,0 +1,205 @@
+import json
+import logging.config
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from logging import Logger, getLogger
+from typing import Any
+
+from common.exceptions import MariaDBError
+from common.logging import APP_LOGGER_NAME, config
+from data import local_day
+from data.model import Energy, as_energy_char, energy_from_char
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.mysql.upsert import bulk_upsert
+from data.octopus.model import (
+    Account,
+    Agreement,
+    BillingPeriod,
+    Electricity,
+    Gas,
+    Meter,
+)
+
+logging.config.dictConfig(config)
+logger: Logger = getLogger(APP_LOGGER_NAME)
+
+# How old a snapshot section may be and still be restored (see ADR-0034).
+# Comfortably covers a restart for a daily image update; a process that was
+# down for longer starts cold, as if there were no snapshot at all.
+WARM_START_MAX_AGE = timedelta(hours=24)
+ACCOUNT_SECTION = "account"
+BILLING_PERIOD_SECTION = "billing_period"
+# One row per energy, suffixed with its char, so each cursor is written on
+# its own as its meter's retrieval completes.
+CONSUMPTION_CURSOR_SECTION = "consumption_cursor"
+
+
+@dataclass
+class WarmStartSnapshot:
+    account: Account | None = None
+    meters: list[Meter] = field(default_factory=list)
+    region_code: str | None = None
+    billing_period: BillingPeriod | None = None
+    consumption_cursors: dict[Energy, datetime] = field(default_factory=dict)
+
+
+def _optional_datetime(value: str | None) -> datetime | None:
+    return None if value is None else datetime.fromisoformat(value)
+
+
+def _meter_state(meter: Meter) -> dict[str, Any]:
+    state: dict[str, Any] = {
+        "energy": as_energy_char(meter.energy),
+        "serial_number": meter.serial_number,
+        "agreements": [
+            {
+                "tariff_code": agreement.tariff_code,
+                "valid_from": agreement.valid_from.isoformat(),
+                "valid_to": (
+                    None
+                    if agreement.valid_to is None
+                    else agreement.valid_to.isoformat()
+                ),
+            }
+            for agreement in meter.agreements
+        ],
+    }
+    if isinstance(meter, Electricity):
+        state["mpan"] = meter.mpan
+    elif isinstance(meter, Gas):
+        state["mprn"] = meter.mprn
+    return state
+
+
+def _meter_from_state(state: dict[str, Any]) -> Meter:
+    agreements = [
+        Agreement(
+            agreement["tariff_code"],
+            datetime.fromisoformat(agreement["valid_from"]),
+            _optional_datetime(agreement["valid_to"]),
+        )
+        for agreement in state["agreements"]
+    ]
+    if energy_from_char(state["energy"]) == Energy.electricity:
+        return Electricity(state["mpan"], state["serial_number"], agreements)
+    return Gas(state["mprn"], state["serial_number"], agreements)
+
+
+class WarmStartStore:
+    _mariadb: MariaDBClient
+    _max_age: timedelta
+
+    restored: WarmStartSnapshot
+
+    def __init__(
+        self, mariadb: MariaDBClient, max_age: timedelta = WARM_START_MAX_AGE
+    ) -> None:
+        self._mariadb = mariadb
+        self._max_age = max_age
+        self.restored = WarmStartSnapshot()
+
+    def restore(self, as_of: datetime | None = None) -> WarmStartSnapshot:
+        if as_of is None:
+            as_of = datetime.now(UTC)
+        snapshot = WarmStartSnapshot()
+        with self._mariadb.session_read_scope() as session:
+            sections = [
+                (row.name, row.state, row.captured_at.replace(tzinfo=UTC))
+                for row in session.query(model.warm_start_state).all()
+            ]
+        for name, state, captured_at in sections:
+            if as_of - captured_at > self._max_age:
+                logger.info(
+                    f"Warm start: {name} captured {captured_at} is stale; "
+                    "re-fetching it."
+                )
+                continue
+            # A section written by an older release, or otherwise unreadable,
+            # is re-fetched rather than failing startup.
+            try:
+                self._restore_section(snapshot, name, json.loads(state), as_of)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Warm start: ignoring unreadable {name}: {e}")
+        logger.info(
+            f"Warm start: restored "
+            f"{'account and meters' if snapshot.account else 'no account'}, "
+            f"{'a' if snapshot.billing_period else 'no'} billing period and "
+            f"{len(snapshot.consumption_cursors)} consumption cursor(s)."
+        )
+        self.restored = snapshot
+        return snapshot
+
+    def save_account(
+        self, account: Account, meters: list[Meter], region_code: str
+    ) -> None:
+        self._save(
+            ACCOUNT_SECTION,
+            {
+                "number": account.number,
+                "address": account.address,
+                "postcode": account.postcode,
+                "region_code": region_code,
+                "meters": [_meter_state(meter) for meter in meters],
+            },
+        )
+
+    def save_billing_period(self, billing_period: BillingPeriod) -> None:
+        self._save(
+            BILLING_PERIOD_SECTION,
+            {
+                "start": billing_period.start.isoformat(),
+                "end": billing_period.end.isoformat(),
+            },
+        )
+
+    def save_consumption_cursor(self, energy: Energy, cursor: datetime) -> None:
+        self._save(
+            f"{CONSUMPTION_CURSOR_SECTION}_{as_energy_char(energy)}",
+            {"cursor": cursor.isoformat()},
+        )
+
+    def _save(self, name: str, state: dict[str, Any]) -> None:
+        # Written through rather than queued behind write_behind: the write
+        # scope lands the calling job's queued writes first, so a cursor is
+        # never committed ahead of the consumption it points past.
+        row = {
+            "name": name,
+            "state": json.dumps(state),
+            "captured_at": datetime.now(UTC),
+        }
+        try:
+            with self._mariadb.session_write_scope() as s:
+                bulk_upsert(s, model.warm_start_state.__table__, [row])
+        except Exception as e:
+            logger.error(f"Failed to write warm-start state {name}: {e}")
+            raise MariaDBError(e) from e
+
+    @staticmethod
+    def _restore_section(
+        snapshot: WarmStartSnapshot,
+        name: str,
+        state: dict[str, Any],
+        as_of: datetime,
+    ) -> None:
+        if name == ACCOUNT_SECTION:
+            snapshot.account = Account(
+                state["number"], state["address"], state["postcode"]
+            )
+            snapshot.meters = [_meter_from_state(meter) for meter in state["meters"]]
+            snapshot.region_code = state["region_code"]
+        elif name == BILLING_PERIOD_SECTION:
+            billing_period = BillingPeriod(
+                start=date.fromisoformat(state["start"]),
+                end=date.fromisoformat(state["end"]),
+            )
+            # A period that has since ended is re-fetched for the next one.
+            if local_day.to_local_date(as_of) <= billing_period.end:
+                snapshot.billing_period = billing_period
+        elif name.startswith(f"{CONSUMPTION_CURSOR_SECTION}_"):
+            energy = energy_from_char(
+                name.removeprefix(f"{CONSUMPTION_CURSOR_SECTION}_")
+            )
+            snapshot.consumption_cursors[energy] = datetime.fromisoformat(
+                state["cursor"]
+            )
@@ -8,11 +8,13 @@ from collections.abc import Callable
 from datetime import datetime as dt
 from datetime import timedelta
 from logging import Logger, getLogger
+from pathlib import Path
 
 from common.config import RefreshSettings, get_settings
 from common.decorator import retry_with_exponential_backoff
 from common.logging import APP_LOGGER_NAME, config
 from data.agile_forecast import AgileForecastRetriever
+from data.archive import ConsumptionArchive
 from data.base import MonitoringClient
 from data.consumption import ConsumptionRetriever
 from data.consumption_summary import (
@@ -21,6 +23,7 @@ from data.consumption_summary import (
 )
 from data.cost_forecast import CostForecastRetriever
 from data.mysql.client import MariaDBClient
+from data.mysql.gaps import ConsumptionGapScanner
 from data.pricing import PricingRetriever
 from data.pruning import DataPruner
 from schedule import Job, Scheduler, default_scheduler
@@ -31,7 +34,7 @@ logger: Logger = getLogger(APP_LOGGER_NAME)
 CONSUMPTION_REFRESH_JOB = "consumption_refresh"
 CONSUMPTION_BACKFILL_JOB = "consumption_backfill"
 PRICING_REFRESH_JOB = "pricing_refresh"
-WEEKLY_CONSUMPTION_SUMMARY_JOB = "update_consumption_summary"
+CONSUMPTION_SUMMARY_JOB = "update_consumption_summary"
 PRUNE_OLD_DATA_JOB = "prune_old_data"
 YEARLY_COMPARISON_BACKFILL_JOB = "yearly_comparison_backfill"
 COST_FORECAST_REFRESH_JOB = "cost_forecast_refresh"
@@ -48,26 +51,25 @@ def _retention_window_start(retention_days: int) -> dt:
     return dt(limit.year, limit.month, limit.day, tzinfo=datetime.UTC)
 
 
-def _retrieve_full_window(
-    label: str,
+def startup(
     consumption: ConsumptionRetriever,
     refresh_config: RefreshSettings,
 ) -> None:
+    # After a warm start only what is newer than each meter's restored
+    # cursor is fetched; without one, the full window (see ADR-0034).
     limit_dt = _retention_window_start(refresh_config.retention)
-    logger.info(f"{label} Retrieving consumption history from {limit_dt}.")
-    consumption.retrieve(period_from=limit_dt)
+    logger.info(
+        f"Startup. Retrieving consumption history from {limit_dt}, or from "
+        "each meter's warm-start cursor where later."
+    )
+    consumption.resume(period_from=limit_dt)
 
 
-def startup(
-    consumption: ConsumptionRetriever,
-    refresh_config: RefreshSettings,
+def run_initial_pricing_sync(
+    pricing: PricingRetriever, full_rate_resync: bool = False
 ) -> None:
-    _retrieve_full_window("Startup.", consumption, refresh_config)
-
-
-def run_initial_pricing_sync(pricing: PricingRetriever) -> None:
     try:
-        pricing.refresh()
+        pricing.refresh(full_resync=full_rate_resync)
     except Exception:
         logger.exception("Pricing sync failed at startup; continuing.")
 
@@ -195,7 +197,11 @@ def register_consumption_backfill_job(
     mariadb: MariaDBClient,
 ) -> Job:
     def backfill() -> None:
-        _retrieve_full_window("Consumption backfill.", consumption, refresh_config)
+        limit_dt = _retention_window_start(refresh_config.retention)
+        logger.info(
+            f"Consumption backfill. Refetching missing half-hours since {limit_dt}."
+        )
+        consumption.backfill_gaps(period_from=limit_dt)
 
     return _schedule_refresh_job(
         scheduler,
@@ -227,7 +233,7 @@ def register_consumption_summary_job(
     pruner: DataPruner,
     mariadb: MariaDBClient,
 ) -> Job:
-    """Registers one weekly Monday-04:00 job that summarizes, then -- only if that
+    """Registers one daily 04:00 job that summarizes, then -- only if that
     summarization succeeded -- prunes raw data in the same background thread,
     immediately after. Sequencing them within one thread (rather than as two
     independently-scheduled jobs) is deliberate: prune_old_data's job_run gate must
@@ -236,23 +242,23 @@ def register_consumption_summary_job(
     can't guarantee that ordering, since the summary job's own retry-with-backoff
     dispatch is itself asynchronous."""
     summarize = _with_backoff_recording(
-        WEEKLY_CONSUMPTION_SUMMARY_JOB, consumption_summary.refresh, mariadb
+        CONSUMPTION_SUMMARY_JOB, consumption_summary.refresh, mariadb
     )
     prune = _with_backoff_recording(PRUNE_OLD_DATA_JOB, pruner.run, mariadb)
 
     def summarize_then_prune() -> None:
         summarize()
-        if mariadb.latest_job_run_is_successful(WEEKLY_CONSUMPTION_SUMMARY_JOB):
+        if mariadb.latest_job_run_is_successful(CONSUMPTION_SUMMARY_JOB):
             prune()
         else:
             logger.info(
-                f"{WEEKLY_CONSUMPTION_SUMMARY_JOB} did not succeed this cycle; "
+                f"{CONSUMPTION_SUMMARY_JOB} did not succeed this cycle; "
                 f"skipping {PRUNE_OLD_DATA_JOB}."
             )
             mariadb.record_job_run(PRUNE_OLD_DATA_JOB, "skipped")
 
-    run = _run_in_background(WEEKLY_CONSUMPTION_SUMMARY_JOB, summarize_then_prune)
-    return scheduler.every().monday.at(DAILY_JOB_TIME).do(run)
+    run = _run_in_background(CONSUMPTION_SUMMARY_JOB, summarize_then_prune)
+    return scheduler.every().day.at(DAILY_JOB_TIME).do(run)
 
 
 def register_cost_forecast_refresh_job(
@@ -296,6 +302,12 @@ def main() -> None:
     try:
         parser = argparse.ArgumentParser()
         parser.add_argument("--config-file")
+        # Re-fetches every rate from scratch in the startup pricing sync,
+        # ignoring the rate watermarks (see ADR-0031).
+        parser.add_argument("--full-rate-resync", action="store_true")
+        # Ignores the warm-start snapshot: re-fetches the account, meters,
+        # region and billing period, and the full consumption window.
+        parser.add_argument("--cold-start", action="store_true")
         args = parser.parse_args()
         settings = get_settings(config_file_path=args.config_file)
         refresh_config = settings.refresh_settings
@@ -306,17 +318,24 @@ def main() -> None:
 
     logger.info(f"Consumption data update interval {refresh_config.refresh_interval}.")
 
-    client = MonitoringClient(settings)
-    consumption = ConsumptionRetriever(client)
+    client = MonitoringClient(settings, warm_start=not args.cold_start)
+    consumption = ConsumptionRetriever(
+        client, client.warm_start, ConsumptionGapScanner(client.mariadb)
+    )
     pricing = PricingRetriever(client)
     consumption_summary = ConsumptionSummaryRetriever(client.mariadb)
     yearly_comparison_backfill = ConsumptionSummaryBackfill(client)
     agile_forecast = AgileForecastRetriever(client)
     cost_forecast = CostForecastRetriever(client)
-    pruner = DataPruner(client.mariadb, refresh_config.retention)
+    archive = (
+        None
+        if refresh_config.archive_directory is None
+        else ConsumptionArchive(Path(refresh_config.archive_directory))
+    )
+    pruner = DataPruner(client.mariadb, refresh_config.retention, archive)
 
     startup(consumption, refresh_config)
-    run_initial_pricing_sync(pricing)
+    run_initial_pricing_sync(pricing, args.full_rate_resync)
     # The backfill (background thread) and this eager sync (foreground) can
     # both upsert the same recent (energy, date) row concurrently on first
     # startup. Harmless: both compute the same correct total from the same
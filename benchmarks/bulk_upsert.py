@@ -0,0 +1,128 @@
+# Compares MariaDBClient's bulk upsert path with the record-at-a-time path it
+# replaced. Run from the repo root:
+#
+#     PYTHONPATH=app python benchmarks/bulk_upsert.py
+#     PYTHONPATH=app python benchmarks/bulk_upsert.py --url mysql+pymysql://user:pw@host/octopus
+#
+# Without --url, a throwaway file-backed SQLite database is used, so the numbers
+# reflect per-statement overhead rather than MariaDB's network round trips --
+# against a real MariaDB the gap widens further.
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from data.mysql import model
+from data.mysql.model import SQLBase
+from data.mysql.upsert import DEFAULT_CHUNK_SIZE, bulk_upsert
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+ROW_COUNTS = (10_000, 100_000)
+
+
+def _per_record_upsert(s: Session, record: Any) -> None:
+    # The pre-bulk write path, kept here verbatim as the benchmark baseline.
+    try:
+        with s.begin_nested():
+            s.add(record)
+            s.flush()
+            return
+    except IntegrityError:
+        pk_columns = [col.name for col in inspect(type(record)).primary_key]
+        pk_filter = {col: getattr(record, col) for col in pk_columns}
+        update_dict = {
+            col.name: getattr(record, col.name) for col in record.__table__.columns
+        }
+        s.query(type(record)).filter_by(**pk_filter).update(
+            update_dict, synchronize_session=False
+        )
+
+
+def _consumption_rows(count: int) -> list[dict[str, Any]]:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    rows = []
+    for slot in range(count):
+        period_from = start + timedelta(minutes=30 * slot)
+        rows.append(
+            {
+                "id": "E" + period_from.strftime("%Y%m%d%H%M%S"),
+                "energy": "E",
+                "period_from": period_from,
+                "period_to": period_from + timedelta(minutes=30),
+                "raw_value": Decimal("0.12345"),
+                "unit": "kwh",
+                "est_kwh": Decimal("0.12345"),
+            }
+        )
+    return rows
+
+
+def _run_per_record(engine: Engine, rows: list[dict[str, Any]]) -> None:
+    with sessionmaker(bind=engine)() as session:
+        for row in rows:
+            _per_record_upsert(session, model.consumption(**row))
+        session.commit()
+
+
+def _run_bulk(engine: Engine, rows: list[dict[str, Any]]) -> None:
+    with sessionmaker(bind=engine)() as session:
+        bulk_upsert(session, model.consumption.__table__, rows, DEFAULT_CHUNK_SIZE)
+        session.commit()
+
+
+def _fresh_engine(url: str | None, workdir: Path) -> Engine:
+    if url is None:
+        database = workdir / f"bench-{time.monotonic_ns()}.sqlite"
+        engine = create_engine(f"sqlite:///{database}").execution_options(
+            schema_translate_map={"octopus": None}
+        )
+    else:
+        engine = create_engine(url)
+    SQLBase.metadata.drop_all(engine, tables=[model.consumption.__table__])
+    SQLBase.metadata.create_all(engine, tables=[model.consumption.__table__])
+    return engine
+
+
+def _timed(
+    label: str, writer: Callable[[Engine, list[dict[str, Any]]], None], engine: Engine
+) -> Callable[[list[dict[str, Any]]], float]:
+    def run(rows: list[dict[str, Any]]) -> float:
+        started = time.perf_counter()
+        writer(engine, rows)
+        elapsed = time.perf_counter() - started
+        print(f"  {label:<28} {elapsed:8.2f}s")
+        return elapsed
+
+    return run
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="SQLAlchemy URL; defaults to a temp SQLite file")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(ROW_COUNTS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for count in args.rows:
+            rows = _consumption_rows(count)
+            print(f"{count:,} rows")
+            for name, writer in (
+                ("per-record", _run_per_record),
+                ("bulk", _run_bulk),
+            ):
+                engine = _fresh_engine(args.url, Path(workdir))
+                _timed(f"{name} (insert)", writer, engine)(rows)
+                _timed(f"{name} (re-upsert)", writer, engine)(rows)
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
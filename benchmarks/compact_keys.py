@@ -0,0 +1,287 @@
+# Before-and-after table and index sizes, upsert time and rate-join time for
+# the migration from formatted-string ids to compact slot keys (ADR-0017).
+# Run from the repo root:
+#
+#     PYTHONPATH=app python benchmarks/compact_keys.py
+#     PYTHONPATH=app python benchmarks/compact_keys.py --url mysql+pymysql://user:pw@host/octopus
+#
+# Builds consumption and product_rate in the pre-ADR-0017 layout (string id
+# primary key plus the old secondary indexes) holding --days of half-hourly
+# rows, measures them, runs the real startup migration, and measures again.
+# The join is the "latest rate starting at or before each half-hour"
+# correlated subquery from grafana/mariadb/queries.md, in its id-era and
+# slot forms.
+
+import argparse
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from data import local_day
+from data.mysql.compact_keys import half_hour_slot, migrate_to_compact_keys
+from data.mysql.model import SQLBase
+from data.mysql.upsert import bulk_upsert
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    Index,
+    MetaData,
+    Numeric,
+    String,
+    Table,
+    create_engine,
+    text,
+)
+from sqlalchemy.dialects.mysql import DECIMAL
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import sessionmaker
+
+DAY_COUNTS = (365, 1825)
+CHUNK_SIZE = 5000
+PRODUCT_CODE = "AGILE-24-10-01"
+REGION = "H"
+NOW = datetime(2026, 7, 1, tzinfo=UTC)
+TABLES = ("consumption", "product_rate")
+
+_legacy = MetaData()
+
+legacy_consumption = Table(
+    "consumption",
+    _legacy,
+    Column("id", String(50), primary_key=True),
+    Column("energy", String(1)),
+    Column("period_from", DateTime, nullable=False),
+    Column("period_to", DateTime, nullable=False),
+    Column("raw_value", DECIMAL(8, 5, unsigned=True), nullable=False),
+    Column("unit", String(10), nullable=False),
+    Column("est_kwh", DECIMAL(8, 5, unsigned=True), nullable=False),
+    Column("local_date", Date, nullable=False),
+    Index("ix_consumption_energy_period_from", "energy", "period_from"),
+    Index("ix_consumption_energy_local_date", "energy", "local_date"),
+)
+
+legacy_product_rate = Table(
+    "product_rate",
+    _legacy,
+    Column("id", String(70), primary_key=True),
+    Column("product_code", String(50), nullable=False),
+    Column("region", String(1), nullable=False),
+    Column("valid_from", DateTime, nullable=False),
+    Column("valid_to", DateTime),
+    Column("unit_rate", Numeric(9, 6), nullable=False),
+    Column("standing_charge", Numeric(9, 6), nullable=False),
+    Index(
+        "ix_product_rate_product_code_region_valid_from_valid_to",
+        "product_code",
+        "region",
+        "valid_from",
+        "valid_to",
+    ),
+)
+
+LEGACY_JOIN = """
+SELECT COUNT(*), SUM(c.est_kwh * pr.unit_rate)
+FROM consumption c
+JOIN product_rate pr ON pr.id = (
+  SELECT pr2.id FROM product_rate pr2
+  WHERE pr2.product_code = :product_code AND pr2.region = :region
+    AND pr2.valid_from <= c.period_from
+  ORDER BY pr2.valid_from DESC LIMIT 1
+)
+WHERE c.energy = 'E' AND c.period_from >= :since
+"""
+
+SLOT_JOIN = """
+SELECT COUNT(*), SUM(c.est_kwh * pr.unit_rate)
+FROM consumption c
+JOIN product_rate pr
+  ON pr.product_code = :product_code AND pr.region = :region
+  AND pr.slot = (
+    SELECT pr2.slot FROM product_rate pr2
+    WHERE pr2.product_code = :product_code AND pr2.region = :region
+      AND pr2.slot <= c.slot
+    ORDER BY pr2.slot DESC LIMIT 1
+  )
+WHERE c.energy = 'E' AND c.period_from >= :since
+"""
+
+
+def _half_hours(days: int) -> list[datetime]:
+    start = NOW - timedelta(days=days)
+    return [start + timedelta(minutes=30 * slot) for slot in range(days * 48)]
+
+
+def _consumption_rows(days: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": "E" + period_from.strftime("%Y%m%d%H%M%S"),
+            "energy": "E",
+            "period_from": period_from,
+            "period_to": period_from + timedelta(minutes=30),
+            "raw_value": Decimal("0.12345"),
+            "unit": "kwh",
+            "est_kwh": Decimal("0.12345"),
+            "local_date": local_day.to_local_date(period_from),
+        }
+        for period_from in _half_hours(days)
+    ]
+
+
+def _rate_rows(days: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": f"{PRODUCT_CODE}_{REGION}_{valid_from.strftime('%Y%m%d%H%M')}",
+            "product_code": PRODUCT_CODE,
+            "region": REGION,
+            "valid_from": valid_from,
+            "valid_to": valid_from + timedelta(minutes=30),
+            "unit_rate": Decimal("24.5"),
+            "standing_charge": Decimal("50.0"),
+        }
+        for valid_from in _half_hours(days)
+    ]
+
+
+def _slot_rows(rows: list[dict[str, Any]], column: str) -> list[dict[str, Any]]:
+    return [
+        {
+            **{name: value for name, value in row.items() if name != "id"},
+            "slot": half_hour_slot(row[column]),
+        }
+        for row in rows
+    ]
+
+
+def _sizes(connection: Connection, table: str) -> tuple[int, int]:
+    if connection.dialect.name == "sqlite":
+        # dbstat counts every page of the b-tree, interior pages included.
+        table_bytes = connection.execute(
+            text("SELECT SUM(pgsize) FROM dbstat WHERE name = :name"),
+            {"name": table},
+        ).scalar_one()
+        index_bytes = connection.execute(
+            text(
+                "SELECT COALESCE(SUM(d.pgsize), 0) FROM dbstat d "
+                "JOIN sqlite_master m ON m.name = d.name "
+                "WHERE m.type = 'index' AND m.tbl_name = :name"
+            ),
+            {"name": table},
+        ).scalar_one()
+        return table_bytes, index_bytes
+    connection.execute(text(f"ANALYZE TABLE {table}"))
+    row = connection.execute(
+        text(
+            "SELECT DATA_LENGTH, INDEX_LENGTH FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+        ),
+        {"name": table},
+    ).one()
+    return row.DATA_LENGTH, row.INDEX_LENGTH
+
+
+def _upsert(engine: Engine, table: Table, rows: list[dict[str, Any]]) -> float:
+    started = time.perf_counter()
+    with sessionmaker(bind=engine)() as session:
+        bulk_upsert(session, table, rows, CHUNK_SIZE)
+        session.commit()
+    return time.perf_counter() - started
+
+
+def _join(engine: Engine, query: str, days: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        count, _ = connection.execute(
+            text(query),
+            {
+                "product_code": PRODUCT_CODE,
+                "region": REGION,
+                "since": (NOW - timedelta(days=days)).replace(tzinfo=None),
+            },
+        ).one()
+    return time.perf_counter() - started, count
+
+
+def _report(engine: Engine, label: str, upserts: dict[str, float]) -> None:
+    with engine.connect() as connection:
+        for table in TABLES:
+            table_bytes, index_bytes = _sizes(connection, table)
+            print(
+                f"  {label:<7} {table:<13} table {table_bytes / 1e6:8.2f} MB  "
+                f"indexes {index_bytes / 1e6:8.2f} MB  "
+                f"upsert {upserts[table]:6.2f}s"
+            )
+
+
+def _engine(url: str | None, workdir: Path) -> Engine:
+    if url is None:
+        database = workdir / f"bench-{time.monotonic_ns()}.sqlite"
+        return create_engine(f"sqlite:///{database}").execution_options(
+            schema_translate_map={"octopus": None}
+        )
+    return create_engine(url)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="SQLAlchemy URL; defaults to a temp SQLite file")
+    parser.add_argument("--days", type=int, nargs="+", default=list(DAY_COUNTS))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for days in args.days:
+            consumption_rows = _consumption_rows(days)
+            rate_rows = _rate_rows(days)
+            print(f"{days} days ({len(consumption_rows):,} rows per table)")
+
+            engine = _engine(args.url, Path(workdir))
+            SQLBase.metadata.drop_all(engine)
+            _legacy.drop_all(engine)
+            _legacy.create_all(engine)
+            _upsert(engine, legacy_consumption, consumption_rows)
+            _upsert(engine, legacy_product_rate, rate_rows)
+            # Timed on a second pass, the steady state: every row an update.
+            legacy_upserts = {
+                "consumption": _upsert(engine, legacy_consumption, consumption_rows),
+                "product_rate": _upsert(engine, legacy_product_rate, rate_rows),
+            }
+            _report(engine, "id", legacy_upserts)
+            elapsed, matched = _join(engine, LEGACY_JOIN, days)
+            print(f"  id      rate join {elapsed:8.2f}s  {matched:,} rows")
+
+            started = time.perf_counter()
+            migrate_to_compact_keys(engine, CHUNK_SIZE)
+            print(f"  migration {time.perf_counter() - started:8.2f}s")
+            with engine.begin() as connection:
+                for table in TABLES:
+                    connection.execute(text(f"DROP TABLE {table}_legacy_id"))
+            if engine.dialect.name == "sqlite":
+                with engine.connect().execution_options(
+                    isolation_level="AUTOCOMMIT"
+                ) as connection:
+                    connection.execute(text("VACUUM"))
+
+            compact = SQLBase.metadata.tables
+            compact_upserts = {
+                "consumption": _upsert(
+                    engine,
+                    compact["octopus.consumption"],
+                    _slot_rows(consumption_rows, "period_from"),
+                ),
+                "product_rate": _upsert(
+                    engine,
+                    compact["octopus.product_rate"],
+                    _slot_rows(rate_rows, "valid_from"),
+                ),
+            }
+            _report(engine, "slot", compact_upserts)
+            elapsed, matched = _join(engine, SLOT_JOIN, days)
+            print(f"  slot    rate join {elapsed:8.2f}s  {matched:,} rows")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+# End-to-end profile of the data layer on the embedded SQLite backend
+# (ADR-0021): no MariaDB container, no mocks -- the real MariaDBClient
+# against a WAL-mode file. Run from the repo root:
+#
+#     PYTHONPATH=app python benchmarks/data_layer.py
+#     PYTHONPATH=app python benchmarks/data_layer.py --days 730 --keep data.sqlite
+#     PYTHONPATH=app python -m cProfile -s cumtime benchmarks/data_layer.py
+#
+# Writes --days of half-hourly Agile rates and electricity and gas
+# consumption a day per call, as the refresh jobs do. Then it times the
+# heaviest reads, a cost rebuild, summarization and a retention prune.
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from common.config import MariaDBSettings
+from data.model import Consumption, Unit
+from data.mysql.client import MariaDBClient
+from data.octopus.model import Agreement, Electricity, Gas, Meter, Rate
+
+DAYS = 365
+PRODUCT_CODE = "AGILE-24-10-01"
+REGION = "H"
+NOW = datetime(2026, 7, 1, tzinfo=UTC)
+
+
+def _timed(label: str, action: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    result = action()
+    print(f"  {label:<38} {time.perf_counter() - started:8.2f}s")
+    return result
+
+
+def _half_hours(day: datetime) -> list[datetime]:
+    return [day + timedelta(minutes=30 * slot) for slot in range(48)]
+
+
+def _meters() -> list[Meter]:
+    def agreement(prefix: str) -> Agreement:
+        return Agreement(
+            tariff_code=f"{prefix}-1R-{PRODUCT_CODE}-{REGION}",
+            valid_from=datetime(2020, 1, 1, tzinfo=UTC),
+            valid_to=None,
+        )
+
+    return [
+        Electricity(mpan="1", serial_number="E1", agreements=[agreement("E")]),
+        Gas(mprn="2", serial_number="G1", agreements=[agreement("G")]),
+    ]
+
+
+def _write_history(client: MariaDBClient, days: int) -> None:
+    first_day = NOW - timedelta(days=days)
+    meters = _meters()
+    for meter in meters:
+        client.write_agreement(meter, meter.agreements)
+    for day_number in range(days):
+        day = first_day + timedelta(days=day_number)
+        client.write_product_rate(
+            PRODUCT_CODE,
+            REGION,
+            [
+                Rate(
+                    valid_from=start,
+                    valid_to=start + timedelta(minutes=30),
+                    unit_rate=Decimal("24.5"),
+                    standing_charge=Decimal("50.0"),
+                )
+                for start in _half_hours(day)
+            ],
+        )
+        for meter in meters:
+            client.write_consumption(
+                meter,
+                [
+                    Consumption(
+                        raw=Decimal("0.25"),
+                        est_kwh=Decimal("0.25"),
+                        unit=Unit.kwh,
+                        start=start,
+                        end=start + timedelta(minutes=30),
+                    )
+                    for start in _half_hours(day)
+                ],
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=DAYS)
+    parser.add_argument("--keep", help="write to this SQLite file and keep it")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(args.keep) if args.keep else Path(workdir) / "octopus.sqlite"
+        client = _timed(
+            "startup (schema sync)",
+            lambda: MariaDBClient(
+                MariaDBSettings(backend="sqlite", sqlite_path=str(path))
+            ),
+        )
+        print(f"{args.days} days, 2 meters, {args.days * 48 * 3:,} half-hour rows")
+        _timed(
+            "write history, a day per call", lambda: _write_history(client, args.days)
+        )
+        _timed(
+            "read_elapsed_billing_period_costs",
+            lambda: client.read_elapsed_billing_period_costs(
+                NOW - timedelta(days=args.days), NOW, REGION
+            ),
+        )
+        _timed("rebuild_consumption_cost", client.rebuild_consumption_cost)
+        _timed(
+            "read_consumption_summarization_batch",
+            lambda: client.read_consumption_summarization_batch(NOW),
+        )
+        _timed(
+            "prune half the history",
+            lambda: client.prune_consumption_older_than(
+                NOW - timedelta(days=args.days // 2)
+            ),
+        )
+        print(f"  {'file size':<38} {path.stat().st_size / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
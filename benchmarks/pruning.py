@@ -0,0 +1,170 @@
+# Compares the retention prune modes on consumption: the original single
+# unbounded DELETE, the batched fallback, and (MariaDB only) dropping monthly
+# partitions. Run from the repo root:
+#
+#     PYTHONPATH=app python benchmarks/pruning.py
+#     PYTHONPATH=app python benchmarks/pruning.py --url mysql+pymysql://user:pw@host/octopus
+#
+# Each mode prunes everything older than RETENTION_DAYS from a table holding
+# --days of half-hourly history. "longest txn" is the longest single
+# transaction -- how long other writers could be blocked -- which is what the
+# batched and partitioned modes exist to shrink. The partitioned mode is
+# skipped without a MariaDB --url, since SQLite has no partitioning.
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from data import local_day
+from data.mysql import model
+from data.mysql.model import SQLBase
+from data.mysql.retention import (
+    delete_in_batches,
+    drop_expired_partitions,
+    sync_monthly_partitions,
+)
+from data.mysql.upsert import bulk_upsert
+from sqlalchemy import create_engine, delete
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+DAY_COUNTS = (365, 1825)
+RETENTION_DAYS = 45
+BATCH_SIZE = 5000
+BATCH_TIME_LIMIT_SECONDS = 2.0
+NOW = datetime(2026, 7, 1, tzinfo=UTC)
+
+
+def _consumption_rows(days: int) -> list[dict[str, Any]]:
+    start = NOW - timedelta(days=days)
+    rows = []
+    for slot in range(days * 48):
+        period_from = start + timedelta(minutes=30 * slot)
+        rows.append(
+            {
+                "id": "E" + period_from.strftime("%Y%m%d%H%M%S"),
+                "energy": "E",
+                "period_from": period_from,
+                "period_to": period_from + timedelta(minutes=30),
+                "raw_value": Decimal("0.12345"),
+                "unit": "kwh",
+                "est_kwh": Decimal("0.12345"),
+                "local_date": local_day.to_local_date(period_from),
+            }
+        )
+    return rows
+
+
+def _fresh_engine(
+    url: str | None, workdir: Path, rows: list[dict[str, Any]], partitioned: bool
+) -> Engine:
+    if url is None:
+        database = workdir / f"bench-{time.monotonic_ns()}.sqlite"
+        engine = create_engine(f"sqlite:///{database}").execution_options(
+            schema_translate_map={"octopus": None}
+        )
+    else:
+        engine = create_engine(url)
+    table = model.consumption.__table__
+    SQLBase.metadata.drop_all(engine, tables=[table])
+    SQLBase.metadata.create_all(engine, tables=[table])
+    with sessionmaker(bind=engine)() as session:
+        bulk_upsert(session, table, rows)
+        session.commit()
+    if partitioned:
+        # Partitioned after loading, the same path schema sync takes on an
+        # already-populated table: one partition per month from the oldest row.
+        with engine.begin() as connection:
+            sync_monthly_partitions(connection, table, "period_from", NOW.date())
+    return engine
+
+
+class _TransactionTimer:
+    def __init__(self, engine: Engine) -> None:
+        self._session = sessionmaker(bind=engine)
+        self.longest = 0.0
+
+    @contextmanager
+    def scope(self) -> Generator[Session]:
+        started = time.perf_counter()
+        session = self._session()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+            self.longest = max(self.longest, time.perf_counter() - started)
+
+
+def _single_delete(engine: Engine, timer: _TransactionTimer) -> int:
+    # The pre-batching prune, kept here as the benchmark baseline.
+    table = model.consumption.__table__
+    with timer.scope() as session:
+        return session.execute(
+            delete(table).where(table.c.period_from < _cutoff())
+        ).rowcount
+
+
+def _batched(engine: Engine, timer: _TransactionTimer) -> int:
+    table = model.consumption.__table__
+    return delete_in_batches(
+        timer.scope,
+        table,
+        table.c.period_from < _cutoff(),
+        BATCH_SIZE,
+        BATCH_TIME_LIMIT_SECONDS,
+    )
+
+
+def _partitioned(engine: Engine, timer: _TransactionTimer) -> int:
+    table = model.consumption.__table__
+    expired = table.c.period_from < _cutoff()
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        dropped = drop_expired_partitions(connection, table, expired, _cutoff())
+    timer.longest = time.perf_counter() - started
+    return dropped + _batched(engine, timer)
+
+
+def _cutoff() -> datetime:
+    return (NOW - timedelta(days=RETENTION_DAYS)).replace(tzinfo=None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="SQLAlchemy URL; defaults to a temp SQLite file")
+    parser.add_argument("--days", type=int, nargs="+", default=list(DAY_COUNTS))
+    args = parser.parse_args()
+
+    modes: list[tuple[str, Callable[[Engine, _TransactionTimer], int], bool]] = [
+        ("single DELETE", _single_delete, False),
+        ("batched", _batched, False),
+    ]
+    if args.url is not None and args.url.startswith(("mysql", "mariadb")):
+        modes.append(("partitioned", _partitioned, True))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for days in args.days:
+            rows = _consumption_rows(days)
+            print(f"{days} days ({len(rows):,} rows), keeping {RETENTION_DAYS}")
+            for label, prune, partitioned in modes:
+                engine = _fresh_engine(args.url, Path(workdir), rows, partitioned)
+                timer = _TransactionTimer(engine)
+                started = time.perf_counter()
+                deleted = prune(engine, timer)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"  {label:<14} {elapsed:8.2f}s total  "
+                    f"{timer.longest:8.2f}s longest txn  {deleted:,} rows"
+                )
+                engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
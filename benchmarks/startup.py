@@ -0,0 +1,99 @@
+# Startup cost of MariaDBClient's schema sync: on an empty database, on an
+# up-to-date one with the full additive sync forced (the pre-fingerprint
+# behaviour), and on an up-to-date one where the stored model fingerprint
+# lets it skip reflection (see ADR-0018). Run from the repo root:
+#
+#     PYTHONPATH=app python benchmarks/startup.py
+#     PYTHONPATH=app python benchmarks/startup.py --url mysql+pymysql://user:pw@host/octopus
+#
+# "statements" counts every SQL statement sent, reflection queries included
+# -- each one a network round trip against a remote MariaDB, which is where
+# the time goes in production. Times are the median of --runs startups.
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from common.config import MariaDBSettings
+from data.mysql import client as client_module
+from data.mysql.client import MariaDBClient
+from data.mysql.model import SQLBase
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+RUNS = 5
+
+
+class _StatementCounter:
+    def __init__(self, engine: Engine) -> None:
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args: Any) -> None:
+        self.count += 1
+
+
+def _settings() -> MariaDBSettings:
+    # Never used to connect: create_engine is pointed at the benchmark's
+    # own engine, the same way the test suite does it.
+    return MariaDBSettings(
+        host="localhost", port=3306, database="octopus", username="b", password="b"
+    )
+
+
+def _startup(engine: Engine) -> tuple[float, int]:
+    client_module.create_engine = lambda *args, **kwargs: engine  # type: ignore[assignment]
+    counter = _StatementCounter(engine)
+    started = time.perf_counter()
+    MariaDBClient(_settings())
+    elapsed = time.perf_counter() - started
+    event.remove(engine, "before_cursor_execute", counter._count)
+    return elapsed, counter.count
+
+
+def _forget_fingerprints(engine: Engine) -> None:
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM schema_version"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="SQLAlchemy URL; defaults to a temp SQLite file")
+    parser.add_argument("--runs", type=int, default=RUNS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.url is None:
+            engine = create_engine(
+                f"sqlite:///{Path(workdir) / 'startup.sqlite'}"
+            ).execution_options(schema_translate_map={"octopus": None})
+        else:
+            engine = create_engine(args.url)
+        SQLBase.metadata.drop_all(engine)
+
+        elapsed, statements = _startup(engine)
+        print(f"  {'empty database':<26} {elapsed:8.3f}s  {statements:4} statements")
+
+        cases = (
+            ("full sync (no fingerprint)", True),
+            ("fingerprint matched", False),
+        )
+        for label, forget in cases:
+            timings = []
+            for _ in range(args.runs):
+                if forget:
+                    _forget_fingerprints(engine)
+                elapsed, statements = _startup(engine)
+                timings.append(elapsed)
+            print(
+                f"  {label:<26} {statistics.median(timings):8.3f}s  "
+                f"{statements:4} statements"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,22 @@
+from collections.abc import Callable
+from datetime import datetime
+
 import pytest
-from common.config import MariaDBSettings
+from common.config import MariaDBSettings, OctopusAPISettings
+from common.rate_limit import HostRateLimiter
 from data.mysql.client import MariaDBClient
 from data.mysql.model import SQLBase
+from data.octopus.api import OctopusEnergyAPIClient
+from data.octopus.model import Agreement, Meter, Product, Rate
+from data.pricing import PricingSource
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.pool import StaticPool
 
 
-@pytest.fixture
-def mariadb_client(monkeypatch: pytest.MonkeyPatch) -> MariaDBClient:
-    """A MariaDBClient backed by an in-memory SQLite database.
+@pytest.fixture(name="engine")
+def _engine() -> Engine:
+    """An in-memory SQLite database with every table created.
 
     Tables are declared with schema="octopus" for real MariaDB, which SQLite
     has no equivalent for, so the schema is translated away for this engine.
@@ -19,7 +27,19 @@ def mariadb_client(monkeypatch: pytest.MonkeyPatch) -> MariaDBClient:
         poolclass=StaticPool,
     ).execution_options(schema_translate_map={"octopus": None})
     SQLBase.metadata.create_all(engine)
+    return engine
+
 
+@pytest.fixture(name="mariadb_client")
+def _mariadb_client(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch, engine: Engine
+) -> MariaDBClient:
+    """A MariaDBClient backed by the in-memory engine.
+
+    Settings are overridden through indirect parametrization, e.g.
+    @pytest.mark.parametrize("mariadb_client", [{"write_behind": True}],
+    indirect=True).
+    """
     monkeypatch.setattr(
         "data.mysql.client.create_engine", lambda *args, **kwargs: engine
     )
@@ -30,5 +50,132 @@ def mariadb_client(monkeypatch: pytest.MonkeyPatch) -> MariaDBClient:
         database="octopus",
         username="test",
         password="test",
+        **getattr(request, "param", {}),
     )
     return MariaDBClient(settings)
+
+
+class _RealPricingSource:
+    """A real PricingSource adapter for tests: genuine OctopusEnergyAPIClient
+    and MariaDBClient underneath, with meters/region_code fixed up front
+    rather than fetched, so tests only need to mock the HTTP endpoints
+    PricingRetriever.refresh() actually calls."""
+
+    def __init__(
+        self,
+        octopus: OctopusEnergyAPIClient,
+        mariadb: MariaDBClient,
+        meters: list[Meter],
+        region_code: str,
+    ) -> None:
+        self._octopus = octopus
+        self._mariadb = mariadb
+        self.meters = meters
+        self.region_code = region_code
+
+    def refresh_meters(self) -> None:
+        pass
+
+    def persist_agreement(self, meter: Meter, agreements: list[Agreement]) -> None:
+        self._mariadb.write_agreement(meter, agreements)
+
+    def fetch_products(self) -> list[Product]:
+        return self._octopus.get_products()
+
+    async def is_product_available_in_region_async(
+        self, product_code: str, region: str
+    ) -> bool:
+        return await self._octopus.get_product_region_availability_async(
+            product_code, region
+        )
+
+    def persist_product(self, product: Product) -> None:
+        self._mariadb.write_product(product)
+
+    def fetch_electricity_rates(
+        self,
+        product_code: str,
+        tariff_code: str,
+        period_from: datetime | None,
+        period_to: datetime | None,
+    ) -> list[Rate]:
+        return self._octopus.get_electricity_rates(
+            product_code, tariff_code, period_from, period_to
+        )
+
+    async def fetch_electricity_rates_async(
+        self,
+        product_code: str,
+        tariff_code: str,
+        period_from: datetime | None,
+        period_to: datetime | None,
+    ) -> list[Rate]:
+        return await self._octopus.get_electricity_rates_async(
+            product_code, tariff_code, period_from, period_to
+        )
+
+    def fetch_gas_rates(
+        self,
+        product_code: str,
+        tariff_code: str,
+        period_from: datetime | None,
+        period_to: datetime | None,
+    ) -> list[Rate]:
+        return self._octopus.get_gas_rates(
+            product_code, tariff_code, period_from, period_to
+        )
+
+    def persist_rate(
+        self, product_code: str, tariff_code: str, region: str, rates: list[Rate]
+    ) -> None:
+        self._mariadb.write_product_rate(product_code, region, rates, tariff_code)
+
+    def read_rate_watermark(
+        self, product_code: str, tariff_code: str, region: str
+    ) -> datetime | None:
+        return self._mariadb.read_rate_watermark(product_code, tariff_code, region)
+
+    async def fetch_electricity_tariff_code_async(
+        self, product_code: str, region: str
+    ) -> str | None:
+        return await self._octopus.get_electricity_tariff_code_async(
+            product_code, region
+        )
+
+
+@pytest.fixture
+def make_pricing_source(
+    mariadb_client: MariaDBClient,
+) -> Callable[[list[Meter]], PricingSource]:
+    def make(meters: list[Meter]) -> PricingSource:
+        octopus = OctopusEnergyAPIClient(
+            OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
+        )
+        return _RealPricingSource(octopus, mariadb_client, meters, "H")
+
+    return make
+
+
+@pytest.fixture
+def no_retry_delay(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Skips @retry's delay between attempts, and @async_retry's.
+
+    The async delay is an asyncio.sleep on the runner's event loop thread,
+    so it's replaced for the whole process for the length of the test.
+    """
+
+    async def no_sleep(_seconds: float) -> None:
+        return None
+
+    monkeypatch.setattr("common.decorator.time.sleep", lambda _seconds: None)
+    monkeypatch.setattr("common.decorator.asyncio.sleep", no_sleep)
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Gives every test its own shared HostRateLimiter.
+
+    Otherwise a host one test throttled with a 429 or 5xx would still be
+    throttled in the next.
+    """
+    monkeypatch.setattr("common.rate_limit._shared_limiter", HostRateLimiter())
@@ -59,11 +59,11 @@ def test_account_and_meters_are_fetched_from_octopus() -> None:
     assert meters[0].serial_number == "00A1234567"
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_account_response_missing_a_required_field_raises_a_clear_validation_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_account_response_missing_a_required_field_raises_a_clear_validation_error() -> (
+    None
+):
     invalid_response = {
         "properties": [
             {
@@ -90,11 +90,9 @@ def test_account_response_missing_a_required_field_raises_a_clear_validation_err
     assert "field required" in str(exc_info.value).lower()
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_account_meter_information_connection_failure_raises_a_clear_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_account_meter_information_connection_failure_raises_a_clear_error() -> None:
     responses.add(
         responses.GET,
         ACCOUNT_ENDPOINT,
@@ -109,11 +107,11 @@ def test_account_meter_information_connection_failure_raises_a_clear_error(
         octopus.get_account_meter_information()
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_account_meter_information_non_json_error_response_raises_a_clear_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_account_meter_information_non_json_error_response_raises_a_clear_error() -> (
+    None
+):
     responses.add(
         responses.GET,
         ACCOUNT_ENDPOINT,
@@ -106,12 +106,11 @@ def test_primary_source_succeeding_persists_its_readings_and_never_calls_the_fal
     assert not x2r_calls
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
 def test_primary_source_failing_falls_back_to_x2r_and_persists_its_readings(
     mariadb_client: MariaDBClient,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     responses.add(
         responses.GET,
         AGILE_ENDPOINT,
@@ -131,12 +130,11 @@ def test_primary_source_failing_falls_back_to_x2r_and_persists_its_readings(
     assert rows[0].forecast_unit_rate == Decimal("18.50")
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
 def test_both_sources_failing_raises_and_persists_nothing(
     mariadb_client: MariaDBClient,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     responses.add(
         responses.GET,
         AGILE_ENDPOINT,
@@ -52,26 +52,20 @@ def test_get_forecast_maps_agile_pred_to_unit_rate_with_thirty_minute_periods()
 
 
 @responses.activate
-def test_empty_prices_array_raises_a_clear_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    # The "no prices" APIError is raised outside get_forecast's own
-    # try/except, so it propagates through the @retry() wrapper like any
-    # other exception -- without this monkeypatch, responses keeps serving
-    # the same empty body on every retry and the test burns ~20s in real
-    # time.sleep(10) calls before failing.
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_empty_prices_array_raises_a_clear_error() -> None:
+    # An empty body is a well-formed answer, not a transient failure: only
+    # the HTTP fetch itself is retried, so this raises on the first call.
     _mock_forecast([])
 
     with pytest.raises(APIError, match=REGION):
         AgilePredictClient().get_forecast(REGION)
 
+    assert len(responses.calls) == 1
 
+
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_non_200_response_raises_api_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_non_200_response_raises_api_error() -> None:
     responses.add(
         responses.GET,
         ENDPOINT,
@@ -83,11 +77,9 @@ def test_non_200_response_raises_api_error(
         AgilePredictClient().get_forecast(REGION)
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_connection_failure_raises_a_descriptive_runtime_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_connection_failure_raises_a_descriptive_runtime_error() -> None:
     responses.add(
         responses.GET,
         ENDPOINT,
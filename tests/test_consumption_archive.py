@@ -0,0 +1,104 @@
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from data.archive import ConsumptionArchive
+from data.model import Consumption, Energy, Unit
+
+MONTH_END = datetime(2026, 1, 31, 23, 0, tzinfo=UTC)
+
+
+def _half_hours(
+    start: datetime, count: int, unit: Unit = Unit.kwh
+) -> list[Consumption]:
+    return [
+        Consumption(
+            raw=Decimal("0.12345") + slot,
+            est_kwh=Decimal("1.23456") + slot,
+            unit=unit,
+            start=start + timedelta(minutes=30 * slot),
+            end=start + timedelta(minutes=30 * (slot + 1)),
+        )
+        for slot in range(count)
+    ]
+
+
+def test_archived_half_hours_read_back_exactly_across_a_month_boundary(
+    tmp_path: Path,
+) -> None:
+    archive = ConsumptionArchive(tmp_path)
+    written = _half_hours(MONTH_END, 6)
+    archive.append(Energy.electricity, written)
+
+    read = archive.read(Energy.electricity, MONTH_END, MONTH_END + timedelta(hours=3))
+
+    assert read == written
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "consumption-2026-01.json.gz",
+        "consumption-2026-02.json.gz",
+    ]
+
+
+def test_a_read_returns_only_the_requested_energy_and_half_open_range(
+    tmp_path: Path,
+) -> None:
+    archive = ConsumptionArchive(tmp_path)
+    electricity = _half_hours(MONTH_END, 4)
+    archive.append(Energy.electricity, electricity)
+    archive.append(Energy.gas, _half_hours(MONTH_END, 4, Unit.m3))
+
+    read = archive.read(
+        Energy.electricity,
+        MONTH_END + timedelta(minutes=30),
+        MONTH_END + timedelta(minutes=90),
+    )
+
+    assert read == electricity[1:3]
+
+
+def test_half_hours_exported_twice_read_back_once_with_the_later_export_winning(
+    tmp_path: Path,
+) -> None:
+    archive = ConsumptionArchive(tmp_path)
+    archive.append(Energy.electricity, _half_hours(MONTH_END, 2))
+    revised = _half_hours(MONTH_END, 1)
+    revised[0].est_kwh = Decimal("9.99999")
+    archive.append(Energy.electricity, revised)
+
+    read = archive.read(Energy.electricity, MONTH_END, MONTH_END + timedelta(hours=1))
+
+    assert [point.est_kwh for point in read] == [Decimal("9.99999"), Decimal("2.23456")]
+
+
+def test_a_truncated_final_segment_leaves_earlier_segments_readable(
+    tmp_path: Path,
+) -> None:
+    archive = ConsumptionArchive(tmp_path)
+    start = datetime(2026, 1, 10, tzinfo=UTC)
+    first = _half_hours(start, 2)
+    archive.append(Energy.electricity, first)
+    archive.append(Energy.electricity, _half_hours(start + timedelta(days=1), 2))
+    path = tmp_path / "consumption-2026-01.json.gz"
+    path.write_bytes(path.read_bytes()[:-10])
+
+    read = archive.read(Energy.electricity, start, start + timedelta(days=2))
+
+    assert read == first
+
+
+def test_an_export_appended_after_a_torn_segment_is_still_readable(
+    tmp_path: Path,
+) -> None:
+    archive = ConsumptionArchive(tmp_path)
+    start = datetime(2026, 1, 10, tzinfo=UTC)
+    first = _half_hours(start, 2)
+    archive.append(Energy.electricity, first)
+    archive.append(Energy.electricity, _half_hours(start + timedelta(days=1), 2))
+    path = tmp_path / "consumption-2026-01.json.gz"
+    path.write_bytes(path.read_bytes()[:-10])
+    third = _half_hours(start + timedelta(days=2), 2)
+    archive.append(Energy.electricity, third)
+
+    read = archive.read(Energy.electricity, start, start + timedelta(days=3))
+
+    assert read == first + third
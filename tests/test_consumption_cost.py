@@ -0,0 +1,254 @@
+import tracemalloc
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from data import local_day
+from data.model import Consumption, Unit
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
+from data.mysql.upsert import bulk_upsert
+from data.octopus.model import Agreement, Electricity, Rate
+
+PRODUCT_CODE = "VAR-22-11-01"
+REGION = "H"
+DAY = datetime(2026, 1, 10, tzinfo=UTC)
+
+
+def _make_electricity_meter(*agreements: Agreement) -> Electricity:
+    return Electricity(
+        mpan="1234567890123",
+        serial_number="00A1234567",
+        agreements=list(agreements),
+    )
+
+
+def _agreement(
+    product_code: str, valid_from: datetime, valid_to: datetime | None = None
+) -> Agreement:
+    return Agreement(
+        tariff_code=f"E-1R-{product_code}-{REGION}",
+        valid_from=valid_from,
+        valid_to=valid_to,
+    )
+
+
+def _rate(unit_rate: str, valid_to: datetime | None = None) -> Rate:
+    return Rate(
+        valid_from=datetime(2026, 1, 1, tzinfo=UTC),
+        valid_to=valid_to,
+        unit_rate=Decimal(unit_rate),
+        standing_charge=Decimal("50.00"),
+    )
+
+
+def _half_hours(count: int, est_kwh: str) -> list[Consumption]:
+    return [
+        Consumption(
+            raw=Decimal(est_kwh),
+            est_kwh=Decimal(est_kwh),
+            unit=Unit.kwh,
+            start=DAY + timedelta(minutes=30 * slot),
+            end=DAY + timedelta(minutes=30 * (slot + 1)),
+        )
+        for slot in range(count)
+    ]
+
+
+def _stored_costs(mariadb_client: MariaDBClient) -> list[model.consumption_cost]:
+    with mariadb_client.session_read_scope() as session:
+        return (
+            session.query(model.consumption_cost)
+            .order_by(model.consumption_cost.period_from)
+            .all()
+        )
+
+
+def test_written_consumption_is_priced_by_the_agreement_and_rate_in_force(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_electricity_meter(_agreement(PRODUCT_CODE, datetime(2022, 1, 1)))
+    mariadb_client.write_agreement(meter, meter.agreements)
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("20.00")])
+
+    mariadb_client.write_consumption(meter, _half_hours(2, "0.5"))
+
+    stored = _stored_costs(mariadb_client)
+    assert [(row.product_code, row.region) for row in stored] == [
+        (PRODUCT_CODE, REGION),
+        (PRODUCT_CODE, REGION),
+    ]
+    assert {row.variable_cost for row in stored} == {Decimal("10.00000000000")}
+    assert {row.standing_charge for row in stored} == {Decimal("50.000000")}
+
+
+def test_a_revised_rate_reprices_already_written_consumption(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_electricity_meter(_agreement(PRODUCT_CODE, datetime(2022, 1, 1)))
+    mariadb_client.write_agreement(meter, meter.agreements)
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("20.00")])
+    mariadb_client.write_consumption(meter, _half_hours(2, "0.5"))
+
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("30.00")])
+
+    assert {row.unit_rate for row in _stored_costs(mariadb_client)} == {
+        Decimal("30.000000")
+    }
+
+
+def test_a_new_agreement_reprices_the_consumption_it_now_covers(
+    mariadb_client: MariaDBClient,
+) -> None:
+    old = _agreement(PRODUCT_CODE, datetime(2022, 1, 1), valid_to=None)
+    meter = _make_electricity_meter(old)
+    mariadb_client.write_agreement(meter, [old])
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("20.00")])
+    mariadb_client.write_product_rate("AGILE-24-10-01", REGION, [_rate("10.00")])
+    mariadb_client.write_consumption(meter, _half_hours(4, "0.5"))
+
+    switch_at = DAY + timedelta(hours=1)
+    mariadb_client.write_agreement(
+        meter,
+        [
+            _agreement(PRODUCT_CODE, datetime(2022, 1, 1), valid_to=switch_at),
+            _agreement("AGILE-24-10-01", switch_at),
+        ],
+    )
+
+    assert [row.product_code for row in _stored_costs(mariadb_client)] == [
+        PRODUCT_CODE,
+        PRODUCT_CODE,
+        "AGILE-24-10-01",
+        "AGILE-24-10-01",
+    ]
+
+
+def test_a_slot_that_loses_its_rate_loses_its_cost_row(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_electricity_meter(_agreement(PRODUCT_CODE, datetime(2022, 1, 1)))
+    mariadb_client.write_agreement(meter, meter.agreements)
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("20.00")])
+    mariadb_client.write_consumption(meter, _half_hours(4, "0.5"))
+
+    mariadb_client.write_product_rate(
+        PRODUCT_CODE, REGION, [_rate("20.00", valid_to=DAY + timedelta(hours=1))]
+    )
+
+    assert len(_stored_costs(mariadb_client)) == 2
+
+
+def test_rewriting_unchanged_rates_does_not_rederive_existing_costs(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_electricity_meter(_agreement(PRODUCT_CODE, datetime(2022, 1, 1)))
+    mariadb_client.write_agreement(meter, meter.agreements)
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("20.00")])
+    mariadb_client.write_consumption(meter, _half_hours(1, "0.5"))
+    # Hand-edited so a re-derivation would be visible.
+    with mariadb_client.session_write_scope() as s:
+        s.query(model.consumption_cost).update({"variable_cost": Decimal(99)})
+
+    mariadb_client.write_agreement(meter, meter.agreements)
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("20.00")])
+
+    assert [row.variable_cost for row in _stored_costs(mariadb_client)] == [
+        Decimal("99.00000000000")
+    ]
+
+
+def test_rebuild_derives_costs_for_rows_written_outside_the_write_path(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_electricity_meter(_agreement(PRODUCT_CODE, datetime(2022, 1, 1)))
+    mariadb_client.write_consumption(meter, _half_hours(3, "0.5"))
+    # Agreement and rate inserted directly, as in a database populated
+    # before consumption_cost existed.
+    with mariadb_client.session_write_scope() as s:
+        s.add(
+            model.agreement(
+                slot=half_hour_slot(datetime(2022, 1, 1)),
+                energy="E",
+                product_code=PRODUCT_CODE,
+                tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
+                valid_from=datetime(2022, 1, 1),
+                valid_to=None,
+            )
+        )
+        s.add(
+            model.product_rate(
+                slot=half_hour_slot(datetime(2026, 1, 1)),
+                product_code=PRODUCT_CODE,
+                region=REGION,
+                valid_from=datetime(2026, 1, 1),
+                valid_to=None,
+                unit_rate=Decimal("20.00"),
+                standing_charge=Decimal("50.00"),
+            )
+        )
+    assert _stored_costs(mariadb_client) == []
+
+    assert mariadb_client.rebuild_consumption_cost() == 3
+    assert len(_stored_costs(mariadb_client)) == 3
+
+
+def test_pruning_consumption_prunes_its_cost_rows_too(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_electricity_meter(_agreement(PRODUCT_CODE, datetime(2022, 1, 1)))
+    mariadb_client.write_agreement(meter, meter.agreements)
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("20.00")])
+    mariadb_client.write_consumption(meter, _half_hours(4, "0.5"))
+
+    mariadb_client.prune_consumption_older_than(DAY + timedelta(hours=1))
+
+    assert [row.period_from for row in _stored_costs(mariadb_client)] == [
+        datetime(2026, 1, 10, 1, 0),
+        datetime(2026, 1, 10, 1, 30),
+    ]
+
+
+def _peak_bytes_rebuilding(mariadb_client: MariaDBClient, half_hours: int) -> int:
+    with mariadb_client.session_write_scope() as s:
+        bulk_upsert(
+            s,
+            model.consumption.__table__,
+            [
+                {
+                    "energy": "E",
+                    "slot": half_hour_slot(point.start),
+                    "period_from": point.start,
+                    "period_to": point.end,
+                    "raw_value": point.raw,
+                    "unit": point.unit.value,
+                    "est_kwh": point.est_kwh,
+                    "local_date": local_day.to_local_date(point.start),
+                }
+                for point in _half_hours(half_hours, "0.5")
+            ],
+        )
+
+    tracemalloc.start()
+    try:
+        assert mariadb_client.rebuild_consumption_cost() == half_hours
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.mark.parametrize("mariadb_client", [{"read_chunk_size": 300}], indirect=True)
+def test_rebuild_peak_memory_stays_flat_as_history_grows(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_electricity_meter(_agreement(PRODUCT_CODE, datetime(2022, 1, 1)))
+    mariadb_client.write_agreement(meter, meter.agreements)
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [_rate("20.00")])
+
+    # Without streaming, four times the history is roughly three times the
+    # peak; chunked, it is the same few chunks' worth either way.
+    month = _peak_bytes_rebuilding(mariadb_client, 1500)
+    four_months = _peak_bytes_rebuilding(mariadb_client, 6000)
+
+    assert four_months < month * 1.5
@@ -0,0 +1,136 @@
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+from data import local_day
+from data.model import Consumption, Energy, Unit
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.mysql.gaps import ConsumptionGapScanner
+from data.octopus.model import Agreement, Electricity
+
+# 29 March 2026 is the spring-forward day: 46 half-hours, not 48.
+BEFORE_CHANGE = date(2026, 3, 28)
+AFTER_CHANGE = date(2026, 3, 30)
+
+
+def _make_electricity_meter() -> Electricity:
+    return Electricity(
+        mpan="1234567890123",
+        serial_number="00A1234567",
+        agreements=[
+            Agreement(
+                tariff_code="E-1R-VAR-22-11-01-A",
+                valid_from=datetime(2022, 11, 1, tzinfo=UTC),
+                valid_to=None,
+            )
+        ],
+    )
+
+
+def _half_hours(
+    period_from: datetime, period_to: datetime, skip: set[datetime] | None = None
+) -> list[Consumption]:
+    readings = []
+    start = period_from
+    while start < period_to:
+        if start not in (skip or set()):
+            readings.append(
+                Consumption(
+                    raw=Decimal("0.1"),
+                    est_kwh=Decimal("0.1"),
+                    unit=Unit.kwh,
+                    start=start,
+                    end=start + timedelta(minutes=30),
+                )
+            )
+        start += timedelta(minutes=30)
+    return readings
+
+
+def _window() -> tuple[datetime, datetime]:
+    return (
+        local_day.start_of_local_day(BEFORE_CHANGE),
+        local_day.start_of_local_day(AFTER_CHANGE + timedelta(days=1)),
+    )
+
+
+def test_a_fully_stored_window_across_a_clock_change_has_no_gaps(
+    mariadb_client: MariaDBClient,
+) -> None:
+    period_from, period_to = _window()
+    mariadb_client.write_consumption(
+        _make_electricity_meter(), _half_hours(period_from, period_to)
+    )
+
+    gaps = ConsumptionGapScanner(mariadb_client).find(
+        Energy.electricity, period_from, period_to
+    )
+
+    assert gaps == []
+
+
+def test_missing_half_hours_coalesce_into_the_fewest_ranges_across_midnight(
+    mariadb_client: MariaDBClient,
+) -> None:
+    period_from, period_to = _window()
+    change_day_start = local_day.start_of_local_day(date(2026, 3, 29))
+    # The last hour of the 28th and the first half-hour of the 29th, then
+    # an hour around midday on the 30th (BST, so 11:00-12:00 UTC).
+    across_midnight = {
+        change_day_start - timedelta(minutes=60),
+        change_day_start - timedelta(minutes=30),
+        change_day_start,
+    }
+    midday = {
+        datetime(2026, 3, 30, 11, tzinfo=UTC),
+        datetime(2026, 3, 30, 11, 30, tzinfo=UTC),
+    }
+    mariadb_client.write_consumption(
+        _make_electricity_meter(),
+        _half_hours(period_from, period_to, skip=across_midnight | midday),
+    )
+
+    gaps = ConsumptionGapScanner(mariadb_client).find(
+        Energy.electricity, period_from, period_to
+    )
+
+    assert gaps == [
+        (
+            change_day_start - timedelta(minutes=60),
+            change_day_start + timedelta(minutes=30),
+        ),
+        (datetime(2026, 3, 30, 11, tzinfo=UTC), datetime(2026, 3, 30, 12, tzinfo=UTC)),
+    ]
+
+
+def test_a_window_starting_mid_day_reports_no_gap_before_its_start(
+    mariadb_client: MariaDBClient,
+) -> None:
+    # The retention window starts at midnight UTC, 01:00 local in summer.
+    period_from = datetime(2026, 6, 1, tzinfo=UTC)
+    period_to = local_day.start_of_local_day(date(2026, 6, 2))
+    mariadb_client.write_consumption(
+        _make_electricity_meter(), _half_hours(period_from, period_to)
+    )
+
+    gaps = ConsumptionGapScanner(mariadb_client).find(
+        Energy.electricity, period_from, period_to
+    )
+
+    assert gaps == []
+
+
+def test_each_gap_run_is_recorded_for_settlement_lag_trends(
+    mariadb_client: MariaDBClient,
+) -> None:
+    gaps = [
+        (datetime(2026, 3, 30, 11, tzinfo=UTC), datetime(2026, 3, 30, 12, tzinfo=UTC)),
+        (datetime(2026, 3, 31, 22, tzinfo=UTC), datetime(2026, 4, 1, 0, tzinfo=UTC)),
+    ]
+
+    ConsumptionGapScanner(mariadb_client).record_run(Energy.electricity, gaps, 5)
+
+    with mariadb_client.session_read_scope() as session:
+        (run,) = session.query(model.consumption_gap_run).all()
+    assert (run.energy, run.gap_ranges, run.missing_half_hours) == ("E", 2, 6)
+    assert run.recovered_half_hours == 5
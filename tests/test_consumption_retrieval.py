@@ -1,13 +1,20 @@
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 import responses
 from common.config import OctopusAPISettings
 from data.consumption import ConsumptionRetriever
-from data.model import Consumption, Energy
+from data.model import Consumption, Energy, Unit
+from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.gaps import ConsumptionGapScanner
 from data.octopus.api import OctopusEnergyAPIClient
 from data.octopus.model import Agreement, Electricity, Meter
+from data.octopus.timestamps import to_utc_z
+from data.warm_start import WarmStartSnapshot, WarmStartStore
+from responses import matchers
 
 CONSUMPTION_ENDPOINT = (
     "https://api.octopus.energy/v1/electricity-meter-points/"
@@ -34,20 +41,23 @@ class _RealConsumptionSource:
     def refresh_meters(self) -> None:
         pass
 
-    def fetch_consumption(
-        self, meter: Meter, period_from: datetime
-    ) -> tuple[str | None, list[Consumption]]:
-        return self._octopus.get_consumption(meter, period_from)
-
-    def fetch_consumption_page(
-        self, energy: Energy, next_page: str
-    ) -> tuple[str | None, list[Consumption]]:
-        return self._octopus.get_consumption_directly_from_endpoint(energy, next_page)
+    def fetch_consumption_range(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        return self._octopus.get_consumption_range(meter, period_from, period_to)
 
     def persist_consumption(self, meter: Meter, consumption: list[Consumption]) -> None:
         self._mariadb.write_consumption(meter, consumption)
 
 
+def _retriever(
+    source: _RealConsumptionSource, mariadb_client: MariaDBClient
+) -> ConsumptionRetriever:
+    return ConsumptionRetriever(
+        source, WarmStartStore(mariadb_client), ConsumptionGapScanner(mariadb_client)
+    )
+
+
 def _make_meter() -> Electricity:
     return Electricity(
         mpan="1234567890123",
@@ -62,20 +72,24 @@ def _make_meter() -> Electricity:
     )
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
 def test_refresh_resumes_from_the_true_max_across_all_pages_not_just_the_last(
-    monkeypatch: pytest.MonkeyPatch,
     mariadb_client: MariaDBClient,
 ) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     next_page_url = CONSUMPTION_ENDPOINT + "?page=2"
 
-    # First fetch (explicit period_from=2026-01-01): page 1 has a reading
-    # ending 2026-01-02, and points to a second, empty page.
+    # The first fetch window (from 2026-01-01) has a reading ending
+    # 2026-01-02 on its first page, and points to a second, empty page.
+    # Every other window, and the second page, is empty.
     responses.add(
         responses.GET,
-        CONSUMPTION_ENDPOINT
-        + "?page_size=100&period_from=2026-01-01T00:00:00Z&order_by=period",
+        CONSUMPTION_ENDPOINT,
+        match=[
+            matchers.query_param_matcher(
+                {"period_from": "2026-01-01T00:00:00Z"}, strict_match=False
+            )
+        ],
         json={
             "results": [
                 {
@@ -94,12 +108,9 @@ def test_refresh_resumes_from_the_true_max_across_all_pages_not_just_the_last(
         json={"results": [], "next": None},
         status=200,
     )
-    # refresh() resumes from page 1's true max (2026-01-02), not the empty
-    # final page's date — this is the exact bug this test pins down.
     responses.add(
         responses.GET,
-        CONSUMPTION_ENDPOINT
-        + "?page_size=100&period_from=2026-01-02T00:00:00Z&order_by=period",
+        CONSUMPTION_ENDPOINT,
         json={"results": [], "next": None},
         status=200,
     )
@@ -109,15 +120,135 @@ def test_refresh_resumes_from_the_true_max_across_all_pages_not_just_the_last(
         OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
     )
     source = _RealConsumptionSource(octopus, mariadb_client, [meter])
-    retriever = ConsumptionRetriever(source)
+    retriever = _retriever(source, mariadb_client)
 
     retriever.get_meter_consumption(meter, period_from=datetime(2026, 1, 1, tzinfo=UTC))
 
     retriever.refresh()
 
-    # The empty final page must not overwrite the resume point with a crash or
-    # a stale date — refresh() should resume from page 1's true latest date.
-    # If it resumed from the wrong date, the registered response above
-    # wouldn't match and responses would raise a ConnectionError instead.
-    resume_request_urls = [call.request.url for call in responses.calls]
-    assert any("period_from=2026-01-02T00" in url for url in resume_request_urls[2:])
+    # The empty final page, and the empty windows after it, must not
+    # overwrite the resume point with a crash or a stale date — refresh()
+    # should resume from page 1's true latest date.
+    request_urls = [call.request.url for call in responses.calls]
+    assert any("period_from=2026-01-02T00" in url for url in request_urls)
+
+
+@responses.activate
+def test_resume_after_a_warm_start_fetches_only_from_the_restored_cursor(
+    mariadb_client: MariaDBClient,
+) -> None:
+    responses.add(
+        responses.GET,
+        CONSUMPTION_ENDPOINT,
+        json={
+            "results": [
+                {
+                    "consumption": "1.0",
+                    "interval_start": "2026-01-10T12:00:00+00:00",
+                    "interval_end": "2026-01-10T12:30:00+00:00",
+                }
+            ],
+            "next": None,
+        },
+        status=200,
+    )
+    octopus = OctopusEnergyAPIClient(
+        OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
+    )
+    source = _RealConsumptionSource(octopus, mariadb_client, [_make_meter()])
+    cursor = datetime(2026, 1, 10, 12, tzinfo=UTC)
+    warm_start = WarmStartStore(mariadb_client)
+    warm_start.restored = WarmStartSnapshot(
+        consumption_cursors={Energy.electricity: cursor}
+    )
+    retriever = ConsumptionRetriever(
+        source, warm_start, ConsumptionGapScanner(mariadb_client)
+    )
+
+    retriever.resume(period_from=datetime(2025, 12, 1, tzinfo=UTC))
+
+    # Windows are fetched concurrently, so calls arrive in no fixed order.
+    request_urls = [call.request.url for call in responses.calls]
+    assert any("period_from=2026-01-10T12%3A00%3A00Z" in url for url in request_urls)
+    assert not any("period_from=2025-" in url for url in request_urls)
+    restored = WarmStartStore(mariadb_client).restore()
+    assert restored.consumption_cursors == {
+        Energy.electricity: datetime(2026, 1, 10, 12, 30, tzinfo=UTC)
+    }
+
+
+@responses.activate
+def test_resume_without_a_cursor_fetches_the_whole_window(
+    mariadb_client: MariaDBClient,
+) -> None:
+    responses.add(
+        responses.GET,
+        CONSUMPTION_ENDPOINT,
+        json={"results": [], "next": None},
+        status=200,
+    )
+    octopus = OctopusEnergyAPIClient(
+        OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
+    )
+    source = _RealConsumptionSource(octopus, mariadb_client, [_make_meter()])
+    retriever = _retriever(source, mariadb_client)
+
+    retriever.resume(period_from=datetime(2025, 12, 1, tzinfo=UTC))
+
+    request_urls = [call.request.url for call in responses.calls]
+    assert any("period_from=2025-12-01T00%3A00%3A00Z" in url for url in request_urls)
+
+
+@responses.activate
+def test_backfill_gaps_fetches_only_the_missing_ranges_and_records_the_recovery(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_meter()
+    today = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+    period_from = today - timedelta(days=3)
+    gap_from = today - timedelta(days=2, hours=-6)
+    stored = [
+        Consumption(
+            raw=Decimal("0.1"),
+            est_kwh=Decimal("0.1"),
+            unit=Unit.kwh,
+            start=period_from + timedelta(minutes=30 * slot),
+            end=period_from + timedelta(minutes=30 * (slot + 1)),
+        )
+        for slot in range(3 * 48 + 4)
+    ]
+    mariadb_client.write_consumption(
+        meter,
+        [c for c in stored if not gap_from <= c.start < gap_from + timedelta(hours=1)],
+    )
+    responses.add(
+        responses.GET,
+        CONSUMPTION_ENDPOINT,
+        json={
+            "results": [
+                {
+                    "consumption": "0.2",
+                    "interval_start": gap_from.isoformat(),
+                    "interval_end": (gap_from + timedelta(minutes=30)).isoformat(),
+                }
+            ],
+            "next": None,
+        },
+        status=200,
+    )
+    octopus = OctopusEnergyAPIClient(
+        OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
+    )
+    retriever = _retriever(
+        _RealConsumptionSource(octopus, mariadb_client, [meter]), mariadb_client
+    )
+
+    retriever.backfill_gaps(period_from=period_from)
+
+    (request,) = [call.request for call in responses.calls]
+    query = parse_qs(urlparse(request.url).query)
+    assert query["period_from"] == [to_utc_z(gap_from)]
+    assert query["period_to"] == [to_utc_z(gap_from + timedelta(hours=1))]
+    with mariadb_client.session_read_scope() as session:
+        (run,) = session.query(model.consumption_gap_run).all()
+    assert (run.missing_half_hours, run.recovered_half_hours) == (2, 1)
@@ -0,0 +1,143 @@
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+from data.consumption_summary import ConsumptionSummaryRetriever
+from data.model import Consumption, ConsumptionSummary, Energy, Unit
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.octopus.model import Agreement, Electricity
+
+
+def _make_electricity_meter() -> Electricity:
+    return Electricity(
+        mpan="1234567890123",
+        serial_number="00A1234567",
+        agreements=[
+            Agreement(
+                tariff_code="E-1R-VAR-22-11-01-A",
+                valid_from=datetime(2022, 11, 1, tzinfo=UTC),
+                valid_to=None,
+            )
+        ],
+    )
+
+
+def _half_hours(start: datetime, count: int, est_kwh: str) -> list[Consumption]:
+    return [
+        Consumption(
+            raw=Decimal(est_kwh),
+            est_kwh=Decimal(est_kwh),
+            unit=Unit.kwh,
+            start=start + timedelta(minutes=30 * slot),
+            end=start + timedelta(minutes=30 * (slot + 1)),
+        )
+        for slot in range(count)
+    ]
+
+
+def _hourly(mariadb_client: MariaDBClient) -> list[tuple[date, int, Decimal, int]]:
+    h = model.hourly_consumption_summary
+    with mariadb_client.session_read_scope() as session:
+        return [
+            (row.date, row.hour, row.total_kwh, row.half_hours)
+            for row in session.query(h).order_by(h.date, h.hour)
+        ]
+
+
+def _monthly(mariadb_client: MariaDBClient) -> list[tuple[date, Decimal, int]]:
+    m = model.monthly_consumption_summary
+    with mariadb_client.session_read_scope() as session:
+        return [
+            (row.month, row.total_kwh, row.days)
+            for row in session.query(m).order_by(m.month)
+        ]
+
+
+def test_written_consumption_is_rolled_up_by_europe_london_local_hour(
+    mariadb_client: MariaDBClient,
+) -> None:
+    # 22:00 UTC on 1 July is 23:00 BST: the last two half-hours are 2 July's.
+    mariadb_client.write_consumption(
+        _make_electricity_meter(),
+        _half_hours(datetime(2026, 7, 1, 22, 0, tzinfo=UTC), 4, "0.5"),
+    )
+
+    assert _hourly(mariadb_client) == [
+        (date(2026, 7, 1), 23, Decimal("1.00000"), 2),
+        (date(2026, 7, 2), 0, Decimal("1.00000"), 2),
+    ]
+
+
+def test_a_revised_half_hour_replaces_its_old_value_in_the_hourly_rollup(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _make_electricity_meter()
+    start = datetime(2026, 1, 10, 12, 0, tzinfo=UTC)
+    mariadb_client.write_consumption(meter, _half_hours(start, 2, "0.5"))
+
+    mariadb_client.write_consumption(meter, _half_hours(start, 1, "2.0"))
+
+    assert _hourly(mariadb_client) == [(date(2026, 1, 10), 12, Decimal("2.50000"), 2)]
+
+
+def test_the_repeated_fall_back_hour_is_one_bucket_of_four_half_hours(
+    mariadb_client: MariaDBClient,
+) -> None:
+    # Clocks go back at 02:00 BST on 25 October 2026: 00:00-02:00 UTC is
+    # 01:00-01:59 local, twice.
+    mariadb_client.write_consumption(
+        _make_electricity_meter(),
+        _half_hours(datetime(2026, 10, 25, 0, 0, tzinfo=UTC), 4, "0.25"),
+    )
+
+    assert _hourly(mariadb_client) == [(date(2026, 10, 25), 1, Decimal("1.00000"), 4)]
+
+
+def test_summary_writes_keep_the_monthly_rollup_in_step_with_the_daily_summary(
+    mariadb_client: MariaDBClient,
+) -> None:
+    def summary(day: date, total_kwh: str) -> ConsumptionSummary:
+        return ConsumptionSummary(
+            energy=Energy.electricity, date=day, total_kwh=Decimal(total_kwh)
+        )
+
+    mariadb_client.write_consumption_summary(
+        [
+            summary(date(2026, 1, 30), "10.0"),
+            summary(date(2026, 1, 31), "12.0"),
+            summary(date(2026, 2, 1), "8.0"),
+        ]
+    )
+    mariadb_client.write_consumption_summary([summary(date(2026, 1, 31), "2.0")])
+
+    assert _monthly(mariadb_client) == [
+        (date(2026, 1, 1), Decimal("12.00000"), 2),
+        (date(2026, 2, 1), Decimal("8.00000"), 1),
+    ]
+
+
+def test_a_summarization_refresh_rolls_its_days_up_into_their_month(
+    mariadb_client: MariaDBClient,
+) -> None:
+    mariadb_client.write_consumption(
+        _make_electricity_meter(),
+        _half_hours(datetime(2026, 3, 10, 12, 0, tzinfo=UTC), 4, "1.5"),
+    )
+
+    ConsumptionSummaryRetriever(mariadb_client).refresh()
+
+    assert _monthly(mariadb_client) == [(date(2026, 3, 1), Decimal("6.00000"), 1)]
+
+
+def test_hourly_totals_are_exact_for_values_sqlite_cannot_store_exactly(
+    mariadb_client: MariaDBClient,
+) -> None:
+    # 0.1 and 0.2 are inexact as the REAL SQLite keeps DECIMAL columns in.
+    meter = _make_electricity_meter()
+    start = datetime(2026, 1, 10, 12, 0, tzinfo=UTC)
+    mariadb_client.write_consumption(meter, _half_hours(start, 1, "0.1"))
+    mariadb_client.write_consumption(
+        meter, _half_hours(start + timedelta(minutes=30), 1, "0.2")
+    )
+
+    assert _hourly(mariadb_client) == [(date(2026, 1, 10), 12, Decimal("0.30000"), 2)]
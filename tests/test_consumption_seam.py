@@ -7,6 +7,7 @@ from common.config import OctopusAPISettings
 from data.model import Energy
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 from data.octopus.api import OctopusEnergyAPIClient
 from data.octopus.model import Agreement, Electricity
 
@@ -61,7 +62,7 @@ def test_consumption_fetched_from_octopus_is_persisted_and_queryable(
         stored = session.query(model.consumption).all()
 
     assert len(stored) == 1
-    assert stored[0].id == "E20260101000000"
+    assert stored[0].slot == half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC))
     assert stored[0].est_kwh == Decimal("1.234")
 
 
@@ -114,7 +115,7 @@ def test_a_bst_offset_consumption_reading_is_persisted_at_its_correct_utc_instan
         stored = session.query(model.consumption).all()
 
     assert len(stored) == 1
-    assert stored[0].id == "E20260701000000"
+    assert stored[0].slot == half_hour_slot(datetime(2026, 7, 1, tzinfo=UTC))
     assert stored[0].period_from == datetime(2026, 7, 1, 0, 0, tzinfo=UTC).replace(
         tzinfo=None
     )
@@ -123,11 +124,11 @@ def test_a_bst_offset_consumption_reading_is_persisted_at_its_correct_utc_instan
     )
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_consumption_response_missing_a_required_field_raises_a_clear_validation_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_consumption_response_missing_a_required_field_raises_a_clear_validation_error() -> (
+    None
+):
     responses.add(
         responses.GET,
         CONSUMPTION_ENDPOINT,
@@ -1,10 +1,12 @@
 from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 
+from data import local_day
 from data.consumption_summary import ConsumptionSummaryRetriever
 from data.model import Consumption, ConsumptionSummary, Energy, Unit
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 from data.octopus.model import Agreement, Electricity, Gas
 
 
@@ -155,44 +157,108 @@ def test_refresh_summarizes_a_gap_day_older_than_the_trailing_window(
     assert stored[0].total_kwh == Decimal("3.00000")
 
 
-def test_summarization_window_is_exactly_fourteen_trailing_days_inclusive_of_as_of(
+def test_a_day_not_rewritten_since_the_last_refresh_is_not_resummarized(
     mariadb_client: MariaDBClient,
 ) -> None:
     electricity = _make_electricity_meter()
-    as_of = datetime(2026, 1, 15, tzinfo=UTC)
-    # The 15th day back from as_of -- must be excluded from a 14-day
-    # trailing window that includes as_of itself (as_of, as_of-1, ...,
-    # as_of-13 = 14 dates total).
-    fifteenth_day_back = as_of - timedelta(days=14)
-
+    untouched_day = datetime(2026, 1, 10, tzinfo=UTC)
+    rewritten_day = datetime(2026, 1, 12, tzinfo=UTC)
     mariadb_client.write_consumption(
         electricity,
-        [_half_hour(fifteenth_day_back.replace(hour=0, minute=0), Decimal("5.0"))],
+        [
+            _half_hour(untouched_day, Decimal("5.0")),
+            _half_hour(rewritten_day, Decimal("1.0")),
+        ],
     )
-    # An existing summary row already covers this day, so it is not a
-    # "gap" either -- only trailing-window inclusion could pull it in.
+    ConsumptionSummaryRetriever(mariadb_client).refresh()
+    # Hand-edited so a re-read of untouched_day's raw rows would be visible.
     mariadb_client.write_consumption_summary(
         [
             ConsumptionSummary(
                 energy=Energy.electricity,
-                date=fifteenth_day_back.date(),
-                total_kwh=Decimal("1.0"),
+                date=untouched_day.date(),
+                total_kwh=Decimal("9.0"),
             )
         ]
     )
 
-    window = mariadb_client.read_consumption_summarization_window(as_of.date())
+    mariadb_client.write_consumption(
+        electricity, [_half_hour(rewritten_day, Decimal("2.0"))]
+    )
+    batch = mariadb_client.read_consumption_summarization_batch()
+
+    assert {(s.date, s.total_kwh) for s in batch.summaries} == {
+        (rewritten_day.date(), Decimal("2.00000"))
+    }
+
+
+def test_refresh_clears_the_dirty_marks_it_summarized(
+    mariadb_client: MariaDBClient,
+) -> None:
+    electricity = _make_electricity_meter()
+    mariadb_client.write_consumption(
+        electricity,
+        [_half_hour(datetime(2026, 1, 12, tzinfo=UTC), Decimal("1.0"))],
+    )
+
+    ConsumptionSummaryRetriever(mariadb_client).refresh()
 
-    windowed_days = {(s.energy, s.date) for s in window}
-    assert (Energy.electricity, fifteenth_day_back.date()) not in windowed_days
+    with mariadb_client.session_read_scope() as session:
+        assert session.query(model.consumption_dirty_day).count() == 0
+    assert mariadb_client.read_consumption_summarization_batch().summaries == []
+
+
+def test_a_day_re_marked_after_the_batch_was_read_stays_dirty(
+    mariadb_client: MariaDBClient,
+) -> None:
+    electricity = _make_electricity_meter()
+    day = datetime(2026, 1, 12, tzinfo=UTC)
+    mariadb_client.write_consumption(electricity, [_half_hour(day, Decimal("1.0"))])
+    batch = mariadb_client.read_consumption_summarization_batch()
+
+    mariadb_client.write_consumption(electricity, [_half_hour(day, Decimal("3.0"))])
+    mariadb_client.complete_consumption_summarization(batch)
+
+    next_batch = mariadb_client.read_consumption_summarization_batch()
+    assert [(s.date, s.total_kwh) for s in next_batch.summaries] == [
+        (day.date(), Decimal("3.00000"))
+    ]
+
+
+def test_the_first_refresh_summarizes_raw_rows_written_before_dirty_tracking(
+    mariadb_client: MariaDBClient,
+) -> None:
+    # Rows inserted directly, bypassing write_consumption, stand in for a
+    # database populated before dirty-day marks existed.
+    with mariadb_client.session_write_scope() as session:
+        session.add(
+            model.consumption(
+                slot=half_hour_slot(datetime(2026, 1, 5)),
+                energy="E",
+                period_from=datetime(2026, 1, 5),
+                period_to=datetime(2026, 1, 5, 0, 30),
+                raw_value=Decimal("4.0"),
+                unit="kwh",
+                est_kwh=Decimal("4.0"),
+                local_date=local_day.to_local_date(datetime(2026, 1, 5)),
+            )
+        )
+
+    ConsumptionSummaryRetriever(mariadb_client).refresh()
+
+    with mariadb_client.session_read_scope() as session:
+        stored = session.query(model.daily_consumption_summary).one()
+        watermark = session.query(model.job_watermark).one()
+    assert (stored.date, stored.total_kwh) == (date(2026, 1, 5), Decimal("4.00000"))
+    assert watermark.job_name == "consumption_summary"
 
 
 def test_an_empty_consumption_table_produces_no_summaries(
     mariadb_client: MariaDBClient,
 ) -> None:
-    # No raw consumption at all -- the candidate-days-restricted summary
-    # lookup must not query with an empty IN (...) list, and the window
-    # must come back empty rather than erroring.
-    window = mariadb_client.read_consumption_summarization_window(date(2026, 7, 20))
+    batch = mariadb_client.read_consumption_summarization_batch(
+        datetime(2026, 7, 20, tzinfo=UTC)
+    )
 
-    assert window == []
+    assert batch.summaries == []
+    assert batch.dirty_days == []
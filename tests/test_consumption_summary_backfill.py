@@ -1,10 +1,15 @@
+import json
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
+from typing import Any
+from urllib.parse import parse_qs, urlparse
 
+import pytest
 import responses
 from common.config import OctopusAPISettings
-from data.consumption_summary import ConsumptionSummaryBackfill
-from data.model import Consumption, ConsumptionSummary, Energy
+from common.exceptions import APIError
+from data.consumption_summary import ConsumptionSummaryBackfill, plan_month_chunks
+from data.model import Consumption, ConsumptionSummary
 from data.mysql import model
 from data.mysql.client import MariaDBClient
 from data.octopus.api import OctopusEnergyAPIClient
@@ -35,18 +40,39 @@ class _RealConsumptionSummaryBackfillSource:
     def refresh_meters(self) -> None:
         pass
 
-    def fetch_consumption(
-        self, meter: Meter, period_from: datetime
-    ) -> tuple[str | None, list[Consumption]]:
-        return self._octopus.get_consumption(meter, period_from)
+    def fetch_daily_consumption(
+        self, meter: Meter, period_from: datetime, period_to: datetime
+    ) -> list[Consumption]:
+        return self._octopus.get_daily_consumption(meter, period_from, period_to)
+
+    def persist_consumption_summary(
+        self, summaries: list[ConsumptionSummary], backfilled_to: datetime | None = None
+    ) -> None:
+        self._mariadb.write_consumption_summary(summaries, backfilled_to)
+
+    def read_backfill_checkpoint(self) -> datetime | None:
+        return self._mariadb.read_backfill_checkpoint()
 
-    def fetch_consumption_page(
-        self, energy: Energy, next_page: str
-    ) -> tuple[str | None, list[Consumption]]:
-        return self._octopus.get_consumption_directly_from_endpoint(energy, next_page)
 
-    def persist_consumption_summary(self, summaries: list[ConsumptionSummary]) -> None:
-        self._mariadb.write_consumption_summary(summaries)
+def _serve_window(
+    readings: list[dict[str, str]],
+) -> Any:
+    # Answers each fetch window with just the day totals that start inside
+    # it, as Octopus does for a group_by=day period_from/period_to request.
+    def callback(request: Any) -> tuple[int, dict[str, str], str]:
+        query = parse_qs(urlparse(request.url).query)
+        period_from = datetime.fromisoformat(query["period_from"][0])
+        period_to = datetime.fromisoformat(query["period_to"][0])
+        results = [
+            reading
+            for reading in readings
+            if period_from
+            <= datetime.fromisoformat(reading["interval_start"])
+            < period_to
+        ]
+        return 200, {}, json.dumps({"results": results, "next": None})
+
+    return callback
 
 
 def _make_meter() -> Electricity:
@@ -64,38 +90,28 @@ def _make_meter() -> Electricity:
 
 
 @responses.activate
-def test_run_summarizes_two_years_of_fetched_consumption_without_writing_raw_rows(
+def test_run_summarizes_two_years_of_fetched_day_totals_without_writing_raw_rows(
     mariadb_client: MariaDBClient,
 ) -> None:
     as_of = datetime(2026, 1, 15, tzinfo=UTC)
-    period_from = as_of - timedelta(days=730)
 
-    responses.add(
+    responses.add_callback(
         responses.GET,
-        CONSUMPTION_ENDPOINT
-        + f"?page_size=100&period_from={period_from.isoformat().replace('+00:00', 'Z')}"
-        "&order_by=period",
-        json={
-            "results": [
-                {
-                    "consumption": "1.5",
-                    "interval_start": "2024-06-01T00:00:00+00:00",
-                    "interval_end": "2024-06-01T00:30:00+00:00",
-                },
+        CONSUMPTION_ENDPOINT,
+        callback=_serve_window(
+            [
                 {
-                    "consumption": "2.5",
-                    "interval_start": "2024-06-01T00:30:00+00:00",
-                    "interval_end": "2024-06-01T01:00:00+00:00",
+                    "consumption": "4.0",
+                    "interval_start": "2024-06-01T00:00:00+01:00",
+                    "interval_end": "2024-06-02T00:00:00+01:00",
                 },
                 {
                     "consumption": "1.0",
-                    "interval_start": "2024-06-02T00:00:00+00:00",
-                    "interval_end": "2024-06-02T00:30:00+00:00",
+                    "interval_start": "2024-06-02T00:00:00+01:00",
+                    "interval_end": "2024-06-03T00:00:00+01:00",
                 },
-            ],
-            "next": None,
-        },
-        status=200,
+            ]
+        ),
     )
 
     meter = _make_meter()
@@ -132,14 +148,8 @@ def test_run_anchors_period_from_to_midnight_even_when_as_of_has_a_time_componen
     as_of = datetime(2026, 1, 15, 14, 32, 7, tzinfo=UTC)
     expected_period_from = datetime(2026, 1, 15, tzinfo=UTC) - timedelta(days=730)
 
-    responses.add(
-        responses.GET,
-        CONSUMPTION_ENDPOINT
-        + "?page_size=100&period_from="
-        + expected_period_from.isoformat().replace("+00:00", "Z")
-        + "&order_by=period",
-        json={"results": [], "next": None},
-        status=200,
+    responses.add_callback(
+        responses.GET, CONSUMPTION_ENDPOINT, callback=_serve_window([])
     )
 
     meter = _make_meter()
@@ -149,7 +159,113 @@ def test_run_anchors_period_from_to_midnight_even_when_as_of_has_a_time_componen
     source = _RealConsumptionSummaryBackfillSource(octopus, mariadb_client, [meter])
     backfill = ConsumptionSummaryBackfill(source)
 
-    # If period_from had carried as_of's 14:32:07 time-of-day instead of
-    # being anchored to midnight, the registered response above wouldn't
-    # match and `responses` would raise a ConnectionError instead.
     backfill.run(as_of=as_of)
+
+    requested_from = min(
+        parse_qs(urlparse(call.request.url).query)["period_from"][0]
+        for call in responses.calls
+    )
+    assert requested_from == expected_period_from.isoformat().replace("+00:00", "Z")
+
+
+def _backfill(mariadb_client: MariaDBClient) -> ConsumptionSummaryBackfill:
+    octopus = OctopusEnergyAPIClient(
+        OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
+    )
+    return ConsumptionSummaryBackfill(
+        _RealConsumptionSummaryBackfillSource(octopus, mariadb_client, [_make_meter()])
+    )
+
+
+def _requested_windows() -> list[tuple[datetime, datetime]]:
+    windows = []
+    for call in responses.calls:
+        query = parse_qs(urlparse(call.request.url).query)
+        windows.append(
+            (
+                datetime.fromisoformat(query["period_from"][0]),
+                datetime.fromisoformat(query["period_to"][0]),
+            )
+        )
+    return windows
+
+
+@responses.activate
+def test_run_requests_day_totals_one_local_month_at_a_time_and_checkpoints_each(
+    mariadb_client: MariaDBClient,
+) -> None:
+    as_of = datetime(2026, 1, 15, 14, 32, tzinfo=UTC)
+    responses.add_callback(
+        responses.GET, CONSUMPTION_ENDPOINT, callback=_serve_window([])
+    )
+
+    _backfill(mariadb_client).run(as_of=as_of)
+
+    windows = _requested_windows()
+    assert all(
+        parse_qs(urlparse(call.request.url).query)["group_by"] == ["day"]
+        for call in responses.calls
+    )
+    # 16 Jan 2024 to the end of that month, 23 whole months, then 1-15 Jan 2026.
+    assert len(windows) == 25
+    assert windows == plan_month_chunks(windows[0][0], as_of)
+    # Summer months start at local midnight, an hour before UTC's.
+    assert (
+        datetime(2024, 7, 31, 23, tzinfo=UTC),
+        datetime(2024, 8, 31, 23, tzinfo=UTC),
+    ) in windows
+    assert mariadb_client.read_backfill_checkpoint() == as_of
+
+
+@pytest.mark.usefixtures("no_retry_delay")
+@responses.activate
+def test_a_failed_run_resumes_from_the_last_month_it_persisted(
+    mariadb_client: MariaDBClient,
+) -> None:
+    as_of = datetime(2026, 1, 15, tzinfo=UTC)
+    march_2025 = datetime(2025, 3, 1, tzinfo=UTC)
+    readings = [
+        {
+            "consumption": "3.0",
+            "interval_start": "2025-02-10T00:00:00+00:00",
+            "interval_end": "2025-02-11T00:00:00+00:00",
+        },
+        {
+            "consumption": "5.0",
+            "interval_start": "2025-03-10T00:00:00+00:00",
+            "interval_end": "2025-03-11T00:00:00+00:00",
+        },
+    ]
+    serve = _serve_window(readings)
+    outage = {"active": True}
+
+    def callback(request: Any) -> tuple[int, dict[str, str], str]:
+        query = parse_qs(urlparse(request.url).query)
+        if outage["active"] and (
+            datetime.fromisoformat(query["period_from"][0]) >= march_2025
+        ):
+            return 500, {}, json.dumps({"detail": "Internal server error"})
+        return serve(request)
+
+    responses.add_callback(responses.GET, CONSUMPTION_ENDPOINT, callback=callback)
+    backfill = _backfill(mariadb_client)
+
+    with pytest.raises(APIError):
+        backfill.run(as_of=as_of)
+    checkpoint = mariadb_client.read_backfill_checkpoint()
+    outage["active"] = False
+    calls_before_retry = len(responses.calls)
+    backfill.run(as_of=as_of)
+
+    with mariadb_client.session_read_scope() as session:
+        stored = {
+            row.date: row.total_kwh
+            for row in session.query(model.daily_consumption_summary).all()
+        }
+    resumed_windows = _requested_windows()[calls_before_retry:]
+    assert checkpoint == march_2025
+    assert resumed_windows[0][0] == march_2025
+    assert stored == {
+        datetime(2025, 2, 10).date(): Decimal("3.00000"),
+        datetime(2025, 3, 10).date(): Decimal("5.00000"),
+    }
@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import responses
+from common.config import OctopusAPISettings
+from data.octopus.api import OctopusEnergyAPIClient
+from data.octopus.consumption import MAX_PAGE_SIZE, plan_fetch_windows
+from data.octopus.model import Agreement, Electricity
+
+CONSUMPTION_ENDPOINT = (
+    "https://api.octopus.energy/v1/electricity-meter-points/"
+    "1234567890123/meters/00A1234567/consumption/"
+)
+PERIOD_FROM = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _octopus(fetch_workers: int = 4) -> OctopusEnergyAPIClient:
+    return OctopusEnergyAPIClient(
+        OctopusAPISettings(
+            account_number="A-1234ABCD",
+            api_key="sk_live_test",
+            fetch_workers=fetch_workers,
+        )
+    )
+
+
+def _meter() -> Electricity:
+    return Electricity(
+        mpan="1234567890123",
+        serial_number="00A1234567",
+        agreements=[
+            Agreement(
+                tariff_code="E-1R-VAR-22-11-01-A",
+                valid_from=datetime(2022, 11, 1, tzinfo=UTC),
+                valid_to=None,
+            )
+        ],
+    )
+
+
+def _reading(start: datetime) -> dict[str, str]:
+    return {
+        "consumption": "0.5",
+        "interval_start": start.isoformat(),
+        "interval_end": (start + timedelta(minutes=30)).isoformat(),
+    }
+
+
+def test_a_range_is_planned_as_back_to_back_windows_ending_at_period_to() -> None:
+    period_to = PERIOD_FROM + timedelta(days=70)
+
+    windows = plan_fetch_windows(PERIOD_FROM, period_to, timedelta(days=31))
+
+    assert windows == [
+        (PERIOD_FROM, PERIOD_FROM + timedelta(days=31)),
+        (PERIOD_FROM + timedelta(days=31), PERIOD_FROM + timedelta(days=62)),
+        (PERIOD_FROM + timedelta(days=62), period_to),
+    ]
+
+
+@responses.activate
+def test_windows_fetched_concurrently_are_merged_in_period_order() -> None:
+    in_flight, most_in_flight = 0, 0
+    lock = threading.Lock()
+
+    def callback(request: Any) -> tuple[int, dict[str, str], str]:
+        nonlocal in_flight, most_in_flight
+        query = parse_qs(urlparse(request.url).query)
+        window_from = datetime.fromisoformat(query["period_from"][0])
+        with lock:
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+        # The earliest window answers last.
+        time.sleep(0.2 if window_from == PERIOD_FROM else 0.05)
+        with lock:
+            in_flight -= 1
+        body = {"results": [_reading(window_from)], "next": None}
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(responses.GET, CONSUMPTION_ENDPOINT, callback=callback)
+
+    consumption = _octopus().get_consumption_range(
+        _meter(), PERIOD_FROM, PERIOD_FROM + timedelta(days=120)
+    )
+
+    starts = [point.start for point in consumption]
+    assert starts == sorted(starts)
+    assert len(starts) == len(responses.calls) == 4
+    assert most_in_flight > 1
+    assert {
+        parse_qs(urlparse(call.request.url).query)["page_size"][0]
+        for call in responses.calls
+    } == {str(MAX_PAGE_SIZE)}
+
+
+@responses.activate
+def test_a_reading_returned_by_both_windows_at_a_boundary_is_kept_once() -> None:
+    boundary = PERIOD_FROM + timedelta(days=31)
+    responses.add(
+        responses.GET,
+        CONSUMPTION_ENDPOINT,
+        json={"results": [_reading(boundary)], "next": None},
+        status=200,
+    )
+
+    consumption = _octopus().get_consumption_range(
+        _meter(), PERIOD_FROM, PERIOD_FROM + timedelta(days=40)
+    )
+
+    assert [point.start for point in consumption] == [boundary]
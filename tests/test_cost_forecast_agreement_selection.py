@@ -4,11 +4,13 @@ from decimal import Decimal
 import pytest
 import responses
 from common.config import OctopusAPISettings
+from data import local_day
 from data.cost_forecast import CostForecastRetriever
 from data.local_day import start_of_local_day
 from data.model import CostForecast, DailyCostSummary
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 from data.octopus.kraken import BillingPeriodClient, KrakenTransport
 from data.octopus.model import (
     AgileForecastReading,
@@ -18,6 +20,7 @@ from data.octopus.model import (
     Meter,
     Rate,
 )
+from data.rate_timeline import RateTimeline
 from sqlalchemy.orm import Session
 
 GRAPHQL_ENDPOINT = "https://api.octopus.energy/v1/graphql/"
@@ -61,10 +64,12 @@ class _RealCostForecastSource:
             period_from, period_to, region
         )
 
-    def read_current_product_rate(
-        self, product_code: str, region: str, as_of: datetime
-    ) -> Rate | None:
-        return self._mariadb.read_current_product_rate(product_code, region, as_of)
+    def read_rate_timeline(
+        self, product_code: str, region: str, period_from: datetime, period_to: datetime
+    ) -> RateTimeline[Rate]:
+        return self._mariadb.read_rate_timeline(
+            product_code, region, period_from, period_to
+        )
 
     def persist_cost_forecast(self, forecast: CostForecast) -> None:
         self._mariadb.write_cost_forecast(forecast)
@@ -81,13 +86,14 @@ def _seed_complete_day(
         slot_start = start + timedelta(minutes=30 * slot)
         s.add(
             model.consumption(
-                id=f"{energy}{slot_start.strftime('%Y%m%d%H%M%S')}",
+                slot=half_hour_slot(slot_start),
                 energy=energy,
                 period_from=slot_start,
                 period_to=slot_start + timedelta(minutes=30),
                 raw_value=Decimal(est_kwh_per_slot),
                 unit="kWh",
                 est_kwh=Decimal(est_kwh_per_slot),
+                local_date=local_day.to_local_date(slot_start),
             )
         )
 
@@ -120,7 +126,7 @@ def _mock_billing_period(start: str, end: str, is_fixed: bool = True) -> None:
         GRAPHQL_ENDPOINT,
         json={
             "data": {
-                "account": {
+                "q0": {
                     "billingOptions": {
                         "currentBillingPeriodStartDate": start,
                         "currentBillingPeriodEndDate": end,
@@ -134,6 +140,9 @@ def _mock_billing_period(start: str, end: str, is_fixed: bool = True) -> None:
 
 
 def _source(mariadb: MariaDBClient, meters: list[Meter]) -> _RealCostForecastSource:
+    # Tests seed agreement/rate/consumption rows directly, bypassing the
+    # write-time maintenance of consumption_cost -- derive it once here.
+    mariadb.rebuild_consumption_cost()
     settings = OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
     return _RealCostForecastSource(
         mariadb,
@@ -183,7 +192,7 @@ def _seed_fixed_tariff_agreement_and_rate(s: Session) -> None:
     # Agreement list passed to CostForecastRetriever.
     s.add(
         model.agreement(
-            id="E20220101000000",
+            slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
             energy="E",
             product_code=PRODUCT_CODE,
             tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -193,7 +202,7 @@ def _seed_fixed_tariff_agreement_and_rate(s: Session) -> None:
     )
     s.add(
         model.product_rate(
-            id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+            slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
             product_code=PRODUCT_CODE,
             region=REGION,
             valid_from=datetime(2026, 1, 1, tzinfo=UTC),
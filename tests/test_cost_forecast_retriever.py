@@ -5,11 +5,13 @@ import pytest
 import responses
 from common.config import OctopusAPISettings
 from common.exceptions import APIError
+from data import local_day
 from data.cost_forecast import CostForecastRetriever
 from data.local_day import start_of_local_day
 from data.model import CostForecast, DailyCostSummary
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 from data.octopus.kraken import BillingPeriodClient, KrakenTransport
 from data.octopus.model import (
     AgileForecastReading,
@@ -19,6 +21,7 @@ from data.octopus.model import (
     Meter,
     Rate,
 )
+from data.rate_timeline import RateTimeline
 from sqlalchemy.orm import Session
 
 GRAPHQL_ENDPOINT = "https://api.octopus.energy/v1/graphql/"
@@ -64,10 +67,12 @@ class _RealCostForecastSource:
             period_from, period_to, region
         )
 
-    def read_current_product_rate(
-        self, product_code: str, region: str, as_of: datetime
-    ) -> Rate | None:
-        return self._mariadb.read_current_product_rate(product_code, region, as_of)
+    def read_rate_timeline(
+        self, product_code: str, region: str, period_from: datetime, period_to: datetime
+    ) -> RateTimeline[Rate]:
+        return self._mariadb.read_rate_timeline(
+            product_code, region, period_from, period_to
+        )
 
     def persist_cost_forecast(self, forecast: CostForecast) -> None:
         self._mariadb.write_cost_forecast(forecast)
@@ -84,13 +89,14 @@ def _seed_complete_day(
         slot_start = start + timedelta(minutes=30 * slot)
         s.add(
             model.consumption(
-                id=f"{energy}{slot_start.strftime('%Y%m%d%H%M%S')}",
+                slot=half_hour_slot(slot_start),
                 energy=energy,
                 period_from=slot_start,
                 period_to=slot_start + timedelta(minutes=30),
                 raw_value=Decimal(est_kwh_per_slot),
                 unit="kWh",
                 est_kwh=Decimal(est_kwh_per_slot),
+                local_date=local_day.to_local_date(slot_start),
             )
         )
 
@@ -148,7 +154,7 @@ def _mock_billing_period(start: str, end: str, is_fixed: bool = True) -> None:
         GRAPHQL_ENDPOINT,
         json={
             "data": {
-                "account": {
+                "q0": {
                     "billingOptions": {
                         "currentBillingPeriodStartDate": start,
                         "currentBillingPeriodEndDate": end,
@@ -162,6 +168,9 @@ def _mock_billing_period(start: str, end: str, is_fixed: bool = True) -> None:
 
 
 def _source(mariadb: MariaDBClient, meters: list[Meter]) -> _RealCostForecastSource:
+    # Tests seed agreement/rate/consumption rows directly, bypassing the
+    # write-time maintenance of consumption_cost -- derive it once here.
+    mariadb.rebuild_consumption_cost()
     settings = OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
     return _RealCostForecastSource(
         mariadb,
@@ -180,7 +189,7 @@ def test_fixed_tariff_actual_cost_and_projection(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="E20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="E",
                 product_code=PRODUCT_CODE,
                 tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -190,7 +199,7 @@ def test_fixed_tariff_actual_cost_and_projection(
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -247,7 +256,7 @@ def test_standing_charge_is_charged_exactly_once_per_day_with_a_non_midnight_as_
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="E20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="E",
                 product_code=PRODUCT_CODE,
                 tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -257,7 +266,7 @@ def test_standing_charge_is_charged_exactly_once_per_day_with_a_non_midnight_as_
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -276,13 +285,16 @@ def test_standing_charge_is_charged_exactly_once_per_day_with_a_non_midnight_as_
         _seed_complete_day(s, date(2026, 7, 7), "0.125")
         s.add(
             model.consumption(
-                id="E20260708000000",
+                slot=half_hour_slot(datetime(2026, 7, 8, 0, 0, tzinfo=UTC)),
                 energy="E",
                 period_from=datetime(2026, 7, 8, 0, 0, tzinfo=UTC),
                 period_to=datetime(2026, 7, 8, 0, 30, tzinfo=UTC),
                 raw_value=Decimal("6.0"),
                 unit="kWh",
                 est_kwh=Decimal("6.0"),
+                local_date=local_day.to_local_date(
+                    datetime(2026, 7, 8, 0, 0, tzinfo=UTC)
+                ),
             )
         )
 
@@ -315,7 +327,7 @@ def _seed_agile_agreement_and_rate(
 ) -> None:
     s.add(
         model.agreement(
-            id="E20220101000000",
+            slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
             energy="E",
             product_code=AGILE_PRODUCT_CODE,
             tariff_code=f"E-1R-{AGILE_PRODUCT_CODE}-{REGION}",
@@ -325,7 +337,7 @@ def _seed_agile_agreement_and_rate(
     )
     s.add(
         model.product_rate(
-            id=f"{AGILE_PRODUCT_CODE}_{REGION}_202607010000",
+            slot=half_hour_slot(datetime(2026, 7, 1, tzinfo=UTC)),
             product_code=AGILE_PRODUCT_CODE,
             region=REGION,
             valid_from=datetime(2026, 7, 1, tzinfo=UTC),
@@ -367,13 +379,16 @@ def test_agile_tariff_costs_each_remaining_slot_at_its_own_rate_not_a_flat_avera
         _seed_agile_agreement_and_rate(s, standing_charge="50.00", unit_rate="25.00")
         s.add(
             model.consumption(
-                id="E20260706000000",
+                slot=half_hour_slot(datetime(2026, 7, 6, 0, 0, tzinfo=UTC)),
                 energy="E",
                 period_from=datetime(2026, 7, 6, 0, 0, tzinfo=UTC),
                 period_to=datetime(2026, 7, 6, 0, 30, tzinfo=UTC),
                 raw_value=Decimal("24.0"),
                 unit="kWh",
                 est_kwh=Decimal("24.0"),
+                local_date=local_day.to_local_date(
+                    datetime(2026, 7, 6, 0, 0, tzinfo=UTC)
+                ),
             )
         )
 
@@ -578,7 +593,7 @@ def test_a_zero_consumption_elapsed_day_still_contributes_its_standing_charge(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="E20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="E",
                 product_code=PRODUCT_CODE,
                 tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -588,7 +603,7 @@ def test_a_zero_consumption_elapsed_day_still_contributes_its_standing_charge(
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -638,7 +653,7 @@ def test_a_lag_incomplete_elapsed_day_gets_the_same_gap_fill_as_a_true_zero_day(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="E20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="E",
                 product_code=PRODUCT_CODE,
                 tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -648,7 +663,7 @@ def test_a_lag_incomplete_elapsed_day_gets_the_same_gap_fill_as_a_true_zero_day(
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -665,13 +680,16 @@ def test_a_lag_incomplete_elapsed_day_gets_the_same_gap_fill_as_a_true_zero_day(
         for slot in range(10):
             s.add(
                 model.consumption(
-                    id=f"E{(jul7_start + timedelta(minutes=30 * slot)).strftime('%Y%m%d%H%M%S')}",
+                    slot=half_hour_slot(jul7_start + timedelta(minutes=30 * slot)),
                     energy="E",
                     period_from=jul7_start + timedelta(minutes=30 * slot),
                     period_to=jul7_start + timedelta(minutes=30 * (slot + 1)),
                     raw_value=Decimal("5.0"),
                     unit="kWh",
                     est_kwh=Decimal("5.0"),
+                    local_date=local_day.to_local_date(
+                        jul7_start + timedelta(minutes=30 * slot)
+                    ),
                 )
             )
 
@@ -709,7 +727,7 @@ def test_the_only_elapsed_day_being_gap_filled_still_produces_a_forecast(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="E20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="E",
                 product_code=PRODUCT_CODE,
                 tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -719,7 +737,7 @@ def test_the_only_elapsed_day_being_gap_filled_still_produces_a_forecast(
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -759,7 +777,7 @@ def test_no_current_product_rate_raises_a_clear_error(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="E20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="E",
                 product_code=PRODUCT_CODE,
                 tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -772,7 +790,7 @@ def test_no_current_product_rate_raises_a_clear_error(
         # for "the current rate" finds nothing.
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -783,13 +801,16 @@ def test_no_current_product_rate_raises_a_clear_error(
         )
         s.add(
             model.consumption(
-                id="E20260706000000",
+                slot=half_hour_slot(datetime(2026, 7, 6, 0, 0, tzinfo=UTC)),
                 energy="E",
                 period_from=datetime(2026, 7, 6, 0, 0, tzinfo=UTC),
                 period_to=datetime(2026, 7, 6, 0, 30, tzinfo=UTC),
                 raw_value=Decimal("2.0"),
                 unit="kWh",
                 est_kwh=Decimal("2.0"),
+                local_date=local_day.to_local_date(
+                    datetime(2026, 7, 6, 0, 0, tzinfo=UTC)
+                ),
             )
         )
 
@@ -816,7 +837,7 @@ def test_no_product_rate_for_a_zero_consumption_elapsed_day_raises_and_writes_no
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="E20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="E",
                 product_code=PRODUCT_CODE,
                 tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -831,7 +852,7 @@ def test_no_product_rate_for_a_zero_consumption_elapsed_day_raises_and_writes_no
         # rate lookup from the already-tested remaining-cost lookup.
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -842,7 +863,7 @@ def test_no_product_rate_for_a_zero_consumption_elapsed_day_raises_and_writes_no
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202607071300",
+                slot=half_hour_slot(datetime(2026, 7, 7, 13, 0, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 7, 7, 13, 0, tzinfo=UTC),
@@ -853,13 +874,16 @@ def test_no_product_rate_for_a_zero_consumption_elapsed_day_raises_and_writes_no
         )
         s.add(
             model.consumption(
-                id="E20260706000000",
+                slot=half_hour_slot(datetime(2026, 7, 6, 0, 0, tzinfo=UTC)),
                 energy="E",
                 period_from=datetime(2026, 7, 6, 0, 0, tzinfo=UTC),
                 period_to=datetime(2026, 7, 6, 0, 30, tzinfo=UTC),
                 raw_value=Decimal("2.0"),
                 unit="kWh",
                 est_kwh=Decimal("2.0"),
+                local_date=local_day.to_local_date(
+                    datetime(2026, 7, 6, 0, 0, tzinfo=UTC)
+                ),
             )
         )
 
@@ -874,12 +898,11 @@ def test_no_product_rate_for_a_zero_consumption_elapsed_day_raises_and_writes_no
         assert session.query(model.cost_forecast).count() == 0
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
 def test_kraken_unreachable_raises_and_writes_no_row(
     mariadb_client: MariaDBClient,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     responses.add(
         responses.POST,
         GRAPHQL_ENDPOINT,
@@ -898,12 +921,11 @@ def test_kraken_unreachable_raises_and_writes_no_row(
         assert session.query(model.cost_forecast).count() == 0
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
 def test_kraken_unreachable_leaves_a_previous_row_unchanged(
     mariadb_client: MariaDBClient,
-    monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     previous = CostForecast(
         billing_period_start=date(2026, 6, 6),
         billing_period_end=date(2026, 7, 6),
@@ -1,8 +1,10 @@
 from datetime import UTC, datetime
 from decimal import Decimal
 
+from data import local_day
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 from sqlalchemy import and_, or_
 
 
@@ -52,7 +54,7 @@ def test_electricity_cost_is_computable_via_a_simple_join(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="E20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="E",
                 product_code="AGILE-24-10-01",
                 tariff_code="E-1R-AGILE-24-10-01-H",
@@ -62,7 +64,7 @@ def test_electricity_cost_is_computable_via_a_simple_join(
         )
         s.add(
             model.product_rate(
-                id="AGILE-24-10-01_H_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, 0, 0, tzinfo=UTC)),
                 product_code="AGILE-24-10-01",
                 region="H",
                 valid_from=datetime(2026, 1, 1, 0, 0, tzinfo=UTC),
@@ -73,7 +75,7 @@ def test_electricity_cost_is_computable_via_a_simple_join(
         )
         s.add(
             model.product_rate(
-                id="AGILE-24-10-01_H_202601010030",
+                slot=half_hour_slot(datetime(2026, 1, 1, 0, 30, tzinfo=UTC)),
                 product_code="AGILE-24-10-01",
                 region="H",
                 valid_from=datetime(2026, 1, 1, 0, 30, tzinfo=UTC),
@@ -84,24 +86,30 @@ def test_electricity_cost_is_computable_via_a_simple_join(
         )
         s.add(
             model.consumption(
-                id="E20260101000000",
+                slot=half_hour_slot(datetime(2026, 1, 1, 0, 0, tzinfo=UTC)),
                 energy="E",
                 period_from=datetime(2026, 1, 1, 0, 0, tzinfo=UTC),
                 period_to=datetime(2026, 1, 1, 0, 30, tzinfo=UTC),
                 raw_value=Decimal("0.5"),
                 unit="kWh",
                 est_kwh=Decimal("0.5"),
+                local_date=local_day.to_local_date(
+                    datetime(2026, 1, 1, 0, 0, tzinfo=UTC)
+                ),
             )
         )
         s.add(
             model.consumption(
-                id="E20260101003000",
+                slot=half_hour_slot(datetime(2026, 1, 1, 0, 30, tzinfo=UTC)),
                 energy="E",
                 period_from=datetime(2026, 1, 1, 0, 30, tzinfo=UTC),
                 period_to=datetime(2026, 1, 1, 1, 0, tzinfo=UTC),
                 raw_value=Decimal("0.3"),
                 unit="kWh",
                 est_kwh=Decimal("0.3"),
+                local_date=local_day.to_local_date(
+                    datetime(2026, 1, 1, 0, 30, tzinfo=UTC)
+                ),
             )
         )
 
@@ -117,7 +125,7 @@ def test_gas_cost_is_computable_via_a_simple_join(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.agreement(
-                id="G20220101000000",
+                slot=half_hour_slot(datetime(2022, 1, 1, tzinfo=UTC)),
                 energy="G",
                 product_code="VAR-22-11-01",
                 tariff_code="G-1R-VAR-22-11-01-H",
@@ -127,7 +135,7 @@ def test_gas_cost_is_computable_via_a_simple_join(
         )
         s.add(
             model.product_rate(
-                id="VAR-22-11-01_H_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, 0, 0, tzinfo=UTC)),
                 product_code="VAR-22-11-01",
                 region="H",
                 valid_from=datetime(2026, 1, 1, 0, 0, tzinfo=UTC),
@@ -138,13 +146,16 @@ def test_gas_cost_is_computable_via_a_simple_join(
         )
         s.add(
             model.consumption(
-                id="G20260101000000",
+                slot=half_hour_slot(datetime(2026, 1, 1, 0, 0, tzinfo=UTC)),
                 energy="G",
                 period_from=datetime(2026, 1, 1, 0, 0, tzinfo=UTC),
                 period_to=datetime(2026, 1, 2, 0, 0, tzinfo=UTC),
                 raw_value=Decimal("10.0"),
                 unit="kWh",
                 est_kwh=Decimal("10.0"),
+                local_date=local_day.to_local_date(
+                    datetime(2026, 1, 1, 0, 0, tzinfo=UTC)
+                ),
             )
         )
 
@@ -1,11 +1,19 @@
+import tracemalloc
+from collections.abc import Generator
+from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
+from pathlib import Path
 
-from data.model import Consumption, Unit
+import pytest
+from data.archive import ConsumptionArchive
+from data.model import Consumption, Energy, Unit
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.retention import delete_in_batches
 from data.octopus.model import Agreement, Electricity, Rate
 from data.pruning import DataPruner
+from sqlalchemy.orm import Session
 
 
 def _make_electricity_meter() -> Electricity:
@@ -124,3 +132,161 @@ def test_data_pruner_run_deletes_expired_consumption_and_rates_but_never_agreeme
     assert remaining_agreements[0].valid_from == old_agreement.valid_from.replace(
         tzinfo=None
     )
+
+
+def test_data_pruner_archives_expired_consumption_before_deleting_it(
+    mariadb_client: MariaDBClient, tmp_path: Path
+) -> None:
+    as_of = datetime(2026, 1, 15, tzinfo=UTC)
+    retention_days = 14
+    old_point = _half_hour(as_of - timedelta(days=retention_days, hours=1))
+    recent_point = _half_hour(as_of - timedelta(days=1))
+    mariadb_client.write_consumption(
+        _make_electricity_meter(), [old_point, recent_point]
+    )
+    archive = ConsumptionArchive(tmp_path)
+
+    DataPruner(mariadb_client, retention_days, archive).run(as_of)
+
+    assert archive.read(Energy.electricity, as_of - timedelta(days=30), as_of) == [
+        old_point
+    ]
+    with mariadb_client.session_read_scope() as session:
+        assert session.query(model.consumption).count() == 1
+
+
+def test_a_read_without_an_archive_returns_only_what_pruning_left_in_the_table(
+    mariadb_client: MariaDBClient,
+) -> None:
+    as_of = datetime(2026, 1, 15, tzinfo=UTC)
+    old_point = _half_hour(as_of - timedelta(days=15))
+    recent_point = _half_hour(as_of - timedelta(days=1))
+    mariadb_client.write_consumption(
+        _make_electricity_meter(), [old_point, recent_point]
+    )
+
+    DataPruner(mariadb_client, 14).run(as_of)
+
+    assert mariadb_client.read_consumption(
+        Energy.electricity, as_of - timedelta(days=30), as_of
+    ) == [recent_point]
+
+
+def test_a_read_with_the_archive_returns_pruned_half_hours_from_it(
+    mariadb_client: MariaDBClient, tmp_path: Path
+) -> None:
+    as_of = datetime(2026, 1, 15, tzinfo=UTC)
+    archived_points = [
+        _half_hour(as_of - timedelta(days=20)),
+        _half_hour(as_of - timedelta(days=15)),
+    ]
+    recent_point = _half_hour(as_of - timedelta(days=1))
+    mariadb_client.write_consumption(
+        _make_electricity_meter(), [*archived_points, recent_point]
+    )
+    archive = ConsumptionArchive(tmp_path)
+
+    DataPruner(mariadb_client, 14, archive).run(as_of)
+
+    assert mariadb_client.read_consumption(
+        Energy.electricity, as_of - timedelta(days=30), as_of, archive.read
+    ) == [*archived_points, recent_point]
+    assert mariadb_client.read_consumption(
+        Energy.electricity, as_of - timedelta(days=16), as_of, archive.read
+    ) == [archived_points[1], recent_point]
+    with mariadb_client.session_read_scope() as session:
+        assert session.query(model.consumption).count() == 1
+
+
+def _write_hourly_consumption(mariadb_client: MariaDBClient, count: int) -> datetime:
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    mariadb_client.write_consumption(
+        _make_electricity_meter(),
+        [_half_hour(start + timedelta(hours=hour)) for hour in range(count)],
+    )
+    return start
+
+
+def test_delete_in_batches_removes_every_expired_row_across_several_batches(
+    mariadb_client: MariaDBClient,
+) -> None:
+    start = _write_hourly_consumption(mariadb_client, 10)
+    table = model.consumption.__table__
+    cutoff = start + timedelta(hours=7)
+
+    deleted = delete_in_batches(
+        mariadb_client.session_write_scope,
+        table,
+        table.c.period_from < cutoff.replace(tzinfo=None),
+        batch_size=3,
+        batch_time_limit=60,
+    )
+
+    assert deleted == 7
+    with mariadb_client.session_read_scope() as session:
+        assert session.query(model.consumption).count() == 3
+
+
+def test_a_batch_over_its_time_limit_halves_the_next_batch(
+    mariadb_client: MariaDBClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    start = _write_hourly_consumption(mariadb_client, 7)
+    table = model.consumption.__table__
+    clock = iter(range(0, 1000, 10))
+    monkeypatch.setattr("data.mysql.retention.time.monotonic", lambda: next(clock))
+    batches = 0
+
+    @contextmanager
+    def counting_scope() -> Generator[Session]:
+        nonlocal batches
+        batches += 1
+        with mariadb_client.session_write_scope() as session:
+            yield session
+
+    deleted = delete_in_batches(
+        counting_scope,
+        table,
+        table.c.period_from >= start.replace(tzinfo=None),
+        batch_size=4,
+        batch_time_limit=1,
+    )
+
+    # 4, then 2, then 1 (every batch "took" 10s), then an empty probe --
+    # against 2 round trips (4, 3) at a constant batch size.
+    assert deleted == 7
+    assert batches == 4
+
+
+def _peak_bytes_archiving(mariadb_client: MariaDBClient, half_hours: int) -> int:
+    _write_hourly_consumption(mariadb_client, half_hours)
+    archived: list[int] = []
+
+    def archive(_energy: Energy, points: list[Consumption]) -> None:
+        archived.append(len(points))
+
+    tracemalloc.start()
+    try:
+        mariadb_client.prune_consumption_older_than(
+            datetime(2027, 1, 1, tzinfo=UTC), archive
+        )
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert sum(archived) == half_hours
+    assert max(archived) == 300
+    return peak
+
+
+@pytest.mark.parametrize(
+    "mariadb_client", [{"read_chunk_size": 300, "prune_batch_size": 300}], indirect=True
+)
+def test_archiving_peak_memory_stays_flat_as_the_expired_history_grows(
+    mariadb_client: MariaDBClient,
+) -> None:
+    # The expired rows are handed to the archive a page at a time, and
+    # deleted a batch at a time, so four times the history costs the same few
+    # pages' worth of memory.
+    month = _peak_bytes_archiving(mariadb_client, 1500)
+    four_months = _peak_bytes_archiving(mariadb_client, 6000)
+
+    assert four_months < month * 1.5
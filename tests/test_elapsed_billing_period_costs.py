@@ -1,21 +1,25 @@
 from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 
+from data import local_day
 from data.local_day import LONDON
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 from sqlalchemy.orm import Session
 
 PRODUCT_CODE = "VAR-24-10-01"
 REGION = "H"
 
 
+# Rows below are seeded directly, bypassing write-time maintenance of
+# consumption_cost, so each test rebuilds it before reading.
 def _seed_agreement(
     s: Session, valid_from: datetime, valid_to: datetime | None = None
 ) -> None:
     s.add(
         model.agreement(
-            id=f"E{valid_from.strftime('%Y%m%d%H%M%S')}",
+            slot=half_hour_slot(valid_from),
             energy="E",
             product_code=PRODUCT_CODE,
             tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
@@ -34,7 +38,7 @@ def _seed_rate(
 ) -> None:
     s.add(
         model.product_rate(
-            id=f"{PRODUCT_CODE}_{REGION}_{valid_from.strftime('%Y%m%d%H%M')}",
+            slot=half_hour_slot(valid_from),
             product_code=PRODUCT_CODE,
             region=REGION,
             valid_from=valid_from,
@@ -48,13 +52,14 @@ def _seed_rate(
 def _seed_consumption(s: Session, period_from: datetime, est_kwh: str) -> None:
     s.add(
         model.consumption(
-            id=f"E{period_from.strftime('%Y%m%d%H%M%S')}",
+            slot=half_hour_slot(period_from),
             energy="E",
             period_from=period_from,
             period_to=period_from,
             raw_value=Decimal(est_kwh),
             unit="kWh",
             est_kwh=Decimal(est_kwh),
+            local_date=local_day.to_local_date(period_from),
         )
     )
 
@@ -80,6 +85,7 @@ def test_a_full_local_day_spanning_a_utc_midnight_boundary_is_grouped_as_one_day
         _seed_agreement(s, datetime(2026, 1, 1, tzinfo=UTC))
         _seed_rate(s, datetime(2026, 1, 1, tzinfo=UTC), None, "20.00", "48.00")
         _seed_complete_day(s, date(2026, 7, 6), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 7, 5)),
@@ -106,6 +112,7 @@ def test_the_uk_spring_forward_date_with_forty_six_rows_is_treated_as_complete(
         start = _local_midnight(date(2026, 3, 29))
         for slot in range(46):
             _seed_consumption(s, start + timedelta(minutes=30 * slot), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 3, 29)),
@@ -128,6 +135,7 @@ def test_the_uk_fall_back_date_with_fifty_rows_is_treated_as_complete(
         start = _local_midnight(date(2026, 10, 25))
         for slot in range(50):
             _seed_consumption(s, start + timedelta(minutes=30 * slot), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 10, 25)),
@@ -151,6 +159,7 @@ def test_days_either_side_of_a_clock_change_still_require_forty_eight_rows(
         start = _local_midnight(date(2026, 3, 28))
         for slot in range(46):
             _seed_consumption(s, start + timedelta(minutes=30 * slot), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 3, 28)),
@@ -173,6 +182,7 @@ def test_an_incomplete_past_day_is_excluded_from_the_result(
         start = datetime(2026, 7, 6, tzinfo=UTC)
         for slot in range(30):
             _seed_consumption(s, start + timedelta(minutes=30 * slot), "1.0")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         datetime(2026, 7, 6, tzinfo=UTC),
@@ -193,6 +203,7 @@ def test_the_current_in_progress_day_is_included_regardless_of_row_count(
         _seed_agreement(s, datetime(2026, 1, 1, tzinfo=UTC))
         _seed_rate(s, datetime(2026, 1, 1, tzinfo=UTC), None, "20.00", "48.00")
         _seed_consumption(s, datetime(2026, 7, 6, 0, 0, tzinfo=UTC), "1.0")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         datetime(2026, 7, 6, tzinfo=UTC),
@@ -222,6 +233,7 @@ def test_two_elapsed_days_with_consumption_on_a_stable_rate(
         # date (2026-07-08), so both must be complete to count.
         _seed_complete_day(s, date(2026, 7, 6), "0.1")
         _seed_complete_day(s, date(2026, 7, 7), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 7, 6)),
@@ -259,7 +271,7 @@ def test_a_rate_for_another_region_is_not_double_matched(
         # must never be joined against this account's (region H) consumption.
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_A_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region="A",
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -271,6 +283,7 @@ def test_a_rate_for_another_region_is_not_double_matched(
         # Full 48-slot day -- strictly before period_to's local date
         # (2026-07-07).
         _seed_complete_day(s, date(2026, 7, 6), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 7, 6)),
@@ -315,6 +328,7 @@ def test_a_mid_period_rate_change_is_reflected_per_half_hour_not_flattened(
             _seed_consumption(s, morning_start + timedelta(minutes=30 * slot), "0.1")
         for slot in range(24):
             _seed_consumption(s, local_noon + timedelta(minutes=30 * slot), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 7, 6)),
@@ -344,6 +358,7 @@ def test_a_mid_day_standing_charge_change_uses_the_higher_of_the_two(
         _seed_rate(s, datetime(2026, 1, 1, tzinfo=UTC), local_noon, "20.00", "55.00")
         _seed_rate(s, local_noon, None, "20.00", "40.00")
         _seed_complete_day(s, date(2026, 7, 6), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 7, 6)),
@@ -370,6 +385,7 @@ def test_a_mid_day_standing_charge_change_uses_the_higher_regardless_of_row_orde
         _seed_rate(s, datetime(2026, 1, 1, tzinfo=UTC), local_noon, "20.00", "40.00")
         _seed_rate(s, local_noon, None, "20.00", "55.00")
         _seed_complete_day(s, date(2026, 7, 6), "0.1")
+    mariadb_client.rebuild_consumption_cost()
 
     results = mariadb_client.read_elapsed_billing_period_costs(
         _local_midnight(date(2026, 7, 6)),
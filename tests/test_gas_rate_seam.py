@@ -67,16 +67,24 @@ def test_gas_unit_rates_are_paired_with_the_standing_charge_in_effect() -> None:
     assert rates[0].valid_to == datetime(2026, 1, 2, tzinfo=UTC)
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_a_gas_rate_fetch_failure_is_reported_as_a_gas_error_not_an_electricity_one(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_a_gas_rate_fetch_failure_is_reported_as_a_gas_error_not_an_electricity_one() -> (
+    None
+):
     responses.add(
         responses.GET,
         UNIT_RATES_ENDPOINT,
         body=requests.exceptions.ConnectTimeout("connection timed out"),
     )
+    # Fetched alongside the unit rates, so it must succeed for the unit-rate
+    # failure to be the one reported.
+    responses.add(
+        responses.GET,
+        STANDING_CHARGES_ENDPOINT,
+        json={"results": [], "next": None},
+        status=200,
+    )
 
     with pytest.raises(RuntimeError, match="gas.*connection timed out"):
         _octopus().get_gas_rates(PRODUCT_CODE, TARIFF_CODE)
@@ -1,11 +1,20 @@
-from datetime import date
+import json
+from datetime import UTC, date, datetime, timedelta
 
 import pytest
 import requests
 import responses
 from common.config import OctopusAPISettings
 from common.exceptions import APIError
-from data.octopus.kraken import BillingPeriodClient, KrakenTransport
+from data.octopus.kraken import (
+    BILLING_OPTIONS_SELECTION,
+    AccountPayload,
+    BillingPeriodClient,
+    KrakenAuthError,
+    KrakenQuery,
+    KrakenTokenCache,
+    KrakenTransport,
+)
 from data.octopus.model import BillingPeriod
 
 GRAPHQL_ENDPOINT = "https://api.octopus.energy/v1/graphql/"
@@ -20,20 +29,20 @@ def _mock_token_mint() -> None:
     )
 
 
+def _billing_options(start: str, end: object, is_fixed: bool) -> dict[str, object]:
+    return {
+        "currentBillingPeriodStartDate": start,
+        "currentBillingPeriodEndDate": end,
+        "isFixed": is_fixed,
+    }
+
+
 def _mock_billing_options(start: str, end: object, is_fixed: bool) -> None:
     responses.add(
         responses.POST,
         GRAPHQL_ENDPOINT,
         json={
-            "data": {
-                "account": {
-                    "billingOptions": {
-                        "currentBillingPeriodStartDate": start,
-                        "currentBillingPeriodEndDate": end,
-                        "isFixed": is_fixed,
-                    }
-                }
-            }
+            "data": {"q0": {"billingOptions": _billing_options(start, end, is_fixed)}}
         },
         status=200,
     )
@@ -115,11 +124,9 @@ def test_isFixed_false_rolls_over_a_year_boundary() -> None:
     assert billing_period.end == date(2027, 1, 13)
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_token_mint_failure_raises_a_clear_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_token_mint_failure_raises_a_clear_error() -> None:
     responses.add(
         responses.POST,
         GRAPHQL_ENDPOINT,
@@ -131,11 +138,9 @@ def test_token_mint_failure_raises_a_clear_error(
         _client().get_current_billing_period()
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_billing_options_query_failure_raises_a_clear_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_billing_options_query_failure_raises_a_clear_error() -> None:
     _mock_token_mint()
     responses.add(
         responses.POST,
@@ -148,11 +153,9 @@ def test_billing_options_query_failure_raises_a_clear_error(
         _client().get_current_billing_period()
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_connection_failure_raises_a_descriptive_runtime_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_connection_failure_raises_a_descriptive_runtime_error() -> None:
     responses.add(
         responses.POST,
         GRAPHQL_ENDPOINT,
@@ -163,23 +166,171 @@ def test_connection_failure_raises_a_descriptive_runtime_error(
         _client().get_current_billing_period()
 
 
+def _mock_token_mint_expiring_at(
+    exp: datetime,
+    refresh_expires_at: datetime | None = None,
+    jwt: str = "kraken-jwt-token",
+) -> None:
+    token = {"token": jwt, "payload": {"exp": int(exp.timestamp())}}
+    if refresh_expires_at is not None:
+        token["refreshToken"] = "kraken-refresh-token"
+        token["refreshExpiresIn"] = int(refresh_expires_at.timestamp())
+    responses.add(
+        responses.POST,
+        GRAPHQL_ENDPOINT,
+        json={"data": {"obtainKrakenToken": token}},
+        status=200,
+    )
+
+
+def _token_inputs() -> list[dict[str, str]]:
+    return [
+        json.loads(call.request.body)["variables"]["input"]
+        for call in responses.calls
+        if "obtainKrakenToken" in call.request.body.decode()
+    ]
+
+
 @responses.activate
-def test_every_call_re_authenticates_rather_than_reusing_a_cached_token() -> None:
-    _mock_token_mint()
+def test_a_token_is_reused_across_calls_until_it_nears_expiry() -> None:
+    _mock_token_mint_expiring_at(datetime.now(UTC) + timedelta(hours=1))
     _mock_billing_options("2026-07-06", "2026-08-05", is_fixed=True)
-    _mock_token_mint()
     _mock_billing_options("2026-08-06", "2026-09-05", is_fixed=True)
     client = _client()
 
     client.get_current_billing_period()
     client.get_current_billing_period()
 
-    token_mint_calls = [
-        call
+    assert len(_token_inputs()) == 1
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_an_expired_token_is_renewed_with_the_refresh_token_not_the_api_key() -> None:
+    now = datetime(2026, 7, 6, 12, 0, tzinfo=UTC)
+    _mock_token_mint_expiring_at(
+        now + timedelta(hours=1), refresh_expires_at=now + timedelta(days=7)
+    )
+    _mock_token_mint_expiring_at(now + timedelta(hours=2))
+    tokens = KrakenTokenCache("sk_live_test", KrakenTransport(), clock=lambda: now)
+
+    tokens.get()
+    now += timedelta(minutes=59)
+    tokens.get()
+
+    assert _token_inputs() == [
+        {"APIKey": "sk_live_test"},
+        {"refreshToken": "kraken-refresh-token"},
+    ]
+
+
+def _mock_rejected_token() -> None:
+    responses.add(
+        responses.POST,
+        GRAPHQL_ENDPOINT,
+        json={
+            "errors": [
+                {
+                    "message": "Signature of the JWT has expired.",
+                    "extensions": {"errorCode": "KT-CT-1124"},
+                }
+            ]
+        },
+        status=200,
+    )
+
+
+def _query_tokens() -> list[str | None]:
+    return [
+        call.request.headers.get("Authorization")
         for call in responses.calls
-        if "obtainKrakenToken" in call.request.body.decode()
+        if "obtainKrakenToken" not in call.request.body.decode()
+    ]
+
+
+@responses.activate
+def test_a_rejected_token_is_dropped_and_the_query_retried_once_with_a_new_one() -> (
+    None
+):
+    _mock_token_mint_expiring_at(datetime.now(UTC) + timedelta(hours=1), jwt="old")
+    _mock_rejected_token()
+    _mock_token_mint_expiring_at(datetime.now(UTC) + timedelta(hours=1), jwt="new")
+    _mock_billing_options("2026-07-06", "2026-08-05", is_fixed=True)
+
+    billing_period = _client().get_current_billing_period()
+
+    assert billing_period.start == date(2026, 7, 5)
+    assert _token_inputs() == [{"APIKey": "sk_live_test"}, {"APIKey": "sk_live_test"}]
+    # The rejected token is sent once, not once per @retry attempt.
+    assert _query_tokens() == ["JWT old", "JWT new"]
+
+
+@responses.activate
+def test_an_unauthorised_response_invalidates_the_token_like_an_auth_error() -> None:
+    _mock_token_mint_expiring_at(datetime.now(UTC) + timedelta(hours=1), jwt="old")
+    responses.add(
+        responses.POST,
+        GRAPHQL_ENDPOINT,
+        json={"detail": "Unauthorized"},
+        status=401,
+    )
+    _mock_token_mint_expiring_at(datetime.now(UTC) + timedelta(hours=1), jwt="new")
+    _mock_billing_options("2026-07-06", "2026-08-05", is_fixed=True)
+
+    _client().get_current_billing_period()
+
+    assert _query_tokens() == ["JWT old", "JWT new"]
+
+
+@responses.activate
+def test_a_new_token_that_is_rejected_too_fails_instead_of_retrying_again() -> None:
+    _mock_token_mint_expiring_at(datetime.now(UTC) + timedelta(hours=1))
+    _mock_rejected_token()
+    _mock_token_mint_expiring_at(datetime.now(UTC) + timedelta(hours=1))
+    _mock_rejected_token()
+
+    with pytest.raises(KrakenAuthError, match="KT-CT-1124"):
+        _client().get_current_billing_period()
+
+    assert len(_token_inputs()) == 2
+    assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_several_queries_are_sent_as_one_post_and_parsed_in_order() -> None:
+    responses.add(
+        responses.POST,
+        GRAPHQL_ENDPOINT,
+        json={
+            "data": {
+                "q0": {
+                    "billingOptions": _billing_options("2026-07-06", "2026-08-05", True)
+                },
+                "q1": {"billingOptions": _billing_options("2026-03-15", None, False)},
+            }
+        },
+        status=200,
+    )
+    queries = [
+        KrakenQuery(
+            BILLING_OPTIONS_SELECTION,
+            {"accountNumber": "String!"},
+            {"accountNumber": account_number},
+            AccountPayload,
+        )
+        for account_number in ("A-1234ABCD", "A-5678EFGH")
     ]
-    assert len(token_mint_calls) == 2
+
+    first, second = KrakenTransport().query_batch(queries, token="kraken-jwt-token")
+
+    request = json.loads(responses.calls[0].request.body)
+    assert len(responses.calls) == 1
+    assert request["variables"] == {
+        "q0_accountNumber": "A-1234ABCD",
+        "q1_accountNumber": "A-5678EFGH",
+    }
+    assert first.billingOptions.period_start == date(2026, 7, 6)
+    assert second.billingOptions.period_start == date(2026, 3, 15)
 
 
 def test_isFixed_true_with_no_end_date_raises_rather_than_silently_falling_back() -> (
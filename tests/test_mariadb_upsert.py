@@ -1,9 +1,17 @@
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
 import pytest
-from data.mysql.client import upsert
-from sqlalchemy import Column, String, create_engine
+from data.model import Consumption, ConsumptionSummary, Energy, Unit
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.mysql.upsert import UpsertResult, bulk_upsert
+from data.octopus.model import Agreement, Electricity
+from sqlalchemy import Column, String
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
-from sqlalchemy.pool import StaticPool
 
 _TestBase = declarative_base()
 
@@ -16,20 +24,134 @@ class _RequiredFieldRecord(_TestBase):
 
 
 @pytest.fixture(name="upsert_session")
-def _upsert_session() -> Session:
-    engine = create_engine(
-        "sqlite://",
-        connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
-    )
+def _upsert_session(engine: Engine) -> Session:
     _TestBase.metadata.create_all(engine)
     return sessionmaker(bind=engine)()
 
 
-def test_upsert_raises_when_a_non_primary_key_constraint_is_violated(
+def _make_electricity_meter() -> Electricity:
+    return Electricity(
+        mpan="1234567890123",
+        serial_number="00A1234567",
+        agreements=[
+            Agreement(
+                tariff_code="E-1R-VAR-22-11-01-A",
+                valid_from=datetime(2022, 11, 1, tzinfo=UTC),
+                valid_to=None,
+            )
+        ],
+    )
+
+
+def _half_hours(start: datetime, count: int, est_kwh: str) -> list[Consumption]:
+    return [
+        Consumption(
+            raw=Decimal(est_kwh),
+            est_kwh=Decimal(est_kwh),
+            unit=Unit.kwh,
+            start=start + timedelta(minutes=30 * slot),
+            end=start + timedelta(minutes=30 * (slot + 1)),
+        )
+        for slot in range(count)
+    ]
+
+
+def test_bulk_upsert_raises_when_a_non_primary_key_constraint_is_violated(
+    upsert_session: Session,
+) -> None:
+    table = _RequiredFieldRecord.__table__
+
+    with pytest.raises(IntegrityError):
+        bulk_upsert(upsert_session, table, [{"id": "1", "required_field": None}])
+
+
+def test_bulk_upsert_reports_inserted_and_updated_rows_separately(
+    upsert_session: Session,
+) -> None:
+    table = _RequiredFieldRecord.__table__
+    bulk_upsert(upsert_session, table, [{"id": "1", "required_field": "a"}])
+
+    result = bulk_upsert(
+        upsert_session,
+        table,
+        [{"id": "1", "required_field": "b"}, {"id": "2", "required_field": "c"}],
+    )
+
+    assert result == UpsertResult(inserted=1, updated=1)
+    stored = {
+        row.id: row.required_field
+        for row in upsert_session.query(_RequiredFieldRecord).all()
+    }
+    assert stored == {"1": "b", "2": "c"}
+
+
+def test_bulk_upsert_writes_every_row_when_split_across_several_chunks(
+    upsert_session: Session,
+) -> None:
+    table = _RequiredFieldRecord.__table__
+    rows = [{"id": str(i), "required_field": "x"} for i in range(7)]
+
+    result = bulk_upsert(upsert_session, table, rows, chunk_size=3)
+
+    assert result == UpsertResult(inserted=7, updated=0)
+    assert upsert_session.query(_RequiredFieldRecord).count() == 7
+
+
+def test_a_primary_key_repeated_within_one_batch_keeps_its_last_value(
     upsert_session: Session,
 ) -> None:
-    record = _RequiredFieldRecord(id="1", required_field=None)  # type: ignore[misc]
+    table = _RequiredFieldRecord.__table__
+
+    result = bulk_upsert(
+        upsert_session,
+        table,
+        [{"id": "1", "required_field": "first"}, {"id": "1", "required_field": "last"}],
+    )
+
+    assert result == UpsertResult(inserted=1, updated=0)
+    assert upsert_session.query(_RequiredFieldRecord).one().required_field == "last"
+
+
+def test_bulk_upsert_rejects_a_non_positive_chunk_size(
+    upsert_session: Session,
+) -> None:
+    with pytest.raises(ValueError):
+        bulk_upsert(upsert_session, _RequiredFieldRecord.__table__, [], chunk_size=0)
+
+
+def test_rewriting_a_consumption_window_reports_updates_not_inserts(
+    mariadb_client: MariaDBClient,
+) -> None:
+    electricity = _make_electricity_meter()
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    mariadb_client.write_consumption(electricity, _half_hours(start, 48, "0.1"))
+
+    result = mariadb_client.write_consumption(
+        electricity, _half_hours(start, 50, "0.2")
+    )
+
+    assert result == UpsertResult(inserted=2, updated=48)
+    with mariadb_client.session_read_scope() as session:
+        stored = session.query(model.consumption).all()
+    assert len(stored) == 50
+    assert {row.est_kwh for row in stored} == {Decimal("0.20000")}
+
+
+def test_composite_key_summaries_are_matched_for_update_reporting(
+    mariadb_client: MariaDBClient,
+) -> None:
+    summary = ConsumptionSummary(
+        energy=Energy.electricity, date=date(2026, 1, 15), total_kwh=Decimal(1)
+    )
+    mariadb_client.write_consumption_summary([summary])
+
+    result = mariadb_client.write_consumption_summary(
+        [
+            summary,
+            ConsumptionSummary(
+                energy=Energy.gas, date=date(2026, 1, 15), total_kwh=Decimal(2)
+            ),
+        ]
+    )
 
-    with pytest.raises(RuntimeError):
-        upsert(upsert_session, record)
+    assert result == UpsertResult(inserted=1, updated=1)
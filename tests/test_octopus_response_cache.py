@@ -0,0 +1,206 @@
+import asyncio
+import json
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+import pytest
+import requests
+import responses
+from common.config import OctopusAPISettings
+from data.octopus.product import ProductClient, ProductDetailResponse
+from data.octopus.response_cache import ResponseCache
+from data.octopus.transport import CACHE_TTLS, OctopusTransport
+
+PRODUCT_DETAIL_ENDPOINT = "https://api.octopus.energy/v1/products/VAR-22-11-01/"
+PRODUCT_DETAIL = {
+    "single_register_electricity_tariffs": {
+        "H": {"direct_debit_monthly": {"code": "E-1R-VAR-22-11-01-H"}}
+    }
+}
+
+
+def _transport(cache_directory: Path | None = None) -> OctopusTransport:
+    return OctopusTransport(
+        OctopusAPISettings(
+            account_number="A-1234ABCD",
+            api_key="sk_live_test",
+            cache_directory=str(cache_directory) if cache_directory else None,
+        )
+    )
+
+
+@responses.activate
+def test_a_product_detail_is_fetched_once_for_both_availability_and_tariff_code() -> (
+    None
+):
+    responses.add(
+        responses.GET, PRODUCT_DETAIL_ENDPOINT, json=PRODUCT_DETAIL, status=200
+    )
+    transport = _transport()
+    products = ProductClient(transport)
+
+    available = products.get_product_region_availability("VAR-22-11-01", "H")
+    tariff_code = products.get_electricity_tariff_code("VAR-22-11-01", "H")
+
+    assert available is True
+    assert tariff_code == "E-1R-VAR-22-11-01-H"
+    assert len(responses.calls) == 1
+    assert (transport.response_cache.hits, transport.response_cache.misses) == (1, 1)
+
+
+@responses.activate
+def test_a_cached_response_is_refetched_once_its_ttl_has_passed() -> None:
+    responses.add(
+        responses.GET, PRODUCT_DETAIL_ENDPOINT, json=PRODUCT_DETAIL, status=200
+    )
+    now = 1_000_000.0
+    transport = _transport()
+    transport.response_cache = ResponseCache(CACHE_TTLS, clock=lambda: now)
+
+    transport.get(PRODUCT_DETAIL_ENDPOINT, ProductDetailResponse)
+    now += 23 * 3600
+    transport.get(PRODUCT_DETAIL_ENDPOINT, ProductDetailResponse)
+    now += 2 * 3600
+    transport.get(PRODUCT_DETAIL_ENDPOINT, ProductDetailResponse)
+
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_the_on_disk_layer_serves_a_restarted_transport_without_a_request(
+    tmp_path: Path,
+) -> None:
+    responses.add(
+        responses.GET, PRODUCT_DETAIL_ENDPOINT, json=PRODUCT_DETAIL, status=200
+    )
+    _transport(tmp_path).get(PRODUCT_DETAIL_ENDPOINT, ProductDetailResponse)
+
+    restarted = _transport(tmp_path)
+    detail = restarted.get(PRODUCT_DETAIL_ENDPOINT, ProductDetailResponse)
+
+    assert len(responses.calls) == 1
+    assert detail.model_dump() == ProductDetailResponse(**PRODUCT_DETAIL).model_dump()
+    assert restarted.response_cache.hits == 1
+
+
+@responses.activate
+def test_concurrent_callers_for_one_response_share_a_single_request() -> None:
+    def callback(_request: requests.PreparedRequest) -> tuple[int, dict, str]:
+        time.sleep(0.1)
+        return 200, {}, json.dumps(PRODUCT_DETAIL)
+
+    responses.add_callback(responses.GET, PRODUCT_DETAIL_ENDPOINT, callback=callback)
+    transport = _transport()
+
+    async def fan_out() -> list[Any]:
+        return await asyncio.gather(
+            *(
+                transport.get_async(PRODUCT_DETAIL_ENDPOINT, ProductDetailResponse)
+                for _ in range(5)
+            )
+        )
+
+    details = transport.run(fan_out())
+
+    assert len(details) == 5
+    assert len(responses.calls) == 1
+    assert (transport.response_cache.hits, transport.response_cache.misses) == (4, 1)
+
+
+def test_callers_sharing_a_cancelled_fetch_are_cancelled_instead_of_left_waiting() -> (
+    None
+):
+    cache = ResponseCache([])
+    started = asyncio.Event()
+
+    async def never_answers() -> ProductDetailResponse:
+        started.set()
+        await asyncio.Event().wait()
+        raise AssertionError("unreachable")
+
+    async def answers() -> ProductDetailResponse:
+        return ProductDetailResponse.model_validate(PRODUCT_DETAIL)
+
+    def get(fetch: Any) -> Any:
+        return cache.get(
+            PRODUCT_DETAIL_ENDPOINT,
+            None,
+            ProductDetailResponse,
+            timedelta(hours=1),
+            fetch,
+        )
+
+    async def cancel_the_fetching_caller() -> ProductDetailResponse:
+        fetching = asyncio.create_task(get(never_answers))
+        await started.wait()
+        sharing = asyncio.create_task(get(answers))
+        await asyncio.sleep(0)
+        fetching.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(sharing, timeout=1)
+        # Nothing is left in flight, so the next caller fetches afresh.
+        return await get(answers)
+
+    detail = asyncio.run(cancel_the_fetching_caller())
+
+    assert "H" in detail.single_register_electricity_tariffs
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_an_expired_file_is_deleted_when_it_is_read(tmp_path: Path) -> None:
+    now = 1_000_000.0
+
+    async def answers() -> ProductDetailResponse:
+        return ProductDetailResponse.model_validate(PRODUCT_DETAIL)
+
+    async def fails() -> ProductDetailResponse:
+        raise requests.ConnectionError("offline")
+
+    def get(cache: ResponseCache, fetch: Any) -> Any:
+        return cache.get(
+            PRODUCT_DETAIL_ENDPOINT,
+            None,
+            ProductDetailResponse,
+            timedelta(hours=1),
+            fetch,
+        )
+
+    asyncio.run(get(ResponseCache([], tmp_path, clock=lambda: now), answers))
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    now += 2 * 3600
+    with pytest.raises(requests.ConnectionError):
+        asyncio.run(get(ResponseCache([], tmp_path, clock=lambda: now), fails))
+
+    assert not list(tmp_path.glob("*.json"))
+
+
+@responses.activate
+def test_the_on_disk_layer_is_read_and_written_off_the_event_loop_thread(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    responses.add(
+        responses.GET, PRODUCT_DETAIL_ENDPOINT, json=PRODUCT_DETAIL, status=200
+    )
+    threads: list[str] = []
+    load, dump = json.load, json.dump
+
+    def recording_load(*args: Any, **kwargs: Any) -> Any:
+        threads.append(threading.current_thread().name)
+        return load(*args, **kwargs)
+
+    def recording_dump(*args: Any, **kwargs: Any) -> None:
+        threads.append(threading.current_thread().name)
+        dump(*args, **kwargs)
+
+    monkeypatch.setattr("data.octopus.response_cache.json.load", recording_load)
+    monkeypatch.setattr("data.octopus.response_cache.json.dump", recording_dump)
+
+    _transport(tmp_path).get(PRODUCT_DETAIL_ENDPOINT, ProductDetailResponse)
+    _transport(tmp_path).get(PRODUCT_DETAIL_ENDPOINT, ProductDetailResponse)
+
+    assert len(threads) == 2
+    assert "http-event-loop" not in threads
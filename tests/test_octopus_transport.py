@@ -1,8 +1,13 @@
+import asyncio
+import json
+import threading
+import time
 from typing import Any
 
 import pytest
 import requests
 import responses
+from common.aio import AsyncRunner
 from common.config import OctopusAPISettings
 from common.exceptions import APIError
 from data.octopus.transport import OctopusTransport
@@ -57,11 +62,9 @@ def test_get_reuses_the_same_session_across_multiple_calls(
     assert serving_sessions[0] is serving_sessions[1]
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_get_raises_api_error_with_json_body_on_non_200_response(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_get_raises_api_error_with_json_body_on_non_200_response() -> None:
     responses.add(responses.GET, ENDPOINT, json={"detail": "not found"}, status=404)
     transport = OctopusTransport(
         OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
@@ -71,11 +74,9 @@ def test_get_raises_api_error_with_json_body_on_non_200_response(
         transport.get(ENDPOINT, _WidgetResponse)
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_get_raises_api_error_with_text_body_on_non_json_error_response(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_get_raises_api_error_with_text_body_on_non_json_error_response() -> None:
     responses.add(
         responses.GET,
         ENDPOINT,
@@ -91,11 +92,9 @@ def test_get_raises_api_error_with_text_body_on_non_json_error_response(
         transport.get(ENDPOINT, _WidgetResponse)
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_get_raises_a_descriptive_runtime_error_on_connection_failure(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_get_raises_a_descriptive_runtime_error_on_connection_failure() -> None:
     responses.add(
         responses.GET,
         ENDPOINT,
@@ -109,14 +108,12 @@ def test_get_raises_a_descriptive_runtime_error_on_connection_failure(
         transport.get(ENDPOINT, _WidgetResponse, description="fetch widgets")
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_get_succeeds_after_a_transient_connection_failure_via_retry(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
+def test_get_succeeds_after_a_transient_connection_failure_via_retry() -> None:
     # Regression test: a reused, potentially stale pooled connection must not
     # break the existing @retry() path -- urllib3's connection pool evicts a
     # dead pooled connection and opens a fresh one on the retried call.
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     responses.add(
         responses.GET,
         ENDPOINT,
@@ -132,11 +129,9 @@ def test_get_succeeds_after_a_transient_connection_failure_via_retry(
     assert result.name == "gadget"
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_get_raises_a_descriptive_runtime_error_on_validation_failure(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_get_raises_a_descriptive_runtime_error_on_validation_failure() -> None:
     responses.add(responses.GET, ENDPOINT, json={}, status=200)
     transport = OctopusTransport(
         OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
@@ -148,3 +143,46 @@ def test_get_raises_a_descriptive_runtime_error_on_validation_failure(
     assert "fetch widgets" in str(exc_info.value)
     assert "name" in str(exc_info.value)
     assert "field required" in str(exc_info.value).lower()
+
+
+@responses.activate
+def test_requests_fanned_out_at_once_are_held_to_the_global_limit() -> None:
+    in_flight, most_in_flight = 0, 0
+    lock = threading.Lock()
+
+    def callback(_request: Any) -> tuple[int, dict[str, str], str]:
+        nonlocal in_flight, most_in_flight
+        with lock:
+            in_flight += 1
+            most_in_flight = max(most_in_flight, in_flight)
+        time.sleep(0.05)
+        with lock:
+            in_flight -= 1
+        return 200, {}, json.dumps({"name": "gadget"})
+
+    responses.add_callback(responses.GET, ENDPOINT, callback=callback)
+    runner = AsyncRunner(max_concurrent_requests=2)
+    transport = OctopusTransport(
+        OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test"),
+        runner,
+    )
+
+    async def fan_out() -> list[_WidgetResponse]:
+        return await asyncio.gather(
+            *(transport.get_async(ENDPOINT, _WidgetResponse) for _ in range(8))
+        )
+
+    results = runner.run(fan_out())
+
+    assert [result.name for result in results] == ["gadget"] * 8
+    assert most_in_flight == 2
+
+
+def test_blocking_on_the_runner_from_its_own_loop_raises_rather_than_hangs() -> None:
+    runner = AsyncRunner(max_concurrent_requests=1)
+
+    async def nested() -> None:
+        runner.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError, match="its own event loop"):
+        runner.run(nested())
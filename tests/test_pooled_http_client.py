@@ -0,0 +1,106 @@
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+from common.http import PooledHTTPClient
+from data.octopus.agile_predict import AgilePredictClient
+from data.octopus.x2r import X2rClient
+
+REGION = "H"
+ETAG = '"forecast-v1"'
+X2R_BODY = {
+    "forecast_at": "2026-07-22T04:15:00+01:00",
+    "region": REGION,
+    "region_name": f"Region {REGION}",
+    "prices": {
+        "forecast": [{"date": "2026-07-22T00:00:00+00:00", "price": "21.19"}],
+        "day_ahead": [],
+        "actual": [],
+    },
+}
+AGILE_PREDICT_BODY = [
+    {"prices": [{"date_time": "2026-07-22T00:00:00Z", "agile_pred": "19.5"}]}
+]
+
+
+class _ForecastServer(ThreadingHTTPServer):
+    # A real keep-alive HTTP/1.1 server on localhost, so connection reuse is
+    # observable: every request records the client port it arrived from.
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _ForecastHandler)
+        self.client_ports: list[int] = []
+        self.conditional_headers: list[str | None] = []
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class _ForecastHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _ForecastServer
+
+    def do_GET(self) -> None:
+        self.server.client_ports.append(self.client_address[1])
+        if_none_match = self.headers.get("If-None-Match")
+        self.server.conditional_headers.append(if_none_match)
+        if if_none_match == ETAG:
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(
+            X2R_BODY if self.path.startswith("/agile/") else AGILE_PREDICT_BODY
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture(name="forecast_server")
+def _forecast_server() -> Iterator[_ForecastServer]:
+    server = _ForecastServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_hourly_forecast_polls_reuse_one_kept_alive_connection(
+    forecast_server: _ForecastServer,
+) -> None:
+    http = PooledHTTPClient()
+    x2r = X2rClient(http)
+    x2r.base_url = forecast_server.base_url + "agile/"
+    agile_predict = AgilePredictClient(http)
+    agile_predict.base_url = forecast_server.base_url + "api/"
+
+    x2r.get_forecast(REGION)
+    agile_predict.get_forecast(REGION)
+    x2r.get_forecast(REGION)
+
+    assert len(forecast_server.client_ports) == 3
+    assert len(set(forecast_server.client_ports)) == 1
+
+
+def test_an_unchanged_forecast_is_revalidated_by_etag_and_served_from_the_304(
+    forecast_server: _ForecastServer,
+) -> None:
+    x2r = X2rClient(PooledHTTPClient())
+    x2r.base_url = forecast_server.base_url + "agile/"
+
+    first = x2r.get_forecast(REGION)
+    second = x2r.get_forecast(REGION)
+
+    assert forecast_server.conditional_headers == [None, ETAG]
+    assert second == first
@@ -1,81 +1,19 @@
 import logging
+from collections.abc import Callable
 from datetime import UTC, datetime
 from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 import responses
-from common.config import OctopusAPISettings
 from data.mysql import model
 from data.mysql.client import MariaDBClient
-from data.octopus.api import OctopusEnergyAPIClient
-from data.octopus.model import Agreement, Electricity, Gas, Meter, Product, Rate
-from data.pricing import PricingRetriever
+from data.octopus.model import Agreement, Electricity, Gas, Meter
+from data.pricing import PricingRetriever, PricingSource
 
 PRODUCTS_ENDPOINT = "https://api.octopus.energy/v1/products/"
 
-
-class _RealPricingSource:
-    """A real PricingSource adapter for tests: genuine OctopusEnergyAPIClient
-    and MariaDBClient underneath, with meters/region_code fixed up front
-    rather than fetched, so tests only need to mock the HTTP endpoints
-    PricingRetriever.refresh() actually calls."""
-
-    def __init__(
-        self,
-        octopus: OctopusEnergyAPIClient,
-        mariadb: MariaDBClient,
-        meters: list[Meter],
-        region_code: str,
-    ) -> None:
-        self._octopus = octopus
-        self._mariadb = mariadb
-        self.meters = meters
-        self.region_code = region_code
-
-    def refresh_meters(self) -> None:
-        pass
-
-    def persist_agreement(self, meter: Meter, agreements: list[Agreement]) -> None:
-        self._mariadb.write_agreement(meter, agreements)
-
-    def fetch_products(self) -> list[Product]:
-        return self._octopus.get_products()
-
-    def is_product_available_in_region(self, product_code: str, region: str) -> bool:
-        return self._octopus.get_product_region_availability(product_code, region)
-
-    def persist_product(self, product: Product) -> None:
-        self._mariadb.write_product(product)
-
-    def fetch_electricity_rates(
-        self,
-        product_code: str,
-        tariff_code: str,
-        period_from: datetime | None,
-        period_to: datetime | None,
-    ) -> list[Rate]:
-        return self._octopus.get_electricity_rates(
-            product_code, tariff_code, period_from, period_to
-        )
-
-    def fetch_gas_rates(
-        self,
-        product_code: str,
-        tariff_code: str,
-        period_from: datetime | None,
-        period_to: datetime | None,
-    ) -> list[Rate]:
-        return self._octopus.get_gas_rates(
-            product_code, tariff_code, period_from, period_to
-        )
-
-    def persist_rate(self, product_code: str, region: str, rates: list[Rate]) -> None:
-        self._mariadb.write_product_rate(product_code, region, rates)
-
-    def fetch_electricity_tariff_code(
-        self, product_code: str, region: str
-    ) -> str | None:
-        return self._octopus.get_electricity_tariff_code(product_code, region)
+MakePricingSource = Callable[[list[Meter]], PricingSource]
 
 
 def _make_electricity_meter() -> Electricity:
@@ -134,15 +72,6 @@ def _make_gas_meter_with_zero_width_agreement() -> Gas:
     )
 
 
-def _make_source(
-    mariadb_client: MariaDBClient, meters: list[Meter], region_code: str = "H"
-) -> _RealPricingSource:
-    octopus = OctopusEnergyAPIClient(
-        OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test")
-    )
-    return _RealPricingSource(octopus, mariadb_client, meters, region_code)
-
-
 def _mock_electricity_rate_endpoints(
     product_code: str = "VAR-22-11-01", tariff_code: str = "E-1R-VAR-22-11-01-A"
 ) -> None:
@@ -220,6 +149,7 @@ def _mock_gas_rate_endpoints(
 @responses.activate
 def test_refresh_persists_every_meters_agreements(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     responses.add(
         responses.GET, PRODUCTS_ENDPOINT, json={"results": [], "next": None}, status=200
@@ -228,7 +158,7 @@ def test_refresh_persists_every_meters_agreements(
     _mock_gas_rate_endpoints()
     electricity_meter = _make_electricity_meter()
     gas_meter = _make_gas_meter()
-    source = _make_source(mariadb_client, [electricity_meter, gas_meter])
+    source = make_pricing_source([electricity_meter, gas_meter])
 
     PricingRetriever(source).refresh()
 
@@ -242,6 +172,7 @@ def test_refresh_persists_every_meters_agreements(
 @responses.activate
 def test_refresh_persists_products_available_in_the_account_s_region(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     responses.add(
         responses.GET,
@@ -282,7 +213,7 @@ def test_refresh_persists_products_available_in_the_account_s_region(
     _mock_electricity_rate_endpoints(
         product_code="VAR-22-11-01", tariff_code="E-1R-VAR-22-11-01-H"
     )
-    source = _make_source(mariadb_client, [])
+    source = make_pricing_source([])
 
     PricingRetriever(source).refresh()
 
@@ -295,13 +226,14 @@ def test_refresh_persists_products_available_in_the_account_s_region(
 @responses.activate
 def test_refresh_persists_the_account_s_own_product_electricity_rates(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     responses.add(
         responses.GET, PRODUCTS_ENDPOINT, json={"results": [], "next": None}, status=200
     )
     _mock_electricity_rate_endpoints()
     electricity_meter = _make_electricity_meter()
-    source = _make_source(mariadb_client, [electricity_meter])
+    source = make_pricing_source([electricity_meter])
 
     PricingRetriever(source).refresh()
 
@@ -316,13 +248,14 @@ def test_refresh_persists_the_account_s_own_product_electricity_rates(
 @responses.activate
 def test_refresh_persists_gas_rates_for_the_account_s_own_product_in_the_same_shape_as_electricity(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     responses.add(
         responses.GET, PRODUCTS_ENDPOINT, json={"results": [], "next": None}, status=200
     )
     _mock_gas_rate_endpoints()
     gas_meter = _make_gas_meter()
-    source = _make_source(mariadb_client, [gas_meter])
+    source = make_pricing_source([gas_meter])
 
     PricingRetriever(source).refresh()
 
@@ -339,6 +272,7 @@ def test_refresh_persists_gas_rates_for_the_account_s_own_product_in_the_same_sh
 @responses.activate
 def test_refresh_does_not_persist_export_products(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     responses.add(
         responses.GET,
@@ -373,7 +307,7 @@ def test_refresh_does_not_persist_export_products(
     _mock_electricity_rate_endpoints(
         product_code="VAR-22-11-01", tariff_code="E-1R-VAR-22-11-01-H"
     )
-    source = _make_source(mariadb_client, [])
+    source = make_pricing_source([])
 
     PricingRetriever(source).refresh()
 
@@ -386,6 +320,7 @@ def test_refresh_does_not_persist_export_products(
 @responses.activate
 def test_refresh_persists_rates_for_every_catalogued_electricity_product(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     responses.add(
         responses.GET,
@@ -415,7 +350,7 @@ def test_refresh_persists_rates_for_every_catalogued_electricity_product(
     _mock_electricity_rate_endpoints(
         product_code="AGILE-24-10-01", tariff_code="E-1R-AGILE-24-10-01-H"
     )
-    source = _make_source(mariadb_client, [])
+    source = make_pricing_source([])
 
     PricingRetriever(source).refresh()
 
@@ -429,6 +364,7 @@ def test_refresh_persists_rates_for_every_catalogued_electricity_product(
 @responses.activate
 def test_refresh_skips_a_product_with_no_published_rate_for_the_region_without_crashing(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     responses.add(
         responses.GET,
@@ -451,7 +387,7 @@ def test_refresh_skips_a_product_with_no_published_rate_for_the_region_without_c
         json={"single_register_electricity_tariffs": {}},
         status=200,
     )
-    source = _make_source(mariadb_client, [])
+    source = make_pricing_source([])
 
     PricingRetriever(source).refresh()
 
@@ -464,6 +400,7 @@ def test_refresh_skips_a_product_with_no_published_rate_for_the_region_without_c
 @responses.activate
 def test_refresh_skips_a_dual_register_only_product_without_crashing(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     responses.add(
         responses.GET,
@@ -491,7 +428,7 @@ def test_refresh_skips_a_dual_register_only_product_without_crashing(
         },
         status=200,
     )
-    source = _make_source(mariadb_client, [])
+    source = make_pricing_source([])
 
     PricingRetriever(source).refresh()
 
@@ -504,6 +441,7 @@ def test_refresh_skips_a_dual_register_only_product_without_crashing(
 @responses.activate
 def test_a_failing_agreement_s_rate_fetch_is_skipped_without_blocking_others(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     responses.add(
@@ -519,7 +457,7 @@ def test_a_failing_agreement_s_rate_fetch_is_skipped_without_blocking_others(
     _mock_gas_rate_endpoints()
     electricity_meter = _make_electricity_meter()
     gas_meter = _make_gas_meter()
-    source = _make_source(mariadb_client, [electricity_meter, gas_meter])
+    source = make_pricing_source([electricity_meter, gas_meter])
 
     with caplog.at_level(logging.WARNING):
         PricingRetriever(source).refresh()
@@ -538,6 +476,7 @@ def test_a_failing_agreement_s_rate_fetch_is_skipped_without_blocking_others(
 @responses.activate
 def test_a_failing_comparison_product_s_rate_fetch_is_skipped_without_blocking_others(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     responses.add(
@@ -590,7 +529,7 @@ def test_a_failing_comparison_product_s_rate_fetch_is_skipped_without_blocking_o
     _mock_electricity_rate_endpoints(
         product_code="AGILE-24-10-01", tariff_code="E-1R-AGILE-24-10-01-H"
     )
-    source = _make_source(mariadb_client, [])
+    source = make_pricing_source([])
 
     with caplog.at_level(logging.WARNING):
         PricingRetriever(source).refresh()
@@ -609,6 +548,7 @@ def test_a_failing_comparison_product_s_rate_fetch_is_skipped_without_blocking_o
 @responses.activate
 def test_refresh_does_not_refetch_the_account_s_own_product_during_the_comparison_pass(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     """The account's own product also appears in the general catalogue. Its
     rates must come only from the agreement's actual tariff_code (the
@@ -646,7 +586,7 @@ def test_refresh_does_not_refetch_the_account_s_own_product_during_the_compariso
         product_code="VAR-22-11-01", tariff_code="E-1R-VAR-22-11-01-A"
     )
     electricity_meter = _make_electricity_meter()
-    source = _make_source(mariadb_client, [electricity_meter])
+    source = make_pricing_source([electricity_meter])
 
     # The product-detail endpoint above is only ever hit once, by
     # _sync_product_catalogue's availability check. If the comparison pass
@@ -665,6 +605,7 @@ def test_refresh_does_not_refetch_the_account_s_own_product_during_the_compariso
 @responses.activate
 def test_refresh_skips_the_rate_fetch_for_a_zero_width_electricity_agreement(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     responses.add(
@@ -674,7 +615,7 @@ def test_refresh_skips_the_rate_fetch_for_a_zero_width_electricity_agreement(
         product_code="VAR-22-11-01", tariff_code="E-1R-VAR-22-11-01-C"
     )
     electricity_meter = _make_electricity_meter_with_zero_width_agreement()
-    source = _make_source(mariadb_client, [electricity_meter])
+    source = make_pricing_source([electricity_meter])
 
     with caplog.at_level(logging.DEBUG, logger="octopus-monitor"):
         PricingRetriever(source).refresh()
@@ -699,6 +640,7 @@ def test_refresh_skips_the_rate_fetch_for_a_zero_width_electricity_agreement(
 @responses.activate
 def test_refresh_skips_the_rate_fetch_for_a_zero_width_gas_agreement(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
     caplog: pytest.LogCaptureFixture,
 ) -> None:
     responses.add(
@@ -708,7 +650,7 @@ def test_refresh_skips_the_rate_fetch_for_a_zero_width_gas_agreement(
         product_code="VAR-22-11-01", tariff_code="G-1R-VAR-22-11-01-C"
     )
     gas_meter = _make_gas_meter_with_zero_width_agreement()
-    source = _make_source(mariadb_client, [gas_meter])
+    source = make_pricing_source([gas_meter])
 
     with caplog.at_level(logging.DEBUG, logger="octopus-monitor"):
         PricingRetriever(source).refresh()
@@ -733,6 +675,7 @@ def test_refresh_skips_the_rate_fetch_for_a_zero_width_gas_agreement(
 @responses.activate
 def test_refresh_still_excludes_a_zero_width_agreement_s_product_from_comparison_sync(
     mariadb_client: MariaDBClient,
+    make_pricing_source: MakePricingSource,
 ) -> None:
     """A zero-width agreement's own rate fetch is skipped, but its product
     code must still count as "owned" so the comparison pass doesn't treat it
@@ -764,7 +707,7 @@ def test_refresh_still_excludes_a_zero_width_agreement_s_product_from_comparison
         status=200,
     )
     electricity_meter = _make_electricity_meter_with_zero_width_agreement()
-    source = _make_source(mariadb_client, [electricity_meter])
+    source = make_pricing_source([electricity_meter])
 
     PricingRetriever(source).refresh()
 
@@ -778,3 +721,148 @@ def test_refresh_still_excludes_a_zero_width_agreement_s_product_from_comparison
     with mariadb_client.session_read_scope() as session:
         stored = session.query(model.product_rate).all()
     assert stored == []
+
+
+def _mock_agile_rate_endpoints(
+    tariff_code: str = "E-1R-AGILE-24-10-01-H",
+) -> None:
+    base = (
+        "https://api.octopus.energy/v1/products/AGILE-24-10-01/electricity-tariffs/"
+        f"{tariff_code}/"
+    )
+    responses.add(
+        responses.GET,
+        base + "standard-unit-rates/",
+        json={
+            "results": [
+                {
+                    "value_inc_vat": 18.90,
+                    "valid_from": "2026-03-10T22:30:00Z",
+                    "valid_to": "2026-03-10T23:00:00Z",
+                },
+                {
+                    "value_inc_vat": 17.25,
+                    "valid_from": "2026-03-10T22:00:00Z",
+                    "valid_to": "2026-03-10T22:30:00Z",
+                },
+            ],
+            "next": None,
+        },
+        status=200,
+    )
+    responses.add(
+        responses.GET,
+        base + "standing-charges/",
+        json={
+            "results": [
+                {
+                    "value_inc_vat": 48.20,
+                    "valid_from": "2026-01-01T00:00:00Z",
+                    "valid_to": None,
+                }
+            ],
+            "next": None,
+        },
+        status=200,
+    )
+
+
+def _unit_rate_period_froms() -> list[str | None]:
+    return [
+        parse_qs(urlparse(call.request.url).query).get("period_from", [None])[0]
+        for call in responses.calls
+        if "standard-unit-rates" in str(call.request.url)
+    ]
+
+
+def _make_agile_electricity_meter() -> Electricity:
+    return Electricity(
+        mpan="1234567890123",
+        serial_number="00A1234567",
+        agreements=[
+            Agreement(
+                tariff_code="E-1R-AGILE-24-10-01-H",
+                valid_from=datetime(2026, 1, 1, tzinfo=UTC),
+                valid_to=None,
+            )
+        ],
+    )
+
+
+@responses.activate
+def test_a_second_refresh_fetches_own_rates_only_from_just_before_the_watermark(
+    make_pricing_source: MakePricingSource,
+) -> None:
+    responses.add(
+        responses.GET, PRODUCTS_ENDPOINT, json={"results": [], "next": None}, status=200
+    )
+    _mock_agile_rate_endpoints()
+    source = make_pricing_source([_make_agile_electricity_meter()])
+    retriever = PricingRetriever(source)
+
+    retriever.refresh()
+    retriever.refresh()
+
+    assert _unit_rate_period_froms() == [
+        "2026-01-01T00:00:00Z",
+        "2026-03-09T22:30:00Z",
+    ]
+
+
+@responses.activate
+def test_a_comparison_product_s_full_history_is_fetched_once_then_incrementally(
+    make_pricing_source: MakePricingSource,
+) -> None:
+    responses.add(
+        responses.GET,
+        PRODUCTS_ENDPOINT,
+        json={
+            "results": [
+                {
+                    "code": "AGILE-24-10-01",
+                    "display_name": "Agile Octopus",
+                    "direction": "IMPORT",
+                }
+            ],
+            "next": None,
+        },
+        status=200,
+    )
+    responses.add(
+        responses.GET,
+        PRODUCTS_ENDPOINT + "AGILE-24-10-01/",
+        json={
+            "single_register_electricity_tariffs": {
+                "H": {"direct_debit_monthly": {"code": "E-1R-AGILE-24-10-01-H"}}
+            }
+        },
+        status=200,
+    )
+    _mock_agile_rate_endpoints()
+    source = make_pricing_source([])
+    retriever = PricingRetriever(source)
+
+    retriever.refresh()
+    retriever.refresh()
+
+    assert _unit_rate_period_froms() == [None, "2026-03-09T22:30:00Z"]
+
+
+@responses.activate
+def test_a_full_resync_ignores_the_watermark_and_refetches_from_the_agreement_start(
+    make_pricing_source: MakePricingSource,
+) -> None:
+    responses.add(
+        responses.GET, PRODUCTS_ENDPOINT, json={"results": [], "next": None}, status=200
+    )
+    _mock_agile_rate_endpoints()
+    source = make_pricing_source([_make_agile_electricity_meter()])
+    retriever = PricingRetriever(source)
+
+    retriever.refresh()
+    retriever.refresh(full_resync=True)
+
+    assert _unit_rate_period_froms() == [
+        "2026-01-01T00:00:00Z",
+        "2026-01-01T00:00:00Z",
+    ]
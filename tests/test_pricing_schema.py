@@ -3,6 +3,7 @@ from decimal import Decimal
 
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 
 
 def test_an_agreement_row_round_trips_through_the_schema(
@@ -12,7 +13,7 @@ def test_an_agreement_row_round_trips_through_the_schema(
     with mariadb_client.session_write_scope() as session:
         session.add(
             model.agreement(
-                id="E-VAR-22-11-01",
+                slot=half_hour_slot(valid_from),
                 energy="E",
                 product_code="VAR-22-11-01",
                 tariff_code="E-1R-VAR-22-11-01-A",
@@ -25,7 +26,7 @@ def test_an_agreement_row_round_trips_through_the_schema(
         stored = session.query(model.agreement).all()
 
     assert len(stored) == 1
-    assert stored[0].id == "E-VAR-22-11-01"
+    assert stored[0].slot == half_hour_slot(valid_from)
     assert stored[0].energy == "E"
     assert stored[0].product_code == "VAR-22-11-01"
     assert stored[0].tariff_code == "E-1R-VAR-22-11-01-A"
@@ -62,7 +63,7 @@ def test_a_product_rate_row_round_trips_through_the_schema(
     with mariadb_client.session_write_scope() as session:
         session.add(
             model.product_rate(
-                id="AGILE-24-10-01_H_2026010100",
+                slot=half_hour_slot(valid_from),
                 product_code="AGILE-24-10-01",
                 region="H",
                 valid_from=valid_from,
@@ -86,3 +86,31 @@ def test_half_hourly_rates_for_the_same_product_are_stored_as_distinct_rows(
         stored = session.query(model.product_rate).all()
 
     assert len(stored) == 2
+
+
+def test_a_tariff_s_rate_watermark_tracks_the_latest_valid_from_written(
+    mariadb_client: MariaDBClient,
+) -> None:
+    tariff_code = "E-1R-AGILE-24-10-01-H"
+    rates = [
+        _make_rate(
+            datetime(2026, 1, 1, 0, 30, tzinfo=UTC),
+            datetime(2026, 1, 1, 1, tzinfo=UTC),
+            "22.10",
+            "48.20",
+        ),
+        _make_rate(
+            datetime(2026, 1, 1, tzinfo=UTC),
+            datetime(2026, 1, 1, 0, 30, tzinfo=UTC),
+            "24.53",
+            "48.20",
+        ),
+    ]
+
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, rates, tariff_code)
+    mariadb_client.write_product_rate(PRODUCT_CODE, REGION, [], tariff_code)
+
+    assert mariadb_client.read_rate_watermark(
+        PRODUCT_CODE, tariff_code, REGION
+    ) == datetime(2026, 1, 1, 0, 30, tzinfo=UTC)
+    assert mariadb_client.read_rate_watermark(PRODUCT_CODE, "other", REGION) is None
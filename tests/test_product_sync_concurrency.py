@@ -0,0 +1,86 @@
+import json
+import re
+import threading
+import time
+from collections.abc import Callable
+
+import requests
+import responses
+from data.octopus.model import Meter, Rate
+from data.pricing import PricingRetriever, PricingSource
+
+PRODUCTS_ENDPOINT = "https://api.octopus.energy/v1/products/"
+
+
+@responses.activate
+def test_comparison_products_are_fetched_side_by_side_but_persisted_in_catalogue_order(
+    make_pricing_source: Callable[[list[Meter]], PricingSource],
+) -> None:
+    product_codes = ["VAR-22-11-01", "AGILE-24-10-01", "GO-VAR-22-10-14"]
+    responses.add(
+        responses.GET,
+        PRODUCTS_ENDPOINT,
+        json={
+            "results": [
+                {"code": code, "display_name": code, "direction": "IMPORT"}
+                for code in product_codes
+            ],
+            "next": None,
+        },
+        status=200,
+    )
+    for code in product_codes:
+        responses.add(
+            responses.GET,
+            PRODUCTS_ENDPOINT + f"{code}/",
+            json={
+                "single_register_electricity_tariffs": {
+                    "H": {"direct_debit_monthly": {"code": f"E-1R-{code}-H"}}
+                }
+            },
+            status=200,
+        )
+    in_flight = 0
+    peak_in_flight = 0
+    lock = threading.Lock()
+
+    def rate_callback(request: requests.PreparedRequest) -> tuple[int, dict, str]:
+        nonlocal in_flight, peak_in_flight
+        with lock:
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+        # The first product in the catalogue answers last.
+        time.sleep(0.3 if product_codes[0] in str(request.url) else 0.05)
+        with lock:
+            in_flight -= 1
+        body = {
+            "results": [
+                {
+                    "value_inc_vat": 24.53,
+                    "valid_from": "2026-01-01T00:00:00Z",
+                    "valid_to": None,
+                }
+            ],
+            "next": None,
+        }
+        return 200, {}, json.dumps(body)
+
+    responses.add_callback(
+        responses.GET, re.compile(r".*/electricity-tariffs/.*"), callback=rate_callback
+    )
+    source = make_pricing_source([])
+    persisted: list[str] = []
+    persist_rate = source.persist_rate
+
+    def recording_persist_rate(
+        product_code: str, tariff_code: str, region: str, rates: list[Rate]
+    ) -> None:
+        persisted.append(product_code)
+        persist_rate(product_code, tariff_code, region, rates)
+
+    source.persist_rate = recording_persist_rate  # type: ignore[method-assign]
+
+    PricingRetriever(source).refresh()
+
+    assert persisted == product_codes
+    assert peak_in_flight > 2
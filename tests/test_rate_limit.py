@@ -0,0 +1,103 @@
+import pytest
+import requests
+import responses
+from common.config import OctopusAPISettings
+from common.rate_limit import BURST, REQUESTS_PER_SECOND, HostRateLimiter
+from data.octopus.transport import OctopusTransport
+from pydantic import BaseModel
+
+OCTOPUS = "https://api.octopus.energy/v1/products/"
+X2R = "https://api.x2r.uk/agile/H"
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _limiter(monkeypatch: pytest.MonkeyPatch) -> tuple[HostRateLimiter, _Clock]:
+    clock = _Clock()
+    monkeypatch.setattr("common.rate_limit.time.sleep", clock.sleep)
+    return HostRateLimiter(clock), clock
+
+
+def _response(status: int, headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+
+def test_a_host_allows_a_burst_then_paces_callers_at_the_steady_rate(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    limiter, _ = _limiter(monkeypatch)
+
+    waits = [limiter.acquire(OCTOPUS) for _ in range(BURST + 2)]
+
+    assert waits[:BURST] == [0.0] * BURST
+    assert waits[BURST:] == pytest.approx([1 / REQUESTS_PER_SECOND] * 2)
+    assert limiter.waited_seconds()["api.octopus.energy"] == pytest.approx(
+        2 / REQUESTS_PER_SECOND
+    )
+
+
+def test_a_429_pauses_only_its_own_host_for_the_retry_after_it_sent(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    limiter, _ = _limiter(monkeypatch)
+
+    limiter.record(OCTOPUS, _response(429, {"Retry-After": "30"}))
+
+    assert limiter.acquire(OCTOPUS) == pytest.approx(30)
+    assert limiter.acquire(X2R) == 0.0
+
+
+def test_server_errors_halve_a_hosts_rate_and_successes_win_it_back(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    limiter, clock = _limiter(monkeypatch)
+    for _ in range(BURST):
+        limiter.acquire(OCTOPUS)
+
+    limiter.record(OCTOPUS, _response(500))
+    limiter.record(OCTOPUS, _response(502))
+    throttled = limiter.acquire(OCTOPUS)
+    for _ in range(10):
+        limiter.record(OCTOPUS, _response(200))
+    clock.now += 10
+    for _ in range(BURST):
+        limiter.acquire(OCTOPUS)
+    recovered = limiter.acquire(OCTOPUS)
+
+    assert throttled == pytest.approx(4 / REQUESTS_PER_SECOND)
+    assert recovered == pytest.approx(1 / REQUESTS_PER_SECOND)
+
+
+class _Widget(BaseModel):
+    name: str
+
+
+@pytest.mark.usefixtures("no_retry_delay")
+@responses.activate
+def test_the_transport_waits_out_a_retry_after_before_its_retry() -> None:
+    responses.add(
+        responses.GET, OCTOPUS, status=429, headers={"Retry-After": "7"}, json={}
+    )
+    responses.add(responses.GET, OCTOPUS, json={"name": "gadget"}, status=200)
+    limiter = HostRateLimiter()
+    transport = OctopusTransport(
+        OctopusAPISettings(account_number="A-1234ABCD", api_key="sk_live_test"),
+        limiter=limiter,
+    )
+
+    result = transport.get(OCTOPUS, _Widget)
+
+    assert result.name == "gadget"
+    assert limiter.waited_seconds()["api.octopus.energy"] > 6
@@ -0,0 +1,102 @@
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from data.octopus.model import Rate
+from data.rate_timeline import RateTimeline
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def _rate(
+    valid_from: datetime, valid_to: datetime | None, unit_rate: str = "20.00"
+) -> Rate:
+    return Rate(
+        valid_from=valid_from,
+        valid_to=valid_to,
+        unit_rate=Decimal(unit_rate),
+        standing_charge=Decimal("50.00"),
+    )
+
+
+def _half_hourly_rates(count: int) -> list[Rate]:
+    return [
+        _rate(
+            START + timedelta(minutes=30 * slot),
+            START + timedelta(minutes=30 * (slot + 1)),
+            str(slot),
+        )
+        for slot in range(count)
+    ]
+
+
+def test_a_lookup_returns_the_window_containing_the_instant_half_open() -> None:
+    timeline = RateTimeline(_half_hourly_rates(4))
+
+    at_boundary = timeline.at(START + timedelta(minutes=30))
+    inside = timeline.at(START + timedelta(minutes=59))
+
+    assert at_boundary is not None
+    assert at_boundary.unit_rate == Decimal(1)
+    assert inside is not None
+    assert inside.unit_rate == Decimal(1)
+
+
+def test_an_instant_before_the_first_or_in_a_gap_has_no_rate() -> None:
+    timeline = RateTimeline(
+        [
+            _rate(START, START + timedelta(days=1)),
+            _rate(START + timedelta(days=2), None),
+        ]
+    )
+
+    assert timeline.at(START - timedelta(seconds=1)) is None
+    assert timeline.at(START + timedelta(days=1, hours=12)) is None
+
+
+def test_an_open_ended_window_covers_every_later_instant() -> None:
+    timeline = RateTimeline([_rate(START, None, "30.00")])
+
+    rate = timeline.at(START + timedelta(days=3650))
+
+    assert rate is not None
+    assert rate.unit_rate == Decimal("30.00")
+
+
+def test_overlapping_windows_prefer_the_most_recently_started_one_in_force() -> None:
+    timeline = RateTimeline(
+        [
+            _rate(START, None, "10.00"),
+            _rate(START + timedelta(days=1), START + timedelta(days=2), "20.00"),
+        ]
+    )
+
+    during_overlap = timeline.at(START + timedelta(days=1, hours=1))
+    after_later_ends = timeline.at(START + timedelta(days=3))
+
+    assert during_overlap is not None
+    assert during_overlap.unit_rate == Decimal("20.00")
+    assert after_later_ends is not None
+    assert after_later_ends.unit_rate == Decimal("10.00")
+
+
+def test_the_first_of_two_windows_starting_together_wins() -> None:
+    timeline = RateTimeline([_rate(START, None, "10.00"), _rate(START, None, "99")])
+
+    rate = timeline.at(START)
+
+    assert rate is not None
+    assert rate.unit_rate == Decimal("10.00")
+
+
+def test_a_sweep_agrees_with_a_lookup_at_every_instant() -> None:
+    timeline = RateTimeline(
+        [
+            *_half_hourly_rates(6),
+            _rate(START + timedelta(hours=5), None, "40.00"),
+        ]
+    )
+    instants = [START + timedelta(minutes=20 * step) for step in range(-2, 30)]
+
+    assert list(timeline.sweep(instants)) == [
+        timeline.at(instant) for instant in instants
+    ]
@@ -3,6 +3,7 @@ from decimal import Decimal
 
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 
 PRODUCT_CODE = "VAR-24-10-01"
 REGION = "H"
@@ -14,7 +15,7 @@ def test_returns_the_rate_valid_at_the_given_moment(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -25,7 +26,7 @@ def test_returns_the_rate_valid_at_the_given_moment(
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202607010000",
+                slot=half_hour_slot(datetime(2026, 7, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 7, 1, tzinfo=UTC),
@@ -35,9 +36,9 @@ def test_returns_the_rate_valid_at_the_given_moment(
             )
         )
 
-    rate = mariadb_client.read_current_product_rate(
-        PRODUCT_CODE, REGION, datetime(2026, 7, 22, tzinfo=UTC)
-    )
+    moment = datetime(2026, 7, 22, tzinfo=UTC)
+    timeline = mariadb_client.read_rate_timeline(PRODUCT_CODE, REGION, moment, moment)
+    rate = timeline.at(moment)
 
     assert rate is not None
     assert rate.unit_rate == Decimal("25.00")
@@ -50,7 +51,7 @@ def test_returns_the_historical_rate_valid_at_a_past_moment(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -61,7 +62,7 @@ def test_returns_the_historical_rate_valid_at_a_past_moment(
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202607010000",
+                slot=half_hour_slot(datetime(2026, 7, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 7, 1, tzinfo=UTC),
@@ -71,9 +72,9 @@ def test_returns_the_historical_rate_valid_at_a_past_moment(
             )
         )
 
-    rate = mariadb_client.read_current_product_rate(
-        PRODUCT_CODE, REGION, datetime(2026, 3, 1, tzinfo=UTC)
-    )
+    moment = datetime(2026, 3, 1, tzinfo=UTC)
+    timeline = mariadb_client.read_rate_timeline(PRODUCT_CODE, REGION, moment, moment)
+    rate = timeline.at(moment)
 
     assert rate is not None
     assert rate.unit_rate == Decimal("20.00")
@@ -89,7 +90,7 @@ def test_overlapping_rows_deterministically_prefer_the_most_recently_started(
     with mariadb_client.session_write_scope() as s:
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202601010000",
+                slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 1, 1, tzinfo=UTC),
@@ -100,7 +101,7 @@ def test_overlapping_rows_deterministically_prefer_the_most_recently_started(
         )
         s.add(
             model.product_rate(
-                id=f"{PRODUCT_CODE}_{REGION}_202603010000",
+                slot=half_hour_slot(datetime(2026, 3, 1, tzinfo=UTC)),
                 product_code=PRODUCT_CODE,
                 region=REGION,
                 valid_from=datetime(2026, 3, 1, tzinfo=UTC),
@@ -110,9 +111,9 @@ def test_overlapping_rows_deterministically_prefer_the_most_recently_started(
             )
         )
 
-    rate = mariadb_client.read_current_product_rate(
-        PRODUCT_CODE, REGION, datetime(2026, 7, 22, tzinfo=UTC)
-    )
+    moment = datetime(2026, 7, 22, tzinfo=UTC)
+    timeline = mariadb_client.read_rate_timeline(PRODUCT_CODE, REGION, moment, moment)
+    rate = timeline.at(moment)
 
     assert rate is not None
     assert rate.unit_rate == Decimal("25.00")
@@ -121,8 +122,39 @@ def test_overlapping_rows_deterministically_prefer_the_most_recently_started(
 def test_returns_none_when_no_rate_covers_the_given_moment(
     mariadb_client: MariaDBClient,
 ) -> None:
-    rate = mariadb_client.read_current_product_rate(
-        "NONEXISTENT", REGION, datetime(2026, 7, 22, tzinfo=UTC)
-    )
+    moment = datetime(2026, 7, 22, tzinfo=UTC)
+    timeline = mariadb_client.read_rate_timeline("NONEXISTENT", REGION, moment, moment)
+    rate = timeline.at(moment)
 
     assert rate is None
+
+
+def test_reads_only_the_rates_in_force_during_the_window(
+    mariadb_client: MariaDBClient,
+) -> None:
+    with mariadb_client.session_write_scope() as s:
+        for month in (1, 3, 5):
+            s.add(
+                model.product_rate(
+                    slot=half_hour_slot(datetime(2026, month, 1, tzinfo=UTC)),
+                    product_code=PRODUCT_CODE,
+                    region=REGION,
+                    valid_from=datetime(2026, month, 1, tzinfo=UTC),
+                    valid_to=datetime(2026, month + 2, 1, tzinfo=UTC),
+                    unit_rate=Decimal(month),
+                    standing_charge=Decimal("50.00"),
+                )
+            )
+
+    timeline = mariadb_client.read_rate_timeline(
+        PRODUCT_CODE,
+        REGION,
+        datetime(2026, 4, 1, tzinfo=UTC),
+        datetime(2026, 4, 30, tzinfo=UTC),
+    )
+
+    assert len(timeline) == 1
+    rate = timeline.at(datetime(2026, 4, 15, tzinfo=UTC))
+    assert rate is not None
+    assert rate.unit_rate == Decimal(3)
+    assert rate.valid_from == datetime(2026, 3, 1, tzinfo=UTC)
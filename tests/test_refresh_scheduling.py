@@ -120,10 +120,10 @@ def test_a_second_invocation_is_skipped_while_a_worker_is_already_running(
     assert consumption.refresh.call_count == 1
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 def test_a_new_invocation_after_the_worker_finished_starts_a_fresh_attempt_count(
-    mariadb_client: MariaDBClient, monkeypatch: pytest.MonkeyPatch
+    mariadb_client: MariaDBClient,
 ) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     scheduler = Scheduler()
     consumption = Mock(spec=ConsumptionRetriever)
     consumption.refresh.side_effect = RuntimeError("Octopus API unavailable")
@@ -175,7 +175,7 @@ def test_run_initial_pricing_sync_does_not_propagate_a_startup_failure() -> None
     run_initial_pricing_sync(pricing)
 
 
-def test_consumption_summary_job_is_registered_for_monday_at_0400(
+def test_consumption_summary_job_is_registered_daily_at_0400(
     mariadb_client: MariaDBClient,
 ) -> None:
     scheduler = Scheduler()
@@ -187,8 +187,7 @@ def test_consumption_summary_job_is_registered_for_monday_at_0400(
         mariadb_client,
     )
 
-    assert job.unit == "weeks"
-    assert job.start_day == "monday"
+    assert job.unit == "days"
     assert str(job.at_time) == "04:00:00"
 
 
@@ -296,15 +295,15 @@ def test_a_successful_cost_forecast_run_is_recorded_as_a_successful_job_run(
     assert runs[0].status == "success"
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 def test_a_failed_cost_forecast_run_is_recorded_as_a_failed_job_run(
-    mariadb_client: MariaDBClient, monkeypatch: pytest.MonkeyPatch
+    mariadb_client: MariaDBClient,
 ) -> None:
     # This exercises the job-registration/backoff wrapper shared by every
     # job in this file, using a Mock retriever -- it does not touch
     # cost_forecast at all. CostForecastRetriever's own "no row written on
     # failure" behavior is covered separately, against a real MariaDBClient,
     # by the test_kraken_unreachable_* tests in test_cost_forecast_retriever.py.
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     scheduler = Scheduler()
     cost_forecast = Mock(spec=CostForecastRetriever)
     cost_forecast.refresh.side_effect = RuntimeError("Kraken unavailable")
@@ -349,10 +348,10 @@ def test_a_successful_agile_forecast_run_is_recorded_as_a_successful_job_run(
     assert runs[0].status == "success"
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 def test_a_failed_agile_forecast_run_is_recorded_as_a_failed_job_run(
-    mariadb_client: MariaDBClient, monkeypatch: pytest.MonkeyPatch
+    mariadb_client: MariaDBClient,
 ) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     scheduler = Scheduler()
     agile_forecast = Mock(spec=AgileForecastRetriever)
     agile_forecast.refresh.side_effect = RuntimeError(
@@ -397,10 +396,10 @@ def test_pruning_runs_immediately_after_a_successful_summary_run_in_the_same_tic
     assert runs[0].status == "success"
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 def test_pruning_is_skipped_and_recorded_when_the_summary_run_ultimately_fails(
-    mariadb_client: MariaDBClient, monkeypatch: pytest.MonkeyPatch
+    mariadb_client: MariaDBClient,
 ) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     scheduler = Scheduler()
     consumption_summary = Mock(spec=ConsumptionSummaryRetriever)
     consumption_summary.refresh.side_effect = RuntimeError("MariaDB unavailable")
@@ -418,14 +417,14 @@ def test_pruning_is_skipped_and_recorded_when_the_summary_run_ultimately_fails(
     assert runs[0].status == "skipped"
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 def test_pruning_reflects_this_cycles_outcome_not_a_stale_previous_success(
-    mariadb_client: MariaDBClient, monkeypatch: pytest.MonkeyPatch
+    mariadb_client: MariaDBClient,
 ) -> None:
     """Regression test: prune_old_data must gate on *this* cycle's summary
     outcome, not whichever job_run happened to be most recently recorded.
     A prior cycle's success sitting in the table must not let pruning
     proceed if this cycle's summarization then fails."""
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
     mariadb_client.record_job_run("update_consumption_summary", "success")
     scheduler = Scheduler()
     consumption_summary = Mock(spec=ConsumptionSummaryRetriever)
@@ -509,7 +508,7 @@ def test_consumption_backfill_job_is_registered_daily_at_0400(
     assert str(job.at_time) == "04:00:00"
 
 
-def test_a_successful_backfill_run_calls_retrieve_and_is_recorded_as_successful(
+def test_a_successful_backfill_run_backfills_gaps_and_is_recorded_as_successful(
     mariadb_client: MariaDBClient,
 ) -> None:
     scheduler = Scheduler()
@@ -520,7 +519,7 @@ def test_a_successful_backfill_run_calls_retrieve_and_is_recorded_as_successful(
     )
     job.run().join()
 
-    consumption.retrieve.assert_called_once()
+    consumption.backfill_gaps.assert_called_once()
     consumption.refresh.assert_not_called()
 
     with mariadb_client.session_read_scope() as session:
@@ -555,7 +554,7 @@ def test_a_backfill_run_recomputes_period_from_at_call_time_not_registration(
     current_time = dt(2026, 6, 1, tzinfo=datetime.UTC)
     job.run().join()
 
-    _, kwargs = consumption.retrieve.call_args
+    _, kwargs = consumption.backfill_gaps.call_args
     expected = (current_time - timedelta(days=REFRESH_CONFIG.retention)).date()
     assert kwargs["period_from"].date() == expected
 
@@ -567,7 +566,7 @@ def test_a_persistently_failing_backfill_retries_with_exponential_backoff(
     monkeypatch.setattr("common.decorator.time.sleep", sleep_delays.append)
     scheduler = Scheduler()
     consumption = Mock(spec=ConsumptionRetriever)
-    consumption.retrieve.side_effect = RuntimeError("Octopus API unavailable")
+    consumption.backfill_gaps.side_effect = RuntimeError("Octopus API unavailable")
 
     job = register_consumption_backfill_job(
         scheduler, REFRESH_CONFIG, consumption, mariadb_client
@@ -575,7 +574,7 @@ def test_a_persistently_failing_backfill_retries_with_exponential_backoff(
     job.run().join()
 
     assert sleep_delays == [60, 120, 240, 480]
-    assert consumption.retrieve.call_count == 5
+    assert consumption.backfill_gaps.call_count == 5
 
     with mariadb_client.session_read_scope() as session:
         runs = (
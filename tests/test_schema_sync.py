@@ -1,4 +1,4 @@
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from decimal import Decimal
 from typing import ClassVar
 
@@ -6,8 +6,18 @@ import pytest
 from common.config import MariaDBSettings
 from data.mysql import model
 from data.mysql.client import MariaDBClient
+from data.mysql.compact_keys import half_hour_slot
 from data.mysql.model import SQLBase
-from sqlalchemy import Column, DateTime, Float, String, create_engine, inspect, text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    create_engine,
+    inspect,
+    text,
+)
 from sqlalchemy.dialects import mysql
 from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
@@ -22,11 +32,27 @@ class _StrippedConsumption(_StrippedBase):
     __tablename__ = "consumption"
     __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
 
+    energy = Column(String, primary_key=True)
+    slot = Column(Integer, primary_key=True, autoincrement=False)
+    period_from = Column(DateTime, nullable=False)
+    period_to = Column(DateTime, nullable=False)
+    raw_value = Column(Float, nullable=False)
+    est_kwh = Column(Float, nullable=False)
+
+
+_LegacyBase = declarative_base()
+
+
+class _LegacyConsumption(_LegacyBase):
+    __tablename__ = "consumption"
+    __table_args__: ClassVar[dict[str, str]] = {"schema": "octopus"}
+
     id = Column(String, primary_key=True)
     energy = Column(String)
     period_from = Column(DateTime, nullable=False)
     period_to = Column(DateTime, nullable=False)
     raw_value = Column(Float, nullable=False)
+    unit = Column(String, nullable=False)
     est_kwh = Column(Float, nullable=False)
 
 
@@ -100,13 +126,14 @@ def test_a_column_missing_from_an_existing_table_is_added_on_startup(
 
     columns = {column["name"] for column in inspect(engine).get_columns("consumption")}
     assert columns == {
-        "id",
         "energy",
+        "slot",
         "period_from",
         "period_to",
         "raw_value",
         "unit",
         "est_kwh",
+        "local_date",
     }
 
 
@@ -158,7 +185,7 @@ def test_consumption_values_round_trip_as_decimal_without_precision_loss(
     session = sessionmaker(bind=engine)()
     session.add(
         model.consumption(
-            id="E20260101000000",
+            slot=half_hour_slot(datetime(2026, 1, 1, tzinfo=UTC)),
             energy="E",
             period_from=datetime(2026, 1, 1, tzinfo=UTC),
             period_to=datetime(2026, 1, 1, 0, 30, tzinfo=UTC),
@@ -188,3 +215,155 @@ def test_a_column_no_longer_declared_in_the_model_is_never_dropped(
 
     columns = {column["name"] for column in inspect(engine).get_columns("job_run")}
     assert "retired_field" in columns
+
+
+def test_consumption_rows_predating_local_date_are_backfilled_on_startup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = _sqlite_engine()
+    _StrippedBase.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    # 23:30 UTC on 20 July is 00:30 on 21 July in Europe/London (BST).
+    session.add(
+        _StrippedConsumption(
+            slot=half_hour_slot(datetime(2026, 7, 20, 23, 30)),
+            energy="E",
+            period_from=datetime(2026, 7, 20, 23, 30),
+            period_to=datetime(2026, 7, 21, 0, 0),
+            raw_value=1.0,
+            est_kwh=1.0,
+        )
+    )
+    session.commit()
+
+    _sync_against(engine, monkeypatch)
+
+    with engine.connect() as connection:
+        local_date = connection.execute(
+            text("SELECT local_date FROM consumption")
+        ).scalar_one()
+    assert local_date == date(2026, 7, 21).isoformat()
+
+
+def test_string_keyed_consumption_is_migrated_to_slot_keys_on_startup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = _sqlite_engine()
+    _LegacyBase.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        _LegacyConsumption(
+            id=f"E{period_from:%Y%m%d%H%M%S}",
+            energy="E",
+            period_from=period_from,
+            period_to=period_from.replace(minute=30),
+            raw_value=1.0,
+            unit="kWh",
+            est_kwh=1.0,
+        )
+        for period_from in (datetime(2026, 7, 20, 22, 0), datetime(2026, 7, 20, 23))
+    )
+    session.commit()
+
+    _sync_against(engine, monkeypatch)
+
+    inspector = inspect(engine)
+    assert inspector.get_pk_constraint("consumption")["constrained_columns"] == [
+        "energy",
+        "slot",
+    ]
+    with engine.connect() as connection:
+        migrated = connection.execute(
+            text("SELECT slot, local_date FROM consumption ORDER BY slot")
+        ).all()
+        legacy_ids = connection.execute(
+            text("SELECT id FROM consumption_legacy_id ORDER BY id")
+        ).scalars()
+        assert migrated == [
+            (half_hour_slot(datetime(2026, 7, 20, 22, 0)), "2026-07-20"),
+            (half_hour_slot(datetime(2026, 7, 20, 23, 0)), "2026-07-21"),
+        ]
+        assert list(legacy_ids) == ["E20260720220000", "E20260720230000"]
+
+
+def test_a_synced_model_fingerprint_skips_reflection_on_the_next_startup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = _sqlite_engine()
+    _sync_against(engine, monkeypatch)
+    # Drift the model fingerprint can't see, so a skipped sync is visible.
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_job_run_job_name_ran_at"))
+
+    _sync_against(engine, monkeypatch)
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("job_run")}
+    assert "ix_job_run_job_name_ran_at" not in index_names
+
+
+def test_a_changed_model_fingerprint_runs_the_full_sync_on_startup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = _sqlite_engine()
+    _sync_against(engine, monkeypatch)
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_job_run_job_name_ran_at"))
+        connection.execute(text("UPDATE schema_version SET fingerprint = 'stale'"))
+
+    _sync_against(engine, monkeypatch)
+
+    index_names = {index["name"] for index in inspect(engine).get_indexes("job_run")}
+    assert "ix_job_run_job_name_ran_at" in index_names
+    with engine.connect() as connection:
+        fingerprints = connection.execute(
+            text("SELECT fingerprint FROM schema_version")
+        ).scalars()
+        assert len([f for f in fingerprints if f != "stale"]) == 1
+
+
+def test_rollups_missing_from_an_existing_database_are_built_on_startup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    engine = _sqlite_engine()
+    rollups = {"hourly_consumption_summary", "monthly_consumption_summary"}
+    SQLBase.metadata.create_all(
+        engine,
+        tables=[
+            table
+            for table in SQLBase.metadata.tables.values()
+            if table.name not in rollups
+        ],
+    )
+    session = sessionmaker(bind=engine)()
+    session.add_all(
+        [
+            model.consumption(
+                slot=half_hour_slot(datetime(2026, 7, 20, 11, 0)),
+                energy="E",
+                local_date=date(2026, 7, 20),
+                period_from=datetime(2026, 7, 20, 11, 0),
+                period_to=datetime(2026, 7, 20, 11, 30),
+                raw_value=Decimal("1.5"),
+                est_kwh=Decimal("1.5"),
+            ),
+            model.daily_consumption_summary(
+                energy="E", date=date(2026, 7, 20), total_kwh=Decimal("1.5")
+            ),
+        ]
+    )
+    session.commit()
+
+    _sync_against(engine, monkeypatch)
+
+    with engine.connect() as connection:
+        hourly = connection.execute(
+            text(
+                "SELECT date, hour, total_kwh, half_hours FROM hourly_consumption_summary"
+            )
+        ).all()
+        monthly = connection.execute(
+            text("SELECT month, total_kwh, days FROM monthly_consumption_summary")
+        ).all()
+    # 11:00 UTC is 12:00 BST.
+    assert hourly == [("2026-07-20", 12, 1.5, 1)]
+    assert monthly == [("2026-07-01", 1.5, 1)]
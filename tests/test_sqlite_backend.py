@@ -0,0 +1,126 @@
+import threading
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from common.config import MariaDBSettings
+from data.model import Consumption, Unit
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.octopus.model import Agreement, Electricity, Gas, Rate
+from pydantic import ValidationError
+from sqlalchemy import text
+
+PRODUCT_CODE = "VAR-22-11-01"
+REGION = "H"
+DAY = datetime(2026, 1, 10, tzinfo=UTC)
+
+
+def _sqlite_client(path: Path) -> MariaDBClient:
+    return MariaDBClient(MariaDBSettings(backend="sqlite", sqlite_path=str(path)))
+
+
+def _agreement(energy_prefix: str = "E") -> Agreement:
+    return Agreement(
+        tariff_code=f"{energy_prefix}-1R-{PRODUCT_CODE}-{REGION}",
+        valid_from=datetime(2022, 1, 1, tzinfo=UTC),
+        valid_to=None,
+    )
+
+
+def _half_hours(start: datetime, count: int) -> list[Consumption]:
+    return [
+        Consumption(
+            raw=Decimal("0.5"),
+            est_kwh=Decimal("0.5"),
+            unit=Unit.kwh,
+            start=start + timedelta(minutes=30 * slot),
+            end=start + timedelta(minutes=30 * (slot + 1)),
+        )
+        for slot in range(count)
+    ]
+
+
+def test_the_sqlite_backend_needs_no_connection_settings() -> None:
+    settings = MariaDBSettings(backend="sqlite")
+
+    assert settings.host is None
+
+
+def test_the_mariadb_backend_names_the_connection_settings_it_is_missing() -> None:
+    with pytest.raises(ValidationError, match="host, password required"):
+        MariaDBSettings(port=3306, database="octopus", username="u")
+
+
+def test_the_sqlite_backend_keeps_its_file_in_wal_mode(tmp_path: Path) -> None:
+    client = _sqlite_client(tmp_path / "octopus.sqlite")
+
+    with client.session_read_scope() as session:
+        journal_mode = session.execute(text("PRAGMA journal_mode")).scalar_one()
+
+    assert journal_mode == "wal"
+
+
+def test_data_written_through_the_sqlite_backend_is_priced_pruned_and_survives_restart(
+    tmp_path: Path,
+) -> None:
+    database = tmp_path / "octopus.sqlite"
+    client = _sqlite_client(database)
+    meter = Electricity(
+        mpan="1234567890123", serial_number="00A1234567", agreements=[_agreement()]
+    )
+    client.write_agreement(meter, meter.agreements)
+    client.write_product_rate(
+        PRODUCT_CODE,
+        REGION,
+        [
+            Rate(
+                valid_from=datetime(2026, 1, 1, tzinfo=UTC),
+                valid_to=None,
+                unit_rate=Decimal("20.00"),
+                standing_charge=Decimal("50.00"),
+            )
+        ],
+    )
+    client.write_consumption(meter, _half_hours(DAY, 4))
+    client.prune_consumption_older_than(DAY + timedelta(hours=1))
+    client.record_job_run("consumption_refresh", "success")
+
+    restarted = _sqlite_client(database)
+
+    with restarted.session_read_scope() as session:
+        costs = session.query(model.consumption_cost).all()
+    assert [cost.variable_cost for cost in costs] == [Decimal("10.00000000000")] * 2
+    assert restarted.latest_job_run_is_successful("consumption_refresh") is True
+
+
+def test_job_threads_writing_at_once_through_the_sqlite_backend_all_commit(
+    tmp_path: Path,
+) -> None:
+    client = _sqlite_client(tmp_path / "octopus.sqlite")
+    meters = [
+        Electricity(mpan="1", serial_number="E1", agreements=[_agreement()]),
+        Gas(mprn="2", serial_number="G1", agreements=[_agreement("G")]),
+    ]
+    errors: list[Exception] = []
+
+    def write_days(meter: Electricity | Gas) -> None:
+        try:
+            for day in range(10):
+                client.write_consumption(
+                    meter, _half_hours(DAY + timedelta(days=day), 48)
+                )
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write_days, args=(m,)) for m in meters]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with client.session_read_scope() as session:
+        written = session.query(model.consumption).count()
+    assert not errors
+    assert written == 2 * 10 * 48
@@ -0,0 +1,176 @@
+import re
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+import responses
+from common.config import ApplicationSettings
+from data.base import MonitoringClient
+from data.consumption import ConsumptionRetriever
+from data.model import Energy
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.mysql.gaps import ConsumptionGapScanner
+from data.octopus.model import Account, Agreement, BillingPeriod, Electricity, Gas
+from data.warm_start import ACCOUNT_SECTION, WARM_START_MAX_AGE, WarmStartStore
+from main import startup
+
+SETTINGS = ApplicationSettings.model_validate(
+    {
+        "octopus": {"account_number": "A-1234ABCD", "api_key": "sk_live_test"},
+        "mariadb": {
+            "host": "localhost",
+            "port": 3306,
+            "database": "octopus",
+            "username": "test",
+            "password": "test",
+        },
+        "data_refresh": {"refresh_interval_hours": 4, "retention_days": 45},
+    }
+)
+
+
+def _meters() -> list[Electricity | Gas]:
+    return [
+        Electricity(
+            mpan="1234567890123",
+            serial_number="00A1234567",
+            agreements=[
+                Agreement(
+                    tariff_code="E-1R-AGILE-24-10-01-H",
+                    valid_from=datetime(2024, 10, 1, tzinfo=UTC),
+                    valid_to=datetime(2025, 10, 1, tzinfo=UTC),
+                ),
+                Agreement(
+                    tariff_code="E-1R-VAR-22-11-01-H",
+                    valid_from=datetime(2025, 10, 1, tzinfo=UTC),
+                    valid_to=None,
+                ),
+            ],
+        ),
+        Gas(
+            mprn="9876543210",
+            serial_number="G4A00000",
+            agreements=[
+                Agreement(
+                    tariff_code="G-1R-VAR-22-11-01-H",
+                    valid_from=datetime(2022, 11, 1, tzinfo=UTC),
+                    valid_to=None,
+                )
+            ],
+        ),
+    ]
+
+
+def test_a_saved_snapshot_restores_the_account_meters_region_period_and_cursors(
+    mariadb_client: MariaDBClient,
+) -> None:
+    store = WarmStartStore(mariadb_client)
+    account = Account("A-1234ABCD", "1 High Street, Town", "AB12CD")
+    store.save_account(account, _meters(), "H")
+    store.save_billing_period(BillingPeriod(date(2099, 1, 5), date(2099, 2, 4)))
+    store.save_consumption_cursor(Energy.gas, datetime(2026, 1, 2, 3, tzinfo=UTC))
+
+    restored = WarmStartStore(mariadb_client).restore()
+
+    assert restored.account == account
+    assert restored.region_code == "H"
+    electricity, gas = restored.meters
+    assert isinstance(electricity, Electricity)
+    assert electricity.mpan == "1234567890123"
+    assert [a.tariff_code for a in electricity.agreements] == [
+        "E-1R-AGILE-24-10-01-H",
+        "E-1R-VAR-22-11-01-H",
+    ]
+    assert electricity.agreements[0].valid_to == datetime(2025, 10, 1, tzinfo=UTC)
+    assert electricity.agreements[1].valid_to is None
+    assert isinstance(gas, Gas)
+    assert gas.mprn == "9876543210"
+    assert restored.billing_period == BillingPeriod(date(2099, 1, 5), date(2099, 2, 4))
+    assert restored.consumption_cursors == {
+        Energy.gas: datetime(2026, 1, 2, 3, tzinfo=UTC)
+    }
+
+
+def test_sections_older_than_the_max_age_are_not_restored(
+    mariadb_client: MariaDBClient,
+) -> None:
+    store = WarmStartStore(mariadb_client)
+    store.save_account(Account("A-1234ABCD", "", "AB12CD"), _meters(), "H")
+    store.save_consumption_cursor(Energy.electricity, datetime.now(UTC))
+
+    restored = store.restore(
+        as_of=datetime.now(UTC) + WARM_START_MAX_AGE + timedelta(minutes=1)
+    )
+
+    assert restored.account is None
+    assert not restored.meters
+    assert not restored.consumption_cursors
+
+
+def test_a_billing_period_that_has_ended_is_fetched_again(
+    mariadb_client: MariaDBClient,
+) -> None:
+    store = WarmStartStore(mariadb_client)
+    store.save_billing_period(BillingPeriod(date(2026, 1, 5), date(2026, 2, 4)))
+
+    restored = store.restore(as_of=datetime(2026, 2, 5, 9, tzinfo=UTC))
+
+    assert restored.billing_period is None
+
+
+def test_an_unreadable_section_is_skipped_rather_than_failing_startup(
+    mariadb_client: MariaDBClient,
+) -> None:
+    store = WarmStartStore(mariadb_client)
+    with mariadb_client.session_write_scope() as session:
+        session.add(
+            model.warm_start_state(
+                name=ACCOUNT_SECTION,
+                state='{"number": "A-1234ABCD"}',
+                captured_at=datetime.now(UTC),
+            )
+        )
+    store.save_consumption_cursor(Energy.electricity, datetime(2026, 1, 2, tzinfo=UTC))
+
+    restored = store.restore()
+
+    assert restored.account is None
+    assert restored.consumption_cursors == {
+        Energy.electricity: datetime(2026, 1, 2, tzinfo=UTC)
+    }
+
+
+@pytest.mark.usefixtures("no_retry_delay")
+@responses.activate
+def test_a_warm_start_fetches_consumption_without_requesting_the_account_again(
+    mariadb_client: MariaDBClient,
+) -> None:
+    # MonitoringClient opens its own MariaDBClient, which shares
+    # mariadb_client's in-memory database.
+    store = WarmStartStore(mariadb_client)
+    store.save_account(Account("A-1234ABCD", "", "AB12CD"), _meters(), "H")
+    cursor = datetime.now(UTC) - timedelta(hours=2)
+    store.save_consumption_cursor(Energy.electricity, cursor)
+    store.save_consumption_cursor(Energy.gas, cursor)
+    responses.add(
+        responses.GET,
+        re.compile(r"https://api\.octopus\.energy/v1/.*/consumption/"),
+        json={"results": [], "next": None},
+        status=200,
+    )
+
+    client = MonitoringClient(SETTINGS)
+    startup(
+        ConsumptionRetriever(
+            client, client.warm_start, ConsumptionGapScanner(client.mariadb)
+        ),
+        SETTINGS.refresh_settings,
+    )
+
+    request_urls = [call.request.url for call in responses.calls]
+    assert len(request_urls) == 2
+    assert not any("/accounts/" in url for url in request_urls)
+    assert [meter.serial_number for meter in client.meters] == [
+        "00A1234567",
+        "G4A00000",
+    ]
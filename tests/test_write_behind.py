@@ -0,0 +1,225 @@
+import threading
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from common.exceptions import MariaDBError
+from data.model import Consumption, Unit
+from data.mysql import model
+from data.mysql.client import MariaDBClient
+from data.mysql.write_behind import WriteBehindQueue
+from data.octopus.model import Agreement, Direction, Electricity, Product, Rate
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+PRODUCT_CODE = "VAR-22-11-01"
+REGION = "H"
+DAY = datetime(2026, 1, 10, tzinfo=UTC)
+# The client under test queues its writes instead of committing them inline.
+WRITE_BEHIND = pytest.mark.parametrize(
+    "mariadb_client", [{"write_behind": True}], indirect=True
+)
+
+
+def _meter() -> Electricity:
+    return Electricity(
+        mpan="1234567890123",
+        serial_number="00A1234567",
+        agreements=[
+            Agreement(
+                tariff_code=f"E-1R-{PRODUCT_CODE}-{REGION}",
+                valid_from=datetime(2022, 1, 1, tzinfo=UTC),
+                valid_to=None,
+            )
+        ],
+    )
+
+
+def _half_hours(count: int) -> list[Consumption]:
+    return [
+        Consumption(
+            raw=Decimal("0.5"),
+            est_kwh=Decimal("0.5"),
+            unit=Unit.kwh,
+            start=DAY + timedelta(minutes=30 * slot),
+            end=DAY + timedelta(minutes=30 * (slot + 1)),
+        )
+        for slot in range(count)
+    ]
+
+
+@WRITE_BEHIND
+def test_a_thread_reads_back_its_own_queued_writes_priced_as_if_written_directly(
+    mariadb_client: MariaDBClient,
+) -> None:
+    meter = _meter()
+    mariadb_client.write_agreement(meter, meter.agreements)
+    mariadb_client.write_product_rate(
+        PRODUCT_CODE,
+        REGION,
+        [
+            Rate(
+                valid_from=datetime(2026, 1, 1, tzinfo=UTC),
+                valid_to=None,
+                unit_rate=Decimal("20.00"),
+                standing_charge=Decimal("50.00"),
+            )
+        ],
+    )
+    mariadb_client.write_consumption(meter, _half_hours(2))
+
+    with mariadb_client.session_read_scope() as session:
+        costs = session.query(model.consumption_cost).all()
+
+    assert {cost.variable_cost for cost in costs} == {Decimal("10.00000000000")}
+    assert len(costs) == 2
+
+
+@WRITE_BEHIND
+def test_a_queued_write_returns_no_counts_rather_than_empty_ones(
+    mariadb_client: MariaDBClient,
+) -> None:
+    result = mariadb_client.write_consumption(_meter(), _half_hours(2))
+
+    assert result is None
+    with mariadb_client.session_read_scope() as session:
+        assert session.query(model.consumption).count() == 2
+
+
+@WRITE_BEHIND
+def test_a_job_run_is_recorded_only_after_the_job_s_queued_writes_commit(
+    mariadb_client: MariaDBClient, engine: Engine
+) -> None:
+    statements: list[str] = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda _conn, _cursor, statement, *args: statements.append(statement),
+    )
+
+    mariadb_client.write_consumption(_meter(), _half_hours(2))
+    mariadb_client.record_job_run("consumption_refresh", "success")
+
+    inserted_into = [
+        statement.split()[2].split(".")[-1]
+        for statement in statements
+        if statement.startswith("INSERT INTO")
+    ]
+    assert inserted_into.index("consumption") < inserted_into.index("job_run")
+
+
+@WRITE_BEHIND
+def test_a_failed_queued_write_fails_the_success_record_instead_of_hiding_behind_it(
+    mariadb_client: MariaDBClient, engine: Engine
+) -> None:
+    model.product.__table__.drop(engine)
+    mariadb_client.write_product(
+        Product(
+            product_code=PRODUCT_CODE,
+            display_name="Flexible Octopus",
+            direction=Direction.IMPORT,
+        )
+    )
+
+    with pytest.raises(MariaDBError):
+        mariadb_client.record_job_run("pricing_refresh", "success")
+    # The failure is reported once: the job's follow-up "failure" record
+    # goes through.
+    mariadb_client.record_job_run("pricing_refresh", "failure", error="boom")
+
+    assert mariadb_client.latest_job_run_is_successful("pricing_refresh") is False
+
+
+def test_writes_queued_while_a_commit_runs_are_merged_into_the_next_one() -> None:
+    committing = threading.Event()
+    release = threading.Event()
+    batches: list[list[int]] = []
+
+    def write_merged(writes: list[int]) -> None:
+        batches.append(writes)
+        committing.set()
+        release.wait(timeout=5)
+
+    queue = WriteBehindQueue(
+        write_merged, lambda _: None, max_pending=10, flush_timeout=5
+    )
+    queue.submit(0)
+    committing.wait(timeout=5)
+    for write in (1, 2, 3):
+        queue.submit(write)
+    release.set()
+    queue.flush()
+
+    assert batches == [[0], [1, 2, 3]]
+
+
+def test_one_bad_write_in_a_merged_commit_fails_only_itself() -> None:
+    committed: list[int] = []
+
+    def write_merged(writes: list[int]) -> None:
+        if 2 in writes:
+            raise ValueError("bad write")
+        committed.extend(writes)
+
+    def write_one(write: int) -> None:
+        write_merged([write])
+
+    queue = WriteBehindQueue(write_merged, write_one, max_pending=10, flush_timeout=5)
+    futures = [queue.submit(write) for write in (1, 2, 3)]
+
+    with pytest.raises(ValueError, match="bad write"):
+        queue.flush()
+    assert [future.exception() is None for future in futures] == [True, False, True]
+    assert sorted(committed) == [1, 3]
+
+
+def test_flush_waits_only_for_writes_the_calling_thread_queued() -> None:
+    release = threading.Event()
+    queue: WriteBehindQueue[Any] = WriteBehindQueue(
+        lambda _: release.wait(timeout=5),
+        lambda _: None,
+        max_pending=10,
+        flush_timeout=5,
+    )
+    other_job = threading.Thread(target=queue.submit, args=("other job's write",))
+    other_job.start()
+    other_job.join()
+
+    queue.flush()
+
+    assert not release.is_set()
+    release.set()
+
+
+def test_flush_gives_up_on_a_writer_stuck_past_the_timeout() -> None:
+    release = threading.Event()
+    queue: WriteBehindQueue[Any] = WriteBehindQueue(
+        lambda _: release.wait(timeout=5),
+        lambda _: None,
+        max_pending=10,
+        flush_timeout=0.1,
+    )
+    queue.submit("write")
+
+    with pytest.raises(MariaDBError, match="not committed within 0.1s"):
+        queue.flush()
+    release.set()
+
+
+# The writer dying is the point; pytest would otherwise report its exit.
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_flush_fails_at_once_once_the_writer_thread_has_died() -> None:
+    def write_merged(_: list[Any]) -> None:
+        raise SystemExit
+
+    threads_before = set(threading.enumerate())
+    queue: WriteBehindQueue[Any] = WriteBehindQueue(
+        write_merged, lambda _: None, max_pending=10, flush_timeout=60
+    )
+    (writer,) = set(threading.enumerate()) - threads_before
+    queue.submit("write")
+    writer.join(timeout=5)
+
+    with pytest.raises(MariaDBError, match="writer thread has stopped"):
+        queue.flush()
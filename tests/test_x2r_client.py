@@ -100,22 +100,18 @@ def test_day_ahead_and_actual_prices_are_not_included_in_the_forecast() -> None:
     assert readings[0].unit_rate == Decimal("21.19")
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_empty_forecast_array_raises_a_clear_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_empty_forecast_array_raises_a_clear_error() -> None:
     _mock_forecast([])
 
     with pytest.raises(APIError, match=REGION):
         X2rClient().get_forecast(REGION)
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_non_200_response_raises_api_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_non_200_response_raises_api_error() -> None:
     responses.add(
         responses.GET,
         ENDPOINT,
@@ -127,11 +123,9 @@ def test_non_200_response_raises_api_error(
         X2rClient().get_forecast(REGION)
 
 
+@pytest.mark.usefixtures("no_retry_delay")
 @responses.activate
-def test_connection_failure_raises_a_descriptive_runtime_error(
-    monkeypatch: pytest.MonkeyPatch,
-) -> None:
-    monkeypatch.setattr("common.decorator.time.sleep", lambda seconds: None)
+def test_connection_failure_raises_a_descriptive_runtime_error() -> None:
     responses.add(
         responses.GET,
         ENDPOINT,